@@ -7,6 +7,12 @@ import math
 import sys
 import threading
 
+a_tools_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from random_stream import RandomStream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -259,13 +265,38 @@ class EnigmaShuffler:
         
         return deck
 
-def generate_shuffled_deck(has_joker=False, deck_count=1):
+def seeded_stream(seed, purpose="deck"):
+    """可复现模式下由洗牌种子派生的随机流（purpose 区分洗牌和切牌）"""
+    return RandomStream(key=hashlib.sha3_256(f"{purpose}:{seed}".encode("utf-8")).digest())
+
+
+def new_deck(has_joker=False, deck_count=1):
+    deck = []
+    for _ in range(deck_count):
+        # 添加标准52张牌
+        deck.extend([Card(s, r) for s in SUITS for r in RANKS])
+        # 如果需要，添加鬼牌
+        if has_joker:
+            deck.append(Card('JOKER', 'A'))
+    return deck
+
+
+def generate_shuffled_deck(has_joker=False, deck_count=1, seed=None):
     """生成加密洗牌后的牌组
     
     Args:
         has_joker: 是否包含鬼牌
         deck_count: 牌副数
+        seed: 洗牌种子；None 时取 rng_provider 派生的种子（正式模式下为 None）。
+              有种子时跳过熵源收集，直接用种子派生的随机流洗牌，结果可复现
     """
+    if seed is None:
+        seed = rng_provider.derive_seed("shuffle")
+    if seed is not None:
+        deck = new_deck(has_joker, deck_count)
+        seeded_stream(seed).shuffle(deck)
+        return [card.to_dict() for card in deck]
+
     # 1. 量子熵源收集
     entropy_source = QuantumEntropySource()
     entropy = entropy_source.collect()
@@ -278,24 +309,16 @@ def generate_shuffled_deck(has_joker=False, deck_count=1):
     enigma = EnigmaShuffler(chaos_seed[:48])
     
     # 4. 创建牌组
-    deck = []
-    for _ in range(deck_count):
-        # 添加标准52张牌
-        deck.extend([Card(s, r) for s in SUITS for r in RANKS])
-        # 如果需要，添加鬼牌
-        if has_joker:
-            deck.append(Card('JOKER', 'A'))
+    deck = new_deck(has_joker, deck_count)
     
     # 5. 第一阶段洗牌 - 英格玛机
     deck = enigma.shuffle(deck)
     
-    # 6. 第二阶段洗牌 - 混沌系统
-    n = len(deck)
-    for i in range(n - 1, 0, -1):
-        # 使用混沌值选择交换位置
-        chaos_val = chaos.next()
-        j = int(chaos_val * (i + 1))
-        deck[i], deck[j] = deck[j], deck[i]
+    # 6. 第二阶段洗牌 - 以熵池和混沌种子为密钥的 SHAKE-256 随机流
+    # （原来用 int(混沌值 * (i + 1)) 选交换位置，每步一次浮点迭代且结果有偏；
+    #  随机流一次取出全部随机字，拒绝采样保证每个位置等概率）
+    stream = RandomStream(key=hashlib.sha3_256(entropy + chaos_seed).digest())
+    stream.shuffle(deck)
     
     return [card.to_dict() for card in deck]
 
@@ -318,9 +341,18 @@ if __name__ == "__main__":
             except ValueError:
                 deck_count = 1
     
-    shuffled_deck = generate_shuffled_deck(has_joker, deck_count)
+    # 可复现模式下由调用方派生本次洗牌的种子（rng_provider.shuffle_env）；
+    # 没有传入时不从继承的 CASINO_SEED 自行派生（每个子进程都从头计数，每次会洗出同一副牌）
+    seed = os.environ.get(rng_provider.SHUFFLE_SEED_ENV, "").strip()
+    seed = int(seed) if seed else None
+    if seed is None:
+        rng_provider.configure(None)
+    shuffled_deck = generate_shuffled_deck(has_joker, deck_count, seed)
     total_cards = len(shuffled_deck)
-    cut_position = secrets.randbelow(total_cards)
+    if seed is None:
+        cut_position = secrets.randbelow(total_cards)
+    else:
+        cut_position = seeded_stream(seed, "cut").randbelow(total_cards)
     
     # **Print** the JSON and exit immediately
     print(json.dumps({
@@ -0,0 +1,108 @@
+"""花旗骰规则引擎（无界面依赖）
+
+把每种下注的结算规则预先编译成查找表：
+    (下注类型, 阶段, 骰子1, 骰子2) -> (结果, 返还倍数)
+
+阶段为 None 表示该注尚未有点数（Come Out 阶段的 Pass/Don't Pass、刚下的 Come/Don't Come），
+为 4-10 时表示该注的点数。单轮注和 Place 注与阶段无关。
+返还倍数含本金（与 CrapsGame 中 amount * 倍数 的写法一致），只有 WIN / PUSH 时有意义。
+"""
+WIN, LOSE, PUSH, NO_ACTION, POINT = "win", "lose", "push", "no_action", "point"
+
+PHASES = (None, 4, 5, 6, 8, 9, 10)
+POINT_NUMBERS = (4, 5, 6, 8, 9, 10)
+
+# Place / Big 6 / Big 8 的赔率（净赢）
+PLACE_RATES = {
+    "big_6": 1, "big_8": 1,
+    "place_4": 9 / 5, "place_5": 7 / 5,
+    "place_6": 7 / 6, "place_8": 7 / 6,
+    "place_9": 7 / 5, "place_10": 9 / 5,
+}
+
+# 单轮注：点数总和 -> 返还倍数
+SINGLE_ROLL_TOTALS = {
+    "field": {2: 3, 12: 3, 3: 2, 4: 2, 9: 2, 10: 2, 11: 2},
+    "any_craps": {2: 8, 3: 8, 12: 8},
+    "any_7": {7: 5},
+    "horn_2": {2: 31},
+    "horn_3": {3: 16},
+    "horn_11": {11: 16},
+    "horn_12": {12: 31},
+}
+
+# 组合注：排序后的骰子 -> 返还倍数
+COMBO_RETURNS = {
+    "combo_11": ((1, 1), 31), "combo_12": ((1, 2), 16), "combo_22": ((2, 2), 8),
+    "combo_33": ((3, 3), 10), "combo_44": ((4, 4), 10), "combo_55": ((5, 5), 8),
+    "combo_56": ((5, 6), 16), "combo_66": ((6, 6), 31),
+}
+
+SINGLE_ROLL_BETS = tuple(SINGLE_ROLL_TOTALS) + tuple(COMBO_RETURNS)
+LINE_BETS = ("pass_line", "dont_pass", "come", "dont_come")
+PLACE_BETS = tuple(PLACE_RATES)
+ALL_BETS = LINE_BETS + PLACE_BETS + SINGLE_ROLL_BETS
+
+_NO_ACTION = (NO_ACTION, 0)
+
+
+def _resolve_rule(bet_type, phase, d1, d2):
+    """按 CrapsGame.calculate_results / calculate_single_roll_win 的规则判定一次掷骰"""
+    total = d1 + d2
+    if bet_type in SINGLE_ROLL_TOTALS:
+        ret = SINGLE_ROLL_TOTALS[bet_type].get(total)
+        return (WIN, ret) if ret else (LOSE, 0)
+    if bet_type in COMBO_RETURNS:
+        combo, ret = COMBO_RETURNS[bet_type]
+        return (WIN, ret) if tuple(sorted((d1, d2))) == combo else (LOSE, 0)
+    if bet_type in PLACE_RATES:
+        if total == 7:
+            return LOSE, 0
+        if total == int(bet_type.split('_')[1]):
+            return WIN, 1 + PLACE_RATES[bet_type]
+        return _NO_ACTION
+
+    do_side = bet_type in ("pass_line", "come")
+    if bet_type not in LINE_BETS:
+        raise ValueError(f"未知下注类型: {bet_type}")
+    if phase is None:
+        if total in (7, 11):
+            return (WIN, 2) if do_side else (LOSE, 0)
+        if total in (2, 3):
+            return (LOSE, 0) if do_side else (WIN, 2)
+        if total == 12:
+            return (LOSE, 0) if do_side else (PUSH, 1)
+        return POINT, 0
+    if total == phase:
+        return (WIN, 2) if do_side else (LOSE, 0)
+    if total == 7:
+        return (LOSE, 0) if do_side else (WIN, 2)
+    return _NO_ACTION
+
+
+def _compile():
+    table = {}
+    for bet_type in ALL_BETS:
+        phases = PHASES if bet_type in LINE_BETS else (None,)
+        for phase in phases:
+            table[(bet_type, phase)] = tuple(
+                _resolve_rule(bet_type, phase, d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)
+            )
+    return table
+
+
+# RESOLUTION[(下注类型, 阶段)][(骰子1 - 1) * 6 + (骰子2 - 1)] -> (结果, 返还倍数)
+RESOLUTION = _compile()
+
+
+def resolve(bet_type, d1, d2, phase=None):
+    """查表返回 (结果, 返还倍数)"""
+    if bet_type not in LINE_BETS:
+        phase = None
+    return RESOLUTION[(bet_type, phase)][(d1 - 1) * 6 + (d2 - 1)]
+
+
+def payout(bet_type, amount, dice, phase=None):
+    """一次掷骰后该注的返还金额（含本金）；输或未结算时为 0"""
+    outcome, ret = resolve(bet_type, dice[0], dice[1], phase)
+    return amount * ret if outcome in (WIN, PUSH) else 0
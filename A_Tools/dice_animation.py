@@ -0,0 +1,192 @@
+import random
+import secrets
+import time
+import tkinter as tk
+
+from PIL import Image, ImageDraw, ImageTk
+
+DEFAULT_FPS = 30
+
+# 骰子点位（按边长比例）
+_DOT_LAYOUT = {
+    1: [(2, 2)],
+    2: [(1, 1), (3, 3)],
+    3: [(1, 1), (2, 2), (3, 3)],
+    4: [(1, 1), (3, 1), (1, 3), (3, 3)],
+    5: [(1, 1), (3, 1), (2, 2), (1, 3), (3, 3)],
+    6: [(1, 1), (3, 1), (1, 2), (3, 2), (1, 3), (3, 3)],
+}
+
+# 骰面贴图缓存：PIL 图像按样式全局缓存；PhotoImage 属于某个 Tk 解释器，缓存挂在窗口上，
+# 随窗口销毁一起释放
+_face_cache = {}
+
+
+def render_dice_face(num, size, bg='#e8d6b3', outline_width=1, pip_color='#333',
+                     one_four_color=None, render_size=None):
+    """生成（并缓存）一个骰面的 PIL 图像
+
+    one_four_color: 1点和4点使用的颜色（None 表示与其它点相同）
+    render_size: 先按此尺寸绘制再缩放到 size（用于抗锯齿）
+    """
+    key = (num, size, bg, outline_width, pip_color, one_four_color, render_size)
+    img = _face_cache.get(key)
+    if img is not None:
+        return img
+
+    draw_size = render_size or size
+    img = Image.new('RGB', (draw_size, draw_size), bg)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 0, draw_size-1, draw_size-1], outline='#333', width=outline_width)
+    dot_color = one_four_color if one_four_color and num in (1, 4) else pip_color
+    dot_size = max(2, draw_size // 10)
+    for gx, gy in _DOT_LAYOUT[num]:
+        x = gx * draw_size // 4
+        y = gy * draw_size // 4
+        draw.ellipse([x-dot_size, y-dot_size, x+dot_size, y+dot_size], fill=dot_color)
+    if render_size and render_size != size:
+        img = img.resize((size, size), Image.LANCZOS)
+
+    _face_cache[key] = img
+    return img
+
+
+def dice_face_images(master, size, **style):
+    """返回 1-6 点的 PhotoImage 列表（下标 0 对应 1 点），同一窗口内按样式复用"""
+    top = master.winfo_toplevel()
+    cache = getattr(top, '_dice_photo_cache', None)
+    if cache is None:
+        cache = top._dice_photo_cache = {}
+    key = (size, tuple(sorted(style.items())))
+    images = cache.get(key)
+    if images is None:
+        images = [ImageTk.PhotoImage(render_dice_face(num, size, **style), master=top)
+                  for num in range(1, 7)]
+        cache[key] = images
+    return images
+
+
+def roll_outcome(count):
+    """使用 secrets 一次性决定 count 颗骰子的最终点数"""
+    return [secrets.randbelow(6) + 1 for _ in range(count)]
+
+
+def _tumble_candidates(value):
+    """翻滚到的下一面：排除当前面与对面"""
+    return [x for x in range(1, 7) if x != value and x != 7 - value]
+
+
+def build_tumble_sequence(final, frames, start=None, rng=random):
+    """预先生成一颗骰子的翻滚画面序列，最后一帧为 final
+
+    相邻两帧既不相同也不是对面，看起来像真实翻滚。
+    画面序列只用于显示，结果由调用方事先决定。
+    """
+    frames = max(1, frames)
+    if frames == 1:
+        return [final]
+    seq = []
+    current = start if start is not None else rng.randint(1, 6)
+    for _ in range(frames - 2):
+        current = rng.choice(_tumble_candidates(current))
+        seq.append(current)
+    # 倒数第二帧必须同时能翻到前一帧与最终面（两个四元集合必有交集）
+    prev_options = set(_tumble_candidates(current)) if (seq or start is not None) else set(range(1, 7))
+    bridge = sorted(prev_options & set(_tumble_candidates(final)))
+    seq.append(rng.choice(bridge))
+    seq.append(final)
+    return seq
+
+
+class DiceAnimation:
+    """固定帧率的骰子动画引擎
+
+    - 结果在开始前决定（finals，或由 roll_outcome 生成），动画过程中不再掷骰
+    - 每颗骰子的画面序列预先生成，按固定帧率播放
+    - 使用单一 after 定时器，按实际流逝时间计算帧号，落后时直接跳帧而不是追帧
+    - 只有画面变化的骰子才会更新图片
+
+    faces 为 6 张贴图（所有骰子共用），或按骰子分别给出的贴图列表
+    """
+    def __init__(self, widget, labels, faces, finals=None, duration=3.0, fps=DEFAULT_FPS,
+                 starts=None, stop_times=None, on_frame=None, on_stop=None, on_done=None):
+        self.widget = widget
+        self.labels = list(labels)
+        if faces and isinstance(faces[0], (list, tuple)):
+            self.faces = list(faces)
+        else:
+            self.faces = [faces] * len(self.labels)
+        self.finals = list(finals) if finals is not None else roll_outcome(len(self.labels))
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.on_frame = on_frame
+        self.on_stop = on_stop
+        self.on_done = on_done
+
+        if stop_times is None:
+            stop_times = [duration] * len(self.labels)
+        self.stop_times = list(stop_times)
+        self.stop_frames = [max(1, int(round(t * fps))) for t in self.stop_times]
+        self.total_frames = max(self.stop_frames)
+
+        starts = starts or [None] * len(self.labels)
+        self.sequences = [
+            build_tumble_sequence(final, frames, start)
+            for final, frames, start in zip(self.finals, self.stop_frames, starts)
+        ]
+        self.shown = [None] * len(self.labels)
+        self.stopped = [False] * len(self.labels)
+
+        self.frame = -1
+        self.dropped_frames = 0
+        self._after_id = None
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._tick()
+        return self
+
+    def cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        elapsed = time.perf_counter() - self._start
+        frame = min(int(elapsed * self.fps), self.total_frames - 1)
+        if frame > self.frame + 1:
+            self.dropped_frames += frame - self.frame - 1
+        self.frame = frame
+
+        try:
+            for i, label in enumerate(self.labels):
+                seq = self.sequences[i]
+                value = seq[min(frame, len(seq) - 1)]
+                if value != self.shown[i]:
+                    label.config(image=self.faces[i][value - 1])
+                    self.shown[i] = value
+                if not self.stopped[i] and frame >= self.stop_frames[i] - 1:
+                    self.stopped[i] = True
+                    if self.on_stop:
+                        self.on_stop(i, self.finals[i])
+        except tk.TclError:
+            # 窗口已关闭
+            return
+
+        if self.on_frame:
+            self.on_frame(frame + 1, self.total_frames)
+
+        if all(self.stopped):
+            if self.on_done:
+                self.on_done(self.finals)
+            return
+
+        # 对齐到下一帧的理想时刻，避免定时器误差累积
+        next_time = self._start + (frame + 1) * self.period
+        delay = max(1, int((next_time - time.perf_counter()) * 1000))
+        self._after_id = self.widget.after(delay, self._tick)
@@ -0,0 +1,42 @@
+"""无界面游戏引擎
+
+    from engines import create
+    engine = create("sicbo", seed=1)
+    engine.subscribe(print)
+    engine.play_round({"big": 100, "total_points:10": 10}, "roll")
+
+ENGINES 中的游戏每局只有一个开奖动作，可以挂在同桌服务器上；
+DECISION_ENGINES 中的游戏在开奖过程中还需要玩家决策（如赌场战争平局后选择战争或投降）。
+
+尚无引擎、仍在各自 GUI 内结算的牌类游戏：三张牌扑克、UOH、DJ Wild、牌九、百家乐。
+百家乐的 Baccarat 牌局类虽不依赖界面，但七种玩法的赔付（resolve_bets）和边注判定
+（_check_side_bets）都在 BaccaratGUI 里，需要先把它们移出 GUI 才能写成引擎。
+"""
+from .base import Event, EngineError, GameEngine, IDLE, BETTING, RESOLVED
+from .bacbo import BacBoEngine
+from .bigsix import BigSixEngine
+from .casino_war import CasinoWarEngine
+from .klondike import KlondikeEngine
+from .roulette import EuropeanRouletteEngine, AmericanRouletteEngine
+from .sicbo import SicboEngine
+
+ENGINES = {
+    "bacbo": BacBoEngine,
+    "bigsix": BigSixEngine,
+    "klondike": KlondikeEngine,
+    "roulette_eu": EuropeanRouletteEngine,
+    "roulette_us": AmericanRouletteEngine,
+    "sicbo": SicboEngine,
+}
+
+DECISION_ENGINES = {
+    "casino_war": CasinoWarEngine,
+}
+
+
+def create(name, **kwargs):
+    """按名称创建引擎实例"""
+    engine_class = ENGINES.get(name) or DECISION_ENGINES.get(name)
+    if engine_class is None:
+        raise EngineError(f"未知游戏: {name}")
+    return engine_class(**kwargs)
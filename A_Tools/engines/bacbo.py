@@ -0,0 +1,94 @@
+"""骰子百家乐（BacBo）引擎
+
+闲庄各掷两颗骰子，点数大者胜。结算规则与 BacboGUI.resolve_bets 一致，
+GUI 也直接调用这里的 settle_bets。
+"""
+from collections import Counter
+
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+# 单注上限（同 BacboGUI.place_bet）
+BET_LIMITS = {
+    'Player': 500_000, 'Banker': 500_000, 'Tie': 100_000,
+    'Small': 30_000, 'Large': 30_000, 'ThreeOfKind': 30_000, 'FourOfKind': 30_000,
+    'Odd': 30_000, 'Even': 30_000, 'PlayerPair': 30_000, 'BankerPair': 30_000,
+}
+
+# 和局按四颗骰子总点数的返还倍数（含本金），其余总点数 5 倍
+TIE_RETURNS = {4: 89, 24: 89, 6: 26, 22: 26, 8: 11, 20: 11, 10: 7, 18: 7}
+TIE_DEFAULT_RETURN = 5
+# 庄/闲遇和局退还 90% 本金
+MAIN_TIE_REFUND = 0.9
+
+
+def winner_of(player_values, banker_values):
+    player_score = sum(player_values)
+    banker_score = sum(banker_values)
+    if player_score > banker_score:
+        return 'Player'
+    if banker_score > player_score:
+        return 'Banker'
+    return 'Tie'
+
+
+def bet_returns(player_values, banker_values):
+    """每个注项每 1 单位下注的返还（含本金）"""
+    winner = winner_of(player_values, banker_values)
+    player_score = sum(player_values)
+    banker_score = sum(banker_values)
+    all_dice = list(player_values) + list(banker_values)
+    counts = Counter(all_dice).values()
+
+    # 单双只看赢家点数；大小在和局时看四颗骰子总点数
+    winner_total = {'Player': player_score, 'Banker': banker_score}.get(winner, 0)
+    check_points = winner_total if winner != 'Tie' else player_score + banker_score
+
+    returns = {
+        'Player': 2 if winner == 'Player' else MAIN_TIE_REFUND if winner == 'Tie' else 0,
+        'Banker': 2 if winner == 'Banker' else MAIN_TIE_REFUND if winner == 'Tie' else 0,
+        'Tie': TIE_RETURNS.get(sum(all_dice), TIE_DEFAULT_RETURN) if winner == 'Tie' else 0,
+        'Small': 2 if 2 <= check_points <= 7 else 0,
+        'Large': 2 if 8 <= check_points <= 12 else 0,
+        'ThreeOfKind': 10 if any(c >= 3 for c in counts) else 0,
+        'FourOfKind': 206 if any(c == 4 for c in counts) else 0,
+        'Odd': 1.97 if winner != 'Tie' and winner_total % 2 == 1 else 0,
+        'Even': 1.97 if winner != 'Tie' and winner_total % 2 == 0 else 0,
+        'PlayerPair': 5.8 if player_values[0] == player_values[1] else 0,
+        'BankerPair': 5.8 if banker_values[0] == banker_values[1] else 0,
+    }
+    return returns
+
+
+def settle_bets(bets, player_values, banker_values):
+    """{注项: 返还（含本金）}，只含有下注的注项"""
+    returns = bet_returns(player_values, banker_values)
+    return {spot: amount * returns.get(spot, 0) for spot, amount in bets.items() if amount}
+
+
+class BacBoEngine(GameEngine):
+    name = "bacbo"
+    BET_LIMITS = BET_LIMITS
+
+    def _act(self, action, player_values=None, banker_values=None):
+        """action 'roll'；可传入指定点数（回放/测试）"""
+        if action != 'roll':
+            raise EngineError(f"未知动作: {action}")
+        self._require(BETTING)
+        randint = self.rng.randint
+        player_values = list(player_values or (randint(1, 6), randint(1, 6)))
+        banker_values = list(banker_values or (randint(1, 6), randint(1, 6)))
+        self.outcome = {
+            'player_dice': player_values,
+            'banker_dice': banker_values,
+            'player_score': sum(player_values),
+            'banker_score': sum(banker_values),
+            'winner': winner_of(player_values, banker_values),
+        }
+        self.phase = RESOLVED
+        return [Event("dice_rolled", dict(self.outcome))]
+
+    def outcome_kwargs(self, outcome):
+        return {"player_values": outcome["player_dice"], "banker_values": outcome["banker_dice"]}
+
+    def payouts_for(self, bets):
+        return settle_bets(bets, self.outcome['player_dice'], self.outcome['banker_dice'])
@@ -0,0 +1,200 @@
+"""无界面游戏引擎基类
+
+每个游戏是一个纯状态机，不依赖 tkinter：
+
+    new_round()              -> 进入下注阶段
+    place_bet(注项, 金额)     -> 记录下注
+    act(动作)                -> 掷骰/发牌等（各游戏自定义）
+    settle()                 -> 结算本局，回到空闲阶段
+
+每个方法返回本次产生的事件列表，同时推送给所有订阅者（GUI、服务器、模拟器）。
+引擎只负责规则与下注金额，不管理账户余额。
+
+未指定 rng / seed 时随机数来自 rng_provider：正式模式为缓冲的 CSPRNG 随机流
+（random_stream）；设置
+CASINO_SEED 后每个引擎按名称派生固定种子（记在 self.seed），可整局复现。
+"""
+import math
+import random
+from collections import namedtuple
+
+import random_stream
+import rng_provider
+
+# 阶段
+IDLE = "idle"
+BETTING = "betting"
+RESOLVED = "resolved"
+
+# type: 事件类型（round_started / bet_placed / bet_cleared / dice_rolled / settled ...）
+# data: 事件内容 dict
+Event = namedtuple("Event", ["type", "data"])
+
+
+class EngineError(ValueError):
+    """非法操作：阶段不对、注项不存在、金额超出限额等"""
+
+
+def make_rng(rng=None, seed=None):
+    """未指定时使用缓冲的 CSPRNG 随机流；给定 seed 时使用可复现的 random.Random"""
+    if rng is not None:
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return random_stream.StreamRandom()
+
+
+class GameEngine:
+    """游戏引擎基类
+
+    子类需要定义 name、BET_LIMITS（{注项: 单注上限}），并实现 _act 与 payouts_for；
+    ROUND_ACTION 为每局的开奖动作（下注阶段只接受这个动作，自动开局时也执行它）；
+    TABLE_LIMIT 为每局总下注上限（None 为不限）；STAKE_MULTIPLIER 用于一注
+    自动带出等额附注的注项（如 Klondike 的 Ante 带 Blind）。
+
+    lock_bets 在开奖前对每组有效下注调用一次（如按下注累积奖池）；单人对局中
+    开奖动作出错后重试也不会再调用。
+
+    payouts_for / validate_bet / validate_round 只依赖传入的下注，
+    多人同桌时可以用同一局结果分别结算每位玩家；此时 shared 设为 True，
+    引擎自身不持有下注，由桌子逐个玩家检查。
+    """
+    name = ""
+    BET_LIMITS = {}
+    TABLE_LIMIT = None
+    STAKE_MULTIPLIER = {}
+    MIN_BET = 1
+    ROUND_ACTION = "roll"
+    shared = False
+
+    def __init__(self, rng=None, seed=None):
+        if rng is None and seed is None:
+            seed = rng_provider.derive_seed(self.name)
+        self.seed = seed if rng is None else None
+        self.rng = make_rng(rng, seed)
+        self.phase = IDLE
+        self.round_id = 0
+        self.bets = {}
+        self.outcome = None
+        self._locked = False
+        self._subscribers = []
+
+    # ------------------- 订阅 -------------------
+    def subscribe(self, callback):
+        """callback(event) 会收到此后产生的每个事件；返回取消订阅的函数"""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _emit(self, events):
+        for event in events:
+            for callback in list(self._subscribers):
+                callback(event)
+        return events
+
+    def _require(self, *phases):
+        if self.phase not in phases:
+            raise EngineError(f"{self.name} 当前阶段为 {self.phase}，不能执行此操作")
+
+    def new_round(self):
+        self._require(IDLE)
+        self.round_id += 1
+        self.bets = {}
+        self.outcome = None
+        self._locked = False
+        self.phase = BETTING
+        return self._emit([Event("round_started", {"round": self.round_id})])
+
+    # ------------------- 下注规则 -------------------
+    def validate_bet(self, bets, spot, amount):
+        """检查在已有下注 bets 上再下 amount 是否合法，返回该注项新的总额"""
+        if spot not in self.BET_LIMITS:
+            raise EngineError(f"未知注项: {spot}")
+        # bool 是 int 的子类；NaN 与任何数比较都为假，会绕过下面所有检查
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount):
+            raise EngineError("下注金额无效")
+        if amount < self.MIN_BET:
+            raise EngineError(f"下注金额至少为 {self.MIN_BET}")
+        total = bets.get(spot, 0) + amount
+        if total > self.BET_LIMITS[spot]:
+            raise EngineError(f"{spot} 单注上限为 {self.BET_LIMITS[spot]:,}")
+        if self.TABLE_LIMIT is not None and sum(bets.values()) + amount > self.TABLE_LIMIT:
+            raise EngineError(f"本局总下注上限为 {self.TABLE_LIMIT:,}")
+        return total
+
+    def validate_round(self, bets):
+        """开局前检查整组下注（如最低 Ante），不合法时抛出 EngineError"""
+
+    def lock_bets(self, bets):
+        """整组下注通过检查、开奖之前调用；多人同桌时每位玩家调用一次"""
+
+    def stake_for(self, spot, amount):
+        """下注 amount 实际需要扣除的金额"""
+        return amount * self.STAKE_MULTIPLIER.get(spot, 1)
+
+    def staked(self, bets):
+        return sum(self.stake_for(spot, amount) for spot, amount in bets.items())
+
+    # ------------------- 状态机 -------------------
+    def place_bet(self, spot, amount):
+        self._require(BETTING)
+        total = self.validate_bet(self.bets, spot, amount)
+        self.bets[spot] = total
+        return self._emit([Event("bet_placed", {"spot": spot, "amount": amount, "total": total})])
+
+    def clear_bets(self):
+        self._require(BETTING)
+        refunded = dict(self.bets)
+        self.bets = {}
+        return self._emit([Event("bet_cleared", {"refunded": refunded})])
+
+    def act(self, action, **kwargs):
+        if self.phase == BETTING:
+            # 先检查动作再锁定下注，非法动作不会触发 lock_bets
+            if action != self.ROUND_ACTION:
+                raise EngineError(f"{self.name} 下注阶段只能执行 {self.ROUND_ACTION}，不能执行 {action}")
+            if not self.shared and not self._locked:
+                self.validate_round(self.bets)
+                self.lock_bets(self.bets)
+                self._locked = True
+        return self._emit(self._act(action, **kwargs))
+
+    def settle(self):
+        """结算本局：settled 事件带 {注项: 返还（含本金）}、总下注和总返还"""
+        self._require(RESOLVED)
+        payouts = self.payouts_for(self.bets)
+        staked = self.staked(self.bets)
+        returned = sum(payouts.values())
+        self.phase = IDLE
+        return self._emit([Event("settled", {
+            "round": self.round_id,
+            "outcome": self.outcome,
+            "payouts": payouts,
+            "staked": staked,
+            "returned": returned,
+            "net": returned - staked,
+        })])
+
+    def play_round(self, bets, action=None):
+        """自动对局：下注 -> 执行动作（默认 ROUND_ACTION）-> 结算，返回全部事件"""
+        events = self.new_round()
+        for spot, amount in bets.items():
+            events += self.place_bet(spot, amount)
+        events += self.act(action or self.ROUND_ACTION)
+        events += self.settle()
+        return events
+
+    def settings(self):
+        """重建同样状态的引擎所需的构造参数（不含 rng / seed），供会话记录使用"""
+        return {}
+
+    # ------------------- 子类实现 -------------------
+    def _act(self, action, **kwargs):
+        raise NotImplementedError
+
+    def outcome_kwargs(self, outcome):
+        """由 settled 事件里的 outcome 还原 _act 的指定结果参数（回放用）"""
+        raise NotImplementedError
+
+    def payouts_for(self, bets):
+        """按本局结果（self.outcome）结算一组下注，返回 {注项: 返还（含本金）}"""
+        raise NotImplementedError
@@ -0,0 +1,49 @@
+"""幸运之轮（Big Six）引擎
+
+54 格转轮，注项为格子上的符号；结算同 BigSixWheelGUI._settle_bets。
+"""
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+WHEEL_SEQUENCE = [
+    "1", "3", "1", "6", "1", "3", "1", "👑",
+    "1", "3", "1", "6", "3", "1", "12", "1",
+    "6", "1", "3", "1", "25", "1", "3", "1",
+    "6", "1", "3", "1", "12", "1", "6", "1",
+    "3", "1", "💵", "3", "1", "3", "1", "3",
+    "1", "12", "1", "6", "1", "3", "1", "25",
+    "1", "3", "1", "6", "1", "12"
+]
+
+# 返还倍数（含本金）
+OUTCOME_MULTIPLIERS = {"1": 2, "3": 4, "6": 7, "12": 13, "25": 26, "👑": 51, "💵": 51}
+
+# 同 BigSixWheelGUI.place_bet：数字格 50 万，特殊格 10 万
+BET_LIMITS = {symbol: 500_000 if symbol.isdigit() else 100_000 for symbol in OUTCOME_MULTIPLIERS}
+
+
+class BigSixEngine(GameEngine):
+    """动作 'spin' 随机选出一个格子"""
+    name = "bigsix"
+    BET_LIMITS = BET_LIMITS
+    ROUND_ACTION = "spin"
+
+    def _act(self, action, index=None):
+        """action 'spin'；可传入指定格子序号（回放/测试）"""
+        if action != 'spin':
+            raise EngineError(f"未知动作: {action}")
+        self._require(BETTING)
+        if index is None:
+            index = self.rng.randrange(len(WHEEL_SEQUENCE))
+        self.outcome = {"index": index, "result": WHEEL_SEQUENCE[index]}
+        self.phase = RESOLVED
+        return [Event("wheel_spun", dict(self.outcome))]
+
+    def outcome_kwargs(self, outcome):
+        return {"index": outcome["index"]}
+
+    def payouts_for(self, bets):
+        result = self.outcome["result"]
+        return {
+            symbol: amount * OUTCOME_MULTIPLIERS[symbol] if symbol == result else 0
+            for symbol, amount in bets.items()
+        }
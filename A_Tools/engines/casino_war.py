@@ -0,0 +1,179 @@
+"""赌场战争（Casino War）引擎
+
+6 副牌的牌靴，剩余 60 张时换新牌靴。每局流程：
+
+    act("deal")        玩家、庄家各发一张，点数大者胜（A 最大）；平局进入战争决策阶段
+    act("surrender")   平局后投降：退还一半 Ante
+    act("war")         平局后加一注与 Ante 等额的战争注，双方各烧 3 张牌再各发一张比大小：
+                       玩家赢或再平时 Ante 赢 1:1、战争注退还，否则都输
+
+Tie 注在首轮平局时赔 10:1，否则输。结算与 CasinoWarGUI 原来的规则一致；
+GUI 订阅本引擎的 cards_dealt / war_dealt / settled 事件驱动发牌动画和余额更新。
+平局后需要玩家决策，所以不在 ENGINES（同桌服务器用的单动作游戏）中。
+"""
+from collections import namedtuple
+
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+SUITS = ['♠', '♥', '♦', '♣']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+RANK_VALUES = {rank: value for value, rank in enumerate(RANKS, start=2)}
+
+DECKS = 6
+CUT_CARDS = 60          # 剩余张数不多于此时换新牌靴
+BURN_CARDS = 3
+MIN_ANTE = 10
+TIE_PAYOUT = 10         # Tie 注 10:1
+WAR_DECISION = "war_decision"
+
+Card = namedtuple("Card", ["suit", "rank"])
+
+
+def card_text(card):
+    return f"{card.rank}{card.suit}"
+
+
+def parse_card(text):
+    """'10♠' -> Card('♠', '10')"""
+    return Card(text[-1], text[:-1])
+
+
+def new_shoe(decks=DECKS):
+    return [Card(suit, rank) for _ in range(decks) for suit in SUITS for rank in RANKS]
+
+
+def compare(player_card, dealer_card):
+    """'player' / 'dealer' / 'tie'"""
+    p = RANK_VALUES[player_card.rank]
+    d = RANK_VALUES[dealer_card.rank]
+    if p > d:
+        return "player"
+    if p < d:
+        return "dealer"
+    return "tie"
+
+
+def settle_bets(outcome, ante, tie, war=0):
+    """按本局结果计算各注的返还（含本金）"""
+    result = outcome["result"]
+    payouts = {"ante": 0, "tie": tie * (TIE_PAYOUT + 1) if result == "tie" else 0}
+    if result == "player":
+        payouts["ante"] = ante * 2
+    elif result == "tie":
+        if outcome.get("decision") == "surrender":
+            payouts["ante"] = ante / 2
+        elif outcome.get("war_result") in ("player", "tie"):
+            payouts["ante"] = ante * 2
+            payouts["war"] = war
+        else:
+            payouts["war"] = 0
+    return payouts
+
+
+class CasinoWarEngine(GameEngine):
+    """注项：ante、tie；战争注由 act("war") 自动加上（与 Ante 等额）"""
+    name = "casino_war"
+    BET_LIMITS = {"ante": 25000, "tie": 2500}
+    ROUND_ACTION = "deal"
+
+    def __init__(self, decks=DECKS, rng=None, seed=None):
+        super().__init__(rng, seed)
+        self.decks = decks
+        self.shoe = []
+
+    def settings(self):
+        return {"decks": self.decks}
+
+    def validate_round(self, bets):
+        if bets.get("ante", 0) < MIN_ANTE:
+            raise EngineError(f"主注至少需要{MIN_ANTE}块")
+
+    # ------------------- 牌靴 -------------------
+    def needs_shuffle(self):
+        return len(self.shoe) <= CUT_CARDS
+
+    def shuffle(self):
+        shoe = new_shoe(self.decks)
+        self.rng.shuffle(shoe)
+        self.shoe = shoe
+
+    def load_shoe(self, cards):
+        """换上外部洗好的牌靴（GUI 用 shuffle.py 洗牌）；牌只需有 suit / rank 属性，从末尾发牌"""
+        self.shoe = [Card(card.suit, card.rank) for card in cards]
+
+    def remaining_counts(self):
+        """{花色: {点数: 剩余张数}}"""
+        counts = {suit: {rank: 0 for rank in RANKS} for suit in SUITS}
+        for card in self.shoe:
+            counts[card.suit][card.rank] += 1
+        return counts
+
+    def _draw(self):
+        if not self.shoe:
+            self.shuffle()
+        return self.shoe.pop()
+
+    # ------------------- 动作 -------------------
+    def _act(self, action, **kwargs):
+        if action == "deal":
+            return self._deal(**kwargs)
+        if action == "war":
+            return self._war(**kwargs)
+        if action == "surrender":
+            return self._surrender()
+        raise EngineError(f"未知动作: {action}")
+
+    def _deal(self, player_card=None, dealer_card=None):
+        """可传入指定的牌（回放/测试）"""
+        self._require(BETTING)
+        events = []
+        if player_card is None and self.needs_shuffle():
+            self.shuffle()
+            events.append(Event("shuffled", {"cards": len(self.shoe)}))
+        player = parse_card(player_card) if player_card else self._draw()
+        dealer = parse_card(dealer_card) if dealer_card else self._draw()
+        result = compare(player, dealer)
+        self.outcome = {"player_card": card_text(player), "dealer_card": card_text(dealer), "result": result}
+        self.phase = WAR_DECISION if result == "tie" else RESOLVED
+        tie_return = settle_bets(self.outcome, 0, self.bets.get("tie", 0))["tie"]
+        events.append(Event("cards_dealt", {**self.outcome, "tie_return": tie_return}))
+        return events
+
+    def _war(self, player_war_card=None, dealer_war_card=None):
+        self._require(WAR_DECISION)
+        self.bets["war"] = self.bets.get("ante", 0)
+        player_burn = [card_text(self._draw()) for _ in range(BURN_CARDS)]
+        player = parse_card(player_war_card) if player_war_card else self._draw()
+        dealer_burn = [card_text(self._draw()) for _ in range(BURN_CARDS)]
+        dealer = parse_card(dealer_war_card) if dealer_war_card else self._draw()
+        self.outcome.update({
+            "decision": "war",
+            "player_burn": player_burn, "player_war_card": card_text(player),
+            "dealer_burn": dealer_burn, "dealer_war_card": card_text(dealer),
+            "war_result": compare(player, dealer),
+        })
+        self.phase = RESOLVED
+        return [Event("war_dealt", dict(self.outcome, war_bet=self.bets["war"]))]
+
+    def _surrender(self):
+        self._require(WAR_DECISION)
+        self.outcome["decision"] = "surrender"
+        self.phase = RESOLVED
+        return [Event("surrendered", {"refund": self.bets.get("ante", 0) / 2})]
+
+    def play_round(self, bets, action=None, decision="war"):
+        """自动对局；首轮平局时按 decision（"war" / "surrender"）继续"""
+        events = self.new_round()
+        for spot, amount in bets.items():
+            events += self.place_bet(spot, amount)
+        events += self.act(action or self.ROUND_ACTION)
+        if self.phase == WAR_DECISION:
+            events += self.act(decision)
+        events += self.settle()
+        return events
+
+    def outcome_kwargs(self, outcome):
+        return {"player_card": outcome["player_card"], "dealer_card": outcome["dealer_card"]}
+
+    def payouts_for(self, bets):
+        return settle_bets(self.outcome, bets.get("ante", 0), bets.get("tie", 0), bets.get("war", 0))
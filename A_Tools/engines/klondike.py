@@ -0,0 +1,236 @@
+"""Klondike 骰子引擎
+
+组合类型、赔付表和 6^5 有序掷骰组合表（导入时一次算好），以及与
+KlondikeDiceGUI.show_showdown / calculate_progressive 一致的结算函数。
+GUI 与 Klondike_Dice_Analyzer 都从这里取规则。
+"""
+from itertools import product
+
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+# 骰子组合类型
+HAND_TYPES = {
+    "five_of_a_kind": "五同",
+    "four_of_a_kind": "四同",
+    "big_straight": "大顺子(2-3-4-5-6)",
+    "small_straight": "小顺子(1-2-3-4-5)",
+    "straight": "顺子",
+    "high_die": "散牌",
+    "full_house": "葫芦",
+    "three_of_a_kind": "三同",
+    "two_pairs": "两对",
+    "one_pair": "一对"
+}
+
+# 组合顺序（从强到弱）
+HAND_RANK_ORDER = [
+    "five_of_a_kind",
+    "four_of_a_kind",
+    "big_straight",
+    "small_straight",
+    "straight",
+    "high_die",
+    "full_house",
+    "three_of_a_kind",
+    "two_pairs",
+    "one_pair"
+]
+
+# Bind赔付表
+BIND_PAYOUT = {
+    "five_of_a_kind": 100,
+    "four_of_a_kind": 50,
+    "big_straight": 10,
+    "small_straight": 10,
+    "straight": 5,
+    "high_die": 2,
+    "other": 1  # 平局或输
+}
+
+# Bonus赔付表
+BONUS_PAYOUT = {
+    "five_of_a_kind": 30,
+    "four_of_a_kind": 10,
+    "big_straight": 5,
+    "small_straight": 5,
+    "straight": 3,
+    "high_die": 0,   # 平局
+    "other": -1      # 输
+}
+
+# Progressive赔付表
+PROGRESSIVE_PAYOUT = {
+    "five_of_a_kind": "$1500 + Prog的10%",
+    "four_of_a_kind": "$500 + Prog的5%",
+    "big_straight": "$300 + Prog的3%",
+    "small_straight": "$300 + Prog的3%",
+    "other": -1  # 输
+}
+
+# 初始Jackpot金额
+INITIAL_JACKPOT = 4200
+
+def _classify_hand(values):
+    """按点数顺序判定 5 颗骰子的组合类型（values 为按掷出顺序的点数列表）"""
+    # 检查大顺子 (2-3-4-5-6 或 6-5-4-3-2)
+    if values == [2, 3, 4, 5, 6] or values == [6, 5, 4, 3, 2]:
+        return "big_straight"
+
+    # 检查小顺子 (1-2-3-4-5 或 5-4-3-2-1)
+    if values == [1, 2, 3, 4, 5] or values == [5, 4, 3, 2, 1]:
+        return "small_straight"
+
+    sorted_values = sorted(values)
+    counts = {i: sorted_values.count(i) for i in set(sorted_values)}
+    unique_count = len(counts)
+
+    # 检查五同
+    if unique_count == 1:
+        return "five_of_a_kind"
+
+    # 检查四同
+    if 4 in counts.values():
+        return "four_of_a_kind"
+
+    # 检查葫芦 (3+2)
+    if 3 in counts.values() and 2 in counts.values():
+        return "full_house"
+
+    # 检查顺子 (任意顺序的顺子)
+    if sorted_values in [[1,2,3,4,5], [2,3,4,5,6]]:
+        return "straight"
+
+    # 检查散牌（high_die） - 无任何组合的牌型
+    if max(counts.values()) == 1 and len(values) == 5:
+        return "high_die"
+
+    # 检查三同
+    if 3 in counts.values():
+        return "three_of_a_kind"
+
+    # 检查两对
+    if list(counts.values()).count(2) == 2:
+        return "two_pairs"
+
+    # 检查一对
+    if 2 in counts.values():
+        return "one_pair"
+
+    # 如果以上都不是，默认为散牌
+    return "high_die"
+
+
+def dice_index(values):
+    """5 颗骰子（按顺序）对应的表下标 0-7775"""
+    v0, v1, v2, v3, v4 = values
+    return ((((v0 - 1) * 6 + v1 - 1) * 6 + v2 - 1) * 6 + v3 - 1) * 6 + v4 - 1
+
+
+# 预先计算全部 6^5 种有序掷骰的组合类型和可比较强度（大顺子/小顺子与骰子顺序有关，所以按有序掷骰建表）
+HAND_TABLE = tuple(_classify_hand(list(values)) for values in product(range(1, 7), repeat=5))
+HAND_STRENGTH = {hand: len(HAND_RANK_ORDER) - i for i, hand in enumerate(HAND_RANK_ORDER)}
+STRENGTH_TABLE = tuple(HAND_STRENGTH[hand] for hand in HAND_TABLE)
+
+
+# 庄家一对为不及格：Ante 退还
+DEALER_NOT_QUALIFIED = "one_pair"
+# Progressive 每局固定下注额，及 (固定奖金, 奖池比例)
+PROGRESSIVE_BET = 2.5
+PROGRESSIVE_RULES = {
+    "five_of_a_kind": (1500, 0.10),
+    "four_of_a_kind": (500, 0.05),
+    "big_straight": (300, 0.03),
+    "small_straight": (300, 0.03),
+}
+MIN_ANTE = 5
+# 每局总下注（含 Blind 和 Progressive）按此比例注入奖池（同 KlondikeDiceGUI.start_game）
+JACKPOT_CONTRIBUTION = 3.1415926 * 0.01
+
+
+def compare(player_hand, dealer_hand):
+    """1 玩家赢，0 平局，-1 庄家赢"""
+    p = HAND_STRENGTH[player_hand]
+    d = HAND_STRENGTH[dealer_hand]
+    return (p > d) - (p < d)
+
+
+def settle_hands(player_hand, dealer_hand, ante, blind, trips):
+    """Ante / Blind / Trips(Bonus) 的返还（含本金）"""
+    result = compare(player_hand, dealer_hand)
+
+    if dealer_hand == DEALER_NOT_QUALIFIED:
+        ante_return = ante
+    else:
+        ante_return = {1: ante * 2, 0: ante, -1: 0}[result]
+
+    if result > 0:
+        multiplier = BIND_PAYOUT.get(player_hand, 1)
+        blind_return = blind if multiplier == 0 else blind * multiplier
+    else:
+        blind_return = blind if result == 0 else 0
+
+    multiplier = BONUS_PAYOUT.get(player_hand, -1)
+    if multiplier == -1:
+        trips_return = 0
+    elif multiplier == 0:
+        trips_return = trips
+    else:
+        trips_return = trips * multiplier
+
+    return {"ante": ante_return, "blind": blind_return, "trips": trips_return}
+
+
+def progressive_win(player_hand, pool):
+    """(奖金, 派奖后的奖池)；奖池不低于初始金额"""
+    fixed, share = PROGRESSIVE_RULES.get(player_hand, (0, 0))
+    win = pool * share + fixed if fixed else 0
+    return win, max(pool - win, INITIAL_JACKPOT)
+
+
+class KlondikeEngine(GameEngine):
+    """注项：ante（自动带出等额 Blind）、trips、progressive（固定 2.5）"""
+    name = "klondike"
+    BET_LIMITS = {"ante": float("inf"), "trips": float("inf"), "progressive": PROGRESSIVE_BET}
+    STAKE_MULTIPLIER = {"ante": 2}
+
+    def __init__(self, jackpot=INITIAL_JACKPOT, rng=None, seed=None):
+        super().__init__(rng, seed)
+        self.jackpot = jackpot
+
+    def validate_round(self, bets):
+        if bets.get("ante", 0) < MIN_ANTE:
+            raise EngineError(f"Ante至少需要{MIN_ANTE}块")
+
+    def lock_bets(self, bets):
+        self.jackpot += self.staked(bets) * JACKPOT_CONTRIBUTION
+
+    def settings(self):
+        return {"jackpot": self.jackpot}
+
+    def _act(self, action, player_dice=None, dealer_dice=None):
+        """action 'roll'；可传入指定点数（回放/测试）"""
+        if action != 'roll':
+            raise EngineError(f"未知动作: {action}")
+        self._require(BETTING)
+        randint = self.rng.randint
+        player_dice = list(player_dice or (randint(1, 6) for _ in range(5)))
+        dealer_dice = list(dealer_dice or (randint(1, 6) for _ in range(5)))
+        self.outcome = {
+            "player_dice": player_dice,
+            "dealer_dice": dealer_dice,
+            "player_hand": HAND_TABLE[dice_index(player_dice)],
+            "dealer_hand": HAND_TABLE[dice_index(dealer_dice)],
+        }
+        self.phase = RESOLVED
+        return [Event("dice_rolled", dict(self.outcome))]
+
+    def outcome_kwargs(self, outcome):
+        return {"player_dice": outcome["player_dice"], "dealer_dice": outcome["dealer_dice"]}
+
+    def payouts_for(self, bets):
+        ante = bets.get("ante", 0)
+        payouts = settle_hands(self.outcome["player_hand"], self.outcome["dealer_hand"],
+                               ante, ante, bets.get("trips", 0))
+        if bets.get("progressive"):
+            payouts["progressive"], self.jackpot = progressive_win(self.outcome["player_hand"], self.jackpot)
+        return payouts
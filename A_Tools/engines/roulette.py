@@ -0,0 +1,139 @@
+"""轮盘引擎（欧式 / 美式）
+
+注项用覆盖的号码表示：号码排序后以 "-" 连接，如 "17"、"17-20"、"0-00-1-2-3"。
+赔率只取决于覆盖的号码数（与 GUI 的 BET_ODDS 一致），GUI 用
+spot_key(spot["numbers"]) 把自己的注项转换过来；合法注项按标准台面生成，
+与 RouletteGameGUI._build_bet_spots 的注项一一对应。
+"""
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+EUROPEAN_SEQUENCE = [
+    "0", "32", "15", "19", "4", "21", "2", "25", "17", "34",
+    "6", "27", "13", "36", "11", "30", "8", "23", "10", "5",
+    "24", "16", "33", "1", "20", "14", "31", "9", "22", "18",
+    "29", "7", "28", "12", "35", "3", "26",
+]
+AMERICAN_SEQUENCE = [
+    "0", "28", "9", "26", "30", "11", "7", "20", "32", "17",
+    "5", "22", "34", "15", "3", "24", "36", "13", "1", "00",
+    "27", "10", "25", "29", "12", "8", "19", "31", "18", "6",
+    "21", "33", "16", "4", "23", "35", "14", "2",
+]
+RED_NUMBERS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+
+# 台面三行号码（同 get_board_layout 的 rows）
+BOARD_ROWS = [
+    [3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36],
+    [2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35],
+    [1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34],
+]
+
+# 覆盖号码数 -> 赔率（不含本金）；5 个号码为美式五号注
+PAYOUT_BY_COUNT = {1: 35, 2: 17, 3: 11, 4: 8, 5: 6, 6: 5, 12: 2, 18: 1}
+# 同 _bet_limit_for_spot：内围注 200，外围注 500
+INSIDE_LIMIT = 200
+OUTSIDE_LIMIT = 500
+
+# 零号区的特殊注项
+ZERO_SPOTS = {
+    "european": [("0", "1"), ("0", "2"), ("0", "3"), ("0", "1", "2"), ("0", "2", "3")],
+    "american": [("0", "00"), ("00", "3"), ("0", "1"), ("00", "2", "3"), ("0", "00", "2"),
+                 ("0", "1", "2"), ("0", "00", "1", "2", "3")],
+}
+
+
+def spot_key(numbers):
+    """号码集合 -> 注项字符串（"00" 排在 "0" 之后、"1" 之前）"""
+    return "-".join(sorted((str(n) for n in numbers), key=lambda n: (int(n), len(n))))
+
+
+def roulette_color(result):
+    if result in ("0", "00"):
+        return "Green"
+    return "Red" if int(result) in RED_NUMBERS else "Black"
+
+
+def board_spots(variant="european"):
+    """该台面全部合法注项 {注项: 号码集合}"""
+    rows = [[str(n) for n in row] for row in BOARD_ROWS]
+    zeros = ["0", "00"] if variant == "american" else ["0"]
+    groups = [[n] for n in zeros] + [[n] for row in rows for n in row]
+    for r in range(3):
+        for c in range(11):
+            groups.append([rows[r][c], rows[r][c + 1]])
+    for c in range(12):
+        for r in range(2):
+            groups.append([rows[r][c], rows[r + 1][c]])
+    for r in range(2):
+        for c in range(11):
+            groups.append([rows[r][c], rows[r][c + 1], rows[r + 1][c], rows[r + 1][c + 1]])
+    streets = [[rows[r][c] for r in range(3)] for c in range(12)]
+    groups += streets
+    groups += [streets[c] + streets[c + 1] for c in range(11)]
+    groups += [[str(n) for n in range(start, start + 12)] for start in (1, 13, 25)]
+    groups += rows
+    groups += [
+        [str(n) for n in range(1, 19)],
+        [str(n) for n in range(19, 37)],
+        [str(n) for n in range(2, 37, 2)],
+        [str(n) for n in range(1, 37, 2)],
+        [str(n) for n in sorted(RED_NUMBERS)],
+        [str(n) for n in range(1, 37) if n not in RED_NUMBERS],
+    ]
+    groups += ZERO_SPOTS[variant]
+    return {spot_key(numbers): frozenset(numbers) for numbers in groups}
+
+
+class RouletteEngine(GameEngine):
+    """注项见 board_spots；动作 'spin' 随机选出一个格子"""
+    name = "roulette"
+    ROUND_ACTION = "spin"
+
+    def __init__(self, variant="european", rng=None, seed=None):
+        super().__init__(rng, seed)
+        if variant not in ZERO_SPOTS:
+            raise EngineError(f"未知轮盘类型: {variant}")
+        self.variant = variant
+        self.sequence = AMERICAN_SEQUENCE if variant == "american" else EUROPEAN_SEQUENCE
+        self.spots = board_spots(variant)
+        self.BET_LIMITS = {
+            spot: INSIDE_LIMIT if len(numbers) <= 6 else OUTSIDE_LIMIT
+            for spot, numbers in self.spots.items()
+        }
+
+    def _act(self, action, index=None):
+        """action 'spin'；可传入指定格子序号（回放/测试）"""
+        if action != 'spin':
+            raise EngineError(f"未知动作: {action}")
+        self._require(BETTING)
+        if index is None:
+            index = self.rng.randrange(len(self.sequence))
+        result = self.sequence[index]
+        self.outcome = {"index": index, "result": result, "color": roulette_color(result)}
+        self.phase = RESOLVED
+        return [Event("wheel_spun", dict(self.outcome))]
+
+    def outcome_kwargs(self, outcome):
+        return {"index": outcome["index"]}
+
+    def payouts_for(self, bets):
+        result = self.outcome["result"]
+        payouts = {}
+        for spot, amount in bets.items():
+            numbers = self.spots[spot]
+            payouts[spot] = amount * (PAYOUT_BY_COUNT[len(numbers)] + 1) if result in numbers else 0
+        return payouts
+
+
+class EuropeanRouletteEngine(RouletteEngine):
+    name = "roulette_eu"
+
+    def __init__(self, rng=None, seed=None):
+        super().__init__("european", rng, seed)
+
+
+class AmericanRouletteEngine(RouletteEngine):
+    name = "roulette_us"
+
+    def __init__(self, rng=None, seed=None):
+        super().__init__("american", rng, seed)
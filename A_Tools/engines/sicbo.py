@@ -0,0 +1,52 @@
+"""骰宝引擎
+
+三颗骰子，结算直接查 sicbo_table 的预计算返还表（与 SicboGame.calculate_results 相同）。
+注项用字符串表示，便于在协议中传输："small"、"double:3"、"total_points:10"、
+"pairs:1&2"、"number_group:1234" ...
+"""
+from .base import GameEngine, BETTING, RESOLVED, Event, EngineError
+
+import sicbo_table
+
+# 注项字符串 <-> sicbo_table.BET_KEYS 中的 (类型, 参数)
+SPOTS = {
+    (bet_type if param is None else f"{bet_type}:{param}"): (bet_type, param)
+    for bet_type, param in sicbo_table.BET_KEYS
+}
+
+# 同 SicboGame.place_bet：单区域 10 万，每局总额 200 万
+SPOT_LIMIT = 100_000
+TABLE_LIMIT = 2_000_000
+
+
+class SicboEngine(GameEngine):
+    name = "sicbo"
+    BET_LIMITS = {spot: SPOT_LIMIT for spot in SPOTS}
+    TABLE_LIMIT = TABLE_LIMIT
+
+    def __init__(self, triple_mode=False, rng=None, seed=None):
+        super().__init__(rng, seed)
+        self.triple_mode = triple_mode
+
+    def settings(self):
+        return {"triple_mode": self.triple_mode}
+
+    def _act(self, action, dice=None):
+        """action 'roll'；可传入指定点数（回放/测试）"""
+        if action != 'roll':
+            raise EngineError(f"未知动作: {action}")
+        self._require(BETTING)
+        dice = list(dice or (self.rng.randint(1, 6) for _ in range(3)))
+        self.outcome = {'dice': dice, 'total': sum(dice), 'triple_mode': self.triple_mode}
+        self.phase = RESOLVED
+        return [Event("dice_rolled", dict(self.outcome))]
+
+    def outcome_kwargs(self, outcome):
+        return {"dice": outcome["dice"]}
+
+    def payouts_for(self, bets):
+        row = sicbo_table.PAYOUT_TABLE[self.triple_mode][sicbo_table.outcome_index(self.outcome['dice'])]
+        return {
+            spot: amount * row[sicbo_table.BET_INDEX[SPOTS[spot]]]
+            for spot, amount in bets.items()
+        }
@@ -0,0 +1,166 @@
+"""game_server 压力测试客户端
+
+启动 N 个游客连接，分散到各游戏，每局开始后随机下注，统计:
+    - 每秒结算局数（按客户端收到的 settled 事件计）
+    - 下注请求往返延迟 p50 / p90 / p99
+    - 被拒绝的下注与断开的连接数
+
+用法:
+    python game_server.py --allow-guest --betting-seconds 1 --result-seconds 0.2 &
+    python game_load_test.py --clients 200 --duration 20
+    python game_load_test.py --spawn --clients 100        自动以短计时启动一个服务器
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from engines import ENGINES
+from engines.roulette import RED_NUMBERS, spot_key
+
+ROULETTE_LOAD_BETS = ["17", "0", "1-2", spot_key(range(1, 19)), spot_key(RED_NUMBERS)]
+
+# 每个游戏压测时使用的注项（都是单注即可独立结算的）
+LOAD_BETS = {
+    "bacbo": ["Player", "Banker", "Tie", "Small", "Large", "PlayerPair"],
+    "bigsix": ["1", "3", "6", "12", "25", "👑"],
+    "klondike": ["ante"],
+    "roulette_eu": ROULETTE_LOAD_BETS,
+    "roulette_us": ROULETTE_LOAD_BETS + ["0-00"],
+    "sicbo": ["big", "small", "odd", "even", "total_points:10", "all_triples"],
+}
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.rounds = set()         # {(桌号, 局号)}
+        self.settlements = 0
+        self.rejected = 0
+        self.disconnected = 0
+        self.errors = []
+
+
+async def run_client(index, args, stats, stop_at):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    rng = random.Random(index)
+    game = args.games[index % len(args.games)]
+    ids = itertools.count(1)
+    sent = {}
+
+    async def request(message):
+        rid = next(ids)
+        sent[rid] = time.perf_counter()
+        writer.write((json.dumps({**message, "id": rid}) + "\n").encode())
+        await writer.drain()
+
+    await request({"op": "guest"})
+    await request({"op": "join", "game": game})
+    try:
+        while time.monotonic() < stop_at:
+            try:
+                line = await asyncio.wait_for(reader.readline(), max(0.01, stop_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                stats.disconnected += 1
+                break
+            msg = json.loads(line)
+            if "id" in msg:
+                started = sent.pop(msg["id"], None)
+                if started is not None:
+                    stats.latencies.append(time.perf_counter() - started)
+                if not msg.get("ok"):
+                    stats.rejected += 1
+                    if len(stats.errors) < 5:
+                        stats.errors.append(msg.get("error"))
+                continue
+            event = msg.get("event")
+            if event == "round_started":
+                for _ in range(args.bets_per_round):
+                    spot = rng.choice(LOAD_BETS[game])
+                    await request({"op": "bet", "spot": spot, "amount": rng.choice((5, 10, 50, 100))})
+            elif event == "settled":
+                stats.settlements += 1
+                stats.rounds.add((msg["table"], msg["round"]))
+    finally:
+        writer.close()
+
+
+def spawn_server(args):
+    command = [sys.executable, os.path.join(current_dir, "game_server.py"), "--allow-guest",
+               "--betting-seconds", str(args.betting_seconds), "--result-seconds", "0.1",
+               "--workers", str(args.workers)]
+    command += ["--unix", args.unix] if args.unix else ["--host", args.host, "--port", str(args.port)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    print(process.stdout.readline().strip())
+    return process
+
+
+async def main_async(args):
+    stats = Stats()
+    start = time.monotonic()
+    stop_at = start + args.duration
+    results = await asyncio.gather(*(run_client(i, args, stats, stop_at) for i in range(args.clients)),
+                                   return_exceptions=True)
+    elapsed = time.monotonic() - start
+    failed = [r for r in results if isinstance(r, Exception)]
+
+    print(f"客户端: {args.clients}（连接失败 {len(failed)}，中途断开 {stats.disconnected}）  时长: {elapsed:.1f} 秒")
+    print(f"结算局数: {len(stats.rounds)}（{len(stats.rounds) / elapsed:.2f} 局/秒）  "
+          f"玩家结算: {stats.settlements}（{stats.settlements / elapsed:.1f} 次/秒）")
+    lat = [v * 1000 for v in stats.latencies]
+    print(f"请求: {len(lat)}  被拒绝: {stats.rejected}  延迟(毫秒) "
+          f"p50 {percentile(lat, 50):.2f}  p90 {percentile(lat, 90):.2f}  "
+          f"p99 {percentile(lat, 99):.2f}  max {max(lat, default=0):.2f}")
+    for error in stats.errors:
+        print(f"  拒绝原因: {error}")
+    if failed:
+        print(f"  连接错误: {failed[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="game_server 压力测试")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="压测时长（秒）")
+    parser.add_argument("--bets-per-round", type=int, default=2)
+    parser.add_argument("--games", nargs="+", default=sorted(ENGINES), choices=sorted(ENGINES))
+    parser.add_argument("--spawn", action="store_true", help="自动启动一个短计时的服务器")
+    parser.add_argument("--betting-seconds", type=float, default=0.5, help="--spawn 时的下注倒计时")
+    parser.add_argument("--workers", type=int, default=2, help="--spawn 时的工作进程数")
+    args = parser.parse_args()
+
+    server = spawn_server(args) if args.spawn else None
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+"""多桌游戏服务器（asyncio）
+
+把 engines 中的无界面引擎挂在本地 TCP 或 Unix socket 后面，协议为每行一个 JSON。
+账户沿用 saving_data.json（内存中记账，定时整文件原子写回）。
+
+进程结构:
+    网关进程   接受客户端连接、登录、余额校验与扣款/派彩，按游戏类型转发到工作进程
+    工作进程   按游戏类型分片（游戏序号 % 进程数），每张桌运行独立的回合计时：
+               开局 -> 下注倒计时（同轮盘 _start_new_round 的 BETTING_SECONDS）-> 封盘
+               -> 开奖 -> 逐个玩家结算 -> 停留 result_seconds -> 下一局
+               没有玩家的桌子不计时。
+
+客户端 -> 服务器（可带 "id"，回复中原样返回，用于计算延迟）:
+    {"op": "login", "user": "root", "password": "..."}
+    {"op": "guest"}                          需以 --allow-guest 启动，余额不写回文件
+    {"op": "join", "game": "sicbo"}          加入人数最少的一张桌
+    {"op": "bet", "spot": "big", "amount": 100}
+    {"op": "balance"} / {"op": "leave"} / {"op": "quit"}
+服务器 -> 客户端:
+    回复   {"ok": true, ...} 或 {"ok": false, "error": "..."}
+    事件   {"event": "round_started" | "round_result" | "settled" | "refund", "table": ..., ...}
+           settled 事件带本人的 staked / payout / net / balance
+
+背压: 每个连接的发送队列有上限，客户端读得太慢时断开该连接，不拖慢整张桌；
+网关与工作进程之间的写入都 await drain()。
+
+用法:
+    python game_server.py --port 8765 --workers 2
+    python game_server.py --unix /tmp/casino.sock --allow-guest --betting-seconds 1
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from engines import ENGINES, EngineError, create
+from shared_table import SharedTable
+
+GAMES = sorted(ENGINES)
+BETTING_SECONDS = 30        # 同 RouletteGameGUI.BETTING_SECONDS
+RESULT_SECONDS = 6          # 同轮盘开奖后 after(6000, _start_new_round)
+SEND_QUEUE_LIMIT = 256      # 每个连接最多积压的消息数
+MAX_LINE = 64 * 1024
+
+
+def get_data_file_path():
+    return os.path.join(os.path.dirname(current_dir), 'saving_data.json')
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+def shard_of(game, workers):
+    return GAMES.index(game) % workers
+
+
+# ======================================================================
+# 工作进程：桌子与回合计时
+# ======================================================================
+class Table:
+    """SharedTable 的回合逻辑，由 asyncio 计时；余额由网关记账"""
+    def __init__(self, table_id, game, send, betting_seconds, result_seconds, max_players):
+        self.table_id = table_id
+        self.table = SharedTable(create(game), betting_seconds, result_seconds, name=table_id)
+        self.send = send
+        self.max_players = max_players
+        self.players = set()
+        self.has_players = asyncio.Event()
+        self.task = asyncio.ensure_future(self.run())
+
+    def join(self, sid):
+        self.players.add(sid)
+        self.has_players.set()
+
+    def leave(self, sid):
+        # 已下的注照常结算
+        self.players.discard(sid)
+        if not self.players:
+            self.has_players.clear()
+
+    def place_bet(self, sid, spot, amount):
+        return self.table.place_bet(sid, spot, amount)["stake"]
+
+    def broadcast(self, event):
+        if self.players:
+            self.send({"sids": sorted(self.players), "event": event})
+
+    async def run(self):
+        table = self.table
+        while True:
+            await self.has_players.wait()
+            self.broadcast(table.open_round())
+            await asyncio.sleep(table.betting_seconds)
+
+            # 整组下注不合法（如 Ante 不足）的玩家全额退回，其余玩家逐个下发结算
+            result = table.resolve_round()
+            round_id = result["round"]
+            self.broadcast({"event": "round_result", "table": self.table_id, "round": round_id,
+                            "outcome": result["outcome"]})
+            for sid, refund in result["refunds"].items():
+                self.send({"sid": sid, "event": {"event": "refund", "table": self.table_id,
+                                                  "round": round_id, **refund}})
+            for sid, settled in result["results"].items():
+                settled = {k: v for k, v in settled.items() if k != "balance"}
+                self.send({"sid": sid, "event": {"event": "settled", "table": self.table_id,
+                                                  "round": round_id, **settled}})
+            await asyncio.sleep(table.result_seconds)
+
+
+class Worker:
+    """一个工作进程：持有若干游戏类型的全部桌子，与网关之间是一条多路复用连接"""
+    def __init__(self, games, tables_per_game, betting_seconds, result_seconds, max_players):
+        self.writer = None
+        self.tables = {}
+        self.by_game = {}
+        self.seat = {}      # {sid: table_id}
+        self.config = (tables_per_game, betting_seconds, result_seconds, max_players)
+        self.games = games
+
+    def send(self, message):
+        self.writer.write(encode(message))
+
+    def _build_tables(self):
+        tables_per_game, betting, result, max_players = self.config
+        for game in self.games:
+            self.by_game[game] = []
+            for i in range(tables_per_game):
+                table = Table(f"{game}-{i}", game, self.send, betting, result, max_players)
+                self.tables[table.table_id] = table
+                self.by_game[game].append(table)
+
+    def handle(self, msg):
+        sid = msg["sid"]
+        op = msg["op"]
+        reply = {"ok": True}
+        try:
+            if op == "join":
+                self.leave(sid)
+                candidates = [t for t in self.by_game[msg["game"]] if len(t.players) < t.max_players]
+                if not candidates:
+                    raise EngineError("所有桌子已满")
+                table = min(candidates, key=lambda t: len(t.players))
+                table.join(sid)
+                self.seat[sid] = table.table_id
+                reply["table"] = table.table_id
+            elif op == "bet":
+                table_id = self.seat.get(sid)
+                if table_id is None:
+                    raise EngineError("请先加入游戏桌")
+                reply["stake"] = self.tables[table_id].place_bet(sid, msg["spot"], msg["amount"])
+            elif op == "leave":
+                self.leave(sid)
+        except (EngineError, KeyError, TypeError) as e:
+            reply = {"ok": False, "error": str(e)}
+        if "rid" in msg:
+            self.send({"sid": sid, "rid": msg["rid"], "reply": reply})
+
+    def leave(self, sid):
+        table_id = self.seat.pop(sid, None)
+        if table_id is not None:
+            self.tables[table_id].leave(sid)
+
+    async def serve(self, host, ready):
+        """只接受网关的一条连接；网关断开后本进程随之退出"""
+        done = asyncio.Event()
+
+        async def on_gateway(reader, writer):
+            self.writer = writer
+            self._build_tables()
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    self.handle(json.loads(line))
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                for table in self.tables.values():
+                    table.task.cancel()
+                done.set()
+
+        server = await asyncio.start_server(on_gateway, host, 0, limit=MAX_LINE)
+        ready.send(server.sockets[0].getsockname()[1])
+        ready.close()
+        async with server:
+            await done.wait()
+
+
+def worker_main(games, config, ready):
+    worker = Worker(games, *config)
+    try:
+        asyncio.run(worker.serve("127.0.0.1", ready))
+    except KeyboardInterrupt:
+        pass
+
+
+# ======================================================================
+# 网关进程：账户、会话与转发
+# ======================================================================
+class AccountStore:
+    """saving_data.json 的内存副本；余额变化后由定时任务整文件写回"""
+    def __init__(self, path, allow_guest=False):
+        self.path = path
+        self.allow_guest = allow_guest
+        with open(path, 'r', encoding='utf-8') as f:
+            self.users = json.load(f)
+        self.by_name = {u['user_name']: u for u in self.users}
+        self.balances = {}
+        self.guests = set()
+        self.dirty = False
+        self._guest_ids = itertools.count(1)
+
+    def login(self, name, password):
+        user = self.by_name.get(name)
+        if user is None or user['password'] != password:
+            raise EngineError("错误登录名称和密码")
+        if user.get('lock', "True") == "True":
+            raise EngineError(f"你的账号 {name} 被锁定 请联系管理员解锁")
+        cash = user['cash']
+        self.balances.setdefault(name, float(cash) if cash not in (None, "None") else 0.0)
+        return name
+
+    def guest(self, balance=1_000_000.0):
+        if not self.allow_guest:
+            raise EngineError("服务器未开放游客登录")
+        name = f"guest{next(self._guest_ids)}"
+        self.guests.add(name)
+        self.balances[name] = balance
+        return name
+
+    def debit(self, name, amount):
+        if self.balances[name] < amount:
+            raise EngineError("余额不足")
+        self.balances[name] -= amount
+        self.dirty = name not in self.guests or self.dirty
+
+    def credit(self, name, amount):
+        self.balances[name] += amount
+        self.dirty = name not in self.guests or self.dirty
+
+    def flush(self):
+        if not self.dirty:
+            return
+        for name, balance in self.balances.items():
+            if name in self.by_name:
+                self.by_name[name]['cash'] = f"{balance:.2f}"
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.users, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class Session:
+    def __init__(self, sid, writer):
+        self.sid = sid
+        self.writer = writer
+        self.user = None
+        self.game = None
+        self.queue = asyncio.Queue(SEND_QUEUE_LIMIT)
+        self.closed = False
+
+    def push(self, message):
+        """放入发送队列；积压超过上限说明客户端读得太慢，直接断开"""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(encode(message))
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+    async def pump(self):
+        try:
+            while not self.closed:
+                data = await self.queue.get()
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+
+class Gateway:
+    def __init__(self, accounts, shard_ports, workers):
+        self.accounts = accounts
+        self.shard_ports = shard_ports
+        self.workers = workers
+        self.shards = {}        # {shard: (reader, writer)}
+        self.sessions = {}      # {sid: Session}
+        self.owners = {}        # {sid: 用户名}，会话断开后仍用于派彩
+        self.pending = {}       # {rid: future}
+        self.rules = {game: create(game) for game in GAMES}     # 只用于计算扣款额
+        self._sids = itertools.count(1)
+        self._rids = itertools.count(1)
+
+    async def connect_shards(self):
+        for shard, port in enumerate(self.shard_ports):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=MAX_LINE)
+            self.shards[shard] = (reader, writer)
+            asyncio.ensure_future(self.read_shard(reader))
+
+    async def read_shard(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            msg = json.loads(line)
+            if "reply" in msg:
+                future = self.pending.pop(msg["rid"], None)
+                if future is not None and not future.done():
+                    future.set_result(msg["reply"])
+            elif "sids" in msg:
+                data = encode(msg["event"])
+                for sid in msg["sids"]:
+                    session = self.sessions.get(sid)
+                    if session is not None and not session.closed:
+                        try:
+                            session.queue.put_nowait(data)
+                        except asyncio.QueueFull:
+                            session.close()
+            else:
+                self.on_player_event(msg["sid"], msg["event"])
+
+    def on_player_event(self, sid, event):
+        user = self.owners.get(sid)
+        if user is None:
+            return
+        if event["event"] == "settled":
+            self.accounts.credit(user, event["payout"])
+            event["net"] = event["payout"] - event["staked"]
+        elif event["event"] == "refund":
+            self.accounts.credit(user, event["amount"])
+        event["balance"] = round(self.accounts.balances[user], 2)
+        session = self.sessions.get(sid)
+        if session is not None:
+            session.push(event)
+
+    async def ask_shard(self, game, message):
+        rid = next(self._rids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[rid] = future
+        _, writer = self.shards[shard_of(game, self.workers)]
+        writer.write(encode({**message, "rid": rid}))
+        await writer.drain()
+        return await future
+
+    async def handle(self, session, msg):
+        op = msg.get("op")
+        accounts = self.accounts
+        if op == "login":
+            session.user = accounts.login(msg.get("user"), msg.get("password"))
+        elif op == "guest":
+            session.user = accounts.guest()
+        elif op == "quit":
+            session.close()
+            return {"ok": True}
+        elif session.user is None:
+            raise EngineError("请先登录")
+        elif op == "join":
+            game = msg.get("game")
+            if game not in ENGINES:
+                raise EngineError(f"未知游戏: {game}")
+            await self.leave(session)
+            reply = await self.ask_shard(game, {"sid": session.sid, "op": "join", "game": game})
+            if reply["ok"]:
+                session.game = game
+            return reply
+        elif op == "bet":
+            if session.game is None:
+                raise EngineError("请先加入游戏桌")
+            amount = msg.get("amount")
+            if (isinstance(amount, bool) or not isinstance(amount, (int, float))
+                    or not math.isfinite(amount) or amount <= 0):
+                raise EngineError("下注金额无效")
+            # 先扣款再转发，工作进程拒绝时退回
+            stake = self.rules[session.game].stake_for(msg.get("spot"), amount)
+            accounts.debit(session.user, stake)
+            reply = await self.ask_shard(session.game, {
+                "sid": session.sid, "op": "bet", "spot": msg.get("spot"), "amount": amount})
+            if not reply["ok"]:
+                accounts.credit(session.user, stake)
+            reply["balance"] = round(accounts.balances[session.user], 2)
+            return reply
+        elif op == "leave":
+            await self.leave(session)
+        elif op != "balance":
+            raise EngineError(f"未知操作: {op}")
+        self.owners[session.sid] = session.user
+        return {"ok": True, "user": session.user, "balance": round(accounts.balances[session.user], 2)}
+
+    async def leave(self, session):
+        if session.game is not None:
+            await self.ask_shard(session.game, {"sid": session.sid, "op": "leave"})
+            session.game = None
+
+    async def on_client(self, reader, writer):
+        session = Session(next(self._sids), writer)
+        self.sessions[session.sid] = session
+        pump = asyncio.ensure_future(session.pump())
+        try:
+            while not session.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break       # 行过长或连接被重置
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict):
+                        raise ValueError
+                except ValueError:
+                    session.push({"ok": False, "error": "无效的 JSON 消息"})
+                    continue
+                try:
+                    reply = await self.handle(session, msg)
+                except EngineError as e:
+                    reply = {"ok": False, "error": str(e)}
+                if "id" in msg:
+                    reply["id"] = msg["id"]
+                session.push(reply)
+        finally:
+            # 断线时只通知工作进程离桌，不等回复（已下的注照常结算）
+            if session.game is not None:
+                _, shard_writer = self.shards[shard_of(session.game, self.workers)]
+                shard_writer.write(encode({"sid": session.sid, "op": "leave"}))
+            del self.sessions[session.sid]
+            session.close()
+            pump.cancel()
+
+    async def flush_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.accounts.flush()
+
+
+async def serve(args, shard_ports):
+    accounts = AccountStore(args.data or get_data_file_path(), args.allow_guest)
+    gateway = Gateway(accounts, shard_ports, args.workers)
+    await gateway.connect_shards()
+    if args.unix:
+        server = await asyncio.start_unix_server(gateway.on_client, args.unix, limit=MAX_LINE)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(gateway.on_client, args.host, args.port, limit=MAX_LINE)
+        where = f"{args.host}:{server.sockets[0].getsockname()[1]}"
+    print(f"游戏服务器已启动: {where}（{args.workers} 个工作进程，游戏: {', '.join(GAMES)}）", flush=True)
+    flusher = asyncio.ensure_future(gateway.flush_loop(args.flush_interval))
+    # terminate 时也走正常退出流程，把账户写回文件
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        pass    # Windows 不支持，只能 Ctrl+C
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        flusher.cancel()
+        accounts.flush()
+
+
+def start_workers(args):
+    """按游戏类型分片启动工作进程，返回 (进程列表, 各分片端口)"""
+    config = (args.tables, args.betting_seconds, args.result_seconds, args.max_players)
+    processes, ports = [], []
+    for shard in range(args.workers):
+        games = [g for g in GAMES if shard_of(g, args.workers) == shard]
+        parent, child = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=worker_main, args=(games, config, child), daemon=True)
+        process.start()
+        processes.append(process)
+        ports.append(parent.recv())
+    return processes, ports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多桌游戏服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="改为监听 Unix socket 路径")
+    parser.add_argument("--workers", type=int, default=min(len(GAMES), os.cpu_count() or 1),
+                        help="工作进程数（按游戏类型分片）")
+    parser.add_argument("--tables", type=int, default=4, help="每种游戏的桌数")
+    parser.add_argument("--max-players", type=int, default=200, help="每桌人数上限")
+    parser.add_argument("--betting-seconds", type=float, default=BETTING_SECONDS, help="下注倒计时（秒）")
+    parser.add_argument("--result-seconds", type=float, default=RESULT_SECONDS, help="开奖后停留（秒）")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="账户写回间隔（秒）")
+    parser.add_argument("--data", default=None, help="账户文件（默认 saving_data.json）")
+    parser.add_argument("--allow-guest", action="store_true", help="允许游客登录（压测用）")
+    args = parser.parse_args()
+    args.workers = max(1, min(args.workers, len(GAMES)))
+
+    processes, ports = start_workers(args)
+    try:
+        asyncio.run(serve(args, ports))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""终端菜单按键输入
+
+各菜单原来都有一份 get_key：每 0.1 秒轮询一次，每次都 tcgetattr / setraw /
+tcsetattr；Windows 分支用 sleep(0.05) 忙等。这里统一为一个输入模块：
+
+- 进入菜单后只切换一次终端模式（cbreak：关闭行缓冲和回显，保留输出换行处理，
+  菜单用 print 输出不会错位），直到 release() 才恢复
+- Unix 通过 selectors 阻塞等待标准输入，没有按键时不占 CPU、不做任何系统调用
+- 一次读到的多个字节全部解码入队，快速连按不会丢键；ESC 与方向键转义序列
+  按短超时区分
+- Windows 使用阻塞的 msvcrt.getwch()，同样没有忙等
+
+get_key() 返回 'up'/'down'/'left'/'right'/'enter'/'esc' 或按下的字符。
+需要 input()/getpass() 或运行游戏前调用 release() 恢复终端原来的模式，
+下一次 get_key() 会自动重新进入按键模式。
+"""
+import atexit
+import codecs
+import os
+import sys
+from collections import deque
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import selectors
+    import termios
+    import tty
+
+# 单独的 ESC 与方向键序列（ESC [ A）之间的等待时间
+ESC_TIMEOUT = 0.05
+
+ARROW_KEYS = {'A': 'up', 'B': 'down', 'C': 'right', 'D': 'left'}
+WINDOWS_ARROW_KEYS = {'H': 'up', 'P': 'down', 'K': 'left', 'M': 'right'}
+SINGLE_KEYS = {'\r': 'enter', '\n': 'enter', '\x1b': 'esc'}
+
+
+def decode_keys(text):
+    """把已读到的字符解码为按键，返回 (按键列表, 未完成的转义序列)
+
+    未完成的部分（末尾单独的 ESC 或半个方向键序列）留给下一次读入拼接，
+    超时仍未补全时由调用者当作 ESC。
+    """
+    keys = []
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch != '\x1b':
+            keys.append(SINGLE_KEYS.get(ch, ch))
+            i += 1
+            continue
+        if i + 1 >= n:
+            return keys, text[i:]
+        if text[i + 1] not in '[O':
+            keys.append('esc')
+            i += 1
+            continue
+        # CSI / SS3 序列：参数字节之后以字母或 ~ 结尾
+        j = i + 2
+        while j < n and (text[j].isdigit() or text[j] == ';'):
+            j += 1
+        if j >= n:
+            return keys, text[i:]
+        final = text[j]
+        if final in ARROW_KEYS:
+            keys.append(ARROW_KEYS[final])
+        # 其他功能键（Home、Delete、F1 等）菜单用不到，直接丢弃
+        i = j + 1
+    return keys, ''
+
+
+class KeyReader:
+    """标准输入按键读取器，终端模式在一次菜单会话内只切换一次"""
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdin
+        self.fd = self.stream.fileno()
+        self.pending = deque()
+        self._partial = ''
+        self._saved_mode = None
+        self._selector = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
+    # ------------------- 终端模式 -------------------
+    def acquire(self):
+        """进入按键模式（已在按键模式时不做任何事）"""
+        if os.name == 'nt' or self._saved_mode is not None:
+            return
+        if os.isatty(self.fd):
+            self._saved_mode = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd, termios.TCSANOW)
+        else:
+            self._saved_mode = False
+
+    def release(self):
+        """恢复进入按键模式前的终端设置"""
+        if self._saved_mode:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved_mode)
+        self._saved_mode = None
+        self._partial = ''
+        self.pending.clear()
+
+    # ------------------- 读取 -------------------
+    def _wait(self, timeout=None):
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.fd, selectors.EVENT_READ)
+        return bool(self._selector.select(timeout))
+
+    def _fill(self):
+        """阻塞直到至少解码出一个按键"""
+        while not self.pending:
+            timeout = ESC_TIMEOUT if self._partial else None
+            if not self._wait(timeout):
+                # 转义序列没有后续字节：是单独按下的 ESC
+                self._partial = ''
+                self.pending.append('esc')
+                break
+            data = os.read(self.fd, 1024)
+            if not data:
+                # 输入已关闭（例如管道结束），按 ESC 处理让菜单逐级返回
+                self.pending.append('esc')
+                break
+            keys, self._partial = decode_keys(self._partial + self._decoder.decode(data))
+            self.pending.extend(keys)
+
+    def _read_windows(self):
+        ch = msvcrt.getwch()
+        if ch in ('\x00', '\xe0'):  # 扩展键（方向键）
+            return WINDOWS_ARROW_KEYS.get(msvcrt.getwch())
+        return SINGLE_KEYS.get(ch, ch)
+
+    def read_key(self):
+        """阻塞等待下一个按键事件"""
+        if os.name == 'nt':
+            key = None
+            while key is None:
+                key = self._read_windows()
+            return key
+        self.acquire()
+        if not self.pending:
+            self._fill()
+        return self.pending.popleft()
+
+    def __iter__(self):
+        while True:
+            yield self.read_key()
+
+
+_reader = None
+
+
+def reader():
+    global _reader
+    if _reader is None:
+        _reader = KeyReader()
+        atexit.register(_reader.release)
+    return _reader
+
+
+def get_key():
+    """跨平台获取键盘按键（阻塞，没有按键时不占用 CPU）"""
+    return reader().read_key()
+
+
+def release():
+    """运行游戏或需要 input() 之前恢复终端模式"""
+    if _reader is not None:
+        _reader.release()
@@ -0,0 +1,207 @@
+import time
+from collections import namedtuple
+
+# 单个格子的显示样式；marks 为 (左上角颜色, 右下角颜色)，None 表示不显示
+MarkerStyle = namedtuple(
+    'MarkerStyle',
+    ['fill', 'outline', 'text', 'text_color', 'font', 'marks'],
+    defaults=('#000000', '', 'black', ('Arial', 12, 'bold'), (None, None))
+)
+
+
+class MarkerRoad:
+    """保留模式珠路图
+
+    网格矩形、圆点、文字和对子角标在创建时一次性生成，之后每局只用
+    itemconfigure 修改颜色/文字，画布上的元素数量始终不变。
+    结果存放在环形缓冲区中，满格后通过移动环形起点实现"滚动"。
+    """
+    def __init__(self, canvas, rows, cols, cell_size=30, radius=None,
+                 grid_outline='#888888', grid_fill='#D0E7FF', grid_width=1,
+                 dot_width=2, scroll_step=1,
+                 corner_marks=False, extra_size=0):
+        self.canvas = canvas
+        self.rows = rows
+        self.cols = cols
+        self.capacity = rows * cols
+        self.cell_size = cell_size
+        self.radius = radius if radius is not None else cell_size * 0.4
+        self.grid_outline = grid_outline
+        self.grid_fill = grid_fill
+        self.grid_width = grid_width
+        self.dot_width = dot_width
+        self.scroll_step = max(1, scroll_step)  # 满格后一次丢弃的旧结果数量（如整列）
+        self.corner_marks = corner_marks
+        self.extra_size = extra_size            # 画布额外留白（像素）
+
+        # 环形缓冲区
+        self._ring = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+
+        # 每个格子的画布元素与当前已显示的样式
+        self._slots = []
+        self._shown = [None] * self.capacity
+
+        self._build()
+
+    def _cell_bbox(self, slot):
+        col = slot // self.rows
+        row = slot % self.rows
+        x1 = col * self.cell_size
+        y1 = row * self.cell_size
+        return x1, y1, x1 + self.cell_size, y1 + self.cell_size
+
+    def _build(self):
+        """一次性创建网格与所有槽位元素"""
+        c = self.canvas
+        c.delete('all')
+        width = self.cols * self.cell_size + self.extra_size
+        height = self.rows * self.cell_size + self.extra_size
+        c.config(width=width, height=height, scrollregion=(0, 0, width, height))
+
+        # 先画全部网格，保证圆点始终在网格之上
+        for slot in range(self.capacity):
+            c.create_rectangle(
+                *self._cell_bbox(slot),
+                outline=self.grid_outline,
+                fill=self.grid_fill,
+                width=self.grid_width,
+                tags=('grid',)
+            )
+
+        r = self.radius
+        pair_r = self.cell_size * 0.12
+        border = 2.5
+        for slot in range(self.capacity):
+            x1, y1, x2, y2 = self._cell_bbox(slot)
+            cx = (x1 + x2) / 2
+            cy = (y1 + y2) / 2
+            dot = c.create_oval(
+                cx - r, cy - r, cx + r, cy + r,
+                width=self.dot_width, state='hidden', tags=('dot',)
+            )
+            marks = []
+            if self.corner_marks:
+                corners = [
+                    (x1 + pair_r * 1.25, y1 + pair_r * 1.25),  # 左上角
+                    (x2 - pair_r * 1.25, y2 - pair_r * 1.25)   # 右下角
+                ]
+                for px, py in corners:
+                    ring = c.create_oval(
+                        px - pair_r - border / 2, py - pair_r - border / 2,
+                        px + pair_r + border / 2, py + pair_r + border / 2,
+                        fill='#FFFFFF', outline='', state='hidden', tags=('dot',)
+                    )
+                    inner = c.create_oval(
+                        px - pair_r, py - pair_r, px + pair_r, py + pair_r,
+                        outline='', state='hidden', tags=('dot',)
+                    )
+                    marks.append((ring, inner))
+            text = c.create_text(cx, cy, text='', state='hidden', tags=('dot',))
+            self._slots.append((dot, text, marks))
+
+        self._shown = [None] * self.capacity
+
+    # ------------------- 数据操作 -------------------
+    def push(self, style):
+        """追加一个结果；满格时移动环形起点丢弃最旧的 scroll_step 个结果"""
+        if self._size >= self.capacity:
+            drop = min(self.scroll_step, self._size)
+            for i in range(drop):
+                self._ring[(self._head + i) % self.capacity] = None
+            self._head = (self._head + drop) % self.capacity
+            self._size -= drop
+        self._ring[(self._head + self._size) % self.capacity] = style
+        self._size += 1
+        self._render()
+
+    def set_results(self, styles):
+        """用一组样式整体替换当前内容（只显示最近 capacity 个）"""
+        styles = list(styles)[-self.capacity:]
+        self._ring = styles + [None] * (self.capacity - len(styles))
+        self._head = 0
+        self._size = len(styles)
+        self._render()
+
+    def clear(self):
+        self._ring = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+        self._render()
+
+    def __len__(self):
+        return self._size
+
+    def item_count(self):
+        """画布上元素总数（应在整个会话中保持不变）"""
+        return len(self.canvas.find_all())
+
+    # ------------------- 渲染 -------------------
+    def _render(self):
+        """只更新样式发生变化的格子"""
+        for slot in range(self.capacity):
+            if slot < self._size:
+                style = self._ring[(self._head + slot) % self.capacity]
+            else:
+                style = None
+            if style != self._shown[slot]:
+                self._apply(slot, style)
+                self._shown[slot] = style
+
+    def _apply(self, slot, style):
+        c = self.canvas
+        dot, text, marks = self._slots[slot]
+        if style is None:
+            c.itemconfigure(dot, state='hidden')
+            c.itemconfigure(text, state='hidden')
+            for ring, inner in marks:
+                c.itemconfigure(ring, state='hidden')
+                c.itemconfigure(inner, state='hidden')
+            return
+
+        c.itemconfigure(dot, state='normal', fill=style.fill, outline=style.outline)
+        c.itemconfigure(text, state='normal', text=style.text,
+                        fill=style.text_color, font=style.font)
+        for (ring, inner), color in zip(marks, style.marks):
+            if color:
+                c.itemconfigure(ring, state='normal')
+                c.itemconfigure(inner, state='normal', fill=color)
+            else:
+                c.itemconfigure(ring, state='hidden')
+                c.itemconfigure(inner, state='hidden')
+
+
+def run_long_session_benchmark(hands=20000, rows=6, cols=9):
+    """长时间会话基准：验证元素数量恒定并统计每局更新耗时"""
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root)
+    road = MarkerRoad(canvas, rows, cols, corner_marks=True, scroll_step=rows)
+
+    styles = [
+        MarkerStyle('#0000FF', '#0000FF', '闲', 'white', marks=('#0000FF', None)),
+        MarkerStyle('#FF0000', '', '庄', 'white', marks=(None, '#FF0000')),
+        MarkerStyle('#00FF00', 'black', '和', 'black'),
+    ]
+    initial_items = road.item_count()
+    start = time.perf_counter()
+    for i in range(hands):
+        road.push(styles[i % len(styles)])
+        if i % 50 == 0:
+            root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    final_items = road.item_count()
+    root.destroy()
+
+    print(f"局数: {hands}")
+    print(f"元素数量: 初始 {initial_items} / 结束 {final_items}")
+    print(f"平均每局更新: {elapsed / hands * 1e6:.1f} µs")
+    return initial_items == final_items
+
+
+if __name__ == "__main__":
+    ok = run_long_session_benchmark()
+    print("元素数量恒定" if ok else "元素数量发生变化!")
@@ -0,0 +1,316 @@
+"""热点路径计时（按 游戏 / 阶段 统计耗时直方图）
+
+洗牌子进程、存档 JSON、牌型判定、画布重绘都在 Tk 回调里同步执行，这里记录
+它们各自花了多少时间。默认关闭；设置环境变量 CASINO_METRICS=1 后启用：
+
+    import metrics
+
+    @metrics.timed()                      # 阶段名默认取函数的 __qualname__，如 "Deck.__init__"
+    def __init__(self): ...
+
+    with metrics.span("Baccarat", "deal"):
+        ...
+
+    metrics.watch_window(self)            # 窗口关闭时输出该游戏的统计摘要
+
+关闭时 timed() 直接返回原函数、span() 返回空上下文，没有额外开销。
+
+直方图采用 HDR 式对数分桶：每个 2 的幂区间再等分 32 个子桶，相对误差约 3%，
+记录一次只是一次整数运算加一次列表自增。启用后后台线程每 CASINO_METRICS_INTERVAL
+秒（默认 60）把有变化的统计追加到 A_Logs/metrics.jsonl（可用 CASINO_METRICS_FILE
+改路径），每行一个 JSON：{"kind": "dump" | "summary", "pid", "time", "metrics": [...]}，
+数值均为累计值，同一 pid 取最后一行即可。
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from term_ui import display_width
+
+ENABLED = os.environ.get("CASINO_METRICS", "").strip().lower() not in ("", "0", "false", "no", "off")
+try:
+    DUMP_INTERVAL = max(1.0, float(os.environ.get("CASINO_METRICS_INTERVAL", 60)))
+except ValueError:
+    DUMP_INTERVAL = 60.0
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS            # 每个 2 的幂区间的子桶数
+MAX_SHIFT = 40                                # 覆盖到约 2^45 ns（9 小时）
+BUCKET_COUNT = (MAX_SHIFT + 2) * SUB_BUCKETS
+
+
+def metrics_path():
+    custom = os.environ.get("CASINO_METRICS_FILE")
+    if custom:
+        return custom
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(root, "A_Logs", "metrics.jsonl")
+
+
+def bucket_index(ns):
+    """耗时（纳秒）-> 桶序号；小于 64 ns 的值各占一个桶"""
+    if ns < 2 * SUB_BUCKETS:
+        return max(0, ns)
+    shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+
+def bucket_value(index):
+    """桶序号 -> 该桶的代表值（区间中点，纳秒）"""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    low = (index - shift * SUB_BUCKETS) << shift
+    return low + ((1 << shift) >> 1)
+
+
+class LatencyHistogram:
+    """单个 (游戏, 阶段) 的耗时直方图，单位纳秒"""
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """q 取 0~100；返回近似值（纳秒），没有数据时返回 0"""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(self.count * q / 100.0)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(max(bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other):
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        """摘要（毫秒）+ 稀疏桶计数，离线可再合并"""
+        ms = 1e-6
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * ms if self.count else 0.0,
+            "min_ms": (self.min or 0) * ms,
+            "p50_ms": self.percentile(50) * ms,
+            "p90_ms": self.percentile(90) * ms,
+            "p99_ms": self.percentile(99) * ms,
+            "max_ms": self.max * ms,
+            "total_ms": self.total * ms,
+            "buckets": {str(i): n for i, n in enumerate(self.counts) if n},
+        }
+
+
+class MetricsRegistry:
+    """全部直方图，键为 (game, phase)；多线程安全"""
+    def __init__(self, path=None, interval=DUMP_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._records = 0
+        self._dumped = 0
+        self._thread = None
+
+    def record(self, game, phase, ns):
+        with self._lock:
+            hist = self.histograms.get((game, phase))
+            if hist is None:
+                hist = self.histograms[(game, phase)] = LatencyHistogram()
+            hist.record(ns)
+            self._records += 1
+        if self._thread is None:
+            self._start_dumper()
+
+    def snapshot(self, game=None):
+        """[(game, phase, 摘要字典)]，按总耗时从大到小"""
+        with self._lock:
+            items = [(g, p, h.to_dict()) for (g, p), h in self.histograms.items() if game in (None, g)]
+        items.sort(key=lambda item: -item[2]["total_ms"])
+        return items
+
+    def dump(self, kind="dump", game=None):
+        """把当前累计值追加写入 metrics 文件；没有新记录时跳过"""
+        if kind == "dump" and self._records == self._dumped:
+            return False
+        records = self._records
+        line = {
+            "kind": kind, "pid": os.getpid(), "time": time.time(), "started": self.started,
+            "metrics": [dict(game=g, phase=p, **stats) for g, p, stats in self.snapshot(game)],
+        }
+        path = self.path or metrics_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"写入 metrics 失败: {e}", file=sys.stderr)
+            return False
+        if kind == "dump":
+            self._dumped = records
+        return True
+
+    def summary(self, game=None):
+        """文字表格：各阶段次数与耗时（毫秒）"""
+        rows = self.snapshot(game)
+        if not rows:
+            return "（没有计时数据）"
+        names = [f"{g} / {p}" for g, p, _ in rows]
+        width = max(display_width(name) for name in names + ["游戏 / 阶段"])
+
+        def cells(name, *values):
+            return name + " " * (width - display_width(name)) + "".join(
+                " " * (11 - display_width(v)) + v for v in values)
+
+        lines = [cells("游戏 / 阶段", "次数", "平均", "p50", "p99", "最大", "合计")]
+        for name, (_, _, s) in zip(names, rows):
+            lines.append(cells(name, str(s["count"]), f"{s['mean_ms']:.3f}", f"{s['p50_ms']:.3f}",
+                               f"{s['p99_ms']:.3f}", f"{s['max_ms']:.3f}", f"{s['total_ms']:.1f}"))
+        return "\n".join(lines)
+
+    def _start_dumper(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._dump_loop, name="metrics-dump", daemon=True)
+        self._thread.start()
+        atexit.register(self.dump)
+
+    def _dump_loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.dump()
+
+
+registry = MetricsRegistry()
+
+
+def game_name(module_name):
+    """模块名 -> 游戏名：Casino_Games.Baccarat -> Baccarat；直接运行的脚本取文件名"""
+    if module_name == "__main__":
+        path = getattr(sys.modules.get("__main__"), "__file__", None)
+        if path:
+            return os.path.splitext(os.path.basename(path))[0]
+    return module_name.rsplit(".", 1)[-1]
+
+
+def timed(phase=None, game=None):
+    """装饰器：记录每次调用的耗时；未启用时原样返回函数"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        key_game = game or game_name(func.__module__)
+        key_phase = phase or func.__qualname__
+        clock = time.perf_counter_ns
+        record = registry.record
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(key_game, key_phase, clock() - start)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def _span(game, phase):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        registry.record(game, phase, time.perf_counter_ns() - start)
+
+
+def span(game, phase):
+    """上下文管理器：记录 with 块的耗时"""
+    return _span(game, phase) if ENABLED else nullcontext()
+
+
+def watch_window(window, game=None):
+    """窗口销毁时写入并打印该游戏的统计摘要；未启用时什么都不做"""
+    if not ENABLED:
+        return
+    game = game or game_name(type(window).__module__)
+
+    def on_destroy(event):
+        if event.widget is not window:
+            return
+        registry.dump(kind="summary", game=game)
+        print(f"[metrics] {game}\n{registry.summary(game)}", file=sys.stderr)
+
+    window.bind("<Destroy>", on_destroy, add="+")
+
+
+def main(argv=None):
+    """读取 metrics.jsonl，按 pid 取最后一行汇总显示"""
+    import argparse
+    parser = argparse.ArgumentParser(description="显示热点路径计时统计")
+    parser.add_argument("path", nargs="?", default=metrics_path())
+    parser.add_argument("--game", help="只显示该游戏")
+    args = parser.parse_args(argv)
+
+    latest = {}
+    with open(args.path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("kind") == "dump" or (entry["pid"], entry["started"]) not in latest:
+                latest[(entry["pid"], entry["started"])] = entry
+            else:
+                # summary 只含单个游戏，合并进该进程最近的记录
+                merged = {(m["game"], m["phase"]): m for m in latest[(entry["pid"], entry["started"])]["metrics"]}
+                merged.update({(m["game"], m["phase"]): m for m in entry["metrics"]})
+                latest[(entry["pid"], entry["started"])]["metrics"] = list(merged.values())
+
+    merged = MetricsRegistry()
+    for entry in latest.values():
+        for m in entry["metrics"]:
+            if args.game and m["game"] != args.game:
+                continue
+            hist = LatencyHistogram()
+            for index, n in m["buckets"].items():
+                hist.counts[int(index)] = n
+            hist.count = m["count"]
+            hist.total = int(m["total_ms"] * 1e6)
+            hist.min = int(m["min_ms"] * 1e6)
+            hist.max = int(m["max_ms"] * 1e6)
+            merged.histograms.setdefault((m["game"], m["phase"]), LatencyHistogram()).merge(hist)
+    print(merged.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""查表式 7 张牌德州扑克牌力评估
+
+牌用整数 0-51 表示：点数 = card // 4（0-12 对应 2-A），花色 = card % 4。
+返回的牌力为整数，数值越大牌越大；牌型在高位，踢脚按 4 位一组排在低位，
+比较结果与各游戏中的 evaluate_hand / find_best_5 一致。
+
+预先计算的表：
+- STRAIGHT_HIGH[mask]  13 位点数掩码中最大顺子的最高点（含 A-2-3-4-5），无顺子为 -1
+- TOP5[mask]           掩码中最高 5 个点数组成的踢脚值
+"""
+from itertools import combinations
+
+# 牌型（与 evaluate_hand 返回的第一项相同）
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH, ROYAL_FLUSH = range(10)
+
+CATEGORY_SHIFT = 20
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'shdc'
+
+
+def _build_straight_table():
+    table = [-1] * 8192
+    for mask in range(8192):
+        # A 同时当作最小的 1
+        ext = (mask << 1) | (1 if mask & (1 << 12) else 0)
+        for high in range(12, 2, -1):
+            # ext 中第 high+1 位对应点数 high
+            window = 0b11111 << (high - 3)
+            if ext & window == window:
+                table[mask] = high
+                break
+    return table
+
+
+def _kicker_value(ranks):
+    value = 0
+    for r in ranks:
+        value = (value << 4) | (r + 1)
+    return value
+
+
+def _build_top5_table():
+    table = [0] * 8192
+    for mask in range(8192):
+        ranks = [r for r in range(12, -1, -1) if mask & (1 << r)][:5]
+        table[mask] = _kicker_value(ranks) << (4 * (5 - len(ranks)))
+    return table
+
+
+STRAIGHT_HIGH = _build_straight_table()
+TOP5 = _build_top5_table()
+
+
+def _score(category, kickers):
+    """kickers 为点数列表（0-12），按 4 位打包并左对齐到 5 个位置"""
+    return (category << CATEGORY_SHIFT) | (_kicker_value(kickers) << (4 * (5 - len(kickers))))
+
+
+def evaluate(cards):
+    """评估 5-7 张牌（整数表示）的最佳五张牌力"""
+    counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    suit_counts = [0, 0, 0, 0]
+    mask = 0
+    for c in cards:
+        r = c >> 2
+        s = c & 3
+        counts[r] += 1
+        bit = 1 << r
+        mask |= bit
+        suit_masks[s] |= bit
+        suit_counts[s] += 1
+
+    flush_mask = 0
+    for s in range(4):
+        if suit_counts[s] >= 5:
+            flush_mask = suit_masks[s]
+            high = STRAIGHT_HIGH[flush_mask]
+            if high >= 0:
+                category = ROYAL_FLUSH if high == 12 else STRAIGHT_FLUSH
+                return _score(category, [high, high - 1, high - 2, high - 3, high - 4 if high > 3 else 12])
+            break
+
+    quads = trips = -1
+    pairs = []
+    for r in range(12, -1, -1):
+        n = counts[r]
+        if n == 4:
+            quads = r
+        elif n == 3:
+            if trips < 0:
+                trips = r
+            else:
+                pairs.append(r)   # 第二组三条当作对子
+        elif n == 2:
+            pairs.append(r)
+
+    if quads >= 0:
+        kicker = max(r for r in range(13) if counts[r] and r != quads)
+        return _score(QUADS, [quads, kicker])
+    if trips >= 0 and pairs:
+        return _score(FULL_HOUSE, [trips, max(pairs)])
+    if flush_mask:
+        return (FLUSH << CATEGORY_SHIFT) | TOP5[flush_mask]
+    high = STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return _score(STRAIGHT, [high, high - 1, high - 2, high - 3, high - 4 if high > 3 else 12])
+    if trips >= 0:
+        kickers = [r for r in range(12, -1, -1) if counts[r] == 1][:2]
+        return _score(TRIPS, [trips] + kickers)
+    if len(pairs) >= 2:
+        high_pair, low_pair = pairs[0], pairs[1]
+        kicker = max(r for r in range(13) if counts[r] and r not in (high_pair, low_pair))
+        return _score(TWO_PAIR, [high_pair, low_pair, kicker])
+    if pairs:
+        kickers = [r for r in range(12, -1, -1) if counts[r] == 1][:3]
+        return _score(PAIR, [pairs[0]] + kickers)
+    return (HIGH_CARD << CATEGORY_SHIFT) | TOP5[mask]
+
+
+def category(score):
+    return score >> CATEGORY_SHIFT
+
+
+def card_from_game(card, suits):
+    """把游戏中的 Card 对象（value 2-14, suit 字符）转换为整数"""
+    return (card.value - 2) * 4 + suits.index(card.suit)
+
+
+def card_name(c):
+    return RANK_CHARS[c >> 2] + SUIT_CHARS[c & 3]
+
+
+def verify_against(evaluate_hand, card_factory, samples=20000, seed=0):
+    """与游戏中的 evaluate_hand 比较随机 7 张牌的牌型和大小顺序，返回不一致次数
+
+    card_factory(c) 把整数牌转换为游戏的 Card 对象。
+    """
+    import random
+
+    rng = random.Random(seed)
+    deck = list(range(52))
+    mismatches = 0
+    previous = None
+    for _ in range(samples):
+        cards = rng.sample(deck, 7)
+        game_cards = [card_factory(c) for c in cards]
+        game_eval = max(evaluate_hand(list(combo)) for combo in combinations(game_cards, 5))
+        score = evaluate(cards)
+        if game_eval[0] != category(score):
+            mismatches += 1
+        if previous is not None:
+            prev_eval, prev_score = previous
+            if (game_eval > prev_eval) != (score > prev_score) or (game_eval == prev_eval) != (score == prev_score):
+                mismatches += 1
+        previous = (game_eval, score)
+    return mismatches
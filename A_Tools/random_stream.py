@@ -0,0 +1,213 @@
+"""缓冲的密码学随机流
+
+secrets.randbelow / SystemRandom 每取一个数都要一次 os.urandom 系统调用，洗一副
+8 副牌的牌靴就是 400 多次。RandomStream 以 os.urandom 取得的 32 字节为密钥，用
+SHAKE-256(密钥 ‖ 计数器) 一次生成 64 KiB 的随机块放进缓冲区，之后的取数只是切片。
+fork 出的子进程会自动换新密钥，不会与父进程输出相同的序列。
+
+区间取数用 Lemire 的乘法移位法：32 位随机字乘以区间长度取高 32 位，低 32 位落在
+拒绝区时重取，因此结果严格均匀（不像 int(x * n) 那样在大区间上有偏差），且绝大多数
+情况下不需要做除法。批量接口一次取出所需的全部随机字：
+
+    import random_stream
+    random_stream.shuffle(deck)                        # 原地 Fisher–Yates
+    shoe = random_stream.shuffle_shoe(deck, 8)         # 8 副牌的牌靴
+    dice = random_stream.roll_dice(3000)               # 3000 颗六面骰
+    values = random_stream.randbelow_many(37, 10000)   # 10000 个 [0, 37) 的整数
+
+需要 random.Random 接口（randint、choice ...）时用 StreamRandom()。
+设置 CASINO_SEED 时 rng_provider 会给模块级的默认随机流换上固定密钥，结果可复现。
+"""
+import hashlib
+import os
+import random
+import threading
+import weakref
+from array import array
+
+KEY_BYTES = 32
+BLOCK_SIZE = 64 * 1024
+WORD_BITS = 32
+WORD_MASK = (1 << WORD_BITS) - 1
+
+_streams = weakref.WeakSet()
+
+
+class RandomStream:
+    """SHAKE-256 计数器模式的随机字节流；多线程共用时加锁"""
+    def __init__(self, key=None, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._fixed_key = key is not None
+        self._rekey(key)
+        _streams.add(self)
+
+    def _rekey(self, key=None):
+        self._key = bytes(key) if key is not None else os.urandom(KEY_BYTES)
+        self._counter = 0
+        self._buffer = b""
+        self._pos = 0
+
+    def _next_block(self):
+        block = hashlib.shake_256(self._key + self._counter.to_bytes(8, "big")).digest(self.block_size)
+        self._counter += 1
+        return block
+
+    # ------------------- 基本取数 -------------------
+    def random_bytes(self, n):
+        with self._lock:
+            pos = self._pos
+            if pos + n <= len(self._buffer):
+                self._pos = pos + n
+                return self._buffer[pos:pos + n]
+            chunks = []
+            while n > 0:
+                if self._pos >= len(self._buffer):
+                    self._buffer = self._next_block()
+                    self._pos = 0
+                take = min(n, len(self._buffer) - self._pos)
+                chunks.append(self._buffer[self._pos:self._pos + take])
+                self._pos += take
+                n -= take
+        return b"".join(chunks)
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("位数不能为负")
+        if k == 0:
+            return 0
+        nbytes = (k + 7) // 8
+        return int.from_bytes(self.random_bytes(nbytes), "little") >> (nbytes * 8 - k)
+
+    def words(self, count):
+        """count 个 32 位无符号随机字（array('I')）"""
+        words = array("I")
+        if words.itemsize != 4:         # 极少见的平台：unsigned int 不是 4 字节
+            return array("L", [self.getrandbits(WORD_BITS) for _ in range(count)])
+        words.frombytes(self.random_bytes(4 * count))
+        return words
+
+    def randbelow(self, n):
+        """[0, n) 内的均匀整数"""
+        if n <= 0:
+            raise ValueError("上限必须为正数")
+        k = (n - 1).bit_length()
+        r = self.getrandbits(k)
+        while r >= n:
+            r = self.getrandbits(k)
+        return r
+
+    def randint(self, low, high):
+        """[low, high] 内的均匀整数"""
+        return low + self.randbelow(high - low + 1)
+
+    # ------------------- 批量接口 -------------------
+    def randbelow_many(self, n, count):
+        """count 个 [0, n) 内的均匀整数"""
+        if n <= 0:
+            raise ValueError("上限必须为正数")
+        if n > 1 << WORD_BITS:
+            return [self.randbelow(n) for _ in range(count)]
+        threshold = (1 << WORD_BITS) % n        # 低 32 位小于它的结果会带来偏差，丢弃
+        result = [m >> WORD_BITS for w in self.words(count) if ((m := w * n) & WORD_MASK) >= threshold]
+        while len(result) < count:
+            need = count - len(result)
+            result += [m >> WORD_BITS for w in self.words(need) if ((m := w * n) & WORD_MASK) >= threshold]
+        return result[:count]
+
+    def roll_dice(self, count, sides=6):
+        """count 颗 sides 面骰子的点数（1..sides）"""
+        return [value + 1 for value in self.randbelow_many(sides, count)]
+
+    def shuffle(self, seq):
+        """原地 Fisher–Yates 洗牌，所需随机字一次取出"""
+        n = len(seq)
+        if n < 2:
+            return seq
+        if n > 1 << WORD_BITS:
+            raise ValueError("序列过长")
+        words = iter(self.words(n - 1))
+        for i in range(n - 1, 0, -1):
+            bound = i + 1
+            m = next(words) * bound
+            if (m & WORD_MASK) < bound:
+                threshold = (1 << WORD_BITS) % bound
+                while (m & WORD_MASK) < threshold:
+                    m = self.getrandbits(WORD_BITS) * bound
+            j = m >> WORD_BITS
+            seq[i], seq[j] = seq[j], seq[i]
+        return seq
+
+    def permutation(self, n):
+        """0..n-1 的随机排列"""
+        return self.shuffle(list(range(n)))
+
+    def shuffle_shoe(self, deck, deck_count=8):
+        """deck 重复 deck_count 副后洗乱，返回新列表（元素是同一批对象的引用，可变对象请自行复制）"""
+        return self.shuffle(list(deck) * deck_count)
+
+
+class StreamRandom(random.Random):
+    """random.Random 接口，随机位来自 RandomStream（与 SystemRandom 一样不能设种子）"""
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else _default
+        super().__init__()
+
+    def seed(self, *args, **kwargs):
+        pass
+
+    def random(self):
+        return (self._stream.getrandbits(53)) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        return self._stream.getrandbits(k)
+
+    def _randbelow(self, n):
+        return self._stream.randbelow(n)
+
+    def randbytes(self, n):
+        return self._stream.random_bytes(n)
+
+    def shuffle(self, x):
+        self._stream.shuffle(x)
+
+    def _notimplemented(self, *args, **kwargs):
+        raise NotImplementedError("StreamRandom 没有可保存的状态")
+
+    getstate = setstate = _notimplemented
+
+
+def _after_fork():
+    for stream in list(_streams):
+        if not stream._fixed_key:
+            stream._lock = threading.Lock()
+            stream._rekey()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def set_default_key(key=None):
+    """给默认随机流换上固定密钥（可复现模式，由 rng_provider 调用）；key 为 None 时恢复随机密钥"""
+    if key is None and not _default._fixed_key:
+        return
+    with _default._lock:
+        _default._fixed_key = key is not None
+        _default._rekey(key)
+
+
+_default = RandomStream()
+
+random_bytes = _default.random_bytes
+getrandbits = _default.getrandbits
+randbelow = _default.randbelow
+randint = _default.randint
+randbelow_many = _default.randbelow_many
+roll_dice = _default.roll_dice
+shuffle = _default.shuffle
+permutation = _default.permutation
+shuffle_shoe = _default.shuffle_shoe
+
+# 可复现模式：导入 rng_provider 时它会调用 set_default_key（上面的名称此时都已定义）
+if os.environ.get("CASINO_SEED", "").strip():
+    import rng_provider  # noqa: F401  只为导入时的副作用：给默认随机流换上固定密钥
@@ -0,0 +1,135 @@
+"""随机数来源
+
+正式模式下所有随机数来自缓冲的 CSPRNG 随机流（random_stream.StreamRandom）。设置环境变量
+CASINO_SEED=<整数> 后进入可复现模式：每个随机流（按名称区分，如引擎名
+"sicbo"、"Roulette_Europe.physics"）用主种子和名称经 SHA-256 派生出独立的
+random.Random，同名流的第 n 次请求也有固定种子，因此各流之间的调用顺序
+不影响彼此；同时用主种子初始化全局 random 模块（覆盖各 GUI 里直接调用的
+random.shuffle / random.choice 等），并给 random_stream 的默认随机流换上固定密钥
+（覆盖各游戏的兜底洗牌 random_stream.shuffle / randbelow）。
+
+    import rng_provider
+    rng = rng_provider.stream("sicbo")        # 引擎、动画等取自己的随机流
+    seed = rng_provider.derive_seed("sicbo")  # 可复现模式下的派生种子，正式模式为 None
+    env = rng_provider.shuffle_env()          # 调用洗牌子进程 shuffle.py 时使用的环境变量
+
+洗牌子进程继承的 CASINO_SEED 在每个进程里都从头计数，所以每次洗牌的种子由调用方
+派生（名称 "shuffle"）后通过 CASINO_SHUFFLE_SEED 传入。正式模式下以上都不生效。
+"""
+import hashlib
+import os
+import random
+import threading
+
+import random_stream
+
+SEED_ENV = "CASINO_SEED"
+SHUFFLE_SEED_ENV = "CASINO_SHUFFLE_SEED"
+
+
+def _seed_from_env():
+    value = os.environ.get(SEED_ENV, "").strip()
+    if not value:
+        return None
+    try:
+        return int(value, 0)
+    except ValueError:
+        # 非数字也可以当种子，按字符串哈希
+        return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
+def mix_seed(seed, name, index=0):
+    """主种子 + 流名称 + 序号 -> 64 位派生种子"""
+    digest = hashlib.sha256(f"{seed}:{name}:{index}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class RngProvider:
+    """seed 为 None 时是正式模式（CSPRNG），否则是可复现模式"""
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._system = random_stream.StreamRandom()
+        self._streams = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def deterministic(self):
+        return self.seed is not None
+
+    def derive_seed(self, name):
+        """为名称 name 取下一个派生种子（每次调用序号加一）；正式模式返回 None"""
+        if self.seed is None:
+            return None
+        with self._lock:
+            index = self._counts.get(name, 0)
+            self._counts[name] = index + 1
+        return mix_seed(self.seed, name, index)
+
+    def new_rng(self, name):
+        """新建一个独立的随机流（引擎实例各用一个）"""
+        if self.seed is None:
+            return self._system
+        return random.Random(self.derive_seed(name))
+
+    def stream(self, name):
+        """名称为 name 的共享随机流（同名返回同一个对象）"""
+        if self.seed is None:
+            return self._system
+        with self._lock:
+            rng = self._streams.get(name)
+        if rng is None:
+            rng = random.Random(mix_seed(self.seed, name, "shared"))
+            with self._lock:
+                rng = self._streams.setdefault(name, rng)
+        return rng
+
+    def seed_global_random(self):
+        """可复现模式下初始化全局 random 模块和 random_stream 的默认随机流；切回正式模式时恢复随机密钥"""
+        if self.seed is not None:
+            random.seed(mix_seed(self.seed, "random"))
+            random_stream.set_default_key(mix_seed(self.seed, "random_stream").to_bytes(8, "big"))
+        else:
+            random_stream.set_default_key(None)
+
+
+_provider = RngProvider(_seed_from_env())
+_provider.seed_global_random()
+
+
+def current():
+    return _provider
+
+
+def configure(seed=None):
+    """切换模式（None 为正式模式），返回新的 provider；已创建的随机流不受影响"""
+    global _provider
+    _provider = RngProvider(seed)
+    _provider.seed_global_random()
+    return _provider
+
+
+def deterministic():
+    return _provider.deterministic
+
+
+def derive_seed(name):
+    return _provider.derive_seed(name)
+
+
+def shuffle_env(env=None):
+    """洗牌子进程的环境变量（默认复制 os.environ）：可复现模式下带上本次洗牌的派生种子"""
+    env = dict(os.environ if env is None else env)
+    env.pop(SHUFFLE_SEED_ENV, None)
+    seed = derive_seed("shuffle")
+    if seed is not None:
+        env[SHUFFLE_SEED_ENV] = str(seed)
+    return env
+
+
+def new_rng(name):
+    return _provider.new_rng(name)
+
+
+def stream(name):
+    return _provider.stream(name)
@@ -0,0 +1,251 @@
+"""离散分布采样器（Walker 别名法）
+
+各小游戏按概率表抽取结果时原本每次都线性累加概率查找；这里把概率表一次性
+建成别名表（Vose 算法），之后每次抽样只需一个随机下标和一次比较，O(1)。
+有 numpy 时 sample_many 可一次向量化抽取大量结果。
+
+- AliasSampler          通用离散分布采样器
+- CrashSampler / crash_sampler  火箭游戏的爆炸倍数分布（低倍数用别名表，长尾用逆 CDF 精确抽取）
+- cumulative_scan_weights  还原“累计概率逐项比较”写法的实际概率（概率和不为 1 时）
+- draw_distinct / draw_distinct_many  不重复抽号（Keno 开奖）
+"""
+import math
+import random
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AliasSampler:
+    """Walker 别名表：values[i] 的抽取概率与 weights[i] 成正比"""
+    def __init__(self, values, weights):
+        values = list(values)
+        weights = [float(w) for w in weights]
+        if not values or len(values) != len(weights):
+            raise ValueError("values 与 weights 长度必须相同且不为空")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("权重总和必须大于 0")
+
+        n = len(values)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # 剩余项因浮点误差落在 1 附近，直接取自身
+
+        self.values = values
+        self.probabilities = [w / total for w in weights]
+        self.prob = prob
+        self.alias = alias
+        self._np_tables = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample_index(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample(self, rng=random):
+        return self.values[self.sample_index(rng)]
+
+    def sample_many(self, count, rng=None):
+        """一次抽取 count 个结果；有 numpy 时返回 ndarray（rng 为 numpy Generator 或种子）"""
+        if np is None:
+            py_rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+            return [self.sample(py_rng) for _ in range(count)]
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        if self._np_tables is None:
+            self._np_tables = (np.asarray(self.values), np.asarray(self.prob), np.asarray(self.alias))
+        values, prob, alias = self._np_tables
+        idx = rng.integers(0, len(prob), size=count)
+        keep = rng.random(count) < prob[idx]
+        return values[np.where(keep, idx, alias[idx])]
+
+    def mean(self, func=None):
+        """分布的精确期望 E[func(value)]"""
+        if func is None:
+            return sum(v * p for v, p in zip(self.values, self.probabilities))
+        return sum(func(v) * p for v, p in zip(self.values, self.probabilities))
+
+
+# ------------------- 火箭爆炸倍数 -------------------
+CRASH_TAIL_START = 10       # 从这里起倍数步长为 1，权重 C / m^k 平滑递减
+CRASH_TAIL_EXPLICIT = 1000  # 长尾中逐项放进别名表的项数，其余部分用连续包络抽取
+
+
+@lru_cache(maxsize=1)
+def crash_table(max_multiplier, C=100, k=1.5):
+    """与 RocketGame 原 generate_probability_table 相同的 (倍数, 权重) 全表（未归一化，仅供核对）"""
+    multipliers = []
+    weights = []
+    multiplier = 1.01
+    while multiplier <= max_multiplier:
+        multipliers.append(round(multiplier, 2))
+        weights.append(C / (multiplier ** k))
+        multiplier += 0.01 if multiplier < 2 else 0.1 if multiplier < CRASH_TAIL_START else 1
+    return tuple(multipliers), tuple(weights)
+
+
+def power_sum(a, n, k):
+    """sum_{j=0}^{n-1} (a + j)^-k；用 Euler–Maclaurin 公式，a 在 1000 以上时误差远小于浮点精度"""
+    if n <= 0:
+        return 0.0
+    b = a + n
+    integral = math.log(b / a) if k == 1 else (a ** (1 - k) - b ** (1 - k)) / (k - 1)
+    d1 = lambda x: -k * x ** (-k - 1)
+    d3 = lambda x: -k * (k + 1) * (k + 2) * x ** (-k - 3)
+    return integral + (a ** -k - b ** -k) / 2 + (d1(b) - d1(a)) / 12 - (d3(b) - d3(a)) / 720
+
+
+class CrashSampler:
+    """爆炸倍数采样器，分布与 crash_table 逐项相同
+
+    倍数 < CRASH_TAIL_START 的部分和长尾的前 CRASH_TAIL_EXPLICIT 项放进别名表，
+    其余长尾（最多上百万项）合成别名表里的一项。抽中它时按连续密度 y^-k 用逆 CDF
+    取一个位置，再按该项真实权重与包络之比接受（拒绝采样），结果与逐项建表完全同分布，
+    建表时间和内存与 max_multiplier 无关。
+    """
+    def __init__(self, max_multiplier, C=100, k=1.5):
+        self.k = k
+        values = []
+        weights = []
+        multiplier = 1.01
+        while multiplier <= max_multiplier and multiplier < CRASH_TAIL_START:
+            values.append(round(multiplier, 2))
+            weights.append(C / (multiplier ** k))
+            multiplier += 0.01 if multiplier < 2 else 0.1
+
+        # 长尾第 j 项：权重按 m0 + j 计算，倍数为 round(m0 + j, 2)（同原表的浮点累加）
+        self.m0 = multiplier
+        self.tail_count = max(0, int(math.floor(max_multiplier - multiplier)) + 1)
+        explicit = min(self.tail_count, CRASH_TAIL_EXPLICIT)
+        for j in range(explicit):
+            values.append(round(multiplier + j, 2))
+            weights.append(C / ((multiplier + j) ** k))
+
+        self.tail_from = explicit
+        tail_weight = C * power_sum(multiplier + explicit, self.tail_count - explicit, k)
+        self.tail_index = len(values) if tail_weight > 0 else None
+        if self.tail_index is not None:
+            values.append(0.0)          # 占位：抽中时改抽长尾
+            weights.append(tail_weight)
+        self.head = AliasSampler(values, weights)
+        self.total = sum(weights)
+        self.C = C
+
+        # 包络 y^-k 的区间 [lo, hi)：第 j 项对应 [m0 + j - 1, m0 + j)，区间内 y^-k >= (m0 + j)^-k
+        self.lo = multiplier + explicit - 1
+        self.hi = multiplier + self.tail_count - 1
+        self._lo_p = self.lo ** (1 - k)
+        self._hi_p = self.hi ** (1 - k)
+
+    def _tail_value(self, u, accept):
+        """u 为逆 CDF 用的均匀数；返回倍数，被拒绝时返回 None"""
+        y = (self._lo_p - u * (self._lo_p - self._hi_p)) ** (1 / (1 - self.k))
+        j = self.tail_from + min(int(y - self.lo), self.tail_count - self.tail_from - 1)
+        m = self.m0 + j
+        if accept < (y / m) ** self.k:
+            return round(m, 2)
+        return None
+
+    def sample(self, rng=random):
+        i = self.head.sample_index(rng)
+        if i != self.tail_index:
+            return self.head.values[i]
+        while True:
+            value = self._tail_value(rng.random(), rng.random())
+            if value is not None:
+                return value
+
+    def sample_many(self, count, rng=None):
+        """一次抽取 count 个结果；有 numpy 时返回 ndarray（rng 为 numpy Generator 或种子）"""
+        if np is None:
+            py_rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+            return [self.sample(py_rng) for _ in range(count)]
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng(rng)
+        result = np.asarray(self.head.sample_many(count, rng), dtype=float)
+        pending = np.flatnonzero(result == 0.0)
+        k = self.k
+        while pending.size:
+            u = rng.random(pending.size)
+            y = (self._lo_p - u * (self._lo_p - self._hi_p)) ** (1 / (1 - k))
+            j = self.tail_from + np.minimum((y - self.lo).astype(np.int64), self.tail_count - self.tail_from - 1)
+            m = self.m0 + j
+            ok = rng.random(pending.size) < (y / m) ** k
+            result[pending[ok]] = np.round(m[ok], 2)
+            pending = pending[~ok]
+        return result
+
+    def survival(self, target):
+        """精确的 P(爆炸倍数 >= target)"""
+        weight = sum(p for i, (v, p) in enumerate(zip(self.head.values, self.head.probabilities))
+                     if i != self.tail_index and v >= target) * self.total
+        if self.tail_index is not None:
+            # 长尾倍数为 round(m0, 2) + j，第一个 >= target 的 j
+            j0 = max(self.tail_from, math.ceil(round(target - round(self.m0, 2), 6)))
+            weight += self.C * power_sum(self.m0 + j0, self.tail_count - j0, self.k)
+        return weight / self.total
+
+
+@lru_cache(maxsize=1)
+def crash_sampler(max_multiplier, C=100, k=1.5):
+    """爆炸倍数采样器（游戏里只用一个 max_multiplier，缓存最近一个）"""
+    return CrashSampler(max_multiplier, C, k)
+
+
+def crash_survival(sampler, target):
+    """精确的 P(爆炸倍数 >= target)"""
+    return sampler.survival(target)
+
+
+# ------------------- 累计概率表 -------------------
+def cumulative_scan_weights(probabilities):
+    """还原 `random.random() <= 累计概率` 逐项查找的实际概率
+
+    probabilities 为 {值: 概率}；概率和超过 1 时，累计超过 1 的部分永远抽不到，
+    这里按实际能抽到的概率截断，保证改用采样器后分布不变。
+    """
+    values = []
+    weights = []
+    cumulative = 0.0
+    for value, prob in probabilities.items():
+        effective = min(prob, max(0.0, 1.0 - cumulative))
+        cumulative += prob
+        if effective > 0:
+            values.append(value)
+            weights.append(effective)
+    return values, weights
+
+
+# ------------------- 不重复抽号 -------------------
+def draw_distinct(low, high, count, rng=random):
+    """从 low..high 中不重复抽取 count 个号码（按抽出顺序）"""
+    return rng.sample(range(low, high + 1), count)
+
+
+def draw_distinct_many(rounds, low, high, count, rng=None):
+    """一次抽取 rounds 组不重复号码，返回 (rounds, count) 的 ndarray（需要 numpy）"""
+    if np is None:
+        raise ImportError("draw_distinct_many 需要 numpy，请先执行 pip install numpy")
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    keys = rng.random((rounds, high - low + 1))
+    return np.argpartition(keys, count - 1, axis=1)[:, :count] + low
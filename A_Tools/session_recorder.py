@@ -0,0 +1,228 @@
+"""对局记录与无界面回放
+
+SessionRecorder 订阅一个引擎，把种子、引擎参数和此后的全部事件（下注、清注、
+开奖、结算）逐行写入 JSONL：
+
+    {"kind": "session", "game": "sicbo", "seed": 123..., "settings": {...}, "start_round": 0, ...}
+    {"kind": "event", "type": "round_started", "data": {"round": 1}}
+    {"kind": "event", "type": "bet_placed", "data": {"spot": "big", "amount": 100, "total": 100}}
+    ...
+
+replay() 不开窗口、不等动画，按记录重新下注并全速跑完每一局，逐局比对结果与派彩：
+有种子且从第 0 局开始记录的会话用同一种子重新开奖（同时验证可复现性）；
+正式模式（CSPRNG）的会话没有种子，用引擎的 outcome_kwargs 把记录的结果原样带回
+_act。回放可用于重现玩家报告的问题，也可作为性能回归的固定负载：
+
+    CASINO_SEED=42 python A_Tools/shared_table.py sicbo --record A_Logs/Sessions/sicbo.jsonl
+    python A_Tools/session_recorder.py record sicbo --seed 42 --rounds 10000 --bet big=100
+    python A_Tools/session_recorder.py replay A_Logs/Sessions/sicbo-42.jsonl --profile
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from engines import ENGINES, EngineError, create
+
+FORMAT_VERSION = 1
+
+
+def sessions_dir():
+    return os.path.join(os.path.dirname(current_dir), "A_Logs", "Sessions")
+
+
+def default_path(game, seed=None):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(sessions_dir(), f"{game}-{stamp}" + (f"-{seed}" if seed is not None else "") + ".jsonl")
+
+
+def _normalize(value):
+    """与写入文件后再读回的值一致（元组变列表、键变字符串），用于比对"""
+    return json.loads(json.dumps(value))
+
+
+class SessionRecorder:
+    """把 engine 此后的事件写入 path；close() 或离开 with 块时停止"""
+    def __init__(self, engine, path=None):
+        self.engine = engine
+        self.path = path or default_path(engine.name, engine.seed)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._write({
+            "kind": "session", "version": FORMAT_VERSION, "game": engine.name,
+            "seed": engine.seed, "mode": "seeded" if engine.seed is not None else "csprng",
+            "settings": engine.settings(), "start_round": engine.round_id, "time": time.time(),
+        })
+        self._file.flush()
+        self._unsubscribe = engine.subscribe(self._on_event)
+
+    def _write(self, entry):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _on_event(self, event):
+        self._write({"kind": "event", "type": event.type, "data": event.data})
+        if event.type == "settled":
+            with self._lock:
+                if self._file is not None:
+                    self._file.flush()
+
+    def close(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_session(path):
+    """返回 (header, rounds)；rounds 为 [{"round", "inputs": [(类型, data)], "settled": data}]，
+    没有结算的最后一局丢弃"""
+    header, rounds, current = None, [], None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue        # 进程中途退出时最后一行可能不完整
+            if entry.get("kind") == "session":
+                header = entry
+                continue
+            kind, data = entry["type"], entry["data"]
+            if kind == "round_started":
+                current = {"round": data["round"], "inputs": [], "settled": None}
+            elif current is None:
+                continue
+            elif kind in ("bet_placed", "bet_cleared"):
+                current["inputs"].append((kind, data))
+            elif kind == "settled":
+                current["settled"] = data
+                rounds.append(current)
+                current = None
+    if header is None:
+        raise ValueError(f"{path} 不是对局记录文件")
+    return header, rounds
+
+
+def replay(path, force_outcomes=False, stop_on_mismatch=False):
+    """全速回放一份记录，返回统计 dict（rounds、mismatches、seconds、mode ...）"""
+    header, rounds = load_session(path)
+    seeded = header["seed"] is not None and header["start_round"] == 0 and not force_outcomes
+    engine = create(header["game"], seed=header["seed"] if seeded else None, **header["settings"])
+    engine.round_id = header["start_round"]
+    mismatches = []
+    staked = returned = 0
+    start = time.perf_counter()
+    for recorded in rounds:
+        engine.round_id = recorded["round"] - 1
+        engine.new_round()
+        for kind, data in recorded["inputs"]:
+            if kind == "bet_placed":
+                engine.place_bet(data["spot"], data["amount"])
+            else:
+                engine.clear_bets()
+        expected = recorded["settled"]
+        kwargs = {} if seeded else engine.outcome_kwargs(expected["outcome"])
+        engine.act(engine.ROUND_ACTION, **kwargs)
+        actual = _normalize(engine.settle()[0].data)
+        staked += actual["staked"]
+        returned += actual["returned"]
+        diff = [key for key in ("outcome", "payouts", "staked", "returned") if actual[key] != expected[key]]
+        if diff:
+            mismatches.append({"round": recorded["round"], "fields": diff,
+                               "expected": {k: expected[k] for k in diff}, "actual": {k: actual[k] for k in diff}})
+            if stop_on_mismatch:
+                break
+    seconds = time.perf_counter() - start
+    return {
+        "game": header["game"], "mode": "seeded" if seeded else "forced",
+        "rounds": len(rounds), "mismatches": mismatches, "seconds": seconds,
+        "rounds_per_second": len(rounds) / seconds if seconds else float("inf"),
+        "staked": staked, "returned": returned,
+    }
+
+
+def record_session(game, rounds, bets, path=None, seed=None, **settings):
+    """自动下注 rounds 局并记录（生成固定的回放负载），返回记录路径"""
+    engine = create(game, seed=seed, **settings)
+    with SessionRecorder(engine, path) as recorder:
+        for _ in range(rounds):
+            engine.play_round(bets)
+    return recorder.path
+
+
+def _parse_bet(text):
+    spot, sep, amount = text.rpartition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"下注格式应为 注项=金额: {text}")
+    return spot, float(amount) if "." in amount else int(amount)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="对局记录与无界面回放")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="自动对局并记录")
+    rec.add_argument("game", choices=sorted(ENGINES))
+    rec.add_argument("--rounds", type=int, default=1000)
+    rec.add_argument("--bet", type=_parse_bet, action="append", required=True, help="注项=金额（可多次指定）")
+    rec.add_argument("--seed", type=int, default=None, help="不指定时按 CASINO_SEED 派生，仍未设置则为 CSPRNG")
+    rec.add_argument("--output", default=None)
+
+    rep = sub.add_parser("replay", help="全速回放并比对结果")
+    rep.add_argument("path")
+    rep.add_argument("--force-outcomes", action="store_true", help="有种子也直接使用记录的结果")
+    rep.add_argument("--repeat", type=int, default=1, help="重复回放次数（计时取最快一次）")
+    rep.add_argument("--profile", action="store_true", help="用 cProfile 输出耗时最多的函数")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        try:
+            path = record_session(args.game, args.rounds, dict(args.bet), args.output, args.seed)
+        except EngineError as e:
+            parser.error(str(e))
+        print(f"已记录 {args.rounds} 局: {path}")
+        return 0
+
+    try:
+        if args.profile:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            result = profiler.runcall(replay, args.path, args.force_outcomes)
+        else:
+            results = [replay(args.path, args.force_outcomes) for _ in range(max(1, args.repeat))]
+            result = min(results, key=lambda r: r["seconds"])
+    except (OSError, ValueError) as e:      # EngineError 也是 ValueError
+        parser.error(str(e))
+    if args.profile:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    print(f"{result['game']}（{'种子重开' if result['mode'] == 'seeded' else '使用记录结果'}）"
+          f" {result['rounds']} 局，{result['seconds']:.3f} 秒，{result['rounds_per_second']:,.0f} 局/秒")
+    print(f"  总下注 {result['staked']:,}，总返还 {result['returned']:,}")
+    for m in result["mismatches"][:10]:
+        print(f"  第 {m['round']} 局不一致 {m['fields']}: 记录 {m['expected']} / 回放 {m['actual']}")
+    if result["mismatches"]:
+        print(f"共 {len(result['mismatches'])} 局与记录不一致")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
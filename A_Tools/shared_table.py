@@ -0,0 +1,612 @@
+"""共享牌桌：每张桌只有一个权威的回合时钟与开奖结果
+
+轮盘、幸运之轮原来每个窗口各自倒计时、各自转轮，开十个窗口就是十张互不相干的桌，
+每个窗口每局还各自写一次余额和历史记录。SharedTable 把一张桌的回合集中到一处:
+
+    开局 -> 下注倒计时 -> 封盘 -> 引擎开奖一次 -> 全部玩家一次性结算
+         -> 有变化的余额一次写回 saving_data.json -> 历史记录写一次 -> 停留 -> 下一局
+
+事件是可以直接 JSON 序列化的 dict，推送给所有订阅者：
+    round_started  {round, deadline（time.time() 时间戳）, betting_seconds}
+    round_result   {round, outcome, results: {玩家: {staked, payout, payouts, net, balance}},
+                    refunds: {玩家: {amount, reason}}}
+
+同一进程内的界面直接 subscribe；各自运行的游戏窗口通过 TableHost 的本地 socket
+（每行一个 JSON）连接，RemoteTable 提供与 SharedTable 相同的接口。
+connect(game, ...) 找不到正在运行的桌时会在后台启动一个（python shared_table.py <game>），
+没有窗口连接一段时间后该进程自动退出。
+
+订阅回调在牌桌线程（或 socket 读取线程）中调用，tkinter 界面应把事件放入队列，
+再用 after() 在主线程中处理。
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from engines import BETTING, EngineError, create
+
+DEFAULT_BALANCE = 1_000_000.0
+CONNECT_TIMEOUT = 5.0       # 启动后台牌桌后等待其监听的最长时间
+SEND_QUEUE_LIMIT = 64       # 每个窗口最多积压的消息数，超过即断开该窗口
+IDLE_EXIT_SECONDS = 60      # 后台牌桌没有任何连接多久后退出
+
+
+def project_root():
+    return os.path.dirname(current_dir)
+
+
+def user_data_path():
+    return os.path.join(project_root(), 'saving_data.json')
+
+
+# ======================================================================
+# 余额
+# ======================================================================
+class BalanceBook:
+    """同桌玩家的余额；每局结算后把有变化的账户一次写回 saving_data.json
+
+    文件中的玩家只记本桌造成的增减（deltas），join 时和每次写回时都重新读取文件里的
+    cash 再加上增减，玩家在桌子运行期间去玩别的游戏改了余额也不会被旧值覆盖。
+    文件中不存在的玩家（Guest 等）只在内存中记账，初始余额取 join 时传入的 balance。
+    """
+    def __init__(self, path=None):
+        self.path = path or user_data_path()
+        self.balances = {}
+        self.deltas = {}            # {玩家: 上次写回后本桌造成的增减}
+        self.guests = set()
+        self._dirty = set()
+
+    def _load_users(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+            return users if isinstance(users, list) else []
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def _cash(user):
+        try:
+            return float(user.get('cash'))
+        except (TypeError, ValueError):
+            return None
+
+    def open(self, player, balance=None):
+        """入座时读取玩家余额；balance 只用于文件中不存在的玩家"""
+        if player in self.guests:
+            return self.balances[player]
+        for user in self._load_users():
+            if user.get('user_name') == player:
+                cash = self._cash(user)
+                if cash is not None:
+                    self.balances[player] = cash + self.deltas.get(player, 0.0)
+                    return self.balances[player]
+                break
+        self.guests.add(player)
+        self.balances[player] = float(DEFAULT_BALANCE if balance is None else balance)
+        return self.balances[player]
+
+    def release(self, player):
+        """玩家离桌且没有未结算的注时丢弃缓存（未写回的增减会先写回）"""
+        if player in self._dirty:
+            self.commit()
+        self.balances.pop(player, None)
+        self.deltas.pop(player, None)
+        self.guests.discard(player)
+
+    def debit(self, player, amount):
+        if self.balances[player] < amount:
+            raise EngineError(f"余额不足，无法下注 ${amount:,.0f}。")
+        self.balances[player] -= amount
+        self.deltas[player] = self.deltas.get(player, 0.0) - amount
+        self._dirty.add(player)
+
+    def credit(self, player, amount):
+        self.balances[player] += amount
+        self.deltas[player] = self.deltas.get(player, 0.0) + amount
+        self._dirty.add(player)
+
+    def commit(self):
+        """把本局有变化的账户写回文件（每局最多一次读、一次写）：文件中的最新 cash 加上本桌增减"""
+        changed = self._dirty - self.guests
+        self._dirty.clear()
+        for player in self.guests:
+            self.deltas.pop(player, None)
+        if not changed:
+            return
+        users = self._load_users()
+        for user in users:
+            name = user.get('user_name')
+            if name in changed:
+                cash = self._cash(user)
+                if cash is None:
+                    cash = self.balances[name] - self.deltas.get(name, 0.0)
+                self.balances[name] = cash + self.deltas.pop(name, 0.0)
+                user['cash'] = f"{self.balances[name]:.2f}"
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(users, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.path)
+
+
+# ======================================================================
+# 牌桌
+# ======================================================================
+class SharedTable:
+    """一张桌的回合状态机与时钟
+
+    book 为 None 时不管余额（由调用者记账，如 game_server 的网关）；
+    history(outcome, bets, results) 每局调用一次，用于写历史记录。
+    """
+    def __init__(self, engine, betting_seconds=30, result_seconds=6, book=None, history=None, name=None):
+        engine.shared = True
+        self.engine = engine
+        self.name = name or engine.name
+        self.betting_seconds = betting_seconds
+        self.result_seconds = result_seconds
+        self.book = book
+        self.history = history
+        self.players = set()
+        self.bets = {}              # {玩家: {注项: 金额}}
+        self.deadline = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ------------------- 订阅 -------------------
+    def subscribe(self, callback):
+        """callback(event) 收到此后的每个事件；返回取消订阅的函数"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish(self, event):
+        event["table"] = self.name
+        for callback in list(self._subscribers):
+            callback(event)
+        return event
+
+    def snapshot(self):
+        """中途加入的界面据此显示当前局"""
+        return {"table": self.name, "round": self.engine.round_id, "phase": self.engine.phase,
+                "deadline": self.deadline, "betting_seconds": self.betting_seconds}
+
+    # ------------------- 玩家 -------------------
+    def join(self, player, balance=None):
+        """入座，返回余额；balance 只作为 Guest 等文件中没有的玩家的初始余额"""
+        with self._lock:
+            self.players.add(player)
+            self._wake.set()
+            return self.book.open(player, balance) if self.book else None
+
+    def leave(self, player):
+        """离桌；已下的注照常结算，结算后再丢弃余额缓存"""
+        with self._lock:
+            self.players.discard(player)
+            if self.book and not (self.engine.phase == BETTING and self.bets.get(player)):
+                self.book.release(player)
+
+    def place_bet(self, player, spot, amount):
+        with self._lock:
+            if self.engine.phase != BETTING:
+                raise EngineError("已封盘，请等待下一局")
+            bets = self.bets.setdefault(player, {})
+            total = self.engine.validate_bet(bets, spot, amount)
+            stake = self.engine.stake_for(spot, amount)
+            if self.book:
+                self.book.debit(player, stake)
+            bets[spot] = total
+            return {"spot": spot, "amount": amount, "total": total, "stake": stake,
+                    "balance": self.book.balances[player] if self.book else None}
+
+    def clear_bets(self, player, spot=None):
+        """撤回全部下注或单个注项，返回退回的金额"""
+        with self._lock:
+            if self.engine.phase != BETTING:
+                raise EngineError("已封盘，请等待下一局")
+            bets = self.bets.get(player, {})
+            if spot is None:
+                removed = dict(bets)
+                bets.clear()
+            else:
+                removed = {spot: bets.pop(spot)} if spot in bets else {}
+            refund = self.engine.staked(removed)
+            if self.book and refund:
+                self.book.credit(player, refund)
+            return {"refund": refund, "balance": self.book.balances[player] if self.book else None}
+
+    # ------------------- 回合 -------------------
+    def open_round(self):
+        with self._lock:
+            self.bets = {}
+            self.engine.new_round()
+            self.deadline = time.time() + self.betting_seconds
+            event = {"event": "round_started", "round": self.engine.round_id,
+                     "deadline": self.deadline, "betting_seconds": self.betting_seconds}
+        return self.publish(event)
+
+    def resolve_round(self):
+        """封盘、开奖一次、批量结算全部玩家，余额与历史记录各写一次"""
+        with self._lock:
+            engine = self.engine
+            book = self.book
+            refunds = {}
+            for player, bets in list(self.bets.items()):
+                try:
+                    engine.validate_round(bets)
+                except EngineError as e:
+                    refunds[player] = {"amount": engine.staked(bets), "reason": str(e)}
+                    del self.bets[player]
+                    if book:
+                        book.credit(player, refunds[player]["amount"])
+                else:
+                    engine.lock_bets(bets)
+
+            outcome = engine.act(engine.ROUND_ACTION)[0].data
+            results = {}
+            for player, bets in self.bets.items():
+                if not bets:
+                    continue
+                payouts = engine.payouts_for(bets)
+                payout = sum(payouts.values())
+                staked = engine.staked(bets)
+                if book:
+                    book.credit(player, payout)
+                results[player] = {"staked": staked, "payout": payout, "payouts": payouts,
+                                   "net": payout - staked,
+                                   "balance": book.balances[player] if book else None}
+            engine.settle()
+            if book:
+                book.commit()
+                for player, result in results.items():
+                    result["balance"] = book.balances[player]
+                for player in list(self.bets):
+                    if player not in self.players:
+                        book.release(player)
+            if self.history:
+                self.history(outcome, self.bets, results)
+            self.deadline = None
+            event = {"event": "round_result", "round": engine.round_id, "outcome": outcome,
+                     "results": results, "refunds": refunds}
+        return self.publish(event)
+
+    # ------------------- 时钟 -------------------
+    def run(self):
+        """阻塞运行回合时钟；没有玩家时不开局"""
+        while not self._stop.is_set():
+            with self._lock:
+                if not self.players:
+                    self._wake.clear()
+            if not self._wake.is_set():
+                self._wake.wait(1.0)
+                continue
+            self.open_round()
+            if self._stop.wait(max(0.0, self.deadline - time.time())):
+                break
+            self.resolve_round()
+            self._stop.wait(self.result_seconds)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name=f"table-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+# ======================================================================
+# 各游戏的共享桌配置
+# ======================================================================
+def _roulette_history(module_name):
+    module = importlib.import_module(f"Casino_Games.{module_name}")
+    history = module.RouletteHistory(module.roulette_log_path())
+    return lambda outcome, bets, results: history.add_result(outcome["result"])
+
+
+def _big_six_history():
+    module = importlib.import_module("Casino_Games.Big_Six_Wheel")
+    history = module.BigSixHistory(module.big_six_log_path())
+
+    def write(outcome, bets, results):
+        snapshot = {}
+        for player_bets in bets.values():
+            for symbol, amount in player_bets.items():
+                snapshot[symbol] = snapshot.get(symbol, 0) + amount
+        history.add_result(result=outcome["result"], bet_snapshot=snapshot,
+                           payout=sum(r["payout"] for r in results.values()),
+                           wheel_index=outcome["index"] + 1)
+    return write
+
+
+# 结果停留时间要覆盖窗口里的转轮动画（最长约 11 秒）再加上原来的结果展示时间
+TABLE_GAMES = {
+    "roulette_eu": {"port": 8811, "betting_seconds": 30, "result_seconds": 18,
+                    "history": lambda: _roulette_history("Roulette_Europe")},
+    "roulette_us": {"port": 8812, "betting_seconds": 30, "result_seconds": 18,
+                    "history": lambda: _roulette_history("Roulette_American")},
+    "bigsix": {"port": 8813, "betting_seconds": 20, "result_seconds": 14, "history": _big_six_history},
+    "sicbo": {"port": 8814, "betting_seconds": 20, "result_seconds": 8, "history": None},
+    "bacbo": {"port": 8815, "betting_seconds": 20, "result_seconds": 8, "history": None},
+}
+
+
+def create_table(game, betting_seconds=None, result_seconds=None, book=None, history=True):
+    config = TABLE_GAMES[game]
+    if project_root() not in sys.path:
+        sys.path.append(project_root())
+    writer = config["history"]() if history and config["history"] else None
+    return SharedTable(
+        create(game),
+        config["betting_seconds"] if betting_seconds is None else betting_seconds,
+        config["result_seconds"] if result_seconds is None else result_seconds,
+        book=book if book is not None else BalanceBook(),
+        history=writer,
+        name=game,
+    )
+
+
+# ======================================================================
+# 本地 socket
+# ======================================================================
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+class TableHost(socketserver.ThreadingTCPServer):
+    """把一张 SharedTable 暴露在本地 TCP 端口上
+
+    客户端 -> 牌桌: {"op": "join", "player": ..., "balance": ...} / "bet" / "clear" / "leave"
+    牌桌 -> 客户端: 回复 {"reply": {...}} 与牌桌事件
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, table, port, idle_exit=None):
+        self.table = table
+        self.idle_exit = idle_exit
+        self.connections = 0
+        self.idle_since = time.monotonic()
+        self._guest_ids = itertools.count(1)
+        self._count_lock = threading.Lock()
+        super().__init__(("127.0.0.1", port), TableConnection)
+
+    def service_actions(self):
+        # serve_forever 每轮调用：长时间没有任何窗口连接时退出
+        if self.idle_exit and not self.connections and time.monotonic() - self.idle_since > self.idle_exit:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def guest_name(self):
+        return f"Guest-{next(self._guest_ids)}"
+
+    def connection_changed(self, delta):
+        with self._count_lock:
+            self.connections += delta
+            self.idle_since = time.monotonic()
+
+
+class TableConnection(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # 回复和事件都经发送队列由单独线程写出；队列满说明窗口卡住了，直接断开
+        self.outbox = queue.Queue(SEND_QUEUE_LIMIT)
+        self.sender = threading.Thread(target=self._send_loop, daemon=True)
+        self.sender.start()
+        self.server.connection_changed(1)
+
+    def _send_loop(self):
+        try:
+            while True:
+                data = self.outbox.get()
+                if data is None:
+                    break
+                self.request.sendall(data)
+        except OSError:
+            pass
+
+    def send(self, message):
+        try:
+            self.outbox.put_nowait(_encode(message))
+        except queue.Full:
+            try:
+                self.request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def handle(self):
+        table = self.server.table
+        unsubscribe = None
+        players = set()
+        try:
+            for line in self.rfile:
+                msg = json.loads(line)
+                op = msg.get("op")
+                try:
+                    if op == "join":
+                        player = msg.get("player") or "Guest"
+                        if player == "Guest":
+                            player = self.server.guest_name()
+                        balance = table.join(player, msg.get("balance"))
+                        players.add(player)
+                        reply = {"player": player, "balance": balance, **table.snapshot()}
+                        if unsubscribe is None:
+                            unsubscribe = table.subscribe(self.send)
+                    elif op == "bet":
+                        reply = table.place_bet(msg["player"], msg["spot"], msg["amount"])
+                    elif op == "clear":
+                        reply = table.clear_bets(msg["player"], msg.get("spot"))
+                    elif op == "leave":
+                        table.leave(msg["player"])
+                        players.discard(msg["player"])
+                        reply = {}
+                    else:
+                        raise EngineError(f"未知操作: {op}")
+                    reply["ok"] = True
+                except (EngineError, KeyError, TypeError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                self.send({"reply": reply})
+        except (OSError, ValueError):
+            pass
+        finally:
+            if unsubscribe is not None:
+                unsubscribe()
+            for player in players:
+                table.leave(player)
+            try:
+                self.outbox.put_nowait(None)
+            except queue.Full:
+                pass
+            self.server.connection_changed(-1)
+
+
+class RemoteTable:
+    """连接到 TableHost 的牌桌，接口与 SharedTable 相同（join / place_bet / clear_bets / subscribe）"""
+    def __init__(self, port, timeout=1.0):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+        self.sock.settimeout(None)
+        self.rfile = self.sock.makefile('rb')
+        self.replies = queue.Queue()
+        self.request_lock = threading.Lock()
+        self._subscribers = []
+        self.closed = False
+        threading.Thread(target=self._read_loop, name="remote-table", daemon=True).start()
+
+    def _read_loop(self):
+        try:
+            for line in self.rfile:
+                msg = json.loads(line)
+                if "reply" in msg:
+                    self.replies.put(msg["reply"])
+                else:
+                    for callback in list(self._subscribers):
+                        callback(msg)
+        except (OSError, ValueError):
+            pass
+        self.closed = True
+        self.replies.put({"ok": False, "error": "与牌桌的连接已断开"})
+        for callback in list(self._subscribers):
+            callback({"event": "disconnected"})
+
+    def _request(self, message):
+        with self.request_lock:
+            if self.closed:
+                raise EngineError("与牌桌的连接已断开")
+            self.sock.sendall(_encode(message))
+            reply = self.replies.get()
+        if not reply.pop("ok", False):
+            raise EngineError(reply.get("error", "牌桌拒绝了请求"))
+        return reply
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def join(self, player, balance=None):
+        """返回 {player（Guest 会分配唯一名称）, balance, round, phase, deadline, ...}"""
+        return self._request({"op": "join", "player": player, "balance": balance})
+
+    def leave(self, player):
+        if not self.closed:
+            self._request({"op": "leave", "player": player})
+
+    def place_bet(self, player, spot, amount):
+        return self._request({"op": "bet", "player": player, "spot": spot, "amount": amount})
+
+    def clear_bets(self, player, spot=None):
+        return self._request({"op": "clear", "player": player, "spot": spot})
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def spawn_host(game):
+    """在后台启动一张共享桌（与当前窗口的生命周期无关）"""
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs["start_new_session"] = True
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), game], **kwargs)
+
+
+def connect(game):
+    """连接 game 的共享桌，没有正在运行的桌时先在后台启动一个"""
+    port = TABLE_GAMES[game]["port"]
+    try:
+        return RemoteTable(port)
+    except OSError:
+        pass
+    spawn_host(game)
+    give_up = time.monotonic() + CONNECT_TIMEOUT
+    while True:
+        time.sleep(0.1)
+        try:
+            return RemoteTable(port)
+        except OSError:
+            if time.monotonic() > give_up:
+                raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行一张共享牌桌")
+    parser.add_argument("game", choices=sorted(TABLE_GAMES))
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--betting-seconds", type=float, default=None)
+    parser.add_argument("--result-seconds", type=float, default=None)
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT_SECONDS,
+                        help="没有窗口连接多少秒后退出（0 为不退出）")
+    parser.add_argument("--record", default=None,
+                        help="把种子与每局结果记录到该文件（可用 session_recorder.py replay 回放）")
+    args = parser.parse_args()
+
+    table = create_table(args.game, args.betting_seconds, args.result_seconds)
+    recorder = None
+    if args.record:
+        from session_recorder import SessionRecorder
+        recorder = SessionRecorder(table.engine, args.record)
+    table.start()
+    port = TABLE_GAMES[args.game]["port"] if args.port is None else args.port
+    try:
+        with TableHost(table, port, idle_exit=args.idle_exit) as host:
+            print(f"共享牌桌 {args.game} 已启动: 127.0.0.1:{port}", flush=True)
+            host.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        table.stop()
+        if recorder is not None:
+            recorder.close()
+
+
+if __name__ == "__main__":
+    main()
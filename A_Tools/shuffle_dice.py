@@ -1,115 +1,15 @@
-import os
-import hashlib
-import time
-import math
-import secrets
+import random_stream
 
-class QuantumEntropySource:
-    """量子熵源收集器 - 多源熵混合"""
-    def __init__(self):
-        self.entropy_pool = bytearray()
-        
-    def collect(self):
-        """从多个系统源收集熵"""
-        # 1. 系统随机源
-        self._add(os.urandom(64))
-        
-        # 2. 时间抖动熵
-        self._collect_time_jitter()
-        
-        # 3. 内存访问延迟
-        self._collect_mem_latency()
-        
-        # 4. 进程/线程ID混合
-        self._add(os.getpid().to_bytes(4, 'big'))
-        self._add(os.getppid().to_bytes(4, 'big'))
-        
-        # 5. 系统时间信息
-        self._add(time.time_ns().to_bytes(8, 'big'))
-        self._add(time.perf_counter_ns().to_bytes(8, 'big'))
-        
-        # 6. 使用SHA3-512进行熵提取
-        return hashlib.sha3_512(self.entropy_pool).digest()
-    
-    def _add(self, data):
-        """添加熵到池中"""
-        self.entropy_pool.extend(data)
-        # 添加当前时间纳秒级精度
-        self.entropy_pool.extend(time.time_ns().to_bytes(8, 'big'))
-    
-    def _collect_time_jitter(self):
-        """测量时间抖动熵"""
-        delays = bytearray()
-        for _ in range(1000):
-            start = time.perf_counter_ns()
-            # 执行一些计算密集型操作
-            _ = sum(math.sin(i) for i in range(100))
-            end = time.perf_counter_ns()
-            delays.extend((end - start).to_bytes(8, 'big'))
-        self._add(delays)
-    
-    def _collect_mem_latency(self):
-        """测量内存访问延迟"""
-        # 创建一个大数组 (模拟DRAM)
-        arr_size = 1024 * 1024  # 1MB
-        arr = bytearray(arr_size)
-        
-        # 用随机数据填充
-        for i in range(arr_size):
-            arr[i] = (i * 997) & 0xFF  # 伪随机填充
-        
-        # 随机访问内存位置
-        delays = bytearray()
-        for _ in range(1000):
-            idx = secrets.randbelow(arr_size)
-            start = time.perf_counter_ns()
-            _ = arr[idx]  # 读取操作
-            end = time.perf_counter_ns()
-            delays.extend((end - start).to_bytes(8, 'big'))
-        
-        self._add(delays)
-
-class ChaosSystem:
-    """混沌系统 - 增加不可预测性"""
-    def __init__(self, seed):
-        # 使用双精度浮点数范围初始化混沌系统
-        self.x = float(int.from_bytes(seed[:8], 'big')) / 2**64
-        self.r = 3.9 + (int.from_bytes(seed[8:16], 'big') % 100) / 1000.0
-    
-    def next(self):
-        """生成下一个混沌值 (Logistic Map)"""
-        self.x = self.r * self.x * (1.0 - self.x)
-        return self.x
-    
-    def random_bytes(self, length):
-        """生成随机字节序列"""
-        result = bytearray()
-        while len(result) < length:
-            chaos_val = self.next()
-            # 提取混沌值的8个字节
-            int_val = int(chaos_val * 2**64)
-            result.extend(int_val.to_bytes(8, 'big'))
-        return bytes(result[:length])
-    
-    def randint(self, min_val, max_val):
-        """生成指定范围内的随机整数"""
-        range_size = max_val - min_val + 1
-        chaos_val = self.next()
-        return min_val + int(chaos_val * range_size)
 
 class TrueRandomGenerator:
-    """真随机数生成器"""
-    def __init__(self):
-        # 初始化量子熵源
-        entropy_source = QuantumEntropySource()
-        entropy = entropy_source.collect()
-        
-        # 初始化混沌系统
-        self.chaos_system = ChaosSystem(entropy)
-    
+    """真随机数生成器：取自缓冲的密码学随机流（random_stream），拒绝采样保证均匀
+
+    原来的 Logistic Map 取整 min + int(x * range) 分布不均（6 点约 30%、4 点约 12%），
+    已不再使用；可复现模式（CASINO_SEED）下随机流由 rng_provider 换上固定密钥。
+    """
     def randint(self, min_val, max_val):
-        """生成真随机整数"""
-        return self.chaos_system.randint(min_val, max_val)
+        """生成 [min_val, max_val] 内的均匀随机整数"""
+        return random_stream.randint(min_val, max_val)
 
 class Dice:
     _true_random_generator = None
@@ -118,7 +18,8 @@ class Dice:
     def __init__(self, value=None):
         # 创建共享的真随机数生成器实例
         if Dice._true_random_generator is None:
-            self.true_random_generator = TrueRandomGenerator()
+            Dice._true_random_generator = TrueRandomGenerator()
+        self.true_random_generator = Dice._true_random_generator
         
         # 初始值
         if value:
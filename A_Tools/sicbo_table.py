@@ -0,0 +1,124 @@
+"""骰宝结算表
+
+导入时预先计算全部 216 种骰子结果 × 所有注项的返还倍数（含本金），
+开/关围骰两种模式各一张表。结算只需取出开出结果对应的一行，
+与下注向量做点积；同一张表也直接给出每个注项的精确返还率和庄家优势。
+
+注项与 SicboGame.bets 的结构一一对应：
+    ("small", None)、("double", 3)、("total_points", 10)、("pairs", "1&2")、("number_group", "1234") ...
+"""
+from itertools import product
+
+TOTAL_ODDS = {4: 62, 5: 31, 6: 18, 7: 12, 8: 8, 9: 7, 10: 6, 11: 6, 12: 7, 13: 8, 14: 12, 15: 18, 16: 31, 17: 62}
+PAIR_KEYS = [f"{i}&{j}" for i in range(1, 7) for j in range(i + 1, 7)]
+NUMBER_GROUPS = ["1234", "2345", "2356", "3456"]
+
+BET_KEYS = (
+    [("small", None), ("big", None), ("odd", None), ("even", None), ("all_triples", None)]
+    + [("double", i) for i in range(1, 7)]
+    + [("total_points", i) for i in range(4, 18)]
+    + [("pairs", p) for p in PAIR_KEYS]
+    + [("triple", i) for i in range(1, 7)]
+    + [("guess_num", i) for i in range(1, 7)]
+    + [("number_group", g) for g in NUMBER_GROUPS]
+)
+BET_INDEX = {key: k for k, key in enumerate(BET_KEYS)}
+
+OUTCOMES = list(product(range(1, 7), repeat=3))
+
+
+def outcome_index(dice):
+    d1, d2, d3 = dice
+    return (d1 - 1) * 36 + (d2 - 1) * 6 + (d3 - 1)
+
+
+def bet_return(bet_type, param, dice, triple_mode):
+    """单个注项每 1 单位下注的返还（含本金），与 SicboGame.calculate_results 的规则一致"""
+    total = sum(dice)
+    is_triple = dice[0] == dice[1] == dice[2]
+    # 开围骰模式下大小单双包含围骰，赔率 0.92:1
+    size_return = 1.92 if triple_mode else 2
+    even_money_blocked = is_triple and not triple_mode
+
+    if bet_type == "small":
+        low = 3 if triple_mode else 4
+        return size_return if low <= total <= 10 and not even_money_blocked else 0
+    if bet_type == "big":
+        high = 18 if triple_mode else 17
+        return size_return if 11 <= total <= high and not even_money_blocked else 0
+    if bet_type == "odd":
+        return size_return if total % 2 == 1 and not even_money_blocked else 0
+    if bet_type == "even":
+        return size_return if total % 2 == 0 and not even_money_blocked else 0
+    if bet_type == "all_triples":
+        return 32 if is_triple else 0
+    if bet_type == "double":
+        return 12 if dice.count(param) >= 2 else 0
+    if bet_type == "total_points":
+        return TOTAL_ODDS[param] + 1 if total == param else 0
+    if bet_type == "pairs":
+        a, b = map(int, param.split('&'))
+        return 7 if dice.count(a) >= 1 and dice.count(b) >= 1 else 0
+    if bet_type == "triple":
+        return 191 if dice.count(param) == 3 else 0
+    if bet_type == "guess_num":
+        return (0, 2, 3, 13)[dice.count(param)]
+    if bet_type == "number_group":
+        group = set(int(x) for x in param)
+        return 8 if len(set(dice)) == 3 and set(dice).issubset(group) else 0
+    raise ValueError(f"未知注项: {bet_type}")
+
+
+def _build_table(triple_mode):
+    return [
+        tuple(bet_return(bet_type, param, dice, triple_mode) for bet_type, param in BET_KEYS)
+        for dice in OUTCOMES
+    ]
+
+
+# PAYOUT_TABLE[triple_mode][outcome_index(dice)][BET_INDEX[key]]
+PAYOUT_TABLE = {False: _build_table(False), True: _build_table(True)}
+
+# 每个注项每 1 单位下注的期望返还
+EXPECTED_RETURN = {
+    mode: tuple(sum(row[k] for row in table) / len(OUTCOMES) for k in range(len(BET_KEYS)))
+    for mode, table in PAYOUT_TABLE.items()
+}
+
+
+def bet_vector(bets):
+    """把 SicboGame.bets 结构展开为 [(注项序号, 金额)]（只含非零项）"""
+    vector = []
+    for bet_type, data in bets.items():
+        if isinstance(data, dict):
+            for param, amount in data.items():
+                if amount:
+                    vector.append((BET_INDEX[(bet_type, param)], amount))
+        elif data:
+            vector.append((BET_INDEX[(bet_type, None)], data))
+    return vector
+
+
+def settle(bets, dice, triple_mode=False):
+    """返回本局总返还（含本金）"""
+    row = PAYOUT_TABLE[triple_mode][outcome_index(dice)]
+    return sum(row[k] * amount for k, amount in bet_vector(bets))
+
+
+def expected_return(bets, triple_mode=False):
+    """当前下注的期望返还（含本金）"""
+    expected = EXPECTED_RETURN[triple_mode]
+    return sum(expected[k] * amount for k, amount in bet_vector(bets))
+
+
+def house_edge(triple_mode=False):
+    """{注项: 庄家优势}"""
+    return {key: 1 - r for key, r in zip(BET_KEYS, EXPECTED_RETURN[triple_mode])}
+
+
+if __name__ == "__main__":
+    for mode in (False, True):
+        print(f"== 围骰模式{'开' if mode else '关'}")
+        for (bet_type, param), edge in house_edge(mode).items():
+            name = bet_type if param is None else f"{bet_type}[{param}]"
+            print(f"  {name:<22}{edge:+.4%}")
@@ -0,0 +1,205 @@
+"""Tk 主线程卡顿检测
+
+洗牌子进程（Deck.__init__ 里 subprocess.run 最多等 30 秒）、整个存档 JSON 重写、
+play_shuffle_animation 等同步操作都在 Tk 回调里执行，期间整个窗口无响应。
+这里用 Tcl 定时器心跳测主线程的延迟：后台线程发现心跳超过阈值没有更新时，用
+sys._current_frames() 反复采样主线程的调用栈，心跳恢复后把这次卡顿（时长、
+采样到的调用栈）追加写入 A_Logs/stalls.jsonl，便于长时间挂机测试后排查。
+心跳用 tk.createtimerhandler 而不是 after()：不少游戏重置时会批量取消 after info
+中的全部任务，after 心跳会被一起取消，之后的卡顿就再也检测不到。
+
+默认关闭；设置环境变量 CASINO_WATCHDOG=1（或直接给阈值毫秒数，如 CASINO_WATCHDOG=400）
+启用，阈值默认 250 ms；CASINO_WATCHDOG_FILE 可改报告路径。
+
+    with stall_watchdog.watch_windows("Baccarat"):   # 期间任何 tk.Tk 窗口进入 mainloop 都会被监视
+        balance = Baccarat.main(balance, user)
+
+    stall_watchdog.attach(window)                    # 或者直接监视某个窗口
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+import metrics
+
+DEFAULT_THRESHOLD_MS = 250
+HEARTBEAT_MS = 50
+MAX_STACK_DEPTH = 30      # 报告里每个调用栈保留的最内层帧数
+MAX_STACKS = 3            # 每次卡顿保留出现次数最多的几个调用栈
+
+
+def _configured_threshold():
+    value = os.environ.get("CASINO_WATCHDOG", "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    try:
+        ms = float(value)
+    except ValueError:
+        return DEFAULT_THRESHOLD_MS
+    return ms if ms > 1 else DEFAULT_THRESHOLD_MS
+
+
+THRESHOLD_MS = _configured_threshold()
+ENABLED = THRESHOLD_MS is not None
+
+
+def stalls_path():
+    custom = os.environ.get("CASINO_WATCHDOG_FILE")
+    if custom:
+        return custom
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(root, "A_Logs", "stalls.jsonl")
+
+
+def _format_stack(frame):
+    """帧 -> ["文件:行号 函数", ...]（由外到内，只保留最内层 MAX_STACK_DEPTH 帧）"""
+    entries = traceback.extract_stack(frame)[-MAX_STACK_DEPTH:]
+    return [f"{os.path.basename(e.filename)}:{e.lineno} {e.name}" for e in entries]
+
+
+def _culprit(stack):
+    """最内层的非 tkinter / 标准库帧，作为报告的一行摘要"""
+    for line in reversed(stack):
+        if not line.startswith(("__init__.py:", "threading.py:", "subprocess.py:", "selectors.py:")):
+            return line
+    return stack[-1] if stack else "?"
+
+
+class StallWatchdog:
+    """监视一个 Tk 窗口的主线程；start() 必须在主线程调用"""
+    def __init__(self, window, game=None, threshold_ms=None, path=None):
+        self.window = window
+        self.game = game or metrics.game_name(type(window).__module__)
+        self.threshold = (threshold_ms or THRESHOLD_MS or DEFAULT_THRESHOLD_MS) / 1000.0
+        self.sample_interval = max(0.01, self.threshold / 5)
+        self.path = path or stalls_path()
+        self.stalls = []            # 已写出的报告摘要 (时长 ms, 摘要行)
+        self._main_ident = None
+        self._last_beat = None
+        self._finished = []         # 心跳发现的已结束卡顿 (开始, 结束)，由监视线程取走
+        self._samples = Counter()
+        self._stop = threading.Event()
+        self._job = None
+        self._thread = None
+        self.dead = False           # 心跳无法继续（之后的卡顿检测不到）
+
+    def start(self):
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._job = self.window.tk.createtimerhandler(HEARTBEAT_MS, self._beat)
+        self._thread = threading.Thread(target=self._watch, name="tk-stall-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._job is not None:
+            self._job.deletetimerhandler()
+            self._job = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _beat(self):
+        now = time.perf_counter()
+        if now - self._last_beat > self.threshold + HEARTBEAT_MS / 1000.0:
+            self._finished.append((self._last_beat, now))
+        self._last_beat = now
+        try:
+            self._job = self.window.tk.createtimerhandler(HEARTBEAT_MS, self._beat)
+        except (tk.TclError, RuntimeError):
+            self._job = None
+            if not self._stop.is_set():
+                self.dead = True
+
+    def _watch(self):
+        limit = self.threshold + HEARTBEAT_MS / 1000.0
+        while not self._stop.wait(self.sample_interval):
+            lag = time.perf_counter() - self._last_beat
+            if lag > limit:
+                frame = sys._current_frames().get(self._main_ident)
+                if frame is not None:
+                    self._samples[tuple(_format_stack(frame))] += 1
+            elif self._finished:
+                while self._finished:
+                    self._report(*self._finished.pop(0))
+            else:
+                self._samples.clear()
+
+    def _report(self, start, end):
+        """写出一次卡顿；心跳间隔本身不算在卡顿时长里"""
+        duration_ms = (end - start) * 1000.0 - HEARTBEAT_MS
+        samples, self._samples = self._samples, Counter()
+        stacks = [{"samples": n, "stack": list(stack)} for stack, n in samples.most_common(MAX_STACKS)]
+        culprit = _culprit(stacks[0]["stack"]) if stacks else "（卡顿期间未采样到调用栈）"
+        report = {
+            "game": self.game, "pid": os.getpid(),
+            "time": time.time() - (time.perf_counter() - start),
+            "duration_ms": round(duration_ms, 1), "threshold_ms": self.threshold * 1000.0,
+            "samples": sum(samples.values()), "culprit": culprit, "stacks": stacks,
+        }
+        self.stalls.append((duration_ms, culprit))
+        if metrics.ENABLED:
+            metrics.registry.record(self.game, "stall", int(duration_ms * 1e6))
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"写入卡顿报告失败: {e}", file=sys.stderr)
+        print(f"[watchdog] {self.game} 主线程卡顿 {duration_ms:.0f} ms: {culprit}", file=sys.stderr)
+
+    def summary(self):
+        note = "；心跳中途停止，之后的卡顿未检测" if self.dead else ""
+        if not self.stalls:
+            return f"[watchdog] {self.game}: 没有超过 {self.threshold * 1000:.0f} ms 的卡顿{note}"
+        worst, culprit = max(self.stalls)
+        return f"[watchdog] {self.game}: 卡顿 {len(self.stalls)} 次，最长 {worst:.0f} ms（{culprit}）{note}"
+
+
+def attach(window, game=None, threshold_ms=None):
+    """监视 window 直到它被销毁；未启用且没有指定阈值时什么都不做"""
+    if not ENABLED and threshold_ms is None:
+        return None
+    dog = StallWatchdog(window, game, threshold_ms).start()
+
+    def on_destroy(event):
+        if event.widget is window:
+            dog.stop()
+            print(dog.summary(), file=sys.stderr)
+
+    window.bind("<Destroy>", on_destroy, add="+")
+    return dog
+
+
+@contextmanager
+def watch_windows(game=None, threshold_ms=None):
+    """期间任何 tk.Tk 窗口调用 mainloop() 时都挂上看门狗（用于 casino_games 启动游戏）"""
+    if not ENABLED and threshold_ms is None:
+        yield
+        return
+    had_own = "mainloop" in tk.Tk.__dict__
+    original = tk.Tk.mainloop
+
+    def mainloop(self, n=0):
+        dog = StallWatchdog(self, game, threshold_ms).start()
+        try:
+            return original(self, n)
+        finally:
+            dog.stop()
+            print(dog.summary(), file=sys.stderr)
+
+    tk.Tk.mainloop = mainloop
+    try:
+        yield
+    finally:
+        if had_own:
+            tk.Tk.mainloop = original
+        else:
+            del tk.Tk.mainloop
@@ -0,0 +1,194 @@
+"""终端菜单渲染
+
+菜单原来每次按方向键都执行 os.system('clear') 再整屏 print，每次按键都要启动一个
+shell 和 clear 程序。这里改为在进程内用 ANSI 光标控制原地重绘：只改写与上一帧
+不同的行，一次 write + flush 输出。
+
+- display_width / pad_cell  按字符串缓存的显示宽度与定宽格式化
+- GridMenu                  分类网格菜单，布局（标题线、定宽单元格）只计算一次
+- Screen                    差分重绘；记录按键到重绘完成的延迟
+
+其他代码直接 print 过内容（进入游戏、输入密码等）后要调用 invalidate()，
+下一帧会整屏重画。
+"""
+import os
+import sys
+import time
+import unicodedata
+from collections import deque
+from functools import lru_cache
+
+CLEAR_SCREEN = "\033[2J\033[H"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+HIGHLIGHT = "\033[7m"
+RESET = "\033[0m"
+
+_vt_enabled = False
+
+
+def enable_ansi():
+    """Windows 控制台默认不解析 ANSI 转义序列，执行一次空命令即可开启"""
+    global _vt_enabled
+    if os.name == 'nt' and not _vt_enabled:
+        os.system('')
+    _vt_enabled = True
+
+
+@lru_cache(maxsize=4096)
+def display_width(s):
+    """终端显示宽度：全角/宽字符占 2 列，其余占 1 列"""
+    width = 0
+    for ch in s:
+        width += 2 if unicodedata.east_asian_width(ch) in ('F', 'W') else 1
+    return width
+
+
+@lru_cache(maxsize=4096)
+def pad_cell(name, width, highlight=False):
+    """将文字格式化为固定显示宽度，左对齐，可选高亮（反色）"""
+    padding = ' ' * max(0, width - display_width(name))
+    if highlight:
+        return f"{HIGHLIGHT}{name}{RESET}{padding}"
+    return name + padding
+
+
+def center_title(title, total_width, fill='='):
+    title_width = display_width(title)
+    left = max(0, (total_width - title_width) // 2)
+    right = max(0, total_width - title_width - left)
+    return fill * left + title + fill * right
+
+
+class GridMenu:
+    """分类网格菜单
+
+    sections 为 [(分类标题, [[游戏名, ...], ...]), ...]；
+    uniform_titles 为 True 时所有分类标题线等宽（取最宽分类），否则按各分类自身宽度。
+    """
+    def __init__(self, header, sections, fixed_width, interval=2, uniform_titles=True):
+        self.header = list(header)
+        self.fixed_width = fixed_width
+        self.separator = ' ' * interval
+        sections = [(title, rows) for title, rows in sections if rows]
+
+        def section_width(rows):
+            cols = max(len(row) for row in rows)
+            return cols * fixed_width + (cols - 1) * interval
+
+        global_width = max(section_width(rows) for _, rows in sections)
+
+        # 每一帧都相同的部分只算一次：标题线、各行未高亮的单元格
+        self.blocks = []
+        self.rows = []
+        for title, rows in sections:
+            cols = max(len(row) for row in rows)
+            width = global_width if uniform_titles else section_width(rows)
+            row_ids = []
+            for row in rows:
+                names = list(row) + [""] * (cols - len(row))
+                cells = [pad_cell(name, fixed_width) for name in names]
+                row_ids.append(len(self.rows))
+                self.rows.append((names, cells, self.separator.join(cells)))
+            self.blocks.append((center_title(title, width), row_ids))
+
+    def row_line(self, row_index, selected_col=None):
+        names, cells, plain = self.rows[row_index]
+        if selected_col is None or selected_col >= len(names) or not names[selected_col]:
+            return plain
+        cells = list(cells)
+        cells[selected_col] = pad_cell(names[selected_col], self.fixed_width, True)
+        return self.separator.join(cells)
+
+    def lines(self, selected_row, selected_col):
+        out = list(self.header)
+        for title_line, row_ids in self.blocks:
+            out.append(title_line)
+            for r in row_ids:
+                out.append(self.row_line(r, selected_col if r == selected_row else None))
+            out.append("")
+        return out
+
+
+class Screen:
+    """原地差分重绘的终端屏幕"""
+    def __init__(self, stream=None, history=256):
+        self.stream = stream
+        self.previous = None
+        self.latencies = deque(maxlen=history)
+        self._input_time = None
+        enable_ansi()
+
+    def invalidate(self):
+        """屏幕已被其他输出改变，下一帧整屏重画"""
+        self.previous = None
+
+    def mark_input(self):
+        """记录按键时刻，render 完成时据此计算按键到重绘的延迟"""
+        self._input_time = time.perf_counter()
+
+    def render(self, lines):
+        stream = self.stream or sys.stdout
+        lines = list(lines)
+        previous = self.previous
+        if previous == lines:
+            # 画面没变（例如按到菜单边界外的键）时什么都不输出
+            out = None
+        elif previous is None:
+            out = [CLEAR_SCREEN, "\n".join(lines), "\n"]
+        else:
+            out = []
+            for i, line in enumerate(lines):
+                if i >= len(previous) or previous[i] != line:
+                    out.append(f"\033[{i + 1};1H{line}{CLEAR_LINE}")
+            if len(lines) < len(previous):
+                out.append(f"\033[{len(lines) + 1};1H{CLEAR_BELOW}")
+            # 光标停在菜单下方，后续 print/input 不会覆盖菜单
+            out.append(f"\033[{len(lines) + 1};1H")
+        if out is not None:
+            stream.write("".join(out))
+            stream.flush()
+            self.previous = lines
+
+        if self._input_time is not None:
+            self.latencies.append(time.perf_counter() - self._input_time)
+            self._input_time = None
+
+    def latency_summary(self):
+        """(次数, 平均毫秒, 最大毫秒)"""
+        if not self.latencies:
+            return 0, 0.0, 0.0
+        values = list(self.latencies)
+        return len(values), sum(values) / len(values) * 1000, max(values) * 1000
+
+
+# 各菜单共用同一个屏幕，切换菜单时先 invalidate
+screen = Screen()
+
+
+def clear():
+    """替代 os.system('clear')：清屏并让下一帧整屏重画"""
+    stream = screen.stream or sys.stdout
+    stream.write(CLEAR_SCREEN)
+    stream.flush()
+    screen.invalidate()
+
+
+if __name__ == "__main__":
+    # 测量按键到重绘的延迟：在内存流上模拟 1000 次方向键移动
+    import io
+
+    sections = [
+        ("扑克", [["三张牌扑克", "视频扑克", "加勒比梭哈扑克", "月亮梭哈扑克"]] * 5),
+        ("21点", [["简单21点", "经典21点", "西班牙式21點", "豪赢21点"]] * 2),
+        ("骰子", [["花旗骰", "克朗代克", "骰宝", "骰子百家乐"]]),
+    ]
+    menu = GridMenu([" 欢迎来到赌场中心!", ""], sections, 14)
+    bench = Screen(stream=io.StringIO(), history=1000)
+    row = 0
+    for _ in range(1000):
+        bench.mark_input()
+        bench.render(menu.lines(row, 1))
+        row = (row + 1) % len(menu.rows)
+    count, mean_ms, max_ms = bench.latency_summary()
+    print(f"{count} 次重绘：平均 {mean_ms:.3f} 毫秒，最大 {max_ms:.3f} 毫秒")
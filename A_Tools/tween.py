@@ -0,0 +1,296 @@
+"""补间动画调度器
+
+设置环境变量 CASINO_FAST_ANIMATIONS=1 时所有窗口的补间在下一帧直接跳到终点
+（挂机测试、录屏时使用）；CASINO_METRICS=1 时每帧耗时记入 metrics，窗口关闭时
+输出帧数、掉帧数和每帧耗时。
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+import metrics
+
+DEFAULT_FPS = 50
+FAST_DEFAULT = os.environ.get("CASINO_FAST_ANIMATIONS", "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def placed_position(widget):
+    """读取控件当前 place 的坐标（不依赖几何计算是否已完成）"""
+    info = widget.place_info()
+    try:
+        return float(info.get('x', 0)), float(info.get('y', 0))
+    except ValueError:
+        return float(widget.winfo_x()), float(widget.winfo_y())
+
+
+class Tween:
+    """单个补间动画；step 返回 True 表示动画已结束
+
+    正常结束时调用 on_done；被取消或控件已销毁而中途丢弃时调用 on_cancel。
+    """
+    def __init__(self, widget=None, on_done=None, on_cancel=None):
+        self.widget = widget
+        self.on_done = on_done
+        self.on_cancel = on_cancel
+        self.done = False
+
+    def step(self, animator, dt):
+        raise NotImplementedError
+
+    def finish(self, animator):
+        """直接跳到终点（快速模式）"""
+        raise NotImplementedError
+
+
+class ApproachTween(Tween):
+    """每帧移动剩余距离的固定比例，直到距离小于阈值（原 after(20) 逼近动画）
+
+    比例按 50fps 定义；掉帧时按实际经过时间换算，速度与帧率无关。
+    """
+    def __init__(self, widget, target, factor=0.2, threshold=5, size=None, on_done=None, on_cancel=None):
+        super().__init__(widget, on_done, on_cancel)
+        self.target = target
+        self.factor = factor
+        self.threshold = threshold
+        self.size = size or {}
+        self.x, self.y = placed_position(widget)
+
+    def step(self, animator, dt):
+        tx, ty = self.target
+        dx = tx - self.x
+        dy = ty - self.y
+        if (dx * dx + dy * dy) ** 0.5 < self.threshold:
+            self.finish(animator)
+            return True
+        f = 1.0 - (1.0 - self.factor) ** (dt * DEFAULT_FPS)
+        self.x += dx * f
+        self.y += dy * f
+        animator.place(self.widget, x=self.x, y=self.y, **self.size)
+        return False
+
+    def finish(self, animator):
+        self.x, self.y = self.target
+        animator.place(self.widget, x=self.x, y=self.y, **self.size)
+
+
+class LinearTween(Tween):
+    """在 duration 秒内把一组控件的 x 坐标线性移动到目标位置"""
+    def __init__(self, moves, duration, on_done=None, on_cancel=None):
+        super().__init__(None, on_done, on_cancel)
+        # moves: {widget: (start_x, target_x)}
+        self.moves = moves
+        self.duration = max(duration, 1e-6)
+        self.elapsed = 0.0
+
+    def step(self, animator, dt):
+        self.elapsed += dt
+        t = min(1.0, self.elapsed / self.duration)
+        for widget, (start_x, target_x) in self.moves.items():
+            animator.place(widget, x=start_x + (target_x - start_x) * t)
+        return t >= 1.0
+
+    def finish(self, animator):
+        for widget, (_, target_x) in self.moves.items():
+            animator.place(widget, x=target_x)
+
+
+class FlashTween(Tween):
+    """duration 秒后把控件的配置恢复为 restore（高亮闪烁后恢复背景色等）；被取消时立即恢复"""
+    def __init__(self, widget, duration, restore, on_done=None):
+        super().__init__(widget, on_done, self._restore)
+        self.duration = duration
+        self.restore = restore
+        self.elapsed = 0.0
+
+    def _restore(self):
+        try:
+            self.widget.config(**self.restore)
+        except tk.TclError:
+            pass
+
+    def step(self, animator, dt):
+        self.elapsed += dt
+        if self.elapsed < self.duration:
+            return False
+        self.finish(animator)
+        return True
+
+    def finish(self, animator):
+        self.widget.config(**self.restore)
+
+
+class Animator:
+    """每个窗口一个的补间动画调度器
+
+    - 所有活动补间共用一个 after 定时器，每帧统一推进
+    - 同一帧内对同一控件的多次 place 合并为一次
+    - 快速模式（fast，默认取 CASINO_FAST_ANIMATIONS）下补间在下一帧直接跳到终点
+    - 记录帧数、掉帧数和每帧耗时
+    """
+    def __init__(self, root, fps=DEFAULT_FPS, fast=None):
+        self.root = root
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.fast = FAST_DEFAULT if fast is None else fast
+        self.game = metrics.game_name(type(root).__module__)
+
+        self._tweens = []
+        self._pending = {}
+        self._after_id = None
+        self._last = None
+
+        self.reset_stats()
+
+    @classmethod
+    def of(cls, widget):
+        """取得（或创建）控件所在窗口的调度器"""
+        top = widget.winfo_toplevel()
+        animator = getattr(top, '_animator', None)
+        if animator is None:
+            animator = cls(top)
+            top._animator = animator
+            if metrics.ENABLED:
+                top.bind("<Destroy>", animator._on_destroy, add="+")
+        return animator
+
+    # ------------------- 添加/取消 -------------------
+    def add(self, tween):
+        self._tweens.append(tween)
+        self._schedule()
+        return tween
+
+    def approach(self, widget, target, factor=0.2, threshold=5, size=None, on_done=None, on_cancel=None):
+        self.cancel(widget)
+        return self.add(ApproachTween(widget, target, factor, threshold, size, on_done, on_cancel))
+
+    def slide_x(self, moves, duration, on_done=None, on_cancel=None):
+        return self.add(LinearTween(moves, duration, on_done, on_cancel))
+
+    def flash(self, widget, duration, **restore):
+        """duration 秒后恢复控件配置，如 flash(label, 0.5, bg='white')"""
+        return self.add(FlashTween(widget, duration, restore))
+
+    def cancel(self, widget=None):
+        """取消某个控件的补间（widget 为 None 时取消全部），被丢弃的补间调用 on_cancel
+
+        没有剩余补间时同时取消帧定时器，之后新增的补间会重新安排定时器。
+        """
+        dropped = [t for t in self._tweens if widget is None or t.widget is widget]
+        for tween in dropped:
+            tween.done = True
+        self._tweens = [t for t in self._tweens if not t.done]
+        if not self._tweens and self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        for tween in dropped:
+            if tween.on_cancel:
+                tween.on_cancel()
+
+    def is_animating(self, widget=None):
+        if widget is None:
+            return bool(self._tweens)
+        return any(t.widget is widget for t in self._tweens)
+
+    # ------------------- 合并的控件更新 -------------------
+    def place(self, widget, **kwargs):
+        self._pending.setdefault(widget, {}).update(kwargs)
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for widget, kwargs in pending.items():
+            try:
+                widget.place(**kwargs)
+            except tk.TclError:
+                # 控件已被销毁
+                self.cancel(widget)
+
+    # ------------------- 帧循环 -------------------
+    def _schedule(self, delay=None):
+        if self._after_id is not None and self._after_id not in self.root.tk.splitlist(self.root.tk.call('after', 'info')):
+            # 帧定时器已在外部被取消（各游戏重置时批量取消 after info 中的任务）
+            self._after_id = None
+        if self._after_id is None:
+            if delay is None:
+                self._last = time.perf_counter()
+                delay = int(self.period * 1000)
+            self._after_id = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        now = time.perf_counter()
+        dt = now - self._last
+        self._last = now
+
+        skipped = int(dt / self.period) - 1
+        if skipped > 0:
+            self.dropped_frames += skipped
+
+        finished = []
+        dropped = []
+        for tween in list(self._tweens):
+            if tween.done:
+                continue
+            try:
+                if self.fast:
+                    tween.finish(self)
+                    ended = True
+                else:
+                    ended = tween.step(self, dt)
+            except tk.TclError:
+                # 控件已被销毁：丢弃该补间
+                tween.done = True
+                dropped.append(tween)
+                continue
+            if ended:
+                tween.done = True
+                finished.append(tween)
+        self._tweens = [t for t in self._tweens if not t.done]
+        self._flush()
+
+        # 回调在位置写入后执行，回调中新增的补间从下一帧开始
+        for tween in finished:
+            if tween.on_done:
+                tween.on_done()
+        for tween in dropped:
+            if tween.on_cancel:
+                tween.on_cancel()
+
+        cost = time.perf_counter() - now
+        self.frames += 1
+        self.total_cost += cost
+        self.max_cost = max(self.max_cost, cost)
+        if metrics.ENABLED:
+            metrics.registry.record(self.game, "tween.frame", int(cost * 1e9))
+
+        if self._tweens:
+            self._schedule(max(1, int((self.period - cost) * 1000)))
+
+    # ------------------- 统计 -------------------
+    def reset_stats(self):
+        self.frames = 0
+        self.dropped_frames = 0
+        self.total_cost = 0.0
+        self.max_cost = 0.0
+
+    def stats(self):
+        avg = self.total_cost / self.frames if self.frames else 0.0
+        return {
+            'frames': self.frames,
+            'dropped_frames': self.dropped_frames,
+            'avg_frame_ms': avg * 1000,
+            'max_frame_ms': self.max_cost * 1000,
+            'active_tweens': len(self._tweens),
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"[tween] {self.game}: {s['frames']} 帧，掉帧 {s['dropped_frames']}，"
+                f"每帧平均 {s['avg_frame_ms']:.2f} ms，最长 {s['max_frame_ms']:.2f} ms")
+
+    def _on_destroy(self, event):
+        if event.widget is self.root and self.frames:
+            print(self.summary(), file=sys.stderr)
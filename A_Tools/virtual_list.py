@@ -0,0 +1,167 @@
+import tkinter as tk
+
+_UNBOUND = object()
+
+
+class VirtualList:
+    """虚拟化列表
+
+    只保留固定数量的行控件（行池），行数按可见区域大小决定。
+    滚动或数据变化时只把数据重新绑定到已有的行上，不会销毁/重建控件；
+    内容未变化的行不会重新配置。
+
+    create_row(parent, index) -> row   创建一行控件并自行布局，返回任意行对象
+    bind_row(row, record)              把一条记录绑定到行上；record 为 None 表示空行
+    """
+    def __init__(self, body, create_row, bind_row, pool_size=None,
+                 row_height=None, scrollbar=None):
+        self.body = body
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.scrollbar = scrollbar
+
+        self.rows = []
+        self.visible = None         # 完整可见的行数（按可见高度自动决定行池时才有）
+        self._bound = []
+        self.data = []
+        self.offset = 0
+
+        if scrollbar is not None:
+            scrollbar.config(command=self.yview)
+        self._bind_wheel(body)
+
+        if pool_size is not None:
+            self.resize_pool(pool_size)
+        else:
+            # 按可见高度自动决定行池大小
+            self.resize_pool(1)
+            body.bind('<Configure>', self._on_configure, add='+')
+
+    # ------------------- 行池 -------------------
+    def resize_pool(self, size):
+        """扩充行池到 size 行（只增不减，多余的行绑定为空）"""
+        while len(self.rows) < size:
+            row = self.create_row(self.body, len(self.rows))
+            self.rows.append(row)
+            self._bound.append(_UNBOUND)
+            for widget in self._row_widgets(row):
+                self._bind_wheel(widget)
+        self.refresh()
+
+    def _row_widgets(self, row):
+        if isinstance(row, tk.Misc):
+            roots = [row]
+        elif isinstance(row, dict):
+            roots = [w for w in row.values() if isinstance(w, tk.Misc)]
+        else:
+            roots = []
+        stack = list(roots)
+        while stack:
+            widget = stack.pop()
+            yield widget
+            stack.extend(widget.winfo_children())
+
+    @staticmethod
+    def _row_root(row):
+        """行的最外层控件：行对象本身，或字典里的 'frame'（没有时取第一个控件）"""
+        if isinstance(row, tk.Misc):
+            return row
+        if isinstance(row, dict):
+            frame = row.get('frame')
+            if isinstance(frame, tk.Misc):
+                return frame
+            return next((w for w in row.values() if isinstance(w, tk.Misc)), None)
+        return None
+
+    def _on_configure(self, event):
+        if not self.rows:
+            return
+        row_height = self.row_height
+        if not row_height:
+            root = self._row_root(self.rows[0])
+            row_height = root.winfo_reqheight() if root is not None else 0
+        if row_height > 0:
+            self.visible = max(1, event.height // row_height)
+            needed = self.visible + 1   # 多一行给底部露出一半的行
+            if needed > len(self.rows):
+                self.resize_pool(needed)
+            self._clamp()
+            self.refresh()
+
+    def _page_rows(self):
+        """一屏完整可见的行数"""
+        if self.visible is None:
+            return len(self.rows)
+        return min(self.visible, len(self.rows))
+
+    # ------------------- 数据 -------------------
+    def set_data(self, data, offset=None):
+        """设置数据源（可索引序列）；offset 为 None 时保持当前滚动位置"""
+        self.data = data
+        if offset is not None:
+            self.offset = offset
+        self._clamp()
+        self.refresh()
+
+    def _clamp(self):
+        max_offset = max(0, len(self.data) - self._page_rows())
+        self.offset = min(max(0, self.offset), max_offset)
+
+    def refresh(self):
+        """把当前窗口内的数据绑定到行池，只重新配置内容有变化的行"""
+        for i, row in enumerate(self.rows):
+            idx = self.offset + i
+            record = self.data[idx] if idx < len(self.data) else None
+            if self._bound[i] is _UNBOUND or self._bound[i] != record:
+                self.bind_row(row, record)
+                self._bound[i] = record
+        self._update_scrollbar()
+
+    def invalidate(self):
+        """强制下一次 refresh 重新绑定所有行（例如图片或配色变化后）"""
+        self._bound = [_UNBOUND] * len(self.rows)
+
+    # ------------------- 滚动 -------------------
+    def scroll(self, rows):
+        old = self.offset
+        self.offset += rows
+        self._clamp()
+        if self.offset != old:
+            self.refresh()
+
+    def yview(self, *args):
+        """供 Scrollbar 的 command 调用"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.offset = int(round(float(args[1]) * len(self.data)))
+            self._clamp()
+            self.refresh()
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= max(1, self._page_rows() - 1)
+            self.scroll(step)
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.data)
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            first = self.offset / total
+            last = min(1.0, (self.offset + self._page_rows()) / total)
+            self.scrollbar.set(first, last)
+
+    def _bind_wheel(self, widget):
+        widget.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        widget.bind('<Button-4>', lambda e: self.scroll(-1), add='+')
+        widget.bind('<Button-5>', lambda e: self.scroll(1), add='+')
+
+    def _on_mousewheel(self, event):
+        if event.delta < 0:
+            self.scroll(1)
+        elif event.delta > 0:
+            self.scroll(-1)
@@ -1,12 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from PIL import Image, ImageTk, ImageDraw
 import random
 import json
 import os, sys
-import time
 import secrets
 
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from marker_road import MarkerRoad, MarkerStyle
+import metrics
+from virtual_list import VirtualList
+from dice_animation import DiceAnimation, dice_face_images
+from engines import bacbo as bacbo_rules
+
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(parent_dir, 'saving_data.json')
@@ -23,6 +35,7 @@ def load_user_data():
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()  # 先加载现有用户数据
     for user in users:
@@ -120,6 +133,7 @@ class BacboGUI(tk.Tk):
         self.last_win = 0
         self.username = username
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
         
         # 骰子动画相关属性
         self.animation_running = False
@@ -372,42 +386,9 @@ class BacboGUI(tk.Tk):
             print(f"保存历史记录失败: {e}")
     
     def _load_dice_assets(self):
-        """加载骰子图片 - 闲家浅蓝色背景，庄家浅红色背景"""
-        dice_size = (80, 80)
-        
-        # 生成闲家骰子图片（浅蓝色背景 #87CEEB）
-        for i in range(1, 7):
-            img = Image.new('RGB', dice_size, '#87CEEB')  # 浅蓝色背景
-            self._draw_dice(img, i)
-            self.player_dice_images.append(ImageTk.PhotoImage(img))
-        
-        # 生成庄家骰子图片（浅红色背景 #FFB6C1）
-        for i in range(1, 7):
-            img = Image.new('RGB', dice_size, '#FFB6C1')  # 浅红色背景
-            self._draw_dice(img, i)
-            self.banker_dice_images.append(ImageTk.PhotoImage(img))
-    
-    def _draw_dice(self, img, num):
-        """绘制骰子点数"""
-        from PIL import ImageDraw
-        draw = ImageDraw.Draw(img)
-        draw.rectangle([0, 0, img.size[0]-1, img.size[1]-1], outline='#333', width=3)
-        dot_color = '#ff0000' if num in [1, 4] else '#333'
-        size = img.size[0]
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2),
-                (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4),
-                (size//4, size//2), (3*size//4, size//2),
-                (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        dot_size = size // 10
-        for pos in dot_positions[num]:
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
+        """加载骰子图片 - 闲家浅蓝色背景，庄家浅红色背景（共享贴图缓存）"""
+        self.player_dice_images = dice_face_images(self, 80, bg='#87CEEB', outline_width=3, one_four_color='#ff0000')
+        self.banker_dice_images = dice_face_images(self, 80, bg='#FFB6C1', outline_width=3, one_four_color='#ff0000')
     
     def _create_dice_display(self):
         """创建骰子显示区域"""
@@ -579,64 +560,11 @@ class BacboGUI(tk.Tk):
         创建历史记录表格（最近5局），三列：闲家 / 庄家 / 赢方。
         历史用的小骰子图像尺寸为 50x50。
         """
-        # ---- 生成 50x50 的历史用骰子图片（Player / Banker）并保存在 self 上 ----
-        # 依赖：self.player_dice_images 和 self.banker_dice_images 应该是已存在的 PhotoImage 列表（6张）
-        # 尝试使用 PIL 以获得更好缩放质量；如果不可用，使用 subsample 回退。
-        try:
-            from PIL import Image, ImageTk
-            pil_available = True
-        except Exception:
-            pil_available = False
-
-        # 准备容器
-        self.history_player_dice_images = []
-        self.history_banker_dice_images = []
-
-        # helper：把已有 PhotoImage 转为 50x50 的 PhotoImage
-        if pil_available:
-            # 使用 ImageTk.getimage 从 PhotoImage 得到 PIL Image，然后 resize，再转回 PhotoImage
-            for img in getattr(self, 'player_dice_images', []):
-                try:
-                    pil_img = ImageTk.getimage(img)
-                    resized = pil_img.resize((30, 30), Image.LANCZOS)
-                    tkimg = ImageTk.PhotoImage(resized)
-                except Exception:
-                    # 出错时退回原图（避免崩溃）
-                    tkimg = img
-                self.history_player_dice_images.append(tkimg)
-            for img in getattr(self, 'banker_dice_images', []):
-                try:
-                    pil_img = ImageTk.getimage(img)
-                    resized = pil_img.resize((30, 30), Image.LANCZOS)
-                    tkimg = ImageTk.PhotoImage(resized)
-                except Exception:
-                    tkimg = img
-                self.history_banker_dice_images.append(tkimg)
-        else:
-            # 回退：使用 subsample 按整数缩小（近似为 50px）
-            for img in getattr(self, 'player_dice_images', []):
-                try:
-                    orig_w = img.width()
-                    orig_h = img.height()
-                    # 计算整数缩放因子（至少为1）
-                    factor_w = max(1, orig_w // 30)
-                    factor_h = max(1, orig_h // 30)
-                    factor = max(1, min(factor_w, factor_h))
-                    tkimg = img.subsample(factor, factor)
-                except Exception:
-                    tkimg = img
-                self.history_player_dice_images.append(tkimg)
-            for img in getattr(self, 'banker_dice_images', []):
-                try:
-                    orig_w = img.width()
-                    orig_h = img.height()
-                    factor_w = max(1, orig_w // 30)
-                    factor_h = max(1, orig_h // 30)
-                    factor = max(1, min(factor_w, factor_h))
-                    tkimg = img.subsample(factor, factor)
-                except Exception:
-                    tkimg = img
-                self.history_banker_dice_images.append(tkimg)
+        # ---- 历史用的小骰子图片：与大图同样式，按 80px 绘制后缩放到 30px ----
+        self.history_player_dice_images = dice_face_images(
+            self, 30, bg='#87CEEB', outline_width=3, one_four_color='#ff0000', render_size=80)
+        self.history_banker_dice_images = dice_face_images(
+            self, 30, bg='#FFB6C1', outline_width=3, one_four_color='#ff0000', render_size=80)
 
         # ---- UI：创建表格 ----
         # 标题
@@ -669,66 +597,66 @@ class BacboGUI(tk.Tk):
             )
             header_label.grid(row=0, column=i, padx=2, pady=2, sticky='nsew')
 
-        # 创建5行数据区域（每行：player_frame(两张50x50) | banker_frame(两张50x50) | winner_lbl）
-        self.history_rows = []
-        for row in range(1, 6):  # 修改为5行
-            # 闲家列：包含一个 frame，内含两个 Label （左最小，右最大）
-            player_frame = tk.Frame(table_frame, bg='#FFFFFF', relief=tk.FLAT, bd=1)
-            player_frame.grid(row=row, column=0, padx=2, pady=2, sticky='nsew')
-            # 左小
-            p_lbl_min = tk.Label(player_frame, bg='#FFFFFF')
-            p_lbl_min.pack(side=tk.LEFT, padx=(4,2), pady=1)
-            # 右大
-            p_lbl_max = tk.Label(player_frame, bg='#FFFFFF')
-            p_lbl_max.pack(side=tk.LEFT, padx=(2,4), pady=1)
-
-            # 庄家列
-            banker_frame = tk.Frame(table_frame, bg='#FFFFFF', relief=tk.FLAT, bd=1)
-            banker_frame.grid(row=row, column=1, padx=2, pady=2, sticky='nsew')
-            b_lbl_min = tk.Label(banker_frame, bg='#FFFFFF')
-            b_lbl_min.pack(side=tk.LEFT, padx=(4,2), pady=1)
-            b_lbl_max = tk.Label(banker_frame, bg='#FFFFFF')
-            b_lbl_max.pack(side=tk.LEFT, padx=(2,4), pady=1 )
-
-            # 赢方列（文本）
-            winner_lbl = tk.Label(
-                table_frame,
-                text="",
-                font=('微软雅黑', 11, 'bold'),
-                bg='#FFFFFF',
-                fg='#000000',
-                width=12,
-                height=2,
-                relief=tk.GROOVE,
-                bd=1
-            )
-            winner_lbl.grid(row=row, column=2, padx=2, pady=2, sticky='nsew')
-
-            # 默认把第1张（index 0）缩小图放进去以占位（若列表非空）
-            if len(self.history_player_dice_images) >= 1:
-                p_lbl_min.config(image=self.history_player_dice_images[0])
-                p_lbl_max.config(image=self.history_player_dice_images[0])
-            if len(self.history_banker_dice_images) >= 1:
-                b_lbl_min.config(image=self.history_banker_dice_images[0])
-                b_lbl_max.config(image=self.history_banker_dice_images[0])
-
-            self.history_rows.append({
-                'player_imgs': [p_lbl_min, p_lbl_max],
-                'banker_imgs': [b_lbl_min, b_lbl_max],
-                'winner_lbl': winner_lbl
-            })
+        # 固定5行的行池（虚拟化列表）：滚动/新局时只重新绑定数据，不重建控件
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
+        scrollbar.grid(row=1, column=3, rowspan=5, sticky='ns')
+        self.history_list = VirtualList(
+            table_frame, self._create_history_row, self._bind_history_row,
+            pool_size=5, scrollbar=scrollbar
+        )
+        self.history_rows = self.history_list.rows
 
         # 网格权重
         for i in range(3):
             table_frame.columnconfigure(i, weight=1)
         for r in range(6):  # 修改为6行（包含表头）
             table_frame.rowconfigure(r, weight=1, minsize=40)
-    
-    def update_history_table(self):
-        """
-        使用 self.history（最近的记录）来更新界面（历史骰子图使用 50x50 缩放图）。
-        每一行显示：闲家（左小右大图标）、庄家（左小右大图标）、赢方文字（带颜色）。
-        """
+
+    def _create_history_row(self, table_frame, index):
+        """创建一行历史记录控件：player_frame(两张小图) | banker_frame(两张小图) | winner_lbl"""
+        row = index + 1  # 第0行为表头
+        # 闲家列：包含一个 frame，内含两个 Label （左最小，右最大）
+        player_frame = tk.Frame(table_frame, bg='#FFFFFF', relief=tk.FLAT, bd=1)
+        player_frame.grid(row=row, column=0, padx=2, pady=2, sticky='nsew')
+        # 左小
+        p_lbl_min = tk.Label(player_frame, bg='#FFFFFF')
+        p_lbl_min.pack(side=tk.LEFT, padx=(4,2), pady=1)
+        # 右大
+        p_lbl_max = tk.Label(player_frame, bg='#FFFFFF')
+        p_lbl_max.pack(side=tk.LEFT, padx=(2,4), pady=1)
+
+        # 庄家列
+        banker_frame = tk.Frame(table_frame, bg='#FFFFFF', relief=tk.FLAT, bd=1)
+        banker_frame.grid(row=row, column=1, padx=2, pady=2, sticky='nsew')
+        b_lbl_min = tk.Label(banker_frame, bg='#FFFFFF')
+        b_lbl_min.pack(side=tk.LEFT, padx=(4,2), pady=1)
+        b_lbl_max = tk.Label(banker_frame, bg='#FFFFFF')
+        b_lbl_max.pack(side=tk.LEFT, padx=(2,4), pady=1 )
+
+        # 赢方列（文本）
+        winner_lbl = tk.Label(
+            table_frame,
+            text="",
+            font=('微软雅黑', 11, 'bold'),
+            bg='#FFFFFF',
+            fg='#000000',
+            width=12,
+            height=2,
+            relief=tk.GROOVE,
+            bd=1
+        )
+        winner_lbl.grid(row=row, column=2, padx=2, pady=2, sticky='nsew')
+
+        return {
+            'player_frame': player_frame,
+            'banker_frame': banker_frame,
+            'player_imgs': [p_lbl_min, p_lbl_max],
+            'banker_imgs': [b_lbl_min, b_lbl_max],
+            'winner_lbl': winner_lbl
+        }
+
+    def _bind_history_row(self, row_widgets, record):
+        """把一条记录绑定到已有的行控件；record 为 None 时显示占位图"""
         # 确保缩放图片存在，否则退回使用原 images
         player_imgs = getattr(self, 'history_player_dice_images', None)
         banker_imgs = getattr(self, 'history_banker_dice_images', None)
@@ -737,54 +665,51 @@ class BacboGUI(tk.Tk):
         if not banker_imgs:
             banker_imgs = getattr(self, 'banker_dice_images', [])
 
-        # 只取最近5局（如果少于5则显示已有）
-        # 修改：从历史中取最新的5条记录，01_Data（最新）在最上方
-        recent_history = self.history[:5] if len(self.history) >= 5 else self.history
-
-        # 先清空所有行为默认状态（使用第一张图作为占位）
-        placeholder_p = player_imgs[0] if player_imgs else None
-        placeholder_b = banker_imgs[0] if banker_imgs else None
-        for row_widgets in self.history_rows:
-            if placeholder_p is not None:
-                row_widgets['player_imgs'][0].config(image=placeholder_p)
-                row_widgets['player_imgs'][1].config(image=placeholder_p)
-            if placeholder_b is not None:
-                row_widgets['banker_imgs'][0].config(image=placeholder_b)
-                row_widgets['banker_imgs'][1].config(image=placeholder_b)
+        if record is None:
+            # 空行：使用第一张图作为占位
+            if player_imgs:
+                row_widgets['player_imgs'][0].config(image=player_imgs[0])
+                row_widgets['player_imgs'][1].config(image=player_imgs[0])
+            if banker_imgs:
+                row_widgets['banker_imgs'][0].config(image=banker_imgs[0])
+                row_widgets['banker_imgs'][1].config(image=banker_imgs[0])
             row_widgets['winner_lbl'].config(text="", bg='#FFFFFF')
+            return
 
-        # 填充数据（最新的在最上方，01_Data在最上方，05_Data在最下方）
-        for i, record in enumerate(recent_history):
-            if i >= len(self.history_rows):
-                break
-            row_widgets = self.history_rows[i]
-            player_vals = record.get('player_dice', [1, 1])
-            banker_vals = record.get('banker_dice', [1, 1])
-            winner = record.get('winner', '')
-
-            # 左小右大显示
-            p_min, p_max = sorted(player_vals)
-            b_min, b_max = sorted(banker_vals)
-
-            # 更新图片（注意下标减1）
-            if 0 < p_min <= len(player_imgs):
-                row_widgets['player_imgs'][0].config(image=player_imgs[p_min-1])
-            if 0 < p_max <= len(player_imgs):
-                row_widgets['player_imgs'][1].config(image=player_imgs[p_max-1])
-
-            if 0 < b_min <= len(banker_imgs):
-                row_widgets['banker_imgs'][0].config(image=banker_imgs[b_min-1])
-            if 0 < b_max <= len(banker_imgs):
-                row_widgets['banker_imgs'][1].config(image=banker_imgs[b_max-1])
-
-            # 更新赢家文字和背景色
-            if winner == 'Player':
-                row_widgets['winner_lbl'].config(text="闲家", bg='#87CEEB')
-            elif winner == 'Banker':
-                row_widgets['winner_lbl'].config(text="庄家", bg='#FFB6C1')
-            else:
-                # Tie 或其他
-                row_widgets['winner_lbl'].config(text="和局", bg='#D3FFCE')
+        player_vals = record.get('player_dice', [1, 1])
+        banker_vals = record.get('banker_dice', [1, 1])
+        winner = record.get('winner', '')
+
+        # 左小右大显示
+        p_min, p_max = sorted(player_vals)
+        b_min, b_max = sorted(banker_vals)
+
+        # 更新图片（注意下标减1）
+        if 0 < p_min <= len(player_imgs):
+            row_widgets['player_imgs'][0].config(image=player_imgs[p_min-1])
+        if 0 < p_max <= len(player_imgs):
+            row_widgets['player_imgs'][1].config(image=player_imgs[p_max-1])
+
+        if 0 < b_min <= len(banker_imgs):
+            row_widgets['banker_imgs'][0].config(image=banker_imgs[b_min-1])
+        if 0 < b_max <= len(banker_imgs):
+            row_widgets['banker_imgs'][1].config(image=banker_imgs[b_max-1])
+
+        # 更新赢家文字和背景色
+        if winner == 'Player':
+            row_widgets['winner_lbl'].config(text="闲家", bg='#87CEEB')
+        elif winner == 'Banker':
+            row_widgets['winner_lbl'].config(text="庄家", bg='#FFB6C1')
+        else:
+            # Tie 或其他
+            row_widgets['winner_lbl'].config(text="和局", bg='#D3FFCE')
+
+    def update_history_table(self):
+        """
+        使用 self.history（最新的在索引0）更新历史表格。
+        行控件固定为5行，新局时回到顶部并只重新绑定内容有变化的行；可滚动查看更早的记录。
+        """
+        self.history_list.set_data(self.history, offset=0)
 
     def add_history_record(self):
         """添加历史记录"""
@@ -823,102 +748,37 @@ class BacboGUI(tk.Tk):
         self._draw_marker_grid()
     
     def _draw_marker_grid(self):
-        """绘制标记路网格"""
-        # 清除现有内容
-        self.marker_canvas.delete('all')
-        
-        # 网格参数 - 改为10列，单元格大小改为26px，移除间隙
-        rows, cols = self.max_marker_rows, self.max_marker_cols  # 6行，10列
-        cell_size = 26  # 从25px增加到26px
-        padding = 0  # 移除间隙
-        
-        # 计算画布所需大小
-        width = cols * (cell_size + padding) + padding
-        height = rows * (cell_size + padding) + padding
-        
-        # 设置画布大小
-        self.marker_canvas.config(width=width, height=height)
-        
-        # 绘制网格
-        for col in range(cols):
-            for row in range(rows):
-                x1 = padding + col * (cell_size + padding)
-                y1 = padding + row * (cell_size + padding)
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                
-                self.marker_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#888888',
-                    fill='#D0E7FF'
-                )
-        
+        """创建标记路（网格与圆点槽位只创建一次，之后原地更新）"""
+        # 网格参数 - 6行10列，单元格26px，无间隙
+        rows, cols = self.max_marker_rows, self.max_marker_cols
+        cell_size = 26
+
+        self.marker_road = MarkerRoad(
+            self.marker_canvas, rows, cols, cell_size, radius=12,
+            grid_outline='#888888', grid_fill='#D0E7FF', dot_width=1
+        )
+
         # 绘制标记
         self._update_marker_road()
-    
+
+    def _marker_style(self, result):
+        """根据结果计算标记路格子的样式"""
+        if result == 'Player':
+            color = "#87CEEB"
+            text = "闲"
+        elif result == 'Banker':
+            color = "#FFB6C1"
+            text = "庄"
+        else:  # Tie
+            color = "#32CD32"
+            text = "和"
+        return MarkerStyle(color, '#000000', text, 'black', ('微软雅黑', '12', 'bold'))
+
     def _update_marker_road(self):
-        """更新标记路显示"""
-        # 清除所有标记
-        self.marker_canvas.delete('marker')
-        
-        # 计算起始索引（如果结果超过60个，只显示最近的60个）
-        start_idx = max(0, len(self.marker_results) - (self.max_marker_rows * self.max_marker_cols))
-        
-        # 绘制标记
-        for idx, result in enumerate(reversed(self.marker_results[start_idx:])):
-            if idx >= self.max_marker_rows * self.max_marker_cols:
-                break
-                
-            col = idx // self.max_marker_rows
-            row = idx % self.max_marker_rows
-            
-            # 网格参数
-            cell_size = 26  # 改为26px
-            padding = 0  # 移除间隙
-            
-            # 计算单元格位置
-            x1 = padding + col * (cell_size + padding)
-            y1 = padding + row * (cell_size + padding)
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-            
-            # 计算圆点位置
-            center_x = (x1 + x2) / 2
-            center_y = (y1 + y2) / 2
-            radius = 12  # 改为12px
-            
-            # 根据结果绘制圆点
-            if result == 'Player':
-                color = "#87CEEB"
-                text = "闲"
-                text_color = 'black'
-            elif result == 'Banker':
-                color = "#FFB6C1"
-                text = "庄"
-                text_color = 'black'
-            else:  # Tie
-                color = "#32CD32"
-                text = "和"
-                text_color = 'black'
-            
-            # 绘制主圆点
-            self.marker_canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                fill=color,
-                outline='#000000',
-                width=1,  
-                tags='marker'
-            )
-            
-            # 添加文字
-            self.marker_canvas.create_text(
-                center_x, center_y,
-                text=text,
-                fill=text_color,
-                font=('微软雅黑', '12', 'bold'),
-                tags='marker'
-            )
+        """更新标记路显示（marker_results 最新在前，按时间顺序显示最近60个）"""
+        capacity = self.max_marker_rows * self.max_marker_cols
+        styles = [self._marker_style(r) for r in reversed(self.marker_results[:capacity])]
+        self.marker_road.set_results(styles)
     
     def _create_stats_display(self, parent):
         """创建统计显示 - 精致表格形式"""
@@ -1578,27 +1438,19 @@ class BacboGUI(tk.Tk):
 
         # 初始化动画控制相关标志
         self.animation_running = True
-        self.animation_start_time = time.time()
-        # 停止时间字典（相对动画开始的秒数）
-        # 先计算 p1 和 b1 的停止时间；后续 p2/b2 在 b1 停止后决定
+        # 停止时间（相对动画开始的秒数）：结果已定，所有停止时刻可在开始前一次算好
         t_p1 = random.uniform(3.8, 4.0)                      # 闲家第一颗停止
         t_b1 = t_p1 + random.uniform(1.2, 1.5)               # 庄家第一颗停止（在 p1 后 1.2-1.5s）
 
-        # 先设置 p2 和 b2 为 None，等 b1 停止时决定
-        self.stop_times = {
-            'p1': t_p1,
-            'b1': t_b1,
-            'p2': None,
-            'b2': None
-        }
-
-        # 停止标志，避免重复设置
-        self.stopped = {
-            'p1': False,
-            'b1': False,
-            'p2': False,
-            'b2': False
-        }
+        # 第二颗的顺序按第一颗的点数决定：点数小的一方先停
+        p1 = self.final_player_values[0]
+        b1 = self.final_banker_values[0]
+        if p1 < b1:
+            t_b2 = t_b1 + random.uniform(3.1, 3.5)
+            t_p2 = t_b2 + random.uniform(1.1, 1.3)
+        else:
+            t_p2 = t_b1 + random.uniform(3.1, 3.5)
+            t_b2 = t_p2 + random.uniform(1.1, 1.3)
 
         # 骰子停止时的累计点数（用于实时更新）
         self.current_player_points = [None, None]  # 记录每颗骰子的点数，None表示未停止
@@ -1609,161 +1461,77 @@ class BacboGUI(tk.Tk):
             self.player_dice_labels[i].config(image=self.player_dice_images[0])
             self.banker_dice_labels[i].config(image=self.banker_dice_images[0])
 
-        # 开始循环动画（使用新的实现）
-        self.animate_dice_sequence()
+        # 顺序：闲1、闲2、庄1、庄2
+        labels = self.player_dice_labels[:2] + self.banker_dice_labels[:2]
+        finals = self.final_player_values + self.final_banker_values
+        # 闲家与庄家使用不同底色的贴图
+        faces = [self.player_dice_images] * 2 + [self.banker_dice_images] * 2
+        self.dice_animation = DiceAnimation(
+            self, labels, faces, finals=finals, stop_times=[t_p1, t_p2, t_b1, t_b2],
+            on_stop=self._on_die_stopped, on_done=self._on_dice_animation_done
+        ).start()
+
+    def _on_die_stopped(self, index, final_val):
+        """某颗骰子停止时更新对应一方的点数显示"""
+        if index < 2:
+            points, label = self.current_player_points, self.player_score_label
+        else:
+            points, label = self.current_banker_points, self.banker_score_label
+        points[index % 2] = final_val
+        label.config(text=f"{sum(v for v in points if v is not None)}")
 
-    def animate_dice_sequence(self):
-        """
-        按照预先计算的 self.stop_times 来决定每颗骰子的停止时刻。
-        循环每 50ms 更新尚未停止的骰子为随机面，直到所有骰子停止，
-        然后进入结算/更新历史等流程。
-        """
+    def _on_dice_animation_done(self, finals):
+        """所有骰子停止后进入结算/更新历史等流程"""
         if not getattr(self, 'animation_running', False):
             return
+        # 结束动画
+        self.animation_running = False
 
-        current_time = time.time() - self.animation_start_time
-
-        # ---------- 处理 p1 停止 ----------
-        if (not self.stopped['p1']) and current_time >= self.stop_times['p1']:
-            # 固定闲家第一颗为最终点数
-            final_val = self.final_player_values[0]
-            self.player_dice_labels[0].config(image=self.player_dice_images[final_val-1])
-            self.current_player_points[0] = final_val
-            self.stopped['p1'] = True
-            # 更新点数显示
-            if self.current_player_points[1] is not None:
-                total = final_val + self.current_player_points[1]
-                self.player_score_label.config(text=f"{total}")
-            else:
-                self.player_score_label.config(text=f"{final_val}")
-
-        # ---------- 处理 b1 停止 ----------
-        if (not self.stopped['b1']) and current_time >= self.stop_times['b1']:
-            final_val = self.final_banker_values[0]
-            self.banker_dice_labels[0].config(image=self.banker_dice_images[final_val-1])
-            self.current_banker_points[0] = final_val
-            self.stopped['b1'] = True
-            # 更新点数显示
-            if self.current_banker_points[1] is not None:
-                total = final_val + self.current_banker_points[1]
-                self.banker_score_label.config(text=f"{total}")
-            else:
-                self.banker_score_label.config(text=f"{final_val}")
-
-            # 在庄家第一颗停止后立即决定第二颗停止的顺序与时间（按照规则）
-            # 比较当前"已知"的第一颗点数（即 final p1 与 final b1）
-            p1 = self.final_player_values[0]
-            b1 = self.final_banker_values[0]
-
-            if p1 < b1:
-                t_b2 = current_time + random.uniform(3.1, 3.5)
-                t_p2 = t_b2 + random.uniform(1.1, 1.3)
-                self.stop_times['b2'] = t_b2
-                self.stop_times['p2'] = t_p2
-            else:
-                t_p2 = current_time + random.uniform(3.1, 3.5)
-                t_b2 = t_p2 + random.uniform(1.1, 1.3)
-                self.stop_times['p2'] = t_p2
-                self.stop_times['b2'] = t_b2
-
-        # ---------- 处理第二颗的停止（根据上面决定的时间） ----------
-        # 闲家第二颗
-        if (not self.stopped['p2']) and (self.stop_times.get('p2') is not None) and current_time >= self.stop_times['p2']:
-            final_val = self.final_player_values[1]
-            self.player_dice_labels[1].config(image=self.player_dice_images[final_val-1])
-            self.current_player_points[1] = final_val
-            self.stopped['p2'] = True
-            # 更新点数显示
-            if self.current_player_points[0] is not None:
-                total = self.current_player_points[0] + final_val
-                self.player_score_label.config(text=f"{total}")
-            else:
-                self.player_score_label.config(text=f"{final_val}")
-
-        # 庄家第二颗
-        if (not self.stopped['b2']) and (self.stop_times.get('b2') is not None) and current_time >= self.stop_times['b2']:
-            final_val = self.final_banker_values[1]
-            self.banker_dice_labels[1].config(image=self.banker_dice_images[final_val-1])
-            self.current_banker_points[1] = final_val
-            self.stopped['b2'] = True
-            # 更新点数显示
-            if self.current_banker_points[0] is not None:
-                total = self.current_banker_points[0] + final_val
-                self.banker_score_label.config(text=f"{total}")
-            else:
-                self.banker_score_label.config(text=f"{final_val}")
-
-        # 随机滚动尚未停止的骰子（视觉效果）
-        # 闲家骰子随机 - 修复：只有未停止的骰子才随机滚动
-        if not self.stopped['p1']:
-            random_val = random.randint(1, 6)
-            self.player_dice_labels[0].config(image=self.player_dice_images[random_val-1])
-        if not self.stopped['p2']:
-            random_val = random.randint(1, 6)
-            self.player_dice_labels[1].config(image=self.player_dice_images[random_val-1])
-        # 庄家骰子随机 - 修复：只有未停止的骰子才随机滚动
-        if not self.stopped['b1']:
-            random_val = random.randint(1, 6)
-            self.banker_dice_labels[0].config(image=self.banker_dice_images[random_val-1])
-        if not self.stopped['b2']:
-            random_val = random.randint(1, 6)
-            self.banker_dice_labels[1].config(image=self.banker_dice_images[random_val-1])
-
-        # 检查是否所有骰子都已停止
-        if all(self.stopped.values()):
-            # 结束动画循环
-            self.animation_running = False
-
-            # 确保所有骰子都显示最终结果
-            for i, value in enumerate(self.final_player_values):
-                self.player_dice_labels[i].config(image=self.player_dice_images[value-1])
-            for i, value in enumerate(self.final_banker_values):
-                self.banker_dice_labels[i].config(image=self.banker_dice_images[value-1])
-
-            # 更新点数显示
-            if self.game.player_score > 0:
-                self.player_score_label.config(text=f"{self.game.player_score}")
-            if self.game.banker_score > 0:
-                self.banker_score_label.config(text=f"{self.game.banker_score}")
+        # 确保所有骰子都显示最终结果
+        for i, value in enumerate(self.final_player_values):
+            self.player_dice_labels[i].config(image=self.player_dice_images[value-1])
+        for i, value in enumerate(self.final_banker_values):
+            self.banker_dice_labels[i].config(image=self.banker_dice_images[value-1])
 
-            # 更新统计和标记路
-            self.add_marker_result(self.game.winner)
-            self._update_marker_road()
-            
-            # 添加到历史记录
-            record = {
-                'player_dice': self.final_player_values.copy(),
-                'banker_dice': self.final_banker_values.copy(),
-                'winner': self.game.winner
-            }
-            # 修改：新记录插入到列表开头（索引0位置）
-            self.history.insert(0, record)
-            if len(self.history) > 61:
-                self.history = self.history[:61]
-            
-            # 更新历史记录表格
-            self.update_history_table()
-            
-            # 保存历史记录到文件
-            self._save_history_to_file()
+        # 更新点数显示
+        if self.game.player_score > 0:
+            self.player_score_label.config(text=f"{self.game.player_score}")
+        if self.game.banker_score > 0:
+            self.banker_score_label.config(text=f"{self.game.banker_score}")
 
-            # 结算下注
-            self.resolve_bets()
+        # 更新统计和标记路
+        self.add_marker_result(self.game.winner)
+        
+        # 添加到历史记录
+        record = {
+            'player_dice': self.final_player_values.copy(),
+            'banker_dice': self.final_banker_values.copy(),
+            'winner': self.game.winner
+        }
+        # 修改：新记录插入到列表开头（索引0位置）
+        self.history.insert(0, record)
+        if len(self.history) > 61:
+            self.history = self.history[:61]
+        
+        # 更新历史记录表格
+        self.update_history_table()
+        
+        # 保存历史记录到文件
+        self._save_history_to_file()
 
-            # 显示结果（创建新的画布文本/背景）
-            self._show_result_text()
+        # 结算下注
+        self.resolve_bets()
 
-            # 更新统计显示
-            self._update_stats_display()
+        # 显示结果（创建新的画布文本/背景）
+        self._show_result_text()
 
-            # 启用按钮（分阶段）
-            self.after(100, self.enable_buttons_except_deal)
-            self.after(1800, lambda: self.deal_button.config(state=tk.NORMAL))
-            self.after(2000, lambda: self.bind('<Return>', lambda e: self.start_game()))
-            return
+        # 更新统计显示
+        self._update_stats_display()
 
-        # 若尚未全部停止，继续循环（50ms）
-        self.after(50, self.animate_dice_sequence)
+        # 启用按钮（分阶段）
+        self.after(100, self.enable_buttons_except_deal)
+        self.after(1800, lambda: self.deal_button.config(state=tk.NORMAL))
+        self.after(2000, lambda: self.bind('<Return>', lambda e: self.start_game()))
     
     def _update_stats_display(self):
         """更新统计显示"""
@@ -1782,108 +1550,11 @@ class BacboGUI(tk.Tk):
                 count = self.stats_counts.get(count_key, 0)
                 row['count_label'].config(text=str(count))
     
+    @metrics.timed()
     def resolve_bets(self):
-        payouts = 0
-        total_bet_amount = sum(self.current_bets.values())
-        
-        # 获取所有骰子值
-        all_dice_values = self.game.player_values + self.game.banker_values
-        
-        # 检查特殊下注
-        # 1. 三个一样（包括四个一样）
-        from collections import Counter
-        dice_counter = Counter(all_dice_values)
-        has_three_of_kind = any(count >= 3 for count in dice_counter.values())
-        has_four_of_kind = any(count == 4 for count in dice_counter.values())
-        
-        # 2. 骰子全红（所有骰子都是1或4）- 移除
-        
-        # 3. 单数/双数
-        if self.game.winner == 'Player':
-            winner_total = self.game.player_score
-        elif self.game.winner == 'Banker':
-            winner_total = self.game.banker_score
-        else:
-            winner_total = 0
-        
-        is_odd = winner_total % 2 == 1
-        is_even = winner_total % 2 == 0
-        
-        # 4. 对子
-        player_pair = self.game.player_values[0] == self.game.player_values[1]
-        banker_pair = self.game.banker_values[0] == self.game.banker_values[1]
-        
-        # 5. 小大判断 - 新增
-        # 根据游戏结果确定检查的点数
-        if self.game.winner == 'Player':
-            check_points = self.game.player_score
-        elif self.game.winner == 'Banker':
-            check_points = self.game.banker_score
-        else:  # Tie
-            check_points = self.game.tie_total
-        
-        # 结算各种下注
-        for bet_type, bet_amount in self.current_bets.items():
-            if bet_type == 'Player':
-                if self.game.winner == 'Player':
-                    payouts += bet_amount * 2  # 1:1赔率
-                elif self.game.winner == 'Tie':
-                    payouts += bet_amount * 0.9  # 退还90%本金
-                    
-            elif bet_type == 'Banker':
-                if self.game.winner == 'Banker':
-                    payouts += bet_amount * 2  # 1:1赔率
-                elif self.game.winner == 'Tie':
-                    payouts += bet_amount * 0.9  # 退还90%本金
-            
-            elif bet_type == 'Tie':
-                if self.game.winner == 'Tie':
-                    # 根据总点数确定赔率
-                    total = sum(all_dice_values)
-                    if total in [4, 24]:
-                        payouts += bet_amount * 89  # 88:1赔率
-                    elif total in [6, 22]:
-                        payouts += bet_amount * 26  # 25:1赔率
-                    elif total in [8, 20]:
-                        payouts += bet_amount * 11  # 10:1赔率
-                    elif total in [10, 18]:
-                        payouts += bet_amount * 7   # 6:1赔率
-                    else:  # 6, 7, 8
-                        payouts += bet_amount * 5   # 4:1赔率
-            
-            elif bet_type == 'Small':  # 新增：小(2-7)
-                if 2 <= check_points <= 7:
-                    payouts += bet_amount * 2  # 1:1赔率
-            
-            elif bet_type == 'Large':  # 新增：大(8-12)
-                if 8 <= check_points <= 12:
-                    payouts += bet_amount * 2  # 1:1赔率
-            
-            elif bet_type == 'ThreeOfKind':
-                if has_three_of_kind:
-                    payouts += bet_amount * 10  # 9:1赔率
-            
-            elif bet_type == 'FourOfKind':
-                if has_four_of_kind:
-                    payouts += bet_amount * 206  # 205:1赔率
-            
-            # 移除 AllRed 的结算逻辑
-            
-            elif bet_type == 'Odd':
-                if is_odd and self.game.winner != 'Tie':
-                    payouts += bet_amount * 1.97  # 0.97:1赔率
-            
-            elif bet_type == 'Even':
-                if is_even and self.game.winner != 'Tie':
-                    payouts += bet_amount * 1.97  # 0.97:1赔率
-            
-            elif bet_type == 'PlayerPair':
-                if player_pair:
-                    payouts += bet_amount * 5.8  # 4.8:1赔率
-            
-            elif bet_type == 'BankerPair':
-                if banker_pair:
-                    payouts += bet_amount * 5.8  # 4.8:1赔率
+        # 各注项的返还（含本金）由引擎按规则计算
+        returns = bacbo_rules.settle_bets(self.current_bets, self.game.player_values, self.game.banker_values)
+        payouts = sum(returns.values())
         
         # 将赔付加入余额并清空当前投注
         self.balance += payouts
@@ -2113,6 +1784,10 @@ class BacboGUI(tk.Tk):
             # 删除最后6个记录（最旧的6个）
             self.marker_results = self.marker_results[:60]
 
+        # 原地追加到标记路（满格时环形滚动）
+        if hasattr(self, 'marker_road'):
+            self.marker_road.push(self._marker_style(winner))
+
 
 # 主函数
 def main(initial_balance=1000000, username="Guest"):
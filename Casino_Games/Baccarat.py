@@ -6,6 +6,17 @@ import json
 import os, sys
 import time
 
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from marker_road import MarkerRoad, MarkerStyle
+import metrics
+
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(parent_dir, 'saving_data.json')
@@ -22,6 +33,7 @@ def load_user_data():
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()  # 先加载现有用户数据
     for user in users:
@@ -231,6 +243,7 @@ class BaccaratGUI(tk.Tk):
         self.game = None
         self.username = username
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
    
         self._initialize_game(False)
         
@@ -4054,40 +4067,25 @@ class BaccaratGUI(tk.Tk):
             outline=''
         )
 
-    def _draw_marker_grid(self):
-        """绘制珠路图网格 - 修改为每行7个格子"""
-        # 清除现有内容
-        self.marker_canvas.delete('all')
-        
-        # 网格参数 - 修改为每行7个格子，每个格子放大1.5倍
-        rows, cols = 6, 9  # 改为7列
-        cell_size = 30  # 从20放大到30 (1.5倍)
-        padding = 0     # 相应增加内边距
-        
+    def _draw_marker_grid(self, clear=True):
+        """创建珠路图（网格与圆点槽位只创建一次，之后原地更新）"""
+        # 网格参数 - 6行9列，每个格子30px
+        rows, cols = 6, 9
+        cell_size = 30
+
         # 更新实例变量
         self.max_marker_rows = rows
         self.max_marker_cols = cols
-        
-        # 计算画布所需大小
-        width = cols * (cell_size + padding) + padding
-        height = rows * (cell_size + padding) + padding
-        
-        # 设置画布大小
-        self.marker_canvas.config(width=width, height=height)
-        
-        # 绘制网格
-        for col in range(cols):
-            for row in range(rows):
-                x1 = padding + col * (cell_size + padding)
-                y1 = padding + row * (cell_size + padding)
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                
-                self.marker_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#888888',
-                    fill='#D0E7FF'
-                )
+
+        if getattr(self, 'marker_road', None) is None or self.marker_road.canvas is not self.marker_canvas:
+            # 满格后整列滚动（与 add_marker_result 移除最旧一列保持一致）
+            self.marker_road = MarkerRoad(
+                self.marker_canvas, rows, cols, cell_size,
+                grid_outline='#888888', grid_fill='#D0E7FF',
+                dot_width=2, scroll_step=rows, corner_marks=True
+            )
+        elif clear:
+            self.marker_road.clear()
 
     def add_marker_result(self, winner, is_natural=False, is_stiger=False, is_btiger=False, 
                     player_hand_len=0, banker_hand_len=0, player_score=0, banker_score=0,
@@ -4255,264 +4253,123 @@ class BaccaratGUI(tk.Tk):
         )
         self.basic_total_label.config(text=str(basic_total))
         
-        # 重新绘制珠路图
-        self._update_marker_road()
+        # 原地追加到珠路图（满格时环形滚动一列）
+        self._draw_marker_grid(clear=False)
+        self.marker_road.push(self._marker_style(self.marker_results[-1]))
 
     def _update_marker_road(self):
-        """更新珠路图显示"""
-        # 保留网格线，只删除圆点
-        self.marker_canvas.delete('dot')  # 只删除圆点，保留网格
-        
-        # 网格参数 - 修改为每行7个格子，每个格子放大1.5倍
-        rows, cols = 6, 9
-        cell_size = 30  # 从20放大到30 (1.5倍)
-        padding = 0     # 相应增加内边距
-        
-        # 计算画布所需大小
-        width = cols * (cell_size + padding) + padding
-        height = rows * (cell_size + padding) + padding
-        
-        # 设置画布大小
-        self.marker_canvas.config(width=width, height=height)
-        
-        # 绘制网格
-        for col in range(cols):
-            for row in range(rows):
-                x1 = padding + col * (cell_size + padding)
-                y1 = padding + row * (cell_size + padding)
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                
-                self.marker_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#888888',
-                    fill='#D0E7FF'
-                )
-
-        # 计算起始索引（如果结果超过42个，只显示最近的42个）
-        start_idx = max(0, len(self.marker_results) - rows * cols)
-        
-        # 绘制圆点
-        for idx, result in enumerate(self.marker_results[start_idx:]):
-            if idx >= rows * cols:  # 超过网格容量
-                break
-                
-            col = idx // rows
-            row = idx % rows
-            
-            # 计算单元格位置
-            x1 = padding + col * (cell_size + padding)
-            y1 = padding + row * (cell_size + padding)
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-            
-            # 计算圆点位置
-            center_x = (x1 + x2) / 2
-            center_y = (y1 + y2) / 2
-            radius = cell_size * 0.4
-            
-            # 根据结果绘制圆点
-            (winner, is_natural, is_stiger, is_btiger, 
-            player_hand_len, banker_hand_len, 
-            player_score, banker_score,
-            is_player_pair, is_banker_pair, is_same_rank_pair, 
-            is_player_monkey, is_banker_monkey) = result  # 新增对子参数
-            
-            outline_color = ''
-            if winner == 'Player':
-                if self.game_mode == "ez" and player_hand_len == 3 and player_score == 8:  ## 简单模式
+        """更新珠路图显示（整体重新绑定，用于模式切换/重建后）"""
+        self._draw_marker_grid(clear=False)
+        styles = [self._marker_style(result) for result in self.marker_results]
+        self.marker_road.set_results(styles)
+
+    def _marker_style(self, result):
+        """根据一局结果计算珠路图格子的样式"""
+        (winner, is_natural, is_stiger, is_btiger,
+        player_hand_len, banker_hand_len,
+        player_score, banker_score,
+        is_player_pair, is_banker_pair, is_same_rank_pair,
+        is_player_monkey, is_banker_monkey) = result  # 新增对子参数
+
+        outline_color = ''
+        if winner == 'Player':
+            if self.game_mode == "ez" and player_hand_len == 3 and player_score == 8:  ## 简单模式
+                color = "#FFFFFF"
+                text = "8"
+                text_color = '#0000FF'
+                outline_color = '#0000FF'
+            elif self.game_mode == "ez" and player_hand_len == 3 and player_score == 9:  ## 简单模式
+                color = "#F2FF00"
+                text = "神"
+                text_color = '#0000FF'
+                outline_color = '#0000FF'
+            elif self.game_mode == "lucky7" and player_score == 7:  ## 幸运7模式
+                if banker_score == 6:  ## 7杀6
                     color = "#FFFFFF"
-                    text = "8"
+                    text = "7-6"
                     text_color = '#0000FF'
                     outline_color = '#0000FF'
-                elif self.game_mode == "ez" and player_hand_len == 3 and player_score == 9:  ## 简单模式
+                else:  ## 闲家7点Only
                     color = "#F2FF00"
-                    text = "神"
+                    text = "7"
                     text_color = '#0000FF'
                     outline_color = '#0000FF'
-                elif self.game_mode == "lucky7" and player_score == 7:  ## 幸运7模式
-                    if banker_score == 6:  ## 7杀6
-                        color = "#FFFFFF"
-                        text = "7-6"
-                        text_color = '#0000FF'
-                        outline_color = '#0000FF'
-                    else:  ## 闲家7点Only
-                        color = "#F2FF00"
-                        text = "7"
-                        text_color = '#0000FF'
-                        outline_color = '#0000FF'
-                elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
+            elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
+                color = "#FFFFFF"
+                text = "猴"
+                outline_color = "#0000FF"
+                text_color = "#0000FF"
+            else:
+                color = "#95D1FF" if is_natural else '#0000FF'
+                text = "闲"
+                text_color = 'black' if is_natural else 'white'
+                outline_color = '#0000FF'
+        elif winner == 'Banker':
+            if (self.game_mode == "tiger" and banker_score == 6 or  ## 老虎模式
+                        self.game_mode == "lucky7" and banker_score == 6):  ## 幸运7模式
+                if banker_hand_len == 2:
                     color = "#FFFFFF"
-                    text = "猴"
-                    outline_color = "#0000FF"
-                    text_color = "#0000FF"
-                else:
-                    color = "#95D1FF" if is_natural else '#0000FF'
-                    text = "闲"
-                    text_color = 'black' if is_natural else 'white'
-                    outline_color = '#0000FF'
-            elif winner == 'Banker':
-                if (self.game_mode == "tiger" and banker_score == 6 or  ## 老虎模式
-                            self.game_mode == "lucky7" and banker_score == 6):  ## 幸运7模式
-                    if banker_hand_len == 2:
-                        color = "#FFFFFF"
-                        text_color = '#FF0000'
-                        outline_color = '#FF0000'
-                        text = "小"
-                    elif banker_hand_len == 3:
-                        text = "大"
-                        color = "#FFFFFF"
-                        outline_color = '#FF0000'
-                        text_color = '#FF0000'
-                elif self.game_mode == "ez" and banker_hand_len == 3 and banker_score == 9:  ## 简单模式
-                    color = "#F2FF00"
-                    text = "神"
-                    text_color = '#FF0000'
-                    outline_color = '#FF0000'
-                elif (self.game_mode == "ez" and banker_hand_len == 3 and banker_score == 7 or   ## 简单模式
-                                self.game_mode == "monkey" and banker_hand_len == 3 and banker_score == 7):  ## 猴子模式
-                    text = "7"
-                    color = '#FFFF00'
                     text_color = '#FF0000'
                     outline_color = '#FF0000'
-                elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
+                    text = "小"
+                elif banker_hand_len == 3:
+                    text = "大"
                     color = "#FFFFFF"
-                    text = "猴"
-                    outline_color = "#FF0000"
-                    text_color = "#FF0000"
-                else:
-                    text = "庄"
-                    text_color = 'black' if is_natural else 'white'
-                    color = "#FF7700" if is_natural else '#FF0000'
-            else:
-                if self.game_mode == "tiger" and is_stiger:  ## 老虎模式
-                    text = "和"
-                    text_color = "#00A100"
-                    outline_color = '#00A100'
-                    color = "#FFFFFF"
-                elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
-                    color = "#FFFFFF"
-                    text = "猴"
-                    outline_color = "#00A100"
-                    text_color = "#00A100"
-                elif self.game_mode == "ez" and player_hand_len == 3 and player_score == 9 and banker_hand_len == 3 and banker_score == 9:  ## 简单模式
-                    color = "#F2FF00"
-                    text = "神"
-                    text_color = '#00A100'
-                    outline_color = '#00A100'
-                else:  # Tie
-                    color = '#00FF00'
-                    text = "和"
-                    text_color = 'black'
-                    outline_color = 'black'
-            
-            # 绘制主圆点
-            self.marker_canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                fill=color,
-                outline=outline_color,
-                width=2,  
-                tags='dot'
-            )
-
-            # 绘制对子标记点
-            pair_radius = cell_size * 0.12  # 对子点半径
-            border_width = 2.5  # 白色边框宽度
-
-            # 双方对子且点数相同 - 在四个角都显示黑色点（带白色边框）
-            if is_same_rank_pair:
-                # 两个角的位置
-                positions = [
-                    (x1 + pair_radius * 1.25, y1 + pair_radius * 1.25),  # 左上角
-                    (x2 - pair_radius * 1.25, y2 - pair_radius * 1.25)   # 右下角
-                ]
-                
-                for pos_x, pos_y in positions:
-                    # 先绘制白色边框
-                    self.marker_canvas.create_oval(
-                        pos_x - pair_radius - border_width/2, 
-                        pos_y - pair_radius - border_width/2,
-                        pos_x + pair_radius + border_width/2, 
-                        pos_y + pair_radius + border_width/2,
-                        fill='#FFFFFF',  # 白色边框
-                        outline='',
-                        tags='dot'
-                    )
-                    
-                    # 再绘制黑色点
-                    self.marker_canvas.create_oval(
-                        pos_x - pair_radius, pos_y - pair_radius,
-                        pos_x + pair_radius, pos_y + pair_radius,
-                        fill='#000000',  # 黑色
-                        outline='',
-                        tags='dot'
-                    )
+                    outline_color = '#FF0000'
+                    text_color = '#FF0000'
+            elif self.game_mode == "ez" and banker_hand_len == 3 and banker_score == 9:  ## 简单模式
+                color = "#F2FF00"
+                text = "神"
+                text_color = '#FF0000'
+                outline_color = '#FF0000'
+            elif (self.game_mode == "ez" and banker_hand_len == 3 and banker_score == 7 or   ## 简单模式
+                            self.game_mode == "monkey" and banker_hand_len == 3 and banker_score == 7):  ## 猴子模式
+                text = "7"
+                color = '#FFFF00'
+                text_color = '#FF0000'
+                outline_color = '#FF0000'
+            elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
+                color = "#FFFFFF"
+                text = "猴"
+                outline_color = "#FF0000"
+                text_color = "#FF0000"
             else:
-                # 闲家对子 - 左上角蓝色点（带白色边框）
-                if is_player_pair:
-                    pair_x = x1 + pair_radius * 1.25
-                    pair_y = y1 + pair_radius * 1.25
-                    
-                    # 先绘制白色边框
-                    self.marker_canvas.create_oval(
-                        pair_x - pair_radius - border_width/2, 
-                        pair_y - pair_radius - border_width/2,
-                        pair_x + pair_radius + border_width/2, 
-                        pair_y + pair_radius + border_width/2,
-                        fill='#FFFFFF',  # 白色边框
-                        outline='',
-                        tags='dot'
-                    )
-                    
-                    # 再绘制蓝色点
-                    self.marker_canvas.create_oval(
-                        pair_x - pair_radius, pair_y - pair_radius,
-                        pair_x + pair_radius, pair_y + pair_radius,
-                        fill="#0000FF",  # 蓝色
-                        outline='',
-                        tags='dot'
-                    )
-                
-                # 庄家对子 - 右下角红色点（带白色边框）
-                if is_banker_pair:
-                    pair_x = x2 - pair_radius * 1.25
-                    pair_y = y2 - pair_radius * 1.5
-                    
-                    # 先绘制白色边框
-                    self.marker_canvas.create_oval(
-                        pair_x - pair_radius - border_width/2, 
-                        pair_y - pair_radius - border_width/2,
-                        pair_x + pair_radius + border_width/2, 
-                        pair_y + pair_radius + border_width/2,
-                        fill='#FFFFFF',  # 白色边框
-                        outline='',
-                        tags='dot'
-                    )
-                    
-                    # 再绘制红色点
-                    self.marker_canvas.create_oval(
-                        pair_x - pair_radius, pair_y - pair_radius,
-                        pair_x + pair_radius, pair_y + pair_radius,
-                        fill='#FF0000',  # 红色
-                        outline='',
-                        tags='dot'
-                    )
+                text = "庄"
+                text_color = 'black' if is_natural else 'white'
+                color = "#FF7700" if is_natural else '#FF0000'
+        else:
+            if self.game_mode == "tiger" and is_stiger:  ## 老虎模式
+                text = "和"
+                text_color = "#00A100"
+                outline_color = '#00A100'
+                color = "#FFFFFF"
+            elif self.game_mode == "monkey" and is_banker_monkey and not is_player_monkey and player_hand_len == 3 and banker_hand_len == 3:  ## 猴子模式
+                color = "#FFFFFF"
+                text = "猴"
+                outline_color = "#00A100"
+                text_color = "#00A100"
+            elif self.game_mode == "ez" and player_hand_len == 3 and player_score == 9 and banker_hand_len == 3 and banker_score == 9:  ## 简单模式
+                color = "#F2FF00"
+                text = "神"
+                text_color = '#00A100'
+                outline_color = '#00A100'
+            else:  # Tie
+                color = '#00FF00'
+                text = "和"
+                text_color = 'black'
+                outline_color = 'black'
+
+        # 对子角标：双方同点对子两角都显示黑点，否则闲对左上蓝点、庄对右下红点
+        if is_same_rank_pair:
+            marks = ('#000000', '#000000')
+        else:
+            marks = ('#0000FF' if is_player_pair else None,
+                     '#FF0000' if is_banker_pair else None)
 
-            if text == "7-6":
-                font_size = 10  # 稍微增大字体
-            elif text == "猴和" and text == "猴闲" and text == "猴庄":
-                font_size = 10
-            else:
-                font_size = 12  # 稍微增大字体
+        font_size = 10 if text == "7-6" else 12
 
-            self.marker_canvas.create_text(
-                center_x, center_y,
-                text=text,
-                fill=text_color,
-                font=('Arial', font_size, 'bold'),
-                tags='dot'
-            )
+        return MarkerStyle(color, outline_color, text, text_color,
+                           ('Arial', font_size, 'bold'), marks)
 
     def read_data_file(self):
         """读取数据文件内容"""
@@ -5594,6 +5451,7 @@ class BaccaratGUI(tk.Tk):
             self.after(10)
         self._flip_card((hand_type, card_id), card, index+4)
 
+    @metrics.timed()
     def resolve_bets(self):
         is_natural = False
         is_stiger = False
@@ -6229,6 +6087,7 @@ class BaccaratGUI(tk.Tk):
             self._initialize_game(True)
             return
 
+    @metrics.timed()
     def _update_bigroad(self):
         """
         更新"大路"
@@ -0,0 +1,188 @@
+"""百家乐 NumPy 向量化结算核心
+
+输入为 (n × 6) 的点数数组，每行一局，列顺序与 Baccarat.play_game 取牌顺序相同:
+    [闲1, 庄1, 闲2, 庄2, 第一张补牌, 第二张补牌]
+Baccarat 引擎的补牌依次从牌堆末尾取出：闲家补牌时用第一张补牌、
+庄家再用第二张；闲家不补时庄家直接用第一张补牌。
+
+一次向量化计算出所有局的点数、补牌决定和胜负，结果与标量引擎逐局一致
+（见 verify_against_scalar）。
+"""
+import os
+import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+# 胜负编码
+PLAYER, BANKER, TIE = 0, 1, 2
+WINNER_NAMES = ('Player', 'Banker', 'Tie')
+
+# 点数 1-13（A-K）对应的牌值
+RANK_VALUES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 0, 0, 0)
+RANK_NAMES = (None, 'A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Baccarat_Kernel 需要 numpy，请先执行 pip install numpy")
+
+
+def banker_draw_table():
+    """庄家补牌表 [庄家前两张点数, 闲家第三张牌值(10 表示闲家未补)] -> 是否补牌"""
+    _require_numpy()
+    table = np.zeros((10, 11), dtype=bool)
+    table[:6, 10] = True                 # 闲家未补牌：庄家 0-5 补
+    table[:3, :10] = True                # 0-2 一定补
+    table[3, :10] = True
+    table[3, 8] = False                  # 3：闲家第三张不是 8 时补
+    table[4, 2:8] = True                 # 4：2-7
+    table[5, 4:8] = True                 # 5：4-7
+    table[6, 6:8] = True                 # 6：6-7
+    return table
+
+
+_BANKER_TABLE = None
+
+
+def resolve_hands(cards):
+    """向量化结算
+
+    cards: (n, 6) 整数数组（牌值 0-9）
+    返回 dict，各项均为长度 n 的数组:
+        player_score / banker_score  最终点数
+        player_draw / banker_draw    是否补牌
+        natural                      是否例牌（任一方前两张 8/9）
+        winner                       PLAYER / BANKER / TIE
+        cards_used                   本局用牌数 4-6
+    """
+    global _BANKER_TABLE
+    _require_numpy()
+    if _BANKER_TABLE is None:
+        _BANKER_TABLE = banker_draw_table()
+
+    cards = np.asarray(cards, dtype=np.int8)
+    p_initial = (cards[:, 0] + cards[:, 2]) % 10
+    b_initial = (cards[:, 1] + cards[:, 3]) % 10
+
+    natural = (p_initial >= 8) | (b_initial >= 8)
+    player_draw = ~natural & (p_initial <= 5)
+
+    # 闲家第三张的牌值；未补牌用 10 作为查表列
+    third_val = np.where(player_draw, cards[:, 4], 10)
+    banker_draw = ~natural & _BANKER_TABLE[b_initial, third_val]
+    banker_card = np.where(player_draw, cards[:, 5], cards[:, 4])
+
+    player_score = (p_initial + np.where(player_draw, cards[:, 4], 0)) % 10
+    banker_score = (b_initial + np.where(banker_draw, banker_card, 0)) % 10
+
+    winner = np.full(len(cards), TIE, dtype=np.int8)
+    winner[player_score > banker_score] = PLAYER
+    winner[banker_score > player_score] = BANKER
+
+    return {
+        'player_score': player_score,
+        'banker_score': banker_score,
+        'player_draw': player_draw,
+        'banker_draw': banker_draw,
+        'natural': natural,
+        'winner': winner,
+        'cards_used': 4 + player_draw.astype(np.int8) + banker_draw.astype(np.int8),
+    }
+
+
+def sample_hands(n, decks=8, rng=None):
+    """从整副牌靴的组成中为每局独立抽 6 张牌（局内不放回）
+
+    返回 (ranks, values)，均为 (n, 6) 数组；ranks 为 1-13，可用于对子判断。
+    牌靴在局与局之间不消耗，适合 what-if 分析和大样本估计。
+    """
+    _require_numpy()
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = np.full((n, 13), 4 * decks, dtype=np.int32)
+    rows = np.arange(n)
+    ranks = np.empty((n, 6), dtype=np.int8)
+    for k in range(6):
+        # 按每行剩余张数加权抽一张，再从该行扣除
+        remaining = 52 * decks - k
+        target = rng.integers(0, remaining, size=n)
+        picked = (np.cumsum(counts, axis=1) > target[:, None]).argmax(axis=1)
+        counts[rows, picked] -= 1
+        ranks[:, k] = picked + 1
+    values = np.asarray(RANK_VALUES, dtype=np.int8)[ranks]
+    return ranks, values
+
+
+def tiger_dragon_hits(result):
+    """老虎 / EZ 玩法中只依赖点数和牌数的边注命中情况（布尔数组）"""
+    winner = result['winner']
+    p_score = result['player_score']
+    b_score = result['banker_score']
+    p_three = result['player_draw']
+    b_three = result['banker_draw']
+    banker_six = (winner == BANKER) & (b_score == 6)
+    return {
+        'Small Tiger': banker_six & ~b_three,
+        'Big Tiger': banker_six & b_three,
+        'Tiger Tie': (winner == TIE) & (b_score == 6),
+        'Dragon 7': (winner == BANKER) & b_three & (b_score == 7),
+        'Panda 8': (winner == PLAYER) & p_three & (p_score == 8),
+    }
+
+
+def verify_against_scalar(n=100000, seed=0):
+    """随机生成 n 局牌，与 Baccarat 标量引擎逐局比对；返回不一致的局数"""
+    _require_numpy()
+    from Baccarat import Baccarat
+
+    rng = np.random.default_rng(seed)
+    ranks = rng.integers(1, 14, size=(n, 6), dtype=np.int8)
+    values = np.asarray(RANK_VALUES, dtype=np.int8)[ranks]
+    result = resolve_hands(values)
+
+    game = Baccarat(decks=1)
+    filler = [('Spade', 'K')] * 8
+    mismatches = 0
+    for i in range(n):
+        row = [('Spade', RANK_NAMES[r]) for r in ranks[i].tolist()]
+        # 前 4 张按 cut_position 顺序发出，补牌从末尾依次 pop
+        game.deck = row[:4] + filler + [row[5], row[4]]
+        game.total_cards = len(game.deck)
+        game.cut_position = 0
+        game.play_game()
+        expected = (
+            game.player_score, game.banker_score,
+            len(game.player_hand) == 3, len(game.banker_hand) == 3,
+            WINNER_NAMES.index(game.winner),
+        )
+        actual = (
+            int(result['player_score'][i]), int(result['banker_score'][i]),
+            bool(result['player_draw'][i]), bool(result['banker_draw'][i]),
+            int(result['winner'][i]),
+        )
+        if expected != actual:
+            mismatches += 1
+    return mismatches
+
+
+if __name__ == "__main__":
+    import time
+
+    count = 200000
+    bad = verify_against_scalar(count)
+    print(f"与标量引擎比对 {count:,} 局，不一致 {bad} 局")
+
+    start = time.perf_counter()
+    ranks, values = sample_hands(1000000, rng=np.random.default_rng(random.getrandbits(32)))
+    result = resolve_hands(values)
+    elapsed = time.perf_counter() - start
+    for code, name in enumerate(WINNER_NAMES):
+        print(f"{name:<8}{np.mean(result['winner'] == code):.6f}")
+    print(f"1,000,000 局（含抽牌）耗时 {elapsed:.2f} 秒")
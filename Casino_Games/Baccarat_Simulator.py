@@ -0,0 +1,246 @@
+"""百家乐无界面模拟器
+
+直接使用 Baccarat.py 中的 Baccarat 牌局引擎（切牌/烧牌、补牌规则、胜负判定）
+和 BaccaratGUI._check_side_bets 边注判定，在多进程中批量模拟整靴牌局，
+统计结果、对子、例牌以及老虎/龙宝等边注的命中频率。
+
+--fast 使用 Baccarat_Kernel 的 NumPy 向量化核心（每局从完整牌靴组成中抽牌，
+不模拟牌靴消耗，只统计依赖点数/牌数的边注）。
+
+用法:
+    python Baccarat_Simulator.py --hands 1000000 --workers 4
+    python Baccarat_Simulator.py --hands 50000000 --fast
+"""
+import argparse
+import os
+import random
+import secrets
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from Baccarat import Baccarat, BaccaratGUI
+
+# 与 BaccaratGUI 开局弃牌流程一致的弃牌数量
+DEDUCT_MAP = {
+    'A': 1, 'J': 10, 'Q': 10, 'K': 10,
+    '10': 10, '2': 2, '3': 3, '4': 4, '5': 5,
+    '6': 6, '7': 7, '8': 8, '9': 9
+}
+
+# 剩余牌数少于该值时换新牌靴（同 BaccaratGUI.start_game）
+RESHUFFLE_AT = 60
+
+DEFAULT_SIDE_MODES = ("tiger", "ez")
+
+
+class SimStats:
+    """可合并的统计直方图"""
+    FIELDS = ('outcome', 'pairs', 'naturals', 'scores', 'cards', 'side_bets', 'shoe_hands')
+
+    def __init__(self):
+        self.hands = 0
+        self.shoes = 0
+        for name in self.FIELDS:
+            setattr(self, name, Counter())
+
+    def merge(self, other):
+        self.hands += other.hands
+        self.shoes += other.shoes
+        for name in self.FIELDS:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def freq(self, counter_name, key):
+        if not self.hands:
+            return 0.0
+        return getattr(self, counter_name)[key] / self.hands
+
+    def report(self):
+        lines = [f"总局数: {self.hands:,}  牌靴: {self.shoes:,}"]
+        lines.append("结果:")
+        for key in ('Banker', 'Player', 'Tie'):
+            lines.append(f"  {key:<8}{self.freq('outcome', key):.6f}")
+        lines.append("对子:")
+        for key in ('Player Pair', 'Banker Pair', 'Both Pair'):
+            lines.append(f"  {key:<12}{self.freq('pairs', key):.6f}")
+        lines.append("例牌(8/9):")
+        for key in ('Player Natural', 'Banker Natural'):
+            lines.append(f"  {key:<15}{self.freq('naturals', key):.6f}")
+        lines.append("牌数:")
+        for key in sorted(self.cards):
+            lines.append(f"  {key} 张  {self.freq('cards', key):.6f}")
+        lines.append("边注命中 (模式/边注/赔率):")
+        for (mode, name, odds), count in sorted(self.side_bets.items(), key=lambda x: (x[0][0], x[0][1], str(x[0][2]))):
+            lines.append(f"  {mode:<6}{name:<14}{odds!s:>6}  {count / self.hands:.6f}")
+        return "\n".join(lines)
+
+
+def new_shoe(decks=8):
+    """建立新牌靴：切牌 + advanced_shuffle + 开局烧牌（与 BaccaratGUI 流程一致）"""
+    game = Baccarat(decks=decks)
+    game.advanced_shuffle(random.randint(103, 299))
+    first_card = game.deck[0]
+    game.deck = game.deck[1 + DEDUCT_MAP.get(first_card[1], 0):]
+    return game
+
+
+def record_hand(game, stats, side_checker):
+    """把一局结果计入统计"""
+    p = game.player_hand
+    b = game.banker_hand
+    stats.hands += 1
+    stats.outcome[game.winner] += 1
+    stats.scores[(game.player_score, game.banker_score)] += 1
+    stats.cards[len(p) + len(b)] += 1
+
+    player_pair = p[0][1] == p[1][1]
+    banker_pair = b[0][1] == b[1][1]
+    if player_pair:
+        stats.pairs['Player Pair'] += 1
+    if banker_pair:
+        stats.pairs['Banker Pair'] += 1
+    if player_pair and banker_pair:
+        stats.pairs['Both Pair'] += 1
+
+    if len(p) == 2 and len(b) == 2:
+        p_initial = game.calculate_score(p)
+        b_initial = game.calculate_score(b)
+        if p_initial >= 8:
+            stats.naturals['Player Natural'] += 1
+        if b_initial >= 8:
+            stats.naturals['Banker Natural'] += 1
+
+    for checker in side_checker:
+        for name, odds in BaccaratGUI._check_side_bets(checker).items():
+            if odds:
+                stats.side_bets[(checker.game_mode, name, odds)] += 1
+
+
+def simulate_chunk(hands, seed=None, side_modes=DEFAULT_SIDE_MODES, decks=8):
+    """工作进程：用独立牌靴模拟 hands 局，返回 SimStats"""
+    random.seed(seed if seed is not None else secrets.randbits(64))
+    stats = SimStats()
+    game = new_shoe(decks)
+    checkers = [SimpleNamespace(game=game, game_mode=mode, current_bets={}) for mode in side_modes]
+    shoe_hands = 0
+    for _ in range(hands):
+        if len(game.deck) - game.cut_position < RESHUFFLE_AT:
+            stats.shoes += 1
+            stats.shoe_hands[shoe_hands] += 1
+            shoe_hands = 0
+            game = new_shoe(decks)
+            for checker in checkers:
+                checker.game = game
+        game.play_game()
+        record_hand(game, stats, checkers)
+        shoe_hands += 1
+    return stats
+
+
+# 向量化核心可计算的边注：(玩法, 边注, 赔率)
+KERNEL_SIDE_BETS = {
+    'Small Tiger': ('tiger', 'Small Tiger', 22),
+    'Big Tiger': ('tiger', 'Big Tiger', 50),
+    'Tiger Tie': ('tiger', 'Tiger Tie', 35),
+    'Dragon 7': ('ez', 'Dragon 7', 40),
+    'Panda 8': ('ez', 'Panda 8', 25),
+}
+
+
+def simulate_chunk_vectorized(hands, seed=None, side_modes=DEFAULT_SIDE_MODES, decks=8):
+    """工作进程（快速路径）：用 NumPy 核心一次结算 hands 局"""
+    import numpy as np
+    import Baccarat_Kernel as kernel
+
+    rng = np.random.default_rng(seed if seed is not None else secrets.randbits(64))
+    ranks, values = kernel.sample_hands(hands, decks, rng)
+    result = kernel.resolve_hands(values)
+
+    stats = SimStats()
+    stats.hands = hands
+    for code, name in enumerate(kernel.WINNER_NAMES):
+        stats.outcome[name] = int(np.count_nonzero(result['winner'] == code))
+
+    player_pair = ranks[:, 0] == ranks[:, 2]
+    banker_pair = ranks[:, 1] == ranks[:, 3]
+    stats.pairs['Player Pair'] = int(player_pair.sum())
+    stats.pairs['Banker Pair'] = int(banker_pair.sum())
+    stats.pairs['Both Pair'] = int((player_pair & banker_pair).sum())
+
+    stats.naturals['Player Natural'] = int(((values[:, 0] + values[:, 2]) % 10 >= 8).sum())
+    stats.naturals['Banker Natural'] = int(((values[:, 1] + values[:, 3]) % 10 >= 8).sum())
+
+    score_keys = result['player_score'].astype(np.int16) * 10 + result['banker_score']
+    for key, count in zip(*np.unique(score_keys, return_counts=True)):
+        stats.scores[(int(key) // 10, int(key) % 10)] = int(count)
+    for used, count in zip(*np.unique(result['cards_used'], return_counts=True)):
+        stats.cards[int(used)] = int(count)
+
+    for name, hits in kernel.tiger_dragon_hits(result).items():
+        mode, bet, odds = KERNEL_SIDE_BETS[name]
+        if mode in side_modes:
+            stats.side_bets[(mode, bet, odds)] = int(hits.sum())
+    return stats
+
+
+def run_simulation(total_hands, workers=None, chunk_size=50000, seed=None,
+                   side_modes=DEFAULT_SIDE_MODES, progress=True, fast=False):
+    """把模拟分块交给进程池，边完成边合并统计并输出进度"""
+    workers = workers or os.cpu_count() or 1
+    chunks = []
+    remaining = total_hands
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+    base_seed = seed if seed is not None else secrets.randbits(32)
+
+    worker = simulate_chunk_vectorized if fast else simulate_chunk
+
+    stats = SimStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(worker, size, base_seed + i, tuple(side_modes))
+            for i, size in enumerate(chunks)
+        ]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if progress:
+                elapsed = time.perf_counter() - start
+                rate = stats.hands / elapsed * 60 if elapsed else 0
+                print(f"\r进度: {stats.hands:,}/{total_hands:,} 局  "
+                      f"{rate:,.0f} 局/分钟", end="", flush=True)
+    if progress:
+        print()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="百家乐无界面模拟器")
+    parser.add_argument("--hands", type=int, default=1000000, help="模拟局数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核心数）")
+    parser.add_argument("--chunk", type=int, default=50000, help="每个任务的局数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（可复现）")
+    parser.add_argument("--modes", default=",".join(DEFAULT_SIDE_MODES),
+                        help="统计边注的玩法，逗号分隔（tiger, ez, lucky7 ...）")
+    parser.add_argument("--fast", action="store_true", help="使用 NumPy 向量化核心")
+    args = parser.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    start = time.perf_counter()
+    chunk = args.chunk if not args.fast else max(args.chunk, 500000)
+    stats = run_simulation(args.hands, args.workers, chunk, args.seed, modes, fast=args.fast)
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(f"耗时 {elapsed:.1f} 秒，{stats.hands / elapsed * 60:,.0f} 局/分钟")
+
+
+if __name__ == "__main__":
+    main()
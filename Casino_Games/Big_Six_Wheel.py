@@ -1,7 +1,9 @@
 import json
 import math
 import os
+import queue
 import random
+import sys
 import time
 import tkinter as tk
 from tkinter import messagebox, ttk
@@ -11,6 +13,15 @@ try:
 except Exception:
     Image = ImageTk = ImageColor = None
 
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "A_Tools")
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from marker_road import MarkerRoad, MarkerStyle
+import metrics
+import shared_table
+from engines import EngineError
+
 
 # ---------------------------
 # Paths / persistence helpers
@@ -72,6 +83,7 @@ def load_balance(username: str, default_balance: float = 1_000_000.0) -> float:
     return default_balance
 
 
+@metrics.timed()
 def update_balance_in_json(username: str, new_balance: float):
     if username == "Guest":
         return
@@ -276,8 +288,10 @@ class BigSixHistory:
 class BigSixWheelGUI(tk.Tk):
     BETTING_SECONDS = 0
     TIMER_TICK_MS = 250
+    TABLE_POLL_MS = 50
+    SHARED_TABLE_GAME = "bigsix"
 
-    def __init__(self, initial_balance=1_000_000, username="Guest"):
+    def __init__(self, initial_balance=1_000_000, username="Guest", shared=False):
         super().__init__()
         self.title("幸运之轮")
         self.geometry("1350x700+50+10")
@@ -288,6 +302,16 @@ class BigSixWheelGUI(tk.Tk):
         self.balance = float(load_balance(username, float(initial_balance)))
         self.history = BigSixHistory(big_six_log_path())
 
+        # 共享牌桌模式：倒计时、开奖、结算与历史记录都由 shared_table 统一处理，
+        # 本窗口只负责下注和转轮动画
+        self.table = None
+        self.table_player = username
+        self._table_events = queue.Queue()
+        self._table_result = None
+        self._pending_round = None
+        self._target_index = None
+        joined = self._join_shared_table() if shared else None
+
         # 标记路相关数据
         self.marker_results = []
         self.stats_counts = {k: 0 for k in OUTCOME_DISPLAY}
@@ -319,10 +343,17 @@ class BigSixWheelGUI(tk.Tk):
 
         self._build_ui()
         self._sync_marker_from_history()
-        self._start_new_round()
+        if joined is not None:
+            # 本局已封盘时先锁定下注，等下一局开始
+            in_betting = joined.get("phase") == "betting" and joined.get("deadline")
+            self._start_new_round(deadline=joined["deadline"] if in_betting else time.time())
+            self.after(self.TABLE_POLL_MS, self._poll_table)
+        else:
+            self._start_new_round()
 
         self.bind('<Return>', lambda event: self.start_game())
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     # ------------------- UI build (保持不变) -------------------
     def _build_ui(self):
@@ -743,65 +774,21 @@ class BigSixWheelGUI(tk.Tk):
             self.percent_labels[cat].config(text=f"{cat}: {percent:.2f}%")
 
     def _draw_marker_grid(self):
-        self.marker_canvas.delete('all')
-        rows, cols = self.marker_rows, self.marker_cols
-        cell_size = 30
-        padding = 0
-        width = cols * (cell_size + padding) + padding
-        height = rows * (cell_size + padding) + padding
-        self.marker_canvas.config(width=width, height=height)
-
-        for col in range(cols):
-            for row in range(rows):
-                x1 = padding + col * (cell_size + padding)
-                y1 = padding + row * (cell_size + padding)
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                self.marker_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#888888',
-                    fill='#D0E7FF'
-                )
+        # 网格与圆点槽位只创建一次，之后由 _update_marker_road 原地更新
+        self.marker_road = MarkerRoad(
+            self.marker_canvas, self.marker_rows, self.marker_cols, cell_size=30,
+            grid_outline='#888888', grid_fill='#D0E7FF', dot_width=2
+        )
 
     def _update_marker_road(self):
-        self._draw_marker_grid()
-        rows, cols = self.marker_rows, self.marker_cols
-        cell_size = 30
-        padding = 0
-
-        max_display = rows * cols
-        start_idx = max(0, len(self.marker_results) - max_display)
-        results_to_show = self.marker_results[start_idx:]
-
-        for idx, result in enumerate(results_to_show):
-            if idx >= max_display:
-                break
-            col = idx // rows
-            row = idx % rows
-            x1 = padding + col * (cell_size + padding)
-            y1 = padding + row * (cell_size + padding)
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-            center_x = (x1 + x2) / 2
-            center_y = (y1 + y2) / 2
-            radius = cell_size * 0.4
-
-            self.marker_canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                fill=OUTCOME_COLORS.get(result, '#FFFFFF'),
-                outline='#000000',
-                width=2,
-                tags='dot'
-            )
+        styles = []
+        for result in self.marker_results[-self.marker_road.capacity:]:
             font = ("Segoe UI Emoji", 12, "bold") if result in ("👑", "💵") else ("Arial", 12, "bold")
-            self.marker_canvas.create_text(
-                center_x, center_y,
-                text=result,
-                fill=OUTCOME_TEXT_COLORS.get(result, 'black'),
-                font=font,
-                tags='dot'
-            )
+            styles.append(MarkerStyle(
+                OUTCOME_COLORS.get(result, '#FFFFFF'), '#000000', result,
+                OUTCOME_TEXT_COLORS.get(result, 'black'), font
+            ))
+        self.marker_road.set_results(styles)
 
     def _sync_marker_from_history(self):
         raw_hist = self.history.recent_results(limit=54)
@@ -821,6 +808,7 @@ class BigSixWheelGUI(tk.Tk):
         self._update_pie_chart()
 
     # ------------------- 轮盘绘制 -------------------
+    @metrics.timed()
     def _draw_wheel(self):
         self.wheel_canvas.delete("all")
         w, h = 900, 430
@@ -919,7 +907,9 @@ class BigSixWheelGUI(tk.Tk):
         return 360.0 / len(WHEEL_SEQUENCE)
 
     # ------------------- 游戏流程 -------------------
-    def _start_new_round(self):
+    def _start_new_round(self, deadline=None):
+        self._pending_round = None
+        self._target_index = None
         self.center_display_result = None
         self._draw_wheel()
 
@@ -944,7 +934,7 @@ class BigSixWheelGUI(tk.Tk):
         self._set_control_buttons_state(tk.NORMAL)
         self._refresh_bet_button_texts()
 
-        self.betting_deadline = time.time() + self.BETTING_SECONDS
+        self.betting_deadline = deadline if deadline is not None else time.time() + self.BETTING_SECONDS
         self._update_countdown()
 
     def _update_countdown(self):
@@ -955,16 +945,23 @@ class BigSixWheelGUI(tk.Tk):
             self.wheel_canvas.itemconfig(self.wheel_timer_id, text=f"{remaining:02d}s")
         if remaining <= 0:
             self._countdown_job = None
-            self._lock_bets_and_spin()
+            if self.table is not None:
+                # 共享桌由牌桌统一封盘，收到开奖结果后再转轮
+                self._lock_bets()
+            else:
+                self._lock_bets_and_spin()
             return
         self._countdown_job = self.after(self.TIMER_TICK_MS, self._update_countdown)
 
     def _lock_bets_and_spin(self):
+        self._lock_bets()
+        self._start_physical_spin()
+
+    def _lock_bets(self):
         self.round_state = "spinning"
         self._set_bet_buttons_state(tk.DISABLED)
         self._disable_amount_buttons()
         self._set_control_buttons_state(tk.DISABLED)
-        self._start_physical_spin()
 
     # ------------------- 物理旋转核心 -------------------
     def _start_physical_spin(self):
@@ -975,11 +972,27 @@ class BigSixWheelGUI(tk.Tk):
         self._last_physics_time = time.time()
         self._physics_update()
 
+    def _aim_wheel(self, index):
+        """共享桌：按牌桌的开奖结果调整轮盘减速度，使指针停在该格子上
+
+        每帧按剩余行程重新计算，逐帧积分的误差不会累积；减速度只在随机值附近微调。
+        """
+        step = self._segment_angle()
+        target = -(index + 0.5) * step
+        nominal = self.wheel_velocity ** 2 / (-2 * self.wheel_acceleration)
+        travel = (target - self.current_wheel_offset) % 360.0
+        travel += 360.0 * max(0, round((nominal - travel) / 360.0))
+        if travel > 1e-6:
+            self.wheel_acceleration = -self.wheel_velocity ** 2 / (2 * travel)
+
     def _physics_update(self):
         now = time.time()
         dt = min(0.05, now - self._last_physics_time)  # 限制最大步长
         self._last_physics_time = now
 
+        if self._target_index is not None and self.wheel_velocity > 0:
+            self._aim_wheel(self._target_index)
+
         self.wheel_velocity += self.wheel_acceleration * dt
         self.wheel_angle_delta = self.wheel_velocity * dt
         self.current_wheel_offset = (self.current_wheel_offset + self.wheel_angle_delta) % 360.0
@@ -996,9 +1009,12 @@ class BigSixWheelGUI(tk.Tk):
         self.is_spinning = False
         self.wheel_velocity = 0.0
         self.current_wheel_offset %= 360.0
+        step = 360.0 / len(WHEEL_SEQUENCE)
+        if self._target_index is not None:
+            # 逐帧积分与连续运动有少许误差，停下后对准开奖格子的中央
+            self.current_wheel_offset = (-(self._target_index + 0.5) * step) % 360.0
         self._draw_wheel()
 
-        step = 360.0 / len(WHEEL_SEQUENCE)
         raw_index = ((-self.current_wheel_offset) / step - 0.5) % len(WHEEL_SEQUENCE)
         self.current_round_index = int(round(raw_index)) % len(WHEEL_SEQUENCE)
         self.current_round_result = WHEEL_SEQUENCE[self.current_round_index]
@@ -1008,12 +1024,16 @@ class BigSixWheelGUI(tk.Tk):
     def _finish_round(self, result):
         payout = self._settle_bets(result)
 
-        self.history.add_result(
-            result=result,
-            bet_snapshot={k: v for k, v in self.current_bets.items() if v},
-            payout=payout,
-            wheel_index=self.current_round_index + 1,
-        )
+        if self.table is not None:
+            # 历史记录已由牌桌写入，这里只重新读取
+            self.history.data = self.history._load_or_create()
+        else:
+            self.history.add_result(
+                result=result,
+                bet_snapshot={k: v for k, v in self.current_bets.items() if v},
+                payout=payout,
+                wheel_index=self.current_round_index + 1,
+            )
         self.add_marker_result(result)
 
         self._refresh_balance_display()
@@ -1028,7 +1048,12 @@ class BigSixWheelGUI(tk.Tk):
         self.center_display_result = result
         self._draw_wheel()
 
-        self.after(2500, self._start_new_round)
+        if self.table is None:
+            self.after(2500, self._start_new_round)
+        elif self._pending_round is not None:
+            # 转轮动画较长时下一局已经开始，展示一会儿结果后再进入
+            pending = self._pending_round
+            self.after(2500, lambda: self._start_new_round(deadline=pending["deadline"]))
 
     # ------------------- 下注相关 -------------------
     def place_bet(self, symbol: str):
@@ -1053,6 +1078,8 @@ class BigSixWheelGUI(tk.Tk):
         if self.balance < actual_amount:
             messagebox.showwarning("余额不足", f"余额不足，无法下注 ${actual_amount:,.0f}。")
             return
+        if not self._table_bet(symbol, actual_amount):
+            return
 
         self.balance -= actual_amount
         self.current_bets[symbol] += actual_amount
@@ -1065,6 +1092,8 @@ class BigSixWheelGUI(tk.Tk):
     def clear_bets(self):
         if self.round_state != "betting":
             return
+        if any(self.current_bets.values()) and not self._table_clear():
+            return
         refund = sum(self.current_bets.values())
         if refund > 0:
             self.balance += refund
@@ -1078,6 +1107,8 @@ class BigSixWheelGUI(tk.Tk):
             return
         amount = self.current_bets.get(symbol, 0)
         if amount > 0:
+            if not self._table_clear(symbol):
+                return
             self.balance += amount
             self.current_bets[symbol] = 0
             self._refresh_balance_display()
@@ -1086,6 +1117,9 @@ class BigSixWheelGUI(tk.Tk):
             self._refresh_bet_button_texts()
 
     def _settle_bets(self, result: str) -> float:
+        if self.table is not None:
+            return self._settle_from_table()
+
         total_payout = 0.0
         for symbol, amount in self.current_bets.items():
             if amount <= 0:
@@ -1126,16 +1160,106 @@ class BigSixWheelGUI(tk.Tk):
 
     def _refresh_balance_display(self):
         self.balance_label.config(text=f"余额: ${self.balance:,.2f}")
-        if self.username != "Guest":
+        if self.username != "Guest" and self.table is None:
             update_balance_in_json(self.username, self.balance)
 
     def on_close(self):
+        if self.table is not None:
+            # 余额由牌桌每局结算后写回，未结算的下注离桌后照常结算
+            self._leave_shared_table()
+        else:
+            try:
+                if self.username != "Guest":
+                    update_balance_in_json(self.username, self.balance)
+            except Exception:
+                pass
+        self.destroy()
+
+    # ------------------- 共享牌桌 -------------------
+    def _join_shared_table(self):
+        self.table = shared_table.connect(self.SHARED_TABLE_GAME)
+        joined = self.table.join(self.username, self.balance)
+        self.table_player = joined["player"]
+        self.balance = float(joined["balance"])
+        self.table.subscribe(self._table_events.put)
+        return joined
+
+    def _leave_shared_table(self):
+        table, self.table = self.table, None
         try:
-            if self.username != "Guest":
-                update_balance_in_json(self.username, self.balance)
-        except Exception:
+            table.leave(self.table_player)
+        except EngineError:
             pass
-        self.destroy()
+        table.close()
+
+    def _table_bet(self, symbol, amount):
+        """共享桌：先在牌桌登记下注，被拒绝时提示并返回 False"""
+        if self.table is None:
+            return True
+        try:
+            self.table.place_bet(self.table_player, symbol, amount)
+        except EngineError as e:
+            messagebox.showwarning("无法下注", str(e))
+            return False
+        return True
+
+    def _table_clear(self, symbol=None):
+        if self.table is None:
+            return True
+        try:
+            self.table.clear_bets(self.table_player, symbol)
+        except EngineError as e:
+            messagebox.showwarning("无法撤回", str(e))
+            return False
+        return True
+
+    def _poll_table(self):
+        """在主线程中处理牌桌事件（回调来自 socket 读取线程）"""
+        if self.table is None:
+            return
+        try:
+            while True:
+                event = self._table_events.get_nowait()
+                kind = event.get("event")
+                if kind == "round_started":
+                    if self.is_spinning or self.round_state == "spinning":
+                        self._pending_round = event
+                    else:
+                        self._start_new_round(deadline=event["deadline"])
+                elif kind == "round_result":
+                    self._on_table_result(event)
+                elif kind == "disconnected":
+                    self._leave_shared_table()
+                    self.balance += sum(self.current_bets.values())
+                    self.current_bets = {k: 0 for k in OUTCOME_DISPLAY}
+                    self._refresh_balance_display()
+                    messagebox.showwarning("共享牌桌", "与共享牌桌的连接已断开，改为单机模式。")
+                    self._start_new_round()
+                    return
+        except queue.Empty:
+            pass
+        self.after(self.TABLE_POLL_MS, self._poll_table)
+
+    def _on_table_result(self, event):
+        self._table_result = event
+        self._target_index = event["outcome"]["index"]
+        if self.round_state == "betting":
+            if self._countdown_job is not None:
+                try:
+                    self.after_cancel(self._countdown_job)
+                except Exception:
+                    pass
+                self._countdown_job = None
+            self._lock_bets()
+        if not self.is_spinning:
+            self._start_physical_spin()
+
+    def _settle_from_table(self):
+        mine = self._table_result["results"].get(self.table_player) if self._table_result else None
+        total_payout = float(mine["payout"]) if mine else 0.0
+        if mine:
+            self.balance = float(mine["balance"])
+        return total_payout
 
     def show_game_instructions(self):
         win = tk.Toplevel(self)
@@ -1164,7 +1288,7 @@ class BigSixWheelGUI(tk.Tk):
         tk.Button(win, text="关闭", command=win.destroy, font=("Arial", 12, "bold"), width=10).pack(pady=10)
 
     def start_game(self):
-        if self.round_state == "betting":
+        if self.round_state == "betting" and self.table is None:
             if self._countdown_job is not None:
                 try:
                     self.after_cancel(self._countdown_job)
@@ -1174,12 +1298,17 @@ class BigSixWheelGUI(tk.Tk):
             self._lock_bets_and_spin()
 
 
-def main(initial_balance=1_000_000, username="Guest"):
-    app = BigSixWheelGUI(initial_balance=initial_balance, username=username)
+def main(initial_balance=1_000_000, username="Guest", shared=False):
+    app = BigSixWheelGUI(initial_balance=initial_balance, username=username, shared=shared)
     app.mainloop()
     return app.balance
 
 
 if __name__ == "__main__":
-    final_balance = main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shared", action="store_true", help="加入共享牌桌（多个窗口同一局）")
+    parser.add_argument("--user", default="Guest")
+    args = parser.parse_args()
+    final_balance = main(username=args.user, shared=args.shared)
     print(f"Final balance: {final_balance}")
\ No newline at end of file
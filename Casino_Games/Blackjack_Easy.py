@@ -5,10 +5,16 @@ import random
 import json
 import os
 import math
-import secrets
 import subprocess, sys
 import time
 
+# 将A_Tools目录添加到系统路径（共享的随机流）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+import random_stream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -93,7 +99,7 @@ class Deck:
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
         
         # 保证 Python 输出为 UTF-8
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         
         try:
@@ -133,8 +139,8 @@ class Deck:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             # fallback：标准顺序+安全乱序
             self.full_deck = [Card(s, r) for _ in range(DECKS) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52 * DECKS)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52 * DECKS)
             
             # 在350-380之间的随机位置插入切牌
             cut_card_pos = random.randint(350, 380)
@@ -149,13 +155,6 @@ class Deck:
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
         self.cut_card_reached = False
     
-    def _secure_shuffle(self):
-        """Fisher–Yates 洗牌，用 secrets 保证随机性"""
-        n = len(self.full_deck)
-        for i in range(n - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = []
         for i in range(n):
@@ -0,0 +1,722 @@
+"""21点无界面蒙特卡洛模拟器
+
+按各版本 BlackjackGUI 中的规则（庄家软17、欧式无暗牌、加倍/投降、
+立即结算、Blackjack 赔率）用基本策略模拟整靴牌局，统计主注和各边注的
+期望值（EV）与 95% 置信区间。
+
+- 牌靴：8 副牌，剩余张数不超过切牌张数时换新牌靴（西班牙21点为 45 张，其余 60 张）
+- 基本策略：按各版本的结算规则，用无限副牌的动态规划求出每种
+  (点数, 软/硬, 张数, 庄家明牌) 的最优操作（要牌/停牌/加倍/投降/加倍UP）
+- 边注：直接调用各版本 BlackjackGame.check_* 判定，按相关牌缓存结果；
+  每局所有边注各下 1 个单位，庄家按下了边注时的流程补牌
+- 主注只下主注时的结算：玩家爆牌直接输，不看庄家的牌
+- 多进程：每个工作进程使用独立种子的牌靴
+
+用法:
+    python Blackjack_Simulator.py --variant classic --hands 2000000
+    python Blackjack_Simulator.py --variant all --hands 500000 --workers 4 --seed 1
+    python Blackjack_Simulator.py --variant spanish --strategy
+"""
+import argparse
+import importlib
+import math
+import os
+import random
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+# 牌用整数表示：点数序号 = card >> 2（0-12 对应 2-A），花色序号 = card & 3（对应 SUITS）
+CARD_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+VALUE_PROBS = {v: (4 if v == 10 else 1) / 13 for v in range(2, 12)}
+
+_MISSING = object()
+
+
+# ------------------- 边注判定 -------------------
+class SideBetChecker:
+    """用游戏模块自己的 BlackjackGame.check_* 判定边注，结果按相关牌缓存"""
+    def __init__(self, module):
+        self.game = module.BlackjackGame()
+        self.cards = [module.Card(module.SUITS[c & 3], module.RANKS[c >> 2]) for c in range(52)]
+        self.cache = {}
+
+    def check(self, method, player, dealer=()):
+        key = (method, player, dealer)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            self.game.player_hand = [self.cards[c] for c in player]
+            self.game.dealer_hand = [self.cards[c] for c in dealer]
+            result = getattr(self.game, method)()
+            self.cache[key] = result
+        return result
+
+
+class Round:
+    """一局的最终状态（传给结算和边注）"""
+    __slots__ = ('player', 'dealer', 'pt', 'dt', 'pbj', 'dbj', 'stake',
+                 'surrendered', 'double_up', 'sweet17', 'special')
+
+    def __init__(self):
+        self.surrendered = False
+        self.double_up = False
+        self.sweet17 = None
+        self.special = None
+
+
+# ------------------- 各版本规则 -------------------
+class Variant:
+    """版本规则；结算金额均为以主注 1 单位计的净输赢"""
+    key = ''
+    name = ''
+    module_name = ''
+    reshuffle_at = 60
+    surrender = False
+    double_up = False
+    side_bets = ()
+
+    def __init__(self):
+        self.checker = None
+
+    def load(self):
+        if self.checker is None:
+            self.checker = SideBetChecker(importlib.import_module(self.module_name))
+        return self
+
+    # 庄家 total 为最优点数，soft 为仍按 11 计的 A 数，raw 为所有 A 按 11 计的总和
+    def dealer_hits(self, total, soft, raw):
+        return total < 17
+
+    def dealer_stops_early(self, total):
+        return False
+
+    def immediate(self, total, n, stake):
+        """玩家达到某些牌型时立即结算主注；返回净输赢，否则 None"""
+        return None
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        raise NotImplementedError
+
+    def begin_round(self, rng, rnd):
+        pass
+
+    def main_result(self, rnd, net):
+        return net
+
+    def settle_sides(self, rnd):
+        return ()
+
+
+def _odds(table, result):
+    return table.get(result, -1)
+
+
+PERFECT_PAIR_ODDS = {"perfect": 25, "colored": 12, "mixed": 6}
+TWENTY_ONE_PLUS_THREE_ODDS = {
+    "straight_three_of_a_kind": 100, "straight_flush": 40, "three_of_a_kind": 30,
+    "straight": 10, "flush": 5,
+}
+HOT_3_ODDS = {
+    "three_seven_same_suit": 500, "three_seven_mixed": 100, "twenty_one_same_suit": 20,
+    "twenty_one_mixed": 4, "twenty": 2, "nineteen": 1,
+}
+LUCKY_QUEEN_ODDS = {
+    "queens_same_suit_dealer_bj": 1000, "queens_same_suit": 100, "same_rank_same_suit": 30,
+    "same_suit": 10, "mixed": 4,
+}
+
+
+class ClassicVariant(Variant):
+    """经典21点：庄家软17停牌，可投降，庄家 Blackjack 时退还加倍部分"""
+    key = 'classic'
+    name = '经典21点'
+    module_name = 'Blackjack_Classic'
+    surrender = True
+    side_bets = ('perfect_pair', 'twenty_one_plus_three', 'royal_match', 'bust', 'hot_3', 'lucky_queen')
+    royal_match_odds = {"royal": 25, "suited": 2.5}
+    bust_odds = {3: 1, 4: 2, 5: 9, 6: 50, 7: 100}
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        if pt > 21:
+            return -stake
+        lose = -1 if dbj else -stake          # 庄家 Blackjack：退还加倍部分
+        if pt == 21 and dt == 21:
+            if pn == 2 and dn == 2:
+                return 0
+            if pn == 2:
+                return 1.5 * stake
+            if dn == 2:
+                return lose
+            return 0
+        if pbj and not dbj:
+            return 1.5 * stake
+        if dbj and not pbj:
+            return lose
+        if dt > 21 or pt > dt:
+            return stake
+        if pt < dt:
+            return -stake
+        return 0
+
+    def settle_sides(self, rnd):
+        check = self.checker.check
+        two = tuple(rnd.player[:2])
+        three = (rnd.dealer[0],)
+        if rnd.pbj:
+            bust = 0
+        elif rnd.dt > 21:
+            bust = self.bust_odds.get(len(rnd.dealer), 250)
+        else:
+            bust = -1
+        return (
+            _odds(PERFECT_PAIR_ODDS, check('check_perfect_pair', two)),
+            _odds(TWENTY_ONE_PLUS_THREE_ODDS, check('check_twenty_one_plus_three', two, three)),
+            _odds(self.royal_match_odds, check('check_royal_match', two)),
+            bust,
+            _odds(HOT_3_ODDS, check('check_hot_3', two, three)),
+            _odds(LUCKY_QUEEN_ODDS, check('check_lucky_queen', two,
+                                          tuple(rnd.dealer[:2]) if rnd.dbj else three)),
+        )
+
+
+class SpanishVariant(Variant):
+    """西班牙21点：庄家软17要牌，21点/五张牌立即结算，庄家22点对玩家20点以下平局"""
+    key = 'spanish'
+    name = '西班牙21点'
+    module_name = 'Blackjack_Spanish'
+    reshuffle_at = 45
+    surrender = True
+    side_bets = ('perfect_pair', 'twenty_one_plus_three', 'royal_match', 'twenty_two_side', 'hot_3', 'lucky_queen')
+    perfect_pair_odds = {"perfect": 21, "colored": 11, "mixed": 6}
+    twenty_one_plus_three_odds = {
+        "straight_three_of_a_kind": 90, "straight_flush": 35, "three_of_a_kind": 29,
+        "straight": 9, "flush": 4.5,
+    }
+    royal_match_odds = {"royal": 30, "suited": 2.5}
+    twenty_two_odds = {"same_suit": 50, "same_color": 20, "mixed_color": 8}
+    hot_3_odds = {
+        "three_seven_same_suit": 350, "three_seven_mixed": 75, "twenty_one_same_suit": 19,
+        "twenty_one_mixed": 4, "twenty": 1.5, "nineteen": 1,
+    }
+    lucky_queen_odds = {
+        "queens_same_suit_dealer_bj": 600, "queens_same_suit": 60, "same_rank_same_suit": 20,
+        "same_suit": 8, "mixed": 3.5,
+    }
+
+    def dealer_hits(self, total, soft, raw):
+        return total < 17 or (total == 17 and soft > 0)
+
+    def immediate(self, total, n, stake):
+        if total > 21:
+            return None
+        if n == 2 and total == 21:
+            return 1.5 * stake
+        if n == 5 and total == 21:
+            return 2 * stake
+        if total == 21 or n == 5:
+            return stake
+        return None
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        if pt > 21:
+            return -stake
+        if dbj:
+            return -1                         # 庄家 Blackjack：退还加倍部分
+        if dt == 22:
+            return 0
+        if dt > 22 or pt > dt:
+            return stake
+        if pt < dt:
+            return -stake
+        return 0
+
+    def settle_sides(self, rnd):
+        check = self.checker.check
+        two = tuple(rnd.player[:2])
+        three = (rnd.dealer[0],)
+        if rnd.dt == 22:
+            twenty_two = _odds(self.twenty_two_odds, check('check_twenty_two_side_bet', (), tuple(rnd.dealer)))
+        else:
+            twenty_two = -1
+        return (
+            _odds(self.perfect_pair_odds, check('check_perfect_pair', two)),
+            _odds(self.twenty_one_plus_three_odds, check('check_twenty_one_plus_three', two, three)),
+            _odds(self.royal_match_odds, check('check_royal_match', two)),
+            twenty_two,
+            _odds(self.hot_3_odds, check('check_hot_3', two, three)),
+            _odds(self.lucky_queen_odds, check('check_lucky_queen', two,
+                                          tuple(rnd.dealer[:2]) if rnd.dbj else three)),
+        )
+
+
+class DoubleUpVariant(Variant):
+    """加倍UP 21点：庄家软17要牌、16点停牌（主注平局），玩家21点立即获胜，可加倍UP"""
+    key = 'double_up'
+    name = '加倍UP 21点'
+    module_name = 'Blackjack_Double_Up'
+    double_up = True
+    side_bets = ('perfect_pair', 'twenty_one_plus_three', 'sixteen')
+    sixteen_odds = {2: 3, 3: 5, 4: 10, 5: 50}
+
+    def dealer_hits(self, total, soft, raw):
+        # is_soft_hand：所有 A 按 11 计仍不超过 21
+        return total < 17 or (total == 17 and soft > 0 and raw <= 21)
+
+    def dealer_stops_early(self, total):
+        return total == 16
+
+    def immediate(self, total, n, stake):
+        if total == 21:
+            return 1.5 * stake if n == 2 else stake
+        return None
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        if pt > 21:
+            return -stake
+        if dt == 16:
+            return 0
+        if pt == 21 and dt == 21:
+            return 0
+        if pbj and not dbj:
+            return 1.5 * stake
+        if dbj and not pbj:
+            return -stake
+        if dt > 21 or pt > dt:
+            return stake
+        if pt < dt:
+            return -stake
+        return 0
+
+    def main_result(self, rnd, net):
+        if rnd.double_up:
+            # 加倍UP：主注有净赢利时 1:1，否则输掉
+            net += 1 if net > 0 else -1
+        return net
+
+    def settle_sides(self, rnd):
+        check = self.checker.check
+        two = tuple(rnd.player[:2])
+        if rnd.dt == 16:
+            sixteen = self.sixteen_odds.get(len(rnd.dealer), 100)
+        else:
+            sixteen = -1
+        return (
+            _odds(PERFECT_PAIR_ODDS, check('check_perfect_pair', two)),
+            _odds(TWENTY_ONE_PLUS_THREE_ODDS, check('check_twenty_one_plus_three', two, (rnd.dealer[0],))),
+            sixteen,
+        )
+
+
+class MultiplyVariant(Variant):
+    """倍数21点：庄家软17停牌，庄家三张爆牌平局，赢牌时按特殊牌倍数加成"""
+    key = 'multiply'
+    name = '倍数21点'
+    module_name = 'Blackjack_Multiply'
+    surrender = True
+    side_bets = ('perfect_pair', 'twenty_one_plus_three')
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        if pt > 21:
+            return -stake
+        if pbj and dbj:
+            return 0
+        if pbj:
+            return 1.5 * stake
+        if dbj:
+            return -1                         # 庄家 Blackjack：退还加倍部分
+        if dt > 21:
+            return 0 if dn == 3 else stake
+        if pt > dt:
+            return stake
+        if pt < dt:
+            return -stake
+        return 0
+
+    def begin_round(self, rng, rnd):
+        # 与 BlackjackGame.generate_special_offer 相同的分布
+        r = rng.random() * 100
+        count = 2 if r < 75 else 3 if r < 90 else 4 if r < 97 else 5
+        r = rng.random() * 100
+        multiplier = 2.5 if r < 60 else 5 if r < 85 else 10 if r < 97.5 else 25 if r < 99.5 else 50
+        rnd.special = (frozenset(rng.sample(range(52), count)), multiplier)
+
+    def main_result(self, rnd, net):
+        if net <= 0:
+            return net
+        cards, multiplier = rnd.special
+        matches = sum(1 for c in rnd.player if c in cards)
+        if not matches:
+            return net
+        # 返还（本金 + 赢额）乘以 倍数 × 匹配张数
+        return (net + rnd.stake) * multiplier * matches - rnd.stake
+
+    def settle_sides(self, rnd):
+        check = self.checker.check
+        two = tuple(rnd.player[:2])
+        return (
+            _odds(PERFECT_PAIR_ODDS, check('check_perfect_pair', two)),
+            _odds(TWENTY_ONE_PLUS_THREE_ODDS, check('check_twenty_one_plus_three', two, (rnd.dealer[0],))),
+        )
+
+
+class PremiereVariant(Variant):
+    """首选21点（押玩家方）：庄家单 A 软17要牌，可投降"""
+    key = 'premiere'
+    name = '首选21点'
+    module_name = 'Blackjack_Premiere'
+    surrender = True
+    side_bets = ('super_pair', 'nuclear_bomb', 'super_tie', 'sweet_seventeen')
+    super_pair_odds = {'both_pair_perfect': 50, 'both_pair': 50, 'single_perfect': 5, 'single_pair': 3}
+    super_tie_odds = {'both_bust': 1, 'seventeen_eighteen_nineteen_tie': 3, 'twenty_tie': 8,
+                      'other_tie': 15, 'blackjack_tie': 25}
+    sweet_seventeen_odds = {'hard17_stop': 5, 'soft17_hit': 5, 'soft17_stop': 6}
+    nuclear_odds = {6: 5, 7: 5, 8: 15, 9: 30, 10: 100, 11: 150}
+
+    def dealer_hits(self, total, soft, raw):
+        # is_soft_17：所有 A 按 11 计的总和正好为 17
+        return total < 17 or (total == 17 and raw == 17 and soft > 0)
+
+    def settle(self, pt, pn, pbj, dt, dn, dbj, stake):
+        if pbj and not dbj:
+            return 1.5 * stake
+        if dbj and not pbj:
+            return -stake
+        if pt > 21:
+            return -stake
+        if dt > 21 or pt > dt:
+            return stake
+        if pt < dt:
+            return -stake
+        return 0
+
+    def settle_sides(self, rnd):
+        check = self.checker.check
+        dealer_two = tuple(rnd.dealer[:2]) if len(rnd.dealer) >= 2 else (rnd.dealer[0],)
+        super_pair = _odds(self.super_pair_odds, check('check_super_pair', tuple(rnd.player[:2]), dealer_two))
+        if rnd.pt > 21 and rnd.dt > 21:
+            cards = len(rnd.player) + len(rnd.dealer)
+            nuclear = self.nuclear_odds.get(cards, 250 if cards >= 12 else -1)
+        else:
+            nuclear = -1
+        if rnd.pt == rnd.dt:
+            super_tie = _odds(self.super_tie_odds, check('check_super_tie', tuple(rnd.player), tuple(rnd.dealer)))
+        else:
+            super_tie = -1
+        return super_pair, nuclear, super_tie, _odds(self.sweet_seventeen_odds, rnd.sweet17)
+
+
+VARIANTS = {v.key: v for v in (ClassicVariant, SpanishVariant, DoubleUpVariant, MultiplyVariant, PremiereVariant)}
+
+
+# ------------------- 基本策略（无限副牌动态规划） -------------------
+def _add_card(total, soft, raw, v):
+    total += v
+    raw += v
+    if v == 11:
+        soft += 1
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft, raw
+
+
+def dealer_distribution(variant, up):
+    """庄家明牌为 up 时最终 (点数, 张数, 是否Blackjack) 的概率；点数 >23 记为 23，张数 >4 记为 4"""
+    dist = {}
+
+    def walk(total, soft, raw, n, prob):
+        if n >= 2 and (variant.dealer_stops_early(total) or not variant.dealer_hits(total, soft, raw) or total > 21):
+            key = (min(total, 23), min(n, 4), n == 2 and total == 21)
+            dist[key] = dist.get(key, 0.0) + prob
+            return
+        for v, pv in VALUE_PROBS.items():
+            walk(*_add_card(total, soft, raw, v), n + 1, prob * pv)
+
+    walk(*_add_card(0, 0, 0, up), 1, 1.0)
+    return dist
+
+
+class BasicStrategy:
+    """按版本规则求出的基本策略表：(点数, 是否软牌, 张数, 庄家明牌) -> 操作
+
+    操作：H 要牌、S 停牌、D 加倍、R 投降、U 加倍UP
+    """
+    def __init__(self, variant):
+        self.variant = variant
+        self.dealer = {up: list(dealer_distribution(variant, up).items()) for up in range(2, 12)}
+        self.table = {}
+        self.evs = {}
+        for up in range(2, 12):
+            best = self._solver(up)
+            for total in range(4, 22):
+                for soft in (False, True):
+                    if soft and total < 12:
+                        continue
+                    for n in range(2, 7):
+                        ev, action = best(total, soft, n)
+                        self.table[(total, soft, n, up)] = action
+                        self.evs[(total, soft, n, up)] = ev
+
+    def _solver(self, up):
+        variant = self.variant
+        dealer = self.dealer[up]
+
+        @lru_cache(maxsize=None)
+        def stand(total, n, stake):
+            return sum(p * variant.settle(total, n, False, dt, dn, dbj, stake) for (dt, dn, dbj), p in dealer)
+
+        def after_card(total, soft, n, stake, then_best):
+            ev = 0.0
+            for v, pv in VALUE_PROBS.items():
+                t2, s2, _ = _add_card(total, 1 if soft else 0, 0, v)
+                if t2 > 21:
+                    ev -= pv * stake
+                    continue
+                instant = variant.immediate(t2, n + 1, stake)
+                if instant is not None:
+                    ev += pv * instant
+                elif then_best:
+                    ev += pv * best(t2, s2 > 0, min(n + 1, 6))[0]
+                else:
+                    ev += pv * stand(t2, n + 1, stake)
+            return ev
+
+        @lru_cache(maxsize=None)
+        def best(total, soft, n):
+            options = [(stand(total, n, 1), 'S')]
+            if total < 21:
+                options.append((after_card(total, soft, n, 1, True), 'H'))
+            if n == 2:
+                options.append((after_card(total, soft, n, 2, False), 'D'))
+                if variant.surrender:
+                    options.append((-0.5, 'R'))
+                if variant.double_up and total <= 20:
+                    win = sum(p * (1 if variant.settle(total, n, False, dt, dn, dbj, 1) > 0 else -1)
+                              for (dt, dn, dbj), p in dealer)
+                    options.append((stand(total, n, 1) + win, 'U'))
+            return max(options)
+
+        return best
+
+    def action(self, total, soft, n, up):
+        return self.table[(total, soft > 0, n if n < 6 else 6, up)]
+
+    def format_table(self):
+        """两张牌时的策略表（行：玩家点数，列：庄家明牌 2-A）"""
+        lines = ["      " + " ".join(f"{('A' if up == 11 else up):>2}" for up in range(2, 12))]
+        for soft in (False, True):
+            for total in range(5 if not soft else 13, 22):
+                row = " ".join(f"{self.table[(total, soft, 2, up)]:>2}" for up in range(2, 12))
+                lines.append(f"{'软' if soft else '硬'}{total:<4}{row}")
+        return "\n".join(lines)
+
+
+_STRATEGY_CACHE = {}
+
+
+def get_strategy(variant):
+    if variant.key not in _STRATEGY_CACHE:
+        _STRATEGY_CACHE[variant.key] = BasicStrategy(variant)
+    return _STRATEGY_CACHE[variant.key]
+
+
+# ------------------- 统计 -------------------
+class BetStats:
+    """可合并的各注项和 / 平方和，用于计算 EV 与置信区间"""
+    def __init__(self, names):
+        self.names = list(names)
+        self.hands = 0
+        self.sums = [0.0] * len(self.names)
+        self.squares = [0.0] * len(self.names)
+
+    def merge(self, other):
+        self.hands += other.hands
+        for i in range(len(self.names)):
+            self.sums[i] += other.sums[i]
+            self.squares[i] += other.squares[i]
+        return self
+
+    def ev(self, i):
+        """(EV, 95% 置信区间半宽)"""
+        if not self.hands:
+            return 0.0, 0.0
+        mean = self.sums[i] / self.hands
+        var = max(self.squares[i] / self.hands - mean * mean, 0.0)
+        return mean, 1.96 * math.sqrt(var / self.hands)
+
+    def report(self):
+        lines = [f"总局数: {self.hands:,}"]
+        for i, name in enumerate(self.names):
+            mean, half = self.ev(i)
+            lines.append(f"  {name:<24}EV {mean:+.5f} ± {half:.5f}")
+        return "\n".join(lines)
+
+
+# ------------------- 模拟 -------------------
+def new_shoe(rng, decks=8):
+    shoe = list(range(52)) * decks
+    rng.shuffle(shoe)
+    return shoe
+
+
+def simulate_chunk(variant_key, hands, seed=None, decks=8):
+    """工作进程：用独立种子的牌靴模拟 hands 局，返回 BetStats"""
+    variant = VARIANTS[variant_key]().load()
+    strategy = get_strategy(variant)
+    table = strategy.table
+    rng = random.Random(seed if seed is not None else secrets.randbits(64))
+    stats = BetStats(('main',) + variant.side_bets)
+    sums, squares = stats.sums, stats.squares
+    count = len(stats.names)
+
+    dealer_hits = variant.dealer_hits
+    stops_early = variant.dealer_stops_early
+    immediate = variant.immediate
+    settle = variant.settle
+    is_premiere = isinstance(variant, PremiereVariant)
+
+    shoe = new_shoe(rng, decks)
+    for _ in range(hands):
+        if len(shoe) <= variant.reshuffle_at:
+            shoe = new_shoe(rng, decks)
+        draw = shoe.pop
+
+        rnd = Round()
+        variant.begin_round(rng, rnd)
+        player = [draw()]
+        dealer = [draw()]
+        player.append(draw())
+        up = CARD_VALUES[dealer[0] >> 2]
+
+        pt, ps, _ = _add_card(0, 0, 0, CARD_VALUES[player[0] >> 2])
+        pt, ps, _ = _add_card(pt, ps, 0, CARD_VALUES[player[1] >> 2])
+        pbj = pt == 21
+        stake = 1
+        main = None
+
+        if pbj:
+            main = immediate(21, 2, 1)
+        else:
+            n = 2
+            while True:
+                action = table[(pt, ps > 0, n if n < 6 else 6, up)]
+                if is_premiere and pt == 17:
+                    if action == 'S':
+                        rnd.sweet17 = 'soft17_stop' if ps else 'hard17_stop'
+                    elif n == 2 and ps:
+                        rnd.sweet17 = 'soft17_hit'
+                if action == 'S':
+                    break
+                if action == 'R':
+                    rnd.surrendered = True
+                    main = -0.5
+                    break
+                if action == 'U':
+                    rnd.double_up = True
+                    break
+                card = draw()
+                player.append(card)
+                n += 1
+                pt, ps, _ = _add_card(pt, ps, 0, CARD_VALUES[card >> 2])
+                if action == 'D':
+                    stake = 2
+                if pt > 21:
+                    break
+                instant = immediate(pt, n, stake)
+                if instant is not None:
+                    main = instant
+                    break
+                if action == 'D' or pt == 21:
+                    break
+
+        # 庄家补牌（按下了全部边注时的流程进行到底）
+        dt, ds, draw_raw = _add_card(0, 0, 0, up)
+        dealer.append(draw())
+        dt, ds, draw_raw = _add_card(dt, ds, draw_raw, CARD_VALUES[dealer[1] >> 2])
+        dbj = dt == 21
+        if not dbj:
+            while not stops_early(dt) and dealer_hits(dt, ds, draw_raw):
+                card = draw()
+                dealer.append(card)
+                dt, ds, draw_raw = _add_card(dt, ds, draw_raw, CARD_VALUES[card >> 2])
+
+        rnd.player, rnd.dealer = player, dealer
+        rnd.pt, rnd.dt, rnd.pbj, rnd.dbj, rnd.stake = pt, dt, pbj, dbj, stake
+        if main is None:
+            main = settle(pt, len(player), pbj, dt, len(dealer), dbj, stake)
+        main = variant.main_result(rnd, main)
+
+        sums[0] += main
+        squares[0] += main * main
+        results = variant.settle_sides(rnd)
+        for i in range(1, count):
+            x = results[i - 1]
+            sums[i] += x
+            squares[i] += x * x
+    stats.hands = hands
+    return stats
+
+
+def run_simulation(variant_key, total_hands, workers=None, chunk_size=200000, seed=None, progress=True):
+    """把模拟分块交给进程池，边完成边合并并输出进度"""
+    workers = workers or os.cpu_count() or 1
+    chunks = []
+    remaining = total_hands
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+    base_seed = seed if seed is not None else secrets.randbits(32)
+
+    variant = VARIANTS[variant_key]
+    stats = BetStats(('main',) + variant.side_bets)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_chunk, variant_key, size, base_seed + i)
+                   for i, size in enumerate(chunks)]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if progress:
+                elapsed = time.perf_counter() - start
+                rate = stats.hands / elapsed if elapsed else 0
+                print(f"\r{variant.name} 进度: {stats.hands:,}/{total_hands:,} 局  "
+                      f"{rate:,.0f} 局/秒", end="", flush=True)
+    if progress:
+        print()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="21点无界面蒙特卡洛模拟器")
+    parser.add_argument("--variant", default="classic",
+                        help=f"版本：{', '.join(VARIANTS)} 或 all")
+    parser.add_argument("--hands", type=int, default=1000000, help="每个版本的模拟局数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核心数）")
+    parser.add_argument("--chunk", type=int, default=200000, help="每个任务的局数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（可复现）")
+    parser.add_argument("--strategy", action="store_true", help="只输出两张牌时的基本策略表")
+    args = parser.parse_args()
+
+    keys = list(VARIANTS) if args.variant == "all" else [args.variant]
+    for key in keys:
+        if key not in VARIANTS:
+            parser.error(f"未知版本: {key}")
+        if args.strategy:
+            print(f"== {VARIANTS[key].name} 基本策略（两张牌）")
+            print(get_strategy(VARIANTS[key]()).format_table())
+            continue
+        start = time.perf_counter()
+        stats = run_simulation(key, args.hands, args.workers, args.chunk, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"== {VARIANTS[key].name}")
+        print(stats.report())
+        print(f"耗时 {elapsed:.1f} 秒，{stats.hands / elapsed:,.0f} 局/秒")
+
+
+if __name__ == "__main__":
+    main()
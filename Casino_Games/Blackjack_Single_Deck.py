@@ -7,6 +7,16 @@ import os
 import math
 import subprocess, sys
 
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -70,7 +80,7 @@ class Deck:
             parent_dir = os.path.dirname(current_dir)
             shuffle_script = os.path.join(parent_dir, 'A_Tools', 'Card', 'shuffle.py')
             cmd = [sys.executable, shuffle_script, 'false', str(self.num_decks)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, env=rng_provider.shuffle_env())
             if result.returncode == 0:
                 shuffle_data = json.loads(result.stdout)
                 shuffled_deck = shuffle_data['deck']
@@ -4,13 +4,20 @@ from PIL import Image, ImageTk, ImageDraw, ImageFont
 import random
 import json
 import os
-import math
 import hashlib
 import time
-import secrets
 import subprocess, sys
 from itertools import combinations  # 新增导入
 
+# 将A_Tools目录添加到系统路径（共享的动画调度器）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from tween import Animator
+import metrics
+import random_stream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -72,6 +79,7 @@ def load_user_data():
     except:
         return []
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()
     for user in users:
@@ -132,6 +140,7 @@ class Card:
         return f"{self.rank}{self.suit}"
 
 class Deck:
+    @metrics.timed()
     def __init__(self):
         # 获取当前脚本所在目录的上一级目录
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -140,7 +149,7 @@ class Deck:
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
         
         # 保证 Python 输出为 UTF-8
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         
         try:
@@ -174,8 +183,8 @@ class Deck:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             # fallback：标准顺序+安全乱序
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52)
         
         # 通用的洗牌后索引 & 发牌序列逻辑
         self.start_pos = self.cut_position
@@ -183,12 +192,6 @@ class Deck:
         self.pointer = 0
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
     
-    def _secure_shuffle(self):
-        """Fisher–Yates 洗牌，用 secrets 保证随机性"""
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
@@ -396,6 +399,7 @@ class CaribbeanStudGUI(tk.Tk):
         self.game = CaribbeanStudGame()
         self.card_images = {}
         self.animation_queue = []
+        self.animator = Animator.of(self)  # 本窗口的动画调度器
         self.animation_in_progress = False
         self.card_positions = {}
         self.active_card_labels = []  # 跟踪所有活动中的卡片标签
@@ -436,6 +440,7 @@ class CaribbeanStudGUI(tk.Tk):
         self._load_assets()
         self._create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     def cancel_auto_reset_timer(self):
         """安全地取消自动重置计时器"""
@@ -1287,37 +1292,22 @@ class CaribbeanStudGUI(tk.Tk):
                     target_positions[label] = idx * 110
                     break
 
-        # 动画参数
-        duration = 1500  # 1.5秒
-        steps = 30
-        interval = duration // steps
-
-        anim_data = []
-        for label in start_positions:
-            start_x = start_positions[label]
-            target_x = target_positions[label]
-            dx = (target_x - start_x) / steps
-            anim_data.append((label, start_x, dx))
-
-        def animate_step(step):
-            if step > steps or self._resetting:
-                # 动画结束，确保所有卡到达目标位置
-                for label, _, _ in anim_data:
-                    if label.winfo_exists():
-                        target_x = target_positions[label]
-                        label.place(x=target_x)
-                # 更新牌型标签
-                self.update_hand_labels()
-                # 结算
-                self.settle_game()
-                return
-            for label, start_x, dx in anim_data:
-                if label.winfo_exists():
-                    new_x = start_x + dx * step
-                    label.place(x=new_x)
-            self.after(interval, lambda: animate_step(step + 1))
+        # 动画参数：1.5秒内线性滑动到目标位置（由窗口的动画调度器统一推进）
+        moves = {
+            label: (start_positions[label], target_positions[label])
+            for label in start_positions
+        }
 
-        animate_step(1)
+        def finished():
+            # 更新牌型标签
+            self.update_hand_labels()
+            # 结算
+            self.settle_game()
+
+        if self._resetting:
+            finished()
+        else:
+            self.animator.slide_x(moves, 1.5, on_done=finished, on_cancel=finished)
 
     def settle_game(self):
         """统一结算方法（动画结束后调用）"""
@@ -1944,49 +1934,30 @@ class CaribbeanStudGUI(tk.Tk):
         # 检查卡片是否仍然存在
         if not hasattr(card_label, "target_pos") or card_label not in self.active_card_labels:
             return
-            
+
+        def arrived():
+            card_label.is_moving = False
+
+            # 如果是回收动画且到达左上角，销毁卡片
+            if card_label.target_pos == (50, 50):
+                if card_label in self.active_card_labels:
+                    self.active_card_labels.remove(card_label)
+                card_label.destroy()
+
+            self.after(20, self.animate_deal)  # 处理下一张牌
+
         try:
-            current_x, current_y = card_label.winfo_x(), card_label.winfo_y()
-            target_x, target_y = card_label.target_pos
-            
-            # 计算移动方向向量
-            dx = target_x - current_x
-            dy = target_y - current_y
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            # 如果已经到达目标位置
-            if distance < 5:
-                # 确保设置正确的宽度和高度
-                card_label.place(x=target_x, y=target_y, width=120, height=180)
-                card_label.is_moving = False
-                
-                # 如果是回收动画且到达左上角，销毁卡片
-                if card_label.target_pos == (50, 50):
-                    if card_label in self.active_card_labels:
-                        self.active_card_labels.remove(card_label)
-                    card_label.destroy()
-                    
-                self.after(20, self.animate_deal)
-                return
-            
-            # 计算移动步长
-            step_x = dx * 0.2
-            step_y = dy * 0.2
-            
-            # 更新位置 - 确保保持宽度和高度
-            new_x = current_x + step_x
-            new_y = current_y + step_y
-            card_label.place(x=new_x, y=new_y, width=120, height=180)
-            
-            # 继续动画
-            self.after(20, lambda: self.animate_card_move(card_label))
-            
+            # 交给窗口的动画调度器逐帧移动（每帧移动剩余距离的20%）
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                size={'width': 120, 'height': 180},
+                on_done=arrived
+            )
         except tk.TclError:
             # 卡片已被销毁，停止动画
             if card_label in self.active_card_labels:
                 self.active_card_labels.remove(card_label)
-            return
-    
+
     def reveal_player_cards(self):
         """翻开玩家牌（带动画），之后1秒后结算5+1，然后进行排序动画"""
         if self.animation_in_progress:
@@ -2053,60 +2024,41 @@ class CaribbeanStudGUI(tk.Tk):
                     target_positions[label] = idx * 110
                     break
 
-        # 动画参数：1秒，15步
-        duration = 1000
-        steps = 15
-        interval = duration // steps
-
-        anim_data = []
-        for label in start_positions:
-            start_x = start_positions[label]
-            target_x = target_positions[label]
-            dx = (target_x - start_x) / steps
-            anim_data.append((label, start_x, dx))
-
-        def animate_step(step):
-            if step > steps or self._resetting:
-                # 动画结束，确保所有卡到达目标位置
-                for label, _, _ in anim_data:
-                    if label.winfo_exists():
-                        target_x = target_positions[label]
-                        label.place(x=target_x)
-
-                # 更新游戏对象中的手牌顺序
-                self.game.player_hand = sorted_hand
-
-                # 手动下注模式：恢复决策按钮
-                if (
-                    self.game.play_bet == 0
-                    and self.game.stage == "pre_flop"
-                    and self.fold_button
-                    and self.play_button
-                ):
-                    try:
-                        if self.fold_button.winfo_exists():
-                            self.fold_button.config(state=tk.NORMAL)
-
-                        if self.play_button.winfo_exists():
-                            self.play_button.config(state=tk.NORMAL)
-
-                    except tk.TclError:
-                        pass
+        # 动画参数：1秒内线性滑动到目标位置（由窗口的动画调度器统一推进）
+        moves = {
+            label: (start_positions[label], target_positions[label])
+            for label in start_positions
+        }
 
-                # 盲注模式：排序结束后自动进入摊牌
-                elif self.game.play_bet > 0:
-                    self.after(1200, self.show_showdown)
+        def finished():
+            # 更新游戏对象中的手牌顺序
+            self.game.player_hand = sorted_hand
+
+            # 手动下注模式：恢复决策按钮
+            if (
+                self.game.play_bet == 0
+                and self.game.stage == "pre_flop"
+                and self.fold_button
+                and self.play_button
+            ):
+                try:
+                    if self.fold_button.winfo_exists():
+                        self.fold_button.config(state=tk.NORMAL)
 
-                return
+                    if self.play_button.winfo_exists():
+                        self.play_button.config(state=tk.NORMAL)
 
-            for label, start_x, dx in anim_data:
-                if label.winfo_exists():
-                    new_x = start_x + dx * step
-                    label.place(x=new_x)
+                except tk.TclError:
+                    pass
 
-            self.after(interval, lambda: animate_step(step + 1))
+            # 盲注模式：排序结束后自动进入摊牌
+            elif self.game.play_bet > 0:
+                self.after(1200, self.show_showdown)
 
-        animate_step(1)
+        if self._resetting:
+            finished()
+        else:
+            self.animator.slide_x(moves, 1.0, on_done=finished, on_cancel=finished)
         
     def start_player_sort_animation(self):
         """开始玩家手牌排序动画"""
@@ -2509,36 +2461,33 @@ class CaribbeanStudGUI(tk.Tk):
         self.animate_card_out_step(auto_reset)
 
     def animate_card_out_step(self, auto_reset):
-        """移动卡片出屏幕的每一步"""
-        all_done = True
-        for card_label in self.active_card_labels[:]:  # 遍历副本
-            if not hasattr(card_label, 'target_pos') or not card_label.winfo_exists():
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
-
-            current_x = card_label.winfo_x()
-            target_x, target_y = card_label.target_pos
-
-            # 计算新位置
-            dx = target_x - current_x
-            if abs(dx) < 5:
-                card_label.place(x=target_x, y=target_y)
-                # 移除此卡片
-                card_label.destroy()
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
+        """把所有牌移出屏幕，全部完成后重置"""
+        cards = [
+            card_label for card_label in self.active_card_labels
+            if hasattr(card_label, 'target_pos') and card_label.winfo_exists()
+        ]
+        if not cards:
+            self._do_reset(auto_reset)
+            return
 
-            new_x = current_x + dx * 0.2
-            card_label.place(x=new_x)
-            all_done = False
+        remaining = [len(cards)]
 
-        if not all_done:
-            self.after(20, lambda: self.animate_card_out_step(auto_reset))
-        else:
-            # 所有动画完成，重置游戏
-            self._do_reset(auto_reset)
+        def card_out(card_label):
+            # 移除此卡片
+            card_label.destroy()
+            if card_label in self.active_card_labels:
+                self.active_card_labels.remove(card_label)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                # 所有动画完成，重置游戏
+                self._do_reset(auto_reset)
+
+        for card_label in cards:
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                on_done=lambda c=card_label: card_out(c),
+                on_cancel=lambda c=card_label: card_out(c)
+            )
 
     def reset_game(self, auto_reset=False):
         # 安全地取消自动重置计时器
@@ -2547,6 +2496,7 @@ class CaribbeanStudGUI(tk.Tk):
         # 设置重置标志，停止所有动画
         self._resetting = True
         
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         # 清除所有挂起的after事件
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
@@ -2577,9 +2527,9 @@ class CaribbeanStudGUI(tk.Tk):
         self.ante_display.config(bg='#FFCDD2')  # 浅红色
         self.play_display.config(bg='#FFCDD2')  # 浅红色
         self.five_plus_one_display.config(bg='#FFCDD2')  # 浅红色
-        self.after(500, lambda: self.ante_display.config(bg='white'))
-        self.after(500, lambda: self.play_display.config(bg='white'))
-        self.after(500, lambda: self.five_plus_one_display.config(bg='white'))
+        self.animator.flash(self.ante_display, 0.5, bg='white')
+        self.animator.flash(self.play_display, 0.5, bg='white')
+        self.animator.flash(self.five_plus_one_display, 0.5, bg='white')
     
     def _do_reset(self, auto_reset=False):
         """真正的重置游戏界面：确保所有牌被移除，弃牌区标题被重建，状态复位。"""
@@ -2594,6 +2544,7 @@ class CaribbeanStudGUI(tk.Tk):
                 pass
             self.auto_reset_timer = None
         
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         # 清除所有挂起的after事件
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
@@ -2625,6 +2576,7 @@ class CaribbeanStudGUI(tk.Tk):
         
         # 清除所有动画状态
         self.animation_queue = []
+        self.animator.cancel()  # 停止仍在进行的补间
         self.animation_in_progress = False
         self.flipping_cards = []
         self.flip_step = 0
@@ -2858,8 +2810,8 @@ class CaribbeanStudGUI(tk.Tk):
         # 高亮显示一下
         self.ante_display.config(bg='#E8F5E9')
         self.five_plus_one_display.config(bg='#E8F5E9')
-        self.after(800, lambda: self.ante_display.config(bg='white'))
-        self.after(800, lambda: self.five_plus_one_display.config(bg='white'))
+        self.animator.flash(self.ante_display, 0.8, bg='white')
+        self.animator.flash(self.five_plus_one_display, 0.8, bg='white')
 
 def main(initial_balance=10000, username="Guest"):
     app = CaribbeanStudGUI(initial_balance, username)
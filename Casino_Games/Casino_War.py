@@ -7,9 +7,18 @@ import os
 import math
 import subprocess, sys
 
-# 扑克牌花色和点数
-SUITS = ['♠', '♥', '♦', '♣']
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import rng_provider
+# 扑克牌花色、点数与结算规则在无界面引擎中定义（A_Tools/engines/casino_war.py）
+from engines import EngineError
+from engines.casino_war import CasinoWarEngine, SUITS, RANKS, parse_card
 
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -55,12 +64,12 @@ class Card:
             return int(self.rank)
 
 class Deck:
+    """用 shuffle.py 洗好的新牌靴，洗好后交给引擎发牌"""
     def __init__(self, num_decks=6):
         self.num_decks = num_decks
         self.cards = []
         self.generate_deck()
         self.shuffle()
-        self.cut_card_position = len(self.cards) - 60
     
     def generate_deck(self):
         self.cards = [Card(suit, rank) for _ in range(self.num_decks) for suit in SUITS for rank in RANKS]
@@ -71,7 +80,7 @@ class Deck:
             parent_dir = os.path.dirname(current_dir)
             shuffle_script = os.path.join(parent_dir, 'A_Tools', 'Card', 'shuffle.py')
             cmd = [sys.executable, shuffle_script, 'false', str(self.num_decks)]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, env=rng_provider.shuffle_env())
             if result.returncode == 0:
                 shuffle_data = json.loads(result.stdout)
                 shuffled_deck = shuffle_data['deck']
@@ -93,30 +102,9 @@ class Deck:
             j = secrets.randbelow(i + 1)
             self.cards[i], self.cards[j] = self.cards[j], self.cards[i]
         print(f"使用secrets洗牌完成，共{len(self.cards)}张牌")
-    
-    def deal_card(self):
-        if len(self.cards) <= 60:
-            print(f"牌堆剩余{len(self.cards)}张牌，重新洗牌")
-            self.generate_deck()
-            self.shuffle()
-            self.cut_card_position = len(self.cards) - 60
-        if len(self.cards) == 0:
-            self.generate_deck()
-            self.shuffle()
-            self.cut_card_position = len(self.cards) - 60
-        return self.cards.pop()
-    
-    def get_remaining_cards_count(self):
-        count_dict = {}
-        for suit in SUITS:
-            count_dict[suit] = {}
-            for rank in RANKS:
-                count_dict[suit][rank] = 0
-        for card in self.cards:
-            count_dict[card.suit][card.rank] += 1
-        return count_dict
 
 class CasinoWarGame:
+    """界面显示用的本局状态（发牌与结算由 CasinoWarEngine 负责）"""
     def __init__(self):
         self.reset_game()
     
@@ -130,30 +118,9 @@ class CasinoWarGame:
         self.dealer_war_card = None
         self.burn_cards_player = []
         self.burn_cards_dealer = []
+        self.tie_return = 0
         self.stage = "betting"
         self.surrendered = False
-    
-    def compare_cards(self, card1, card2):
-        v1 = self.card_value(card1)
-        v2 = self.card_value(card2)
-        if v1 > v2:
-            return "player"
-        elif v1 < v2:
-            return "dealer"
-        else:
-            return "tie"
-    
-    def card_value(self, card):
-        if card.rank == 'A':
-            return 14
-        elif card.rank == 'K':
-            return 13
-        elif card.rank == 'Q':
-            return 12
-        elif card.rank == 'J':
-            return 11
-        else:
-            return int(card.rank)
 
 class CasinoWarGUI(tk.Tk):
     def __init__(self, initial_balance, username):
@@ -166,6 +133,9 @@ class CasinoWarGUI(tk.Tk):
         self.username = username
         self.balance = initial_balance
         self.game = CasinoWarGame()
+        self.engine = CasinoWarEngine()
+        self.engine.subscribe(self.on_engine_event)
+        self.paid_this_round = 0   # 本局已提前派发的金额（首轮平局时的 Tie 注）
         self.card_images = {}
         self.active_card_labels = []
         self.selected_chip = None
@@ -642,10 +612,16 @@ class CasinoWarGUI(tk.Tk):
         except ValueError:
             messagebox.showerror("错误", "请输入有效的下注金额")
             return
-        if self.game.ante_bet < 10:
-            messagebox.showerror("错误", "主注至少需要10块")
+        bets = {spot: amount for spot, amount in (("ante", self.game.ante_bet), ("tie", self.game.tie_bet)) if amount}
+        try:
+            self.engine.validate_round(bets)
+            checked = {}
+            for spot, amount in bets.items():
+                checked[spot] = self.engine.validate_bet(checked, spot, amount)
+        except EngineError as e:
+            messagebox.showerror("错误", str(e))
             return
-        total_bet = self.game.ante_bet + self.game.tie_bet
+        total_bet = self.engine.staked(bets)
         if self.balance < total_bet:
             messagebox.showerror("错误", "余额不足以支付下注！")
             return
@@ -662,40 +638,48 @@ class CasinoWarGUI(tk.Tk):
         self.update_balance()
         self.current_bet_label.config(text=f"本局下注: ${total_bet:.2f}")
         
-        need_shuffle = (not hasattr(self.game, 'deck') or self.game.deck is None or len(self.game.deck.cards) <= 60)
-        def continue_after_shuffle():
-            self.game.deck = Deck(6)
+        def deal():
             self.game.reset_game()
-            self.game.ante_bet = int(self.ante_var.get())
-            self.game.tie_bet = int(self.tie_var.get())
+            self.game.ante_bet = bets.get("ante", 0)
+            self.game.tie_bet = bets.get("tie", 0)
             for widget in self.dealer_cards_frame.winfo_children():
                 widget.destroy()
             for widget in self.player_cards_frame.winfo_children():
                 widget.destroy()
-            self.game.player_card = self.game.deck.deal_card()
-            self.game.dealer_card = self.game.deck.deal_card()
-            self.stage_label.config(text="发牌中")
-            self.status_label.config(text="正在发牌...")
-            self._deal_initial_cards()
-        
-        def continue_without_shuffle():
-            self.game.reset_game()
-            self.game.ante_bet = int(self.ante_var.get())
-            self.game.tie_bet = int(self.tie_var.get())
-            for widget in self.dealer_cards_frame.winfo_children():
-                widget.destroy()
-            for widget in self.player_cards_frame.winfo_children():
-                widget.destroy()
-            self.game.player_card = self.game.deck.deal_card()
-            self.game.dealer_card = self.game.deck.deal_card()
+            self.paid_this_round = 0
+            self.engine.new_round()
+            for spot, amount in bets.items():
+                self.engine.place_bet(spot, amount)
+            self.engine.act("deal")   # cards_dealt 事件开始发牌动画
+
+        def continue_after_shuffle():
+            self.engine.load_shoe(Deck(6).cards)
+            deal()
+
+        if self.engine.needs_shuffle():
+            self.play_shuffle_animation(duration_ms=10000, callback=continue_after_shuffle)
+        else:
+            deal()
+
+    def on_engine_event(self, event):
+        """引擎事件：发牌结果驱动动画，结算事件更新余额"""
+        data = event.data
+        if event.type == "cards_dealt":
+            self.game.player_card = parse_card(data["player_card"])
+            self.game.dealer_card = parse_card(data["dealer_card"])
+            self.game.tie_return = data["tie_return"]
             self.stage_label.config(text="发牌中")
             self.status_label.config(text="正在发牌...")
             self._deal_initial_cards()
-        
-        if need_shuffle:
-            self.play_shuffle_animation(duration_ms=10000, callback=continue_after_shuffle)
-        else:
-            continue_without_shuffle()
+        elif event.type == "war_dealt":
+            self.game.war_bet = data["war_bet"]
+            self.game.burn_cards_player = [parse_card(text) for text in data["player_burn"]]
+            self.game.burn_cards_dealer = [parse_card(text) for text in data["dealer_burn"]]
+            self.game.player_war_card = parse_card(data["player_war_card"])
+            self.game.dealer_war_card = parse_card(data["dealer_war_card"])
+        elif event.type == "settled":
+            self.balance += data["returned"] - self.paid_this_round
+            self.update_balance()
     
     def _deal_initial_cards(self):
         player_card_label = self.add_card_to_frame(self.player_cards_frame, self.game.player_card, show_front=False, position=0)
@@ -711,11 +695,9 @@ class CasinoWarGUI(tk.Tk):
         self._initial_compare()
     
     def _initial_compare(self):
-        result = self.game.compare_cards(self.game.player_card, self.game.dealer_card)
+        result = self.engine.outcome["result"]
         if result == "player":
-            win_amount = self.game.ante_bet * 2
-            self.balance += win_amount
-            self.update_balance()
+            win_amount = self.engine.settle()[0].data["payouts"]["ante"]
             self.last_win = win_amount
             self.last_win_label.config(text=f"上局获胜: ${win_amount:.2f}")
             self.status_label.config(text="玩家手牌更大！你赢了。")
@@ -725,6 +707,7 @@ class CasinoWarGUI(tk.Tk):
             self.tie_display.config(bg='white')
             self._show_restart_button()
         elif result == "dealer":
+            self.engine.settle()
             self.last_win = 0
             self.last_win_label.config(text="上局获胜: $0.00")
             self.status_label.config(text="庄家手牌更大！下局加油。")
@@ -733,9 +716,10 @@ class CasinoWarGUI(tk.Tk):
             self.tie_var.set("0")
             self.tie_display.config(bg='white')
             self._show_restart_button()
-        else:  # 平局
-            tie_win = self.game.tie_bet * 11
+        else:  # 平局：Tie 注先派发，主注等待战争/投降决策
+            tie_win = self.game.tie_return
             if tie_win > 0:
+                self.paid_this_round = tie_win
                 self.balance += tie_win
                 self.update_balance()
                 self.last_win = tie_win
@@ -753,9 +737,8 @@ class CasinoWarGUI(tk.Tk):
     
     def surrender_action(self):
         # 投降：拿回一半主注，且 Tie 已经赔付过，累加
-        refund = self.game.ante_bet / 2
-        self.balance += refund
-        self.update_balance()
+        self.engine.act("surrender")
+        refund = self.engine.settle()[0].data["payouts"]["ante"]
         # 累加获胜金额（已有的 last_win 是 Tie 赢额，加上投降返还）
         total_win = self.last_win + refund
         self.last_win = total_win
@@ -783,8 +766,8 @@ class CasinoWarGUI(tk.Tk):
         if hasattr(self, 'war_btn'):
             self.war_btn.config(state=tk.DISABLED)
 
-        self.balance -= self.game.ante_bet
-        self.game.war_bet = self.game.ante_bet
+        self.engine.act("war")   # war_dealt 事件给出烧牌和战争牌
+        self.balance -= self.game.war_bet
         self.update_balance()
         total_bet = self.game.ante_bet + self.game.tie_bet + self.game.war_bet
         self.current_bet_label.config(text=f"本局下注: ${total_bet:.2f}")
@@ -801,13 +784,11 @@ class CasinoWarGUI(tk.Tk):
         self._burn_player_cards(0, start_x, start_y)
         
     def _burn_player_cards(self, index, start_x, start_y):
-        if index >= 3:
-            self.game.player_war_card = self.game.deck.deal_card()
+        if index >= len(self.game.burn_cards_player):
             self.move_card_animation(start_x, start_y, self.player_cards_frame, 4, self.game.player_war_card, show_front=False,
                                      callback=lambda lbl: self._reveal_player_war_card(lbl))
             return
-        card = self.game.deck.deal_card()
-        self.game.burn_cards_player.append(card)
+        card = self.game.burn_cards_player[index]
         self.move_card_animation(start_x, start_y, self.player_cards_frame, 1+index, card, show_front=False,
                                  callback=lambda lbl: self._burn_player_cards(index+1, start_x, start_y))
     
@@ -820,13 +801,11 @@ class CasinoWarGUI(tk.Tk):
         self._burn_dealer_cards_step(0, start_x, start_y)
     
     def _burn_dealer_cards_step(self, index, start_x, start_y):
-        if index >= 3:
-            self.game.dealer_war_card = self.game.deck.deal_card()
+        if index >= len(self.game.burn_cards_dealer):
             self.move_card_animation(start_x, start_y, self.dealer_cards_frame, 4, self.game.dealer_war_card, show_front=False,
                                      callback=lambda lbl: self._reveal_dealer_war_card(lbl))
             return
-        card = self.game.deck.deal_card()
-        self.game.burn_cards_dealer.append(card)
+        card = self.game.burn_cards_dealer[index]
         self.move_card_animation(start_x, start_y, self.dealer_cards_frame, 1+index, card, show_front=False,
                                  callback=lambda lbl: self._burn_dealer_cards_step(index+1, start_x, start_y))
     
@@ -834,13 +813,12 @@ class CasinoWarGUI(tk.Tk):
         self.flip_card_animation(lbl, self.game.dealer_war_card, callback=self._war_compare)
     
     def _war_compare(self):
-        result = self.game.compare_cards(self.game.player_war_card, self.game.dealer_war_card)
+        result = self.engine.outcome["war_result"]
+        payouts = self.engine.settle()[0].data["payouts"]
         if result == "player":
-            ante_win = self.game.ante_bet * 2
-            war_return = self.game.war_bet
+            ante_win = payouts["ante"]
+            war_return = payouts["war"]
             total_win = ante_win + war_return
-            self.balance += total_win
-            self.update_balance()
             self.last_win = total_win
             self.last_win_label.config(text=f"上局获胜: ${total_win:.2f}")
             self.status_label.config(text="战争胜利！主注获胜，战争平局退还。")
@@ -857,11 +835,9 @@ class CasinoWarGUI(tk.Tk):
             self.war_var.set("0")
             self.war_display.config(bg='white')
         else:  # 平局
-            ante_win = self.game.ante_bet * 2
-            war_return = self.game.war_bet
+            ante_win = payouts["ante"]
+            war_return = payouts["war"]
             total_win = ante_win + war_return
-            self.balance += total_win
-            self.update_balance()
             self.last_win = total_win
             self.last_win_label.config(text=f"上局获胜: ${total_win:.2f}")
             self.status_label.config(text="战争平局！主注获胜，战争平局退还。")
@@ -1008,10 +984,10 @@ class CasinoWarGUI(tk.Tk):
         win.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
     
     def show_remaining_cards(self, event=None):
-        if not hasattr(self.game, 'deck') or self.game.deck is None:
+        if not self.engine.shoe:
             messagebox.showinfo("提示", "牌堆未初始化")
             return
-        remaining_cards = self.game.deck.get_remaining_cards_count()
+        remaining_cards = self.engine.remaining_counts()
         win = tk.Toplevel(self)
         win.title("剩余牌堆统计")
         win.geometry("600x400")
@@ -1019,7 +995,7 @@ class CasinoWarGUI(tk.Tk):
         win.configure(bg='#F0F0F0')
         main_frame = tk.Frame(win, bg='#F0F0F0')
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        title_label = tk.Label(main_frame, text=f"剩余{len(self.game.deck.cards)}张牌", font=('Arial', 16, 'bold'), bg='#F0F0F0', fg='#333333')
+        title_label = tk.Label(main_frame, text=f"剩余{len(self.engine.shoe)}张牌", font=('Arial', 16, 'bold'), bg='#F0F0F0', fg='#333333')
         title_label.pack(pady=(0, 10))
         table_frame = tk.Frame(main_frame, bg='#F0F0F0')
         table_frame.pack(fill=tk.BOTH, expand=True)
@@ -0,0 +1,181 @@
+"""花旗骰无界面模拟器
+
+使用 A_Tools/craps_rules 中与 CrapsGame 相同的结算表，在多进程中连续掷骰，
+对每种下注各维持 1 个单位的注码：注结算后在允许下注的阶段立即重新下注。
+统计每种下注的每注期望值（EV）、方差、95% 置信区间以及平均持续掷骰数。
+
+- Pass Line / Don't Pass 只在 Come Out 阶段下注
+- Come / Don't Come / Place / Big 6/8 只在 Point 阶段下注（Place 注在 Come Out 阶段照常结算）
+- 单轮注每次掷骰都下注
+
+用法:
+    python Craps_Simulator.py --rolls 5000000 --workers 4
+"""
+import argparse
+import math
+import os
+import random
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import craps_rules
+from craps_rules import WIN, LOSE, PUSH, POINT, LINE_BETS, PLACE_BETS, SINGLE_ROLL_BETS, ALL_BETS
+
+POINT_PHASE_BETS = ("come", "dont_come") + PLACE_BETS
+
+
+class BetStats:
+    """可合并的每注统计：结算次数、净输赢和 / 平方和、持续掷骰数"""
+    def __init__(self):
+        self.rolls = 0
+        self.count = {bet: 0 for bet in ALL_BETS}
+        self.sums = {bet: 0.0 for bet in ALL_BETS}
+        self.squares = {bet: 0.0 for bet in ALL_BETS}
+        self.duration = {bet: 0 for bet in ALL_BETS}
+
+    def merge(self, other):
+        self.rolls += other.rolls
+        for bet in ALL_BETS:
+            self.count[bet] += other.count[bet]
+            self.sums[bet] += other.sums[bet]
+            self.squares[bet] += other.squares[bet]
+            self.duration[bet] += other.duration[bet]
+        return self
+
+    def ev(self, bet):
+        """(每注 EV, 方差, 95% 置信区间半宽)"""
+        n = self.count[bet]
+        if not n:
+            return 0.0, 0.0, 0.0
+        mean = self.sums[bet] / n
+        var = max(self.squares[bet] / n - mean * mean, 0.0)
+        return mean, var, 1.96 * math.sqrt(var / n)
+
+    def report(self):
+        lines = [f"总掷骰数: {self.rolls:,}",
+                 f"  {'下注':<12}{'结算次数':>12}{'EV/注':>12}{'±95%':>10}{'方差':>10}{'平均掷骰':>10}"]
+        for bet in ALL_BETS:
+            mean, var, half = self.ev(bet)
+            n = self.count[bet]
+            rolls = self.duration[bet] / n if n else 0
+            lines.append(f"  {bet:<12}{n:>12,}{mean:>+12.5f}{half:>10.5f}{var:>10.3f}{rolls:>10.2f}")
+        return "\n".join(lines)
+
+
+def simulate_chunk(rolls, seed=None):
+    """工作进程：连续掷 rolls 次骰子，返回 BetStats"""
+    rng = random.Random(seed if seed is not None else secrets.randbits(64))
+    resolution = craps_rules.RESOLUTION
+    stats = BetStats()
+    count, sums, squares, duration = stats.count, stats.sums, stats.squares, stats.duration
+
+    point = None
+    # 每种多轮注的状态：该注自身的阶段（None 或点数）和已持续的掷骰数；未下注时为 False
+    active = {bet: False for bet in LINE_BETS + PLACE_BETS}
+    age = {bet: 0 for bet in LINE_BETS + PLACE_BETS}
+    tables = {bet: resolution[(bet, None)] for bet in PLACE_BETS + SINGLE_ROLL_BETS}
+
+    randrange = rng.randrange
+    for _ in range(rolls):
+        # 下注
+        if point is None:
+            for bet in ("pass_line", "dont_pass"):
+                if active[bet] is False:
+                    active[bet] = None
+                    age[bet] = 0
+        else:
+            for bet in POINT_PHASE_BETS:
+                if active[bet] is False:
+                    active[bet] = None
+                    age[bet] = 0
+
+        index = randrange(36)
+        total = index // 6 + index % 6 + 2
+
+        for bet in SINGLE_ROLL_BETS:
+            outcome, ret = tables[bet][index]
+            net = ret - 1
+            count[bet] += 1
+            sums[bet] += net
+            squares[bet] += net * net
+            duration[bet] += 1
+
+        for bet, phase in active.items():
+            if phase is False:
+                continue
+            age[bet] += 1
+            if bet in tables:
+                outcome, ret = tables[bet][index]
+            else:
+                outcome, ret = resolution[(bet, phase)][index]
+            if outcome == POINT:
+                active[bet] = total
+                continue
+            if outcome in (WIN, LOSE, PUSH):
+                net = ret - 1
+                count[bet] += 1
+                sums[bet] += net
+                squares[bet] += net * net
+                duration[bet] += age[bet]
+                active[bet] = False
+
+        # 推进主阶段（与 Pass Line 的点数一致）
+        if point is None:
+            if total in craps_rules.POINT_NUMBERS:
+                point = total
+        elif total == point or total == 7:
+            point = None
+    stats.rolls = rolls
+    return stats
+
+
+def run_simulation(total_rolls, workers=None, chunk_size=1000000, seed=None, progress=True):
+    """把模拟分块交给进程池，边完成边合并统计并输出进度"""
+    workers = workers or os.cpu_count() or 1
+    chunks = []
+    remaining = total_rolls
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+    base_seed = seed if seed is not None else secrets.randbits(32)
+
+    stats = BetStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_chunk, size, base_seed + i) for i, size in enumerate(chunks)]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if progress:
+                elapsed = time.perf_counter() - start
+                rate = stats.rolls / elapsed if elapsed else 0
+                print(f"\r进度: {stats.rolls:,}/{total_rolls:,} 次  {rate:,.0f} 次/秒", end="", flush=True)
+    if progress:
+        print()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="花旗骰无界面模拟器")
+    parser.add_argument("--rolls", type=int, default=2000000, help="掷骰次数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核心数）")
+    parser.add_argument("--chunk", type=int, default=1000000, help="每个任务的掷骰次数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（可复现）")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = run_simulation(args.rolls, args.workers, args.chunk, args.seed)
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(f"耗时 {elapsed:.1f} 秒，{stats.rolls / elapsed:,.0f} 次/秒")
+
+
+if __name__ == "__main__":
+    main()
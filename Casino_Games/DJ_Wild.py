@@ -5,10 +5,16 @@ import random
 import json
 import os
 import math
-import secrets
 import subprocess, sys
 from itertools import product
 
+# 将A_Tools目录添加到系统路径（共享的随机流）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+import random_stream
+import rng_provider
+
 # ------------------------- 基础数据 -------------------------
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -94,7 +100,7 @@ class Deck:
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         card_dir = os.path.join(parent_dir, 'A_Tools', 'Card')
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         try:
             result = subprocess.run(
@@ -108,17 +114,12 @@ class Deck:
         except Exception:
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS] + [Card('JOKER', 'JOKER')]
             print(self.full_deck)
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(53)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(53)
         self.start_pos = self.cut_position
         self.indexes = [(self.start_pos + i) % len(self.full_deck) for i in range(len(self.full_deck))]
         self.pointer = 0
 
-    def _secure_shuffle(self):
-        for i in range(len(self.full_deck)-1, 0, -1):
-            j = secrets.randbelow(i+1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
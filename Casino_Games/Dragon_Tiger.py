@@ -6,6 +6,16 @@ import json
 import os, sys
 import time
 
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import metrics
+
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(parent_dir, 'saving_data.json')
@@ -22,6 +32,7 @@ def load_user_data():
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()  # 先加载现有用户数据
     for user in users:
@@ -182,6 +193,7 @@ class DragonTigerGUI(tk.Tk):
         self.game = None
         self.username = username
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
    
         self._initialize_game(False)
         
@@ -1061,6 +1073,7 @@ class DragonTigerGUI(tk.Tk):
         self.marker_canvas = tk.Canvas(marker_frame, bg='#D0E7FF', highlightthickness=0)
         self.marker_canvas.pack(fill=tk.BOTH, expand=True, padx=3, pady=(0, 0))
 
+    @metrics.timed()
     def _update_bigroad(self):
         """
         将 self.bigroad_results 绘制到 self.bigroad_canvas 上（严格符合你的要求）：
@@ -2451,6 +2464,7 @@ class DragonTigerGUI(tk.Tk):
                 # 最后兜底：返回已有的 back_image
                 return getattr(self, 'back_image', None)
 
+    @metrics.timed()
     def resolve_bets(self):
         payouts = 0
         total_bet_amount = sum(self.current_bets.values())
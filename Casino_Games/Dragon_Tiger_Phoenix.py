@@ -6,6 +6,16 @@ import json
 import os, sys
 import time
 
+# 获取当前文件所在目录并定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+a_tools_dir = os.path.join(parent_dir, 'A_Tools')
+
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import metrics
+
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(parent_dir, 'saving_data.json')
@@ -20,6 +30,7 @@ def load_user_data():
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()
     for user in users:
@@ -170,6 +181,7 @@ class DragonTigerPhoenixGUI(tk.Tk):
         self.last_win = 0
         self.username = username
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
         self._initialize_game(False)
 
@@ -863,6 +875,7 @@ class DragonTigerPhoenixGUI(tk.Tk):
         self.marker_canvas = tk.Canvas(marker_frame, bg='#D0E7FF', highlightthickness=0)
         self.marker_canvas.pack(fill=tk.BOTH, expand=True, padx=3, pady=(0,0))
 
+    @metrics.timed()
     def _update_bigroad(self):
         """按照百家乐大路规则绘制：连续相同的结果在同一列向下，结果改变则新起一列；列满（6行）时相同结果新起一列继续向下。
            同时绘制连线：向下连竖线，向右连横线，颜色与获胜方相同（Tie用绿色）。"""
@@ -1833,6 +1846,7 @@ class DragonTigerPhoenixGUI(tk.Tk):
             except Exception:
                 return getattr(self, 'back_image', None)
 
+    @metrics.timed()
     def resolve_bets(self):
         payouts = 0
         outcome = self.game.outcome
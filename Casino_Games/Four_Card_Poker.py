@@ -4,12 +4,19 @@ from PIL import Image, ImageTk, ImageDraw, ImageFont
 import random
 import json
 import os
-import math
 import hashlib
 import time
-import secrets
 import subprocess, sys
 
+# 将A_Tools目录添加到系统路径（共享的动画调度器）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from tween import Animator
+import metrics
+import random_stream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -80,6 +87,7 @@ def load_user_data():
     except:
         return []
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()
     for user in users:
@@ -97,6 +105,7 @@ class Card:
         return f"{self.rank}{self.suit}"
 
 class Deck:
+    @metrics.timed()
     def __init__(self):
         # 获取当前脚本所在目录的上一级目录
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -105,7 +114,7 @@ class Deck:
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
         
         # 保证 Python 输出为 UTF-8
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         
         try:
@@ -139,8 +148,8 @@ class Deck:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             # fallback：标准顺序+安全乱序
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52)
         
         # 通用的洗牌后索引 & 发牌序列逻辑
         self.start_pos = self.cut_position
@@ -148,12 +157,6 @@ class Deck:
         self.pointer = 0
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
     
-    def _secure_shuffle(self):
-        """Fisher–Yates 洗牌，用 secrets 保证随机性"""
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
@@ -511,6 +514,7 @@ class FourCardPokerGUI(tk.Tk):
         self.game = FourCardGame(self.game_mode)
         self.card_images = {}
         self.animation_queue = []
+        self.animator = Animator.of(self)  # 本窗口的动画调度器
         self.animation_in_progress = False
         self.card_positions = {}
         self.active_card_labels = []
@@ -547,6 +551,7 @@ class FourCardPokerGUI(tk.Tk):
         self._load_assets()
         self._create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     def cancel_auto_reset_timer(self):
         """安全地取消自动重置计时器"""
@@ -1802,49 +1807,30 @@ class FourCardPokerGUI(tk.Tk):
         # 检查卡片是否仍然存在
         if not hasattr(card_label, "target_pos") or card_label not in self.active_card_labels:
             return
-            
+
+        def arrived():
+            card_label.is_moving = False
+
+            # 如果是回收动画且到达左上角，销毁卡片
+            if card_label.target_pos == (50, 50):
+                if card_label in self.active_card_labels:
+                    self.active_card_labels.remove(card_label)
+                card_label.destroy()
+
+            self.after(10, self.animate_deal)  # 处理下一张牌
+
         try:
-            current_x, current_y = card_label.winfo_x(), card_label.winfo_y()
-            target_x, target_y = card_label.target_pos
-            
-            # 计算移动方向向量
-            dx = target_x - current_x
-            dy = target_y - current_y
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            # 如果已经到达目标位置
-            if distance < 5:
-                # 确保设置正确的宽度和高度
-                card_label.place(x=target_x, y=target_y, width=120, height=180)
-                card_label.is_moving = False
-                
-                # 如果是回收动画且到达左上角，销毁卡片
-                if card_label.target_pos == (50, 50):
-                    if card_label in self.active_card_labels:
-                        self.active_card_labels.remove(card_label)
-                    card_label.destroy()
-                    
-                self.after(10, self.animate_deal)  # 处理下一张牌
-                return
-            
-            # 计算移动步长
-            step_x = dx * 0.2
-            step_y = dy * 0.2
-            
-            # 更新位置 - 确保保持宽度和高度
-            new_x = current_x + step_x
-            new_y = current_y + step_y
-            card_label.place(x=new_x, y=new_y, width=120, height=180)
-            
-            # 继续动画
-            self.after(20, lambda: self.animate_card_move(card_label))
-            
+            # 交给窗口的动画调度器逐帧移动（每帧移动剩余距离的20%）
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                size={'width': 120, 'height': 180},
+                on_done=arrived
+            )
         except tk.TclError:
             # 卡片已被销毁，停止动画
             if card_label in self.active_card_labels:
                 self.active_card_labels.remove(card_label)
-            return
-    
+
     def reveal_initial_cards(self):
         """翻开玩家所有牌和庄家第一张牌（仅在基本模式下翻开庄家第一张牌）"""
         if self.animation_in_progress:
@@ -2614,36 +2600,33 @@ class FourCardPokerGUI(tk.Tk):
         self.animate_card_out_step(auto_reset)
 
     def animate_card_out_step(self, auto_reset):
-        """移动卡片出屏幕的每一步"""
-        all_done = True
-        for card_label in self.active_card_labels[:]:  # 遍历副本
-            if not hasattr(card_label, 'target_pos') or not card_label.winfo_exists():
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
-
-            current_x = card_label.winfo_x()
-            target_x, target_y = card_label.target_pos
-
-            # 计算新位置
-            dx = target_x - current_x
-            if abs(dx) < 5:
-                card_label.place(x=target_x, y=target_y)
-                # 移除此卡片
-                card_label.destroy()
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
+        """把所有牌移出屏幕，全部完成后重置"""
+        cards = [
+            card_label for card_label in self.active_card_labels
+            if hasattr(card_label, 'target_pos') and card_label.winfo_exists()
+        ]
+        if not cards:
+            self._do_reset(auto_reset)
+            return
 
-            new_x = current_x + dx * 0.2
-            card_label.place(x=new_x)
-            all_done = False
+        remaining = [len(cards)]
 
-        if not all_done:
-            self.after(20, lambda: self.animate_card_out_step(auto_reset))
-        else:
-            # 所有动画完成，重置游戏
-            self._do_reset(auto_reset)
+        def card_out(card_label):
+            # 移除此卡片
+            card_label.destroy()
+            if card_label in self.active_card_labels:
+                self.active_card_labels.remove(card_label)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                # 所有动画完成，重置游戏
+                self._do_reset(auto_reset)
+
+        for card_label in cards:
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                on_done=lambda c=card_label: card_out(c),
+                on_cancel=lambda c=card_label: card_out(c)
+            )
 
     def reset_game(self, auto_reset=False):
         # 安全地取消自动重置计时器
@@ -2652,6 +2635,7 @@ class FourCardPokerGUI(tk.Tk):
         # 设置重置标志，停止所有动画
         self._resetting = True
         
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         # 清除所有挂起的after事件
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
@@ -2691,14 +2675,14 @@ class FourCardPokerGUI(tk.Tk):
             self.crazy_play_display.config(bg='#FFCDD2')  # 浅红色
             self.super_bonus_display.config(bg='#FFCDD2')  # 浅红色
             self.queens_plus_display.config(bg='#FFCDD2')  # 浅红色
-        self.after(500, lambda: self.ante_display.config(bg='white'))
+        self.animator.flash(self.ante_display, 0.5, bg='white')
         if self.game_mode == "basic":
-            self.after(500, lambda: self.basic_play_display.config(bg='white'))
-            self.after(500, lambda: self.ace_plus_display.config(bg='white'))
+            self.animator.flash(self.basic_play_display, 0.5, bg='white')
+            self.animator.flash(self.ace_plus_display, 0.5, bg='white')
         else:
-            self.after(500, lambda: self.crazy_play_display.config(bg='white'))
-            self.after(500, lambda: self.super_bonus_display.config(bg='white'))
-            self.after(500, lambda: self.queens_plus_display.config(bg='white'))
+            self.animator.flash(self.crazy_play_display, 0.5, bg='white')
+            self.animator.flash(self.super_bonus_display, 0.5, bg='white')
+            self.animator.flash(self.queens_plus_display, 0.5, bg='white')
     
     def _do_reset(self, auto_reset=False):
         self._load_assets()
@@ -2714,6 +2698,7 @@ class FourCardPokerGUI(tk.Tk):
         # 启用切换按钮
         self.switch_button.config(state=tk.NORMAL)
         
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         # 清除所有挂起的after事件
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
@@ -2747,6 +2732,7 @@ class FourCardPokerGUI(tk.Tk):
         
         # 清除所有动画状态
         self.animation_queue = []
+        self.animator.cancel()  # 停止仍在进行的补间
         self.animation_in_progress = False
         self.flipping_cards = []
         self.flip_step = 0
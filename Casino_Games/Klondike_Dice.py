@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk, ImageDraw
 import random
 import json
 import os
@@ -19,68 +18,14 @@ if a_tools_dir not in sys.path:
 
 # 导入真随机骰子模块
 from shuffle_dice import Dice
+from dice_animation import DiceAnimation, dice_face_images
+
+# 组合类型、赔付表与 6^5 组合表在无界面引擎中定义（A_Tools/engines/klondike.py）
+from engines.klondike import (
+    HAND_TYPES, BONUS_PAYOUT, INITIAL_JACKPOT,
+    dice_index, HAND_TABLE, HAND_STRENGTH, JACKPOT_CONTRIBUTION, settle_hands, progressive_win
+)
 
-# 骰子组合类型
-HAND_TYPES = {
-    "five_of_a_kind": "五同",
-    "four_of_a_kind": "四同",
-    "big_straight": "大顺子(2-3-4-5-6)",
-    "small_straight": "小顺子(1-2-3-4-5)",
-    "straight": "顺子",
-    "high_die": "散牌",
-    "full_house": "葫芦",
-    "three_of_a_kind": "三同",
-    "two_pairs": "两对",
-    "one_pair": "一对"
-}
-
-# 组合顺序（从强到弱）
-HAND_RANK_ORDER = [
-    "five_of_a_kind",
-    "four_of_a_kind",
-    "big_straight",
-    "small_straight",
-    "straight",
-    "high_die",
-    "full_house",
-    "three_of_a_kind",
-    "two_pairs",
-    "one_pair"
-]
-
-# Bind赔付表
-BIND_PAYOUT = {
-    "five_of_a_kind": 100,
-    "four_of_a_kind": 50,
-    "big_straight": 10,
-    "small_straight": 10,
-    "straight": 5,
-    "high_die": 2,
-    "other": 1  # 平局或输
-}
-
-# Bonus赔付表
-BONUS_PAYOUT = {
-    "five_of_a_kind": 30,
-    "four_of_a_kind": 10,
-    "big_straight": 5,
-    "small_straight": 5,
-    "straight": 3,
-    "high_die": 0,   # 平局
-    "other": -1      # 输
-}
-
-# Progressive赔付表
-PROGRESSIVE_PAYOUT = {
-    "five_of_a_kind": "$1500 + Prog的10%",
-    "four_of_a_kind": "$500 + Prog的5%",
-    "big_straight": "$300 + Prog的3%",
-    "small_straight": "$300 + Prog的3%",
-    "other": -1  # 输
-}
-
-# 初始Jackpot金额
-INITIAL_JACKPOT = 4200
 
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -185,68 +130,15 @@ class KlondikeDiceGame:
         return sorted(dice, key=lambda d: d.value)
     
     def evaluate_hand(self, dice):
-        """评估骰子组合类型"""
-        values = [d.value for d in dice]
-        
-        # 检查大顺子 (2-3-4-5-6 或 6-5-4-3-2)
-        if values == [2, 3, 4, 5, 6] or values == [6, 5, 4, 3, 2]:
-            return "big_straight"
-        
-        # 检查小顺子 (1-2-3-4-5 或 5-4-3-2-1)
-        if values == [1, 2, 3, 4, 5] or values == [5, 4, 3, 2, 1]:
-            return "small_straight"
-        
-        sorted_values = sorted(values)
-        counts = {i: sorted_values.count(i) for i in set(sorted_values)}
-        unique_count = len(counts)
-        
-        # 检查五同
-        if unique_count == 1:
-            return "five_of_a_kind"
-        
-        # 检查四同
-        if 4 in counts.values():
-            return "four_of_a_kind"
-        
-        # 检查葫芦 (3+2)
-        if 3 in counts.values() and 2 in counts.values():
-            return "full_house"
-        
-        # 检查顺子 (任意顺序的顺子)
-        if sorted_values in [[1,2,3,4,5], [2,3,4,5,6]]:
-            return "straight"
-        
-        # 检查散牌（high_die） - 无任何组合的牌型
-        if max(counts.values()) == 1 and len(values) == 5:
-            return "high_die"
-        
-        # 检查三同
-        if 3 in counts.values():
-            return "three_of_a_kind"
-        
-        # 检查两对
-        if list(counts.values()).count(2) == 2:
-            return "two_pairs"
-        
-        # 检查一对
-        if 2 in counts.values():
-            return "one_pair"
-        
-        # 如果以上都不是，默认为散牌
-        return "high_die"
+        """评估骰子组合类型（查预计算表）"""
+        return HAND_TABLE[dice_index([d.value for d in dice])]
     
     def compare_hands(self, hand1, hand2):
         """比较两手牌，返回1表示hand1赢，0表示平局，-1表示hand2赢"""
-        rank1 = HAND_RANK_ORDER.index(hand1)
-        rank2 = HAND_RANK_ORDER.index(hand2)
-        
-        if rank1 < rank2:  # 组合等级越高（在列表中位置越靠前）越强
-            return 1
-        elif rank1 > rank2:
-            return -1
-        else:
-            # 相同组合类型，平局
-            return 0
+        rank1 = HAND_STRENGTH[hand1]
+        rank2 = HAND_STRENGTH[hand2]
+        # 相同组合类型为平局
+        return (rank1 > rank2) - (rank1 < rank2)
 
 class KlondikeDiceGUI(tk.Tk):
     def __init__(self, initial_balance, username):
@@ -295,41 +187,10 @@ class KlondikeDiceGUI(tk.Tk):
         self.destroy()
         self.quit()
     
-    def draw_dice(self, img, num):
-        """程序绘制骰子图像"""
-        draw = ImageDraw.Draw(img)
-        size = img.size[0]
-        dot_size = max(2, size // 10)  # 确保点大小至少为2像素
-        # 绘制骰子边框
-        draw.rectangle([0, 0, size-1, size-1], outline='#333', width=1, fill='#e8d6b3')
-        dot_color = '#333'
-        
-        # 定义骰子点数位置
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4), (size//4, size//2), (3*size//4, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        
-        # 绘制骰子点数
-        for pos in dot_positions.get(num, []):
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
-    
     def _load_assets(self):
-        dice_size = (80, 80)  # 骰子显示大小
-        
-        # 为1-6每个点数创建图像
-        self.dice_images = {}
-        for i in range(1, 7):
-            # 创建空白图像（使用更大尺寸绘制，然后缩小）
-            base_img = Image.new('RGB', (120, 120), '#e8d6b3')
-            self.draw_dice(base_img, i)
-            # 缩小到显示尺寸
-            resized_img = base_img.resize(dice_size, Image.LANCZOS)
-            self.dice_images[i] = ImageTk.PhotoImage(resized_img)
+        # 骰子显示大小 80，使用 120 绘制后缩小（共享贴图缓存）
+        faces = dice_face_images(self, 80, render_size=120)
+        self.dice_images = {i: faces[i-1] for i in range(1, 7)}
 
     def add_chip_to_bet_area(self, event, bet_type):
         """添加筹码到下注区域"""
@@ -1024,7 +885,7 @@ class KlondikeDiceGUI(tk.Tk):
             self.current_bet_label.config(text=f"本局下注: ${total_bet:.2f}")
             
             # 将下注金额的1%加入Progressive奖池
-            jackpot_contribution = total_bet * 3.1415926 * 0.01
+            jackpot_contribution = total_bet * JACKPOT_CONTRIBUTION
             self.game.progressive_amount += jackpot_contribution
             save_progressive(self.game.progressive_amount)
             self.progressive_var.set(f"${self.game.progressive_amount:.2f}")
@@ -1205,34 +1066,31 @@ class KlondikeDiceGUI(tk.Tk):
         self.animate_roll()
     
     def animate_roll(self):
-        if self.roll_count > 30:  # 总共滚动30次
-            # 动画结束，显示最终结果
-            self.dice_animation_active = False
-            self.game.stage = "showdown"
-            self.stage_label.config(text="阶段: 结算")
-            
-            # 显示庄家骰子
-            self.reveal_dealer_dice()
-            
-            # 显示玩家骰子
-            self.reveal_player_dice()
-            
-            # 更新组合标签
-            self.update_hand_labels()
-            
-            # 结算游戏
-            self.after(2000, self.show_showdown)
-            return
+        """播放翻滚动画；点数已由 roll_all 决定，动画过程中不再掷骰"""
+        labels = [d for d in self.rolling_dice if d.winfo_exists()]
+        finals = [d.dice.value for d in labels]
+        self.roll_animation = DiceAnimation(
+            self, labels, [self.dice_images[i] for i in range(1, 7)],
+            finals=finals, duration=1.5, on_done=self._on_roll_done
+        ).start()
+
+    def _on_roll_done(self, finals):
+        # 动画结束，显示最终结果
+        self.dice_animation_active = False
+        self.game.stage = "showdown"
+        self.stage_label.config(text="阶段: 结算")
+        
+        # 显示庄家骰子
+        self.reveal_dealer_dice()
         
-        # 更新骰子显示
-        for dice_label in self.rolling_dice:
-            if dice_label.winfo_exists():
-                # 随机显示骰子面
-                value = dice_label.dice.roll()
-                dice_label.config(image=self.dice_images[value])
+        # 显示玩家骰子
+        self.reveal_player_dice()
         
-        self.roll_count += 1
-        self.after(50, self.animate_roll)
+        # 更新组合标签
+        self.update_hand_labels()
+        
+        # 结算游戏
+        self.after(2000, self.show_showdown)
     
     def reveal_dealer_dice(self):
         """显示庄家骰子的最终结果"""
@@ -1261,60 +1119,35 @@ class KlondikeDiceGUI(tk.Tk):
             "progressive": 0
         }
         
-        # 1. Ante结算 - 修复问题3：庄家不及格时只退还Ante
-        if dealer_hand == "one_pair":  # 庄家不及格（一对）
-            details["ante"] = self.game.ante  # 退还Ante
-            winnings += self.game.ante
-            self.ante_display.config(bg='lightblue')  # 高亮显示
-        else:
-            # 比较牌型
-            comparison = self.game.compare_hands(dealer_hand, player_hand)
-            if comparison < 0:  # 玩家赢
-                details["ante"] = self.game.ante * 2  # 1:1赔付
-                winnings += self.game.ante * 2
-                self.ante_display.config(bg='gold')
-            elif comparison == 0:  # 平局
-                details["ante"] = self.game.ante  # 退还Ante
-                winnings += self.game.ante
-                self.ante_display.config(bg='lightblue')
-            else:  # 庄家赢
-                details["ante"] = 0
-                self.ante_display.config(bg='white')
-        
-        # 2. Blind结算 - 不受庄家不及格影响
+        # Ante / Blind / Trips 的返还由引擎按规则计算（含本金）
+        returns = settle_hands(player_hand, dealer_hand, self.game.ante, self.game.blind, self.game.trips)
+        details.update(returns)
+        winnings += returns["ante"] + returns["blind"] + returns["trips"]
         comparison = self.game.compare_hands(dealer_hand, player_hand)
-        if comparison < 0:  # 玩家赢
-            # 根据牌型获取赔率
-            payout_multiplier = BIND_PAYOUT.get(player_hand, 1)  # 使用新的赔付表
-            if payout_multiplier == 0:  # 其他牌型平局
-                details["blind"] = self.game.blind
-                winnings += self.game.blind
-                self.blind_display.config(bg='lightblue')
-            else:
-                details["blind"] = self.game.blind * payout_multiplier
-                winnings += self.game.blind * payout_multiplier
-                self.blind_display.config(bg='gold')
-        elif comparison == 0:  # 平局
-            details["blind"] = self.game.blind
-            winnings += self.game.blind
+
+        # 1. Ante - 庄家不及格（一对）时只退还Ante
+        if dealer_hand == "one_pair" or comparison == 0:
+            self.ante_display.config(bg='lightblue')  # 退还
+        elif comparison < 0:  # 玩家赢
+            self.ante_display.config(bg='gold')
+        else:
+            self.ante_display.config(bg='white')
+
+        # 2. Blind - 不受庄家不及格影响
+        if comparison < 0:
+            self.blind_display.config(bg='gold')
+        elif comparison == 0:
             self.blind_display.config(bg='lightblue')
-        else:  # 庄家赢
-            details["blind"] = 0
+        else:
             self.blind_display.config(bg='white')
-        
-        # 3. Trips结算 - 不受庄家不及格影响
-        # 根据玩家牌型获取赔率
-        payout_multiplier = BONUS_PAYOUT.get(player_hand, -1)
-        if payout_multiplier == -1:  # 其他牌型输
-            details["trips"] = 0
+
+        # 3. Trips - 不受庄家不及格影响
+        multiplier = BONUS_PAYOUT.get(player_hand, -1)
+        if multiplier == -1:
             self.trips_display.config(bg='white')
-        elif payout_multiplier == 0:  # 散牌平局
-            details["trips"] = self.game.trips
-            winnings += self.game.trips
+        elif multiplier == 0:  # 散牌平局
             self.trips_display.config(bg='lightblue')
         else:
-            details["trips"] = self.game.trips * payout_multiplier
-            winnings += self.game.trips * payout_multiplier
             self.trips_display.config(bg='gold')
         
         # 4. Progressive结算 - 不受庄家不及格影响
@@ -1366,24 +1199,8 @@ class KlondikeDiceGUI(tk.Tk):
         self.auto_reset_timer = self.after(30000, lambda: self.reset_game(True))
     
     def calculate_progressive(self, player_hand):
-        """计算Progressive奖金"""
-        win_amount = 0
-        if player_hand == "big_straight":
-            win_amount = self.game.progressive_amount * 0.03 + 300
-            self.game.progressive_amount -= win_amount
-        elif player_hand == "small_straight":
-            win_amount = self.game.progressive_amount * 0.03 + 300
-            self.game.progressive_amount -= win_amount
-        elif player_hand == "five_of_a_kind":
-            win_amount = self.game.progressive_amount * 0.1 + 1500
-            self.game.progressive_amount -= win_amount
-        elif player_hand == "four_of_a_kind":
-            win_amount = self.game.progressive_amount * 0.05 + 500
-            self.game.progressive_amount -= win_amount
-        
-        # 确保奖池不低于4200
-        if self.game.progressive_amount < 4200:
-            self.game.progressive_amount = 4200
+        """计算Progressive奖金（派奖后奖池不低于初始金额）"""
+        win_amount, self.game.progressive_amount = progressive_win(player_hand, self.game.progressive_amount)
         
         # 保存更新后的奖池
         save_progressive(self.game.progressive_amount)
@@ -0,0 +1,133 @@
+"""Klondike 骰子精确分析
+
+使用 engines/klondike.py 中预先计算的 6^5 有序掷骰组合表，得到每种组合的精确概率，
+再按 10×10 组合对计算玩家对庄家的胜/平/负概率，以及 Ante、Blind、Bonus
+和 Progressive 注项的精确期望值（EV），规则与 KlondikeDiceGUI.show_showdown 一致。
+
+用法:
+    python Klondike_Dice_Analyzer.py
+    python Klondike_Dice_Analyzer.py --jackpot 25000
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from fractions import Fraction
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from engines.klondike import (
+    HAND_TYPES, HAND_RANK_ORDER, HAND_TABLE, HAND_STRENGTH,
+    BIND_PAYOUT, BONUS_PAYOUT, INITIAL_JACKPOT,
+    PROGRESSIVE_BET, PROGRESSIVE_RULES, DEALER_NOT_QUALIFIED
+)
+
+
+def hand_probabilities():
+    """{组合: 精确概率}"""
+    counts = Counter(HAND_TABLE)
+    return {hand: Fraction(counts[hand], len(HAND_TABLE)) for hand in HAND_RANK_ORDER}
+
+
+def showdown_probabilities(probs):
+    """玩家对庄家的 (赢, 平, 输) 概率，以及按玩家组合细分的赢/平概率"""
+    win = tie = lose = Fraction(0)
+    win_by_hand = Counter()
+    tie_by_hand = Counter()
+    for player, pp in probs.items():
+        for dealer, pd in probs.items():
+            p = pp * pd
+            if HAND_STRENGTH[player] > HAND_STRENGTH[dealer]:
+                win += p
+                win_by_hand[player] += p
+            elif HAND_STRENGTH[player] == HAND_STRENGTH[dealer]:
+                tie += p
+                tie_by_hand[player] += p
+            else:
+                lose += p
+    return win, tie, lose, win_by_hand, tie_by_hand
+
+
+def ante_ev(probs):
+    """庄家一对不及格时退还 Ante；否则 1:1 比大小"""
+    ev = Fraction(0)
+    for player, pp in probs.items():
+        for dealer, pd in probs.items():
+            if dealer == DEALER_NOT_QUALIFIED:
+                continue
+            if HAND_STRENGTH[player] > HAND_STRENGTH[dealer]:
+                ev += pp * pd
+            elif HAND_STRENGTH[player] < HAND_STRENGTH[dealer]:
+                ev -= pp * pd
+    return ev
+
+
+def blind_ev(win_by_hand, lose):
+    """赢时返还 Blind × BIND_PAYOUT（未列出的组合只退本金），平局退还，输则失去"""
+    ev = -lose
+    for hand, p in win_by_hand.items():
+        ev += p * (BIND_PAYOUT.get(hand, 1) - 1)
+    return ev
+
+
+def bonus_ev(probs):
+    """返还 = 下注 × BONUS_PAYOUT（-1 为输，0 为退还本金）"""
+    ev = Fraction(0)
+    for hand, p in probs.items():
+        multiplier = BONUS_PAYOUT.get(hand, -1)
+        if multiplier == -1:
+            ev -= p
+        elif multiplier > 0:
+            ev += p * (multiplier - 1)
+    return ev
+
+
+def progressive_ev(probs, jackpot):
+    """每 1 单位 Progressive 下注的期望值"""
+    expected_return = sum(
+        float(probs[hand]) * (fixed + jackpot * share)
+        for hand, (fixed, share) in PROGRESSIVE_RULES.items()
+    )
+    return (expected_return - PROGRESSIVE_BET) / PROGRESSIVE_BET
+
+
+def break_even_jackpot(probs):
+    """Progressive 期望值为 0 时的奖池金额"""
+    fixed = sum(float(probs[h]) * f for h, (f, _) in PROGRESSIVE_RULES.items())
+    share = sum(float(probs[h]) * s for h, (_, s) in PROGRESSIVE_RULES.items())
+    return (PROGRESSIVE_BET - fixed) / share
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Klondike 骰子精确分析")
+    parser.add_argument("--jackpot", type=float, default=INITIAL_JACKPOT, help="Progressive 奖池金额")
+    args = parser.parse_args()
+
+    probs = hand_probabilities()
+    print(f"组合概率（共 {len(HAND_TABLE):,} 种有序掷骰）:")
+    for hand in HAND_RANK_ORDER:
+        print(f"  {HAND_TYPES[hand]:<16}{probs[hand].numerator * len(HAND_TABLE) // probs[hand].denominator:>6}"
+              f"  {float(probs[hand]):.6f}")
+
+    win, tie, lose, win_by_hand, _ = showdown_probabilities(probs)
+    print(f"玩家对庄家: 赢 {float(win):.6f}  平 {float(tie):.6f}  输 {float(lose):.6f}")
+
+    ante = ante_ev(probs)
+    blind = blind_ev(win_by_hand, lose)
+    print(f"Ante EV:  {float(ante):+.6f}")
+    print(f"Blind EV: {float(blind):+.6f}")
+    print(f"Ante+Blind（每 1 单位 Ante）EV: {float(ante + blind):+.6f}")
+    print(f"Bonus EV: {float(bonus_ev(probs)):+.6f}")
+    print(f"Progressive（${PROGRESSIVE_BET}，奖池 ${args.jackpot:,.2f}）EV: {progressive_ev(probs, args.jackpot):+.6f}")
+    break_even = break_even_jackpot(probs)
+    if break_even > 0:
+        print(f"Progressive 保本奖池: ${break_even:,.2f}")
+    else:
+        print("Progressive 固定奖金的期望已超过下注额，任何奖池金额下 EV 均为正")
+
+
+if __name__ == "__main__":
+    main()
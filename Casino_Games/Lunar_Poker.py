@@ -4,13 +4,20 @@ from PIL import Image, ImageTk, ImageDraw, ImageFont
 import random
 import json
 import os
-import math
 import hashlib
 import time
-import secrets
 import subprocess, sys
 from itertools import combinations
 
+# 将A_Tools目录添加到系统路径（共享的动画调度器）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from tween import Animator
+import metrics
+import random_stream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -81,6 +88,7 @@ def load_user_data():
     except:
         return []
 
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()
     for user in users:
@@ -98,12 +106,13 @@ class Card:
         return f"{self.rank}{self.suit}"
 
 class Deck:
+    @metrics.timed()
     def __init__(self):
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         card_dir = os.path.join(parent_dir, 'A_Tools', 'Card')
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
 
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
 
         try:
@@ -134,19 +143,14 @@ class Deck:
                 KeyError) as e:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52)
 
         self.start_pos = self.cut_position
         self.indexes = [(self.start_pos + i) % 52 for i in range(52)]
         self.pointer = 0
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
 
-    def _secure_shuffle(self):
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
@@ -400,6 +404,7 @@ class LunarPokerGUI(tk.Tk):
         self.game = LunarPokerGame()
         self.card_images = {}
         self.animation_queue = []
+        self.animator = Animator.of(self)  # 本窗口的动画调度器
         self.animation_in_progress = False
         self.card_positions = {}
         self.active_card_labels = []
@@ -433,6 +438,7 @@ class LunarPokerGUI(tk.Tk):
         self._load_assets()
         self._create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     def cancel_auto_reset_timer(self):
         if self.auto_reset_timer:
@@ -1836,35 +1842,25 @@ class LunarPokerGUI(tk.Tk):
         self.animate_card_move(card_label)
 
     def animate_card_move(self, card_label):
+        # 检查卡片是否仍然存在
         if not hasattr(card_label, "target_pos") or card_label not in self.active_card_labels:
             return
 
-        try:
-            current_x, current_y = card_label.winfo_x(), card_label.winfo_y()
-            target_x, target_y = card_label.target_pos
-
-            dx = target_x - current_x
-            dy = target_y - current_y
-            distance = math.sqrt(dx**2 + dy**2)
-
-            if distance < 5:
-                card_label.place(x=target_x, y=target_y, width=120, height=180)
-                card_label.is_moving = False
-                self.after(100, self.animate_deal)
-                return
-
-            step_x = dx * 0.2
-            step_y = dy * 0.2
-            new_x = current_x + step_x
-            new_y = current_y + step_y
-            card_label.place(x=new_x, y=new_y, width=120, height=180)
-
-            self.after(20, lambda: self.animate_card_move(card_label))
+        def arrived():
+            card_label.is_moving = False
+            self.after(100, self.animate_deal)  # 处理下一张牌
 
+        try:
+            # 交给窗口的动画调度器逐帧移动（每帧移动剩余距离的20%）
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                size={'width': 120, 'height': 180},
+                on_done=arrived
+            )
         except tk.TclError:
+            # 卡片已被销毁，停止动画
             if card_label in self.active_card_labels:
                 self.active_card_labels.remove(card_label)
-            return
 
     def reveal_player_cards(self):
         """翻开玩家牌，翻开庄家第一张"""
@@ -3239,13 +3235,14 @@ class LunarPokerGUI(tk.Tk):
             widget.config(bg='white')
         self.ante_display.config(bg='#FFCDD2')
         self.super_bet_display.config(bg='#FFCDD2')
-        self.after(500, lambda: self.ante_display.config(bg='white'))
-        self.after(500, lambda: self.super_bet_display.config(bg='white'))
+        self.animator.flash(self.ante_display, 0.5, bg='white')
+        self.animator.flash(self.super_bet_display, 0.5, bg='white')
 
     def reset_game(self, auto_reset=False):
         self.cancel_auto_reset_timer()
         self._resetting = True
 
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
 
@@ -3286,31 +3283,33 @@ class LunarPokerGUI(tk.Tk):
         self.animate_card_out_step(auto_reset)
 
     def animate_card_out_step(self, auto_reset):
-        all_done = True
-        for card_label in self.active_card_labels[:]:
-            if not hasattr(card_label, 'target_pos') or not card_label.winfo_exists():
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
-
-            current_x = card_label.winfo_x()
-            target_x, target_y = card_label.target_pos
-            dx = target_x - current_x
-            if abs(dx) < 5:
-                card_label.place(x=target_x, y=target_y)
-                card_label.destroy()
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
+        """把所有牌移出屏幕，全部完成后重置"""
+        cards = [
+            card_label for card_label in self.active_card_labels
+            if hasattr(card_label, 'target_pos') and card_label.winfo_exists()
+        ]
+        if not cards:
+            self._do_reset(auto_reset)
+            return
 
-            new_x = current_x + dx * 0.2
-            card_label.place(x=new_x)
-            all_done = False
+        remaining = [len(cards)]
 
-        if not all_done:
-            self.after(20, lambda: self.animate_card_out_step(auto_reset))
-        else:
-            self._do_reset(auto_reset)
+        def card_out(card_label):
+            # 移除此卡片
+            card_label.destroy()
+            if card_label in self.active_card_labels:
+                self.active_card_labels.remove(card_label)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                # 所有动画完成，重置游戏
+                self._do_reset(auto_reset)
+
+        for card_label in cards:
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                on_done=lambda c=card_label: card_out(c),
+                on_cancel=lambda c=card_label: card_out(c)
+            )
 
     def _do_reset(self, auto_reset=False):
         self._load_assets()
@@ -3322,6 +3321,7 @@ class LunarPokerGUI(tk.Tk):
                 pass
             self.auto_reset_timer = None
 
+        self.animator.cancel()  # 先停止补间并取消其帧定时器，以免下面的批量取消留下失效的定时器 id
         for after_id in self.tk.eval('after info').split():
             self.after_cancel(after_id)
 
@@ -3345,6 +3345,7 @@ class LunarPokerGUI(tk.Tk):
         self.ak_moved = False
         self.ak_animation_active = False
         self.animation_queue = []
+        self.animator.cancel()  # 停止仍在进行的补间
         self.animation_in_progress = False
         self.flipping_cards = []
         self.flip_step = 0
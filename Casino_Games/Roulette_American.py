@@ -1,6 +1,8 @@
 import json
 import math
 import os
+import queue
+import sys
 import uuid
 import time
 import tkinter as tk
@@ -11,8 +13,21 @@ try:
 except Exception:
     ImageColor = None
 
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "A_Tools")
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from marker_road import MarkerRoad, MarkerStyle
+import metrics
+import rng_provider
+import shared_table
+from engines import EngineError
+from engines.roulette import spot_key
+
 def uuid_uniform(a: float, b: float) -> float:
-    """使用 uuid4 的随机位生成 [a, b) 范围内的浮点数"""
+    """使用 uuid4 的随机位生成 [a, b) 范围内的浮点数（CASINO_SEED 可复现模式下改用固定种子的随机流）"""
+    if rng_provider.deterministic():
+        return rng_provider.stream("Roulette_American.physics").uniform(a, b)
     # uuid4 返回 128 位随机整数，取高 64 位足够了
     rand_int = uuid.uuid4().int >> 64   # 取高 64 位
     # 映射到 [0, 1) 区间
@@ -89,6 +104,7 @@ def load_balance(username: str, default_balance: float = 1_000_000.0) -> float:
     return default_balance
 
 
+@metrics.timed()
 def update_balance_in_json(username: str, new_balance: float):
     if username == "Guest":
         return
@@ -680,8 +696,10 @@ class RouletteBoardGeometry:
 class RouletteGameGUI(tk.Tk):
     BETTING_SECONDS = 30  #时间
     TIMER_TICK_MS = 250
+    TABLE_POLL_MS = 50
+    SHARED_TABLE_GAME = "roulette_us"
 
-    def __init__(self, initial_balance=1_000_000, username="Guest"):
+    def __init__(self, initial_balance=1_000_000, username="Guest", shared=False):
         super().__init__()
         self.title("美式轮盘")
         self.geometry("1230x770+20+10")
@@ -692,6 +710,16 @@ class RouletteGameGUI(tk.Tk):
         self.balance = float(load_balance(username, float(initial_balance)))
         self.history = RouletteHistory(roulette_log_path())
 
+        # 共享牌桌模式：倒计时、开奖、结算与历史记录都由 shared_table 统一处理，
+        # 本窗口只负责下注和转轮动画
+        self.table = None
+        self.table_player = username
+        self._table_events = queue.Queue()
+        self._table_result = None
+        self._pending_round = None
+        self._target_index = None
+        joined = self._join_shared_table() if shared else None
+
         self.geometry_model = RouletteBoardGeometry(scale=BOARD_SCALE)
         self.marker_results = []
         self.marker_rows = 6
@@ -751,13 +779,20 @@ class RouletteGameGUI(tk.Tk):
 
         self._build_ui()
         self._sync_marker_from_history()
-        self._start_new_round()
+        if joined is not None:
+            # 本局已封盘时先锁定下注，等下一局开始
+            in_betting = joined.get("phase") == "betting" and joined.get("deadline")
+            self._start_new_round(deadline=joined["deadline"] if in_betting else time.time())
+            self.after(self.TABLE_POLL_MS, self._poll_table)
+        else:
+            self._start_new_round()
 
         self.focus_force()                         # 确保窗口获得焦点
         self.bind("<Return>", lambda event: self.start_game())
         self.bind("<KP_Enter>", lambda event: self.start_game())
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     # =====================================================
     # UI
@@ -1082,6 +1117,8 @@ class RouletteGameGUI(tk.Tk):
                 continue
             if self.balance < actual_amount:
                 break
+            if not self._table_bet(spot, actual_amount):
+                break
 
             self.balance -= actual_amount
             self.current_bets[spot_id] = existing + actual_amount
@@ -1096,7 +1133,7 @@ class RouletteGameGUI(tk.Tk):
 
     def _toggle_pause_timer(self):
         """暂停/继续倒计时"""
-        if self.round_state != "betting":
+        if self.round_state != "betting" or self.table is not None:
             return
 
         if not self.timer_paused:
@@ -1926,84 +1963,26 @@ class RouletteGameGUI(tk.Tk):
         update_group(cold_items, self.cold_canvases, "#EEF7FF")
 
     def _draw_marker_grid(self):
-        self.marker_canvas.delete("all")
-
-        rows = self.marker_rows
-        cols = self.marker_cols
-        cell_size = 30
-
-        width = cols * cell_size + 2
-        height = rows * cell_size + 2
-
-        self.marker_canvas.config(
-            width=width,
-            height=height,
-            scrollregion=(0, 0, width, height)
+        # 网格与圆点槽位只创建一次，之后由 _update_marker_road 原地更新
+        self.marker_road = MarkerRoad(
+            self.marker_canvas, self.marker_rows, self.marker_cols, cell_size=30,
+            grid_outline="#7B6441", grid_fill="#F7ECD3", dot_width=2, extra_size=2
         )
 
-        for col in range(cols):
-            for row in range(rows):
-                x1 = col * cell_size
-                y1 = row * cell_size
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-
-                self.marker_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline="#7B6441",
-                    fill="#F7ECD3",
-                    width=1
-                )
-
     def _update_marker_road(self):
-        self._draw_marker_grid()
-        rows, cols = self.marker_rows, self.marker_cols
-        cell_size = 30
-        max_display = rows * cols
-        start_idx = max(0, len(self.marker_results) - max_display)
-        results_to_show = self.marker_results[start_idx:]
-
-        for idx, entry in enumerate(results_to_show):
-            if idx >= max_display:
-                break
+        styles = []
+        for entry in self.marker_results[-self.marker_road.capacity:]:
             result = entry["result"]
             color = roulette_color(result)
             if color == "Red":
                 fill = RED
-                text_fill = "white"
             elif color == "Black":
                 fill = BLACK
-                text_fill = "white"
             else:
                 fill = TEAL
-                text_fill = "white"
-
-            col = idx // rows
-            row = idx % rows
-            x1 = col * cell_size
-            y1 = row * cell_size
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-            cx = (x1 + x2) / 2
-            cy = (y1 + y2) / 2
-            radius = cell_size * 0.40
-
-            self.marker_canvas.create_oval(
-                cx - radius, cy - radius,
-                cx + radius, cy + radius,
-                fill=fill,
-                outline="#000000",
-                width=2,
-                tags="dot"
-            )
             font = ("Segoe UI Emoji", 11, "bold") if result == "00" else ("Arial", 11, "bold")
-            self.marker_canvas.create_text(
-                cx, cy,
-                text=result,
-                fill=text_fill,
-                font=font,
-                tags="dot"
-            )
+            styles.append(MarkerStyle(fill, "#000000", result, "white", font))
+        self.marker_road.set_results(styles)
 
     def _sync_marker_from_history(self):
         raw_hist = self.history.recent_results(limit=54)
@@ -2023,6 +2002,7 @@ class RouletteGameGUI(tk.Tk):
     # =====================================================
     # Wheel drawing (unchanged)
     # =====================================================
+    @metrics.timed()
     def _draw_wheel(self):
         # 强制处理 pending 的布局事件，确保能获取到正确的画布尺寸
         self.update_idletasks()
@@ -2888,6 +2868,8 @@ class RouletteGameGUI(tk.Tk):
         if self.balance < actual_amount:
             messagebox.showwarning("余额不足", f"余额不足，无法下注 ${actual_amount:,.0f}。")
             return
+        if not self._table_bet(spot, actual_amount):
+            return
 
         self.balance -= actual_amount
         self.current_bets[spot_id] = existing + actual_amount
@@ -2904,6 +2886,8 @@ class RouletteGameGUI(tk.Tk):
         """清除当前所有下注，并退还金额"""
         if self.round_state != "betting":
             return
+        if self.current_bets and not self._table_clear():
+            return
 
         refund = sum(self.current_bets.values())
 
@@ -2926,6 +2910,8 @@ class RouletteGameGUI(tk.Tk):
             return
         amount = self.current_bets.get(spot_id, 0)
         if amount > 0:
+            if not self._table_clear(self._find_spot_by_id(spot_id)):
+                return
             self.balance += amount
             self.current_bets.pop(spot_id, None)
             self.current_bet_colors.pop(spot_id, None)
@@ -2939,6 +2925,9 @@ class RouletteGameGUI(tk.Tk):
             self.current_bet_label.config(text=f"${total_bet:,}")
 
     def _settle_bets(self, result: str) -> float:
+        if self.table is not None:
+            return self._settle_from_table()
+
         total_payout = 0.0
 
         for spot_id, amount in list(self.current_bets.items()):
@@ -2965,7 +2954,9 @@ class RouletteGameGUI(tk.Tk):
     # =====================================================
     # Game flow
     # =====================================================
-    def _start_new_round(self):
+    def _start_new_round(self, deadline=None):
+        self._pending_round = None
+        self._target_index = None
         # 重新添加帮助按钮（因为上面delete了all）
         self._add_help_button_on_board()
 
@@ -3016,7 +3007,7 @@ class RouletteGameGUI(tk.Tk):
         self._draw_wheel()
         self._repaint_all_chips()
 
-        self.betting_deadline = time.time() + self.BETTING_SECONDS
+        self.betting_deadline = deadline if deadline is not None else time.time() + self.BETTING_SECONDS
         self._update_countdown()
         
     def _update_countdown(self):
@@ -3036,12 +3027,20 @@ class RouletteGameGUI(tk.Tk):
 
         if remaining <= 0:
             self._countdown_job = None
-            self._lock_bets_and_spin()
+            if self.table is not None:
+                # 共享桌由牌桌统一封盘，收到开奖结果后再转轮
+                self._lock_bets()
+            else:
+                self._lock_bets_and_spin()
             return
 
         self._countdown_job = self.after(self.TIMER_TICK_MS, self._update_countdown)
 
     def _lock_bets_and_spin(self):
+        self._lock_bets()
+        self._start_physical_spin()
+
+    def _lock_bets(self):
         # 如果弹窗还开着，关掉它（可选）
         if self.detail_window and self.detail_window.winfo_exists():
             self.detail_window.destroy()
@@ -3058,7 +3057,6 @@ class RouletteGameGUI(tk.Tk):
         self._set_bet_buttons_state(tk.DISABLED)
         self._disable_amount_buttons()
         self._set_control_buttons_state(tk.DISABLED)   # 禁用所有游戏按钮
-        self._start_physical_spin()
 
     def _start_physical_spin(self):
         # 轮盘：保持原本顺时针旋转
@@ -3075,11 +3073,31 @@ class RouletteGameGUI(tk.Tk):
         self._last_physics_time = time.time()
         self._physics_update()
 
+    def _aim_pointer(self, index):
+        """共享桌：按牌桌的开奖结果调整指针减速度，使其停在该格子上
+
+        每帧按剩余行程重新计算，逐帧积分的误差不会累积；减速度只在随机值附近微调。
+        """
+        step = 360.0 / len(ROULETTE_SEQUENCE)
+        wheel_stop = self.current_wheel_offset
+        if self.wheel_velocity > 0:
+            wheel_stop += self.wheel_velocity ** 2 / (-2 * self.wheel_acceleration)
+        target = wheel_stop + (index + 0.5) * step
+        # 指针逆时针转：剩余角度与目标同余，圈数取最接近当前减速度下自然停下的圈数
+        nominal = self.pointer_velocity ** 2 / (-2 * self.pointer_acceleration)
+        travel = (self.pointer_angle - target) % 360.0
+        travel += 360.0 * max(0, round((nominal - travel) / 360.0))
+        if travel > 1e-6:
+            self.pointer_acceleration = -self.pointer_velocity ** 2 / (2 * travel)
+
     def _physics_update(self):
         now = time.time()
         dt = min(0.05, now - self._last_physics_time)
         self._last_physics_time = now
 
+        if self._target_index is not None and self.pointer_velocity > 0:
+            self._aim_pointer(self._target_index)
+
         # 轮盘：顺时针
         self.wheel_velocity = max(0.0, self.wheel_velocity + self.wheel_acceleration * dt)
         self.current_wheel_offset = (self.current_wheel_offset + self.wheel_velocity * dt) % 360.0
@@ -3116,6 +3134,10 @@ class RouletteGameGUI(tk.Tk):
 
         # 中奖结果 = 轮盘当前角度 与 指针当前角度 的相对位置
         step = 360.0 / len(ROULETTE_SEQUENCE)
+        if self._target_index is not None:
+            # 逐帧积分与连续运动有少许误差，停下后对准开奖格子的中央
+            self.pointer_angle = (self.current_wheel_offset + (self._target_index + 0.5) * step) % 360.0
+            self._draw_wheel()
         raw_index = ((self.pointer_angle - self.current_wheel_offset) / step - 0.5) % len(ROULETTE_SEQUENCE)
         self.current_round_index = int(round(raw_index)) % len(ROULETTE_SEQUENCE)
         self.current_round_result = ROULETTE_SEQUENCE[self.current_round_index]
@@ -3376,7 +3398,11 @@ class RouletteGameGUI(tk.Tk):
     def _finish_round(self, result):
         payout = self._settle_bets(result)
 
-        self.history.add_result(result)
+        if self.table is not None:
+            # 历史记录已由牌桌写入，这里只重新读取
+            self.history.data = self.history._load_or_create()
+        else:
+            self.history.add_result(result)
         self.add_marker_result(result)
         self._refresh_balance_display()
 
@@ -3437,7 +3463,12 @@ class RouletteGameGUI(tk.Tk):
             self.wheel_canvas.bind("<Button-1>", self._on_wheel_click)
             self._center_click_bound = True
 
-        self.after(6000, self._start_new_round)
+        if self.table is None:
+            self.after(6000, self._start_new_round)
+        elif self._pending_round is not None:
+            # 转轮动画较长时下一局已经开始，展示一会儿结果后再进入
+            pending = self._pending_round
+            self.after(3000, lambda: self._start_new_round(deadline=pending["deadline"]))
 
     def _on_wheel_click(self, event):
         """点击轮盘画布时，判断是否点中中心区域，且处于结果展示阶段"""
@@ -3558,17 +3589,112 @@ class RouletteGameGUI(tk.Tk):
 
     def _refresh_balance_display(self):
         self.balance_label_side.config(text=f"余额: ${self.balance:,.2f}")
-        if self.username != "Guest":
+        if self.username != "Guest" and self.table is None:
             update_balance_in_json(self.username, self.balance)
         self._update_repeat_button_state()
 
     def on_close(self):
+        if self.table is not None:
+            # 余额由牌桌每局结算后写回，未结算的下注离桌后照常结算
+            self._leave_shared_table()
+        else:
+            try:
+                if self.username != "Guest":
+                    update_balance_in_json(self.username, self.balance)
+            except Exception:
+                pass
+        self.destroy()
+
+    # =====================================================
+    # Shared table
+    # =====================================================
+    def _join_shared_table(self):
+        self.table = shared_table.connect(self.SHARED_TABLE_GAME)
+        joined = self.table.join(self.username, self.balance)
+        self.table_player = joined["player"]
+        self.balance = float(joined["balance"])
+        self.table.subscribe(self._table_events.put)
+        return joined
+
+    def _leave_shared_table(self):
+        table, self.table = self.table, None
         try:
-            if self.username != "Guest":
-                update_balance_in_json(self.username, self.balance)
-        except Exception:
+            table.leave(self.table_player)
+        except EngineError:
             pass
-        self.destroy()
+        table.close()
+
+    def _table_bet(self, spot, amount):
+        """共享桌：先在牌桌登记下注，被拒绝时提示并返回 False"""
+        if self.table is None:
+            return True
+        try:
+            self.table.place_bet(self.table_player, spot_key(spot["numbers"]), amount)
+        except EngineError as e:
+            messagebox.showwarning("无法下注", str(e))
+            return False
+        return True
+
+    def _table_clear(self, spot=None):
+        if self.table is None:
+            return True
+        try:
+            self.table.clear_bets(self.table_player, spot_key(spot["numbers"]) if spot else None)
+        except EngineError as e:
+            messagebox.showwarning("无法撤回", str(e))
+            return False
+        return True
+
+    def _poll_table(self):
+        """在主线程中处理牌桌事件（回调来自 socket 读取线程）"""
+        if self.table is None:
+            return
+        try:
+            while True:
+                event = self._table_events.get_nowait()
+                kind = event.get("event")
+                if kind == "round_started":
+                    if self.is_spinning:
+                        self._pending_round = event
+                    else:
+                        self._start_new_round(deadline=event["deadline"])
+                elif kind == "round_result":
+                    self._on_table_result(event)
+                elif kind == "disconnected":
+                    self._leave_shared_table()
+                    self.balance += sum(self.current_bets.values())
+                    self._refresh_balance_display()
+                    messagebox.showwarning("共享牌桌", "与共享牌桌的连接已断开，改为单机模式。")
+                    self._start_new_round()
+                    return
+        except queue.Empty:
+            pass
+        self.after(self.TABLE_POLL_MS, self._poll_table)
+
+    def _on_table_result(self, event):
+        self._table_result = event
+        self._target_index = event["outcome"]["index"]
+        if self.round_state == "betting":
+            if self._countdown_job is not None:
+                try:
+                    self.after_cancel(self._countdown_job)
+                except Exception:
+                    pass
+                self._countdown_job = None
+            self._lock_bets()
+        if not self.is_spinning:
+            self._start_physical_spin()
+
+    def _settle_from_table(self):
+        mine = self._table_result["results"].get(self.table_player) if self._table_result else None
+        total_payout = float(mine["payout"]) if mine else 0.0
+        if mine:
+            self.balance = float(mine["balance"])
+        self.last_win_amount = int(total_payout)
+        self.current_chip_label.config(
+            text=f"本局获胜金额: ${self.last_win_amount:,}"
+        )
+        return total_payout
 
     def show_game_instructions(self):
         win = tk.Toplevel(self)
@@ -3605,7 +3731,7 @@ class RouletteGameGUI(tk.Tk):
 
     def start_game(self):
         """强制开始游戏：下注阶段立即旋转，结果阶段跳转到新的一局"""
-        if self.round_state == "betting":
+        if self.round_state == "betting" and self.table is None:
             # 取消倒计时，立即开始旋转
             if self._countdown_job is not None:
                 try:
@@ -3615,12 +3741,17 @@ class RouletteGameGUI(tk.Tk):
                 self._countdown_job = None
             self._lock_bets_and_spin()
 
-def main(initial_balance=1_000_000, username="Guest"):
-    app = RouletteGameGUI(initial_balance=initial_balance, username=username)
+def main(initial_balance=1_000_000, username="Guest", shared=False):
+    app = RouletteGameGUI(initial_balance=initial_balance, username=username, shared=shared)
     app.mainloop()
     return app.balance
 
 
 if __name__ == "__main__":
-    final_balance = main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shared", action="store_true", help="加入共享牌桌（多个窗口同一局）")
+    parser.add_argument("--user", default="Guest")
+    args = parser.parse_args()
+    final_balance = main(username=args.user, shared=args.shared)
     print(f"Final balance: {final_balance}")
\ No newline at end of file
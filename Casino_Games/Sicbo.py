@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import secrets
-import time
-from PIL import Image, ImageTk, ImageDraw
 import os, json
 import sys
 import math
@@ -16,6 +14,10 @@ a_tools_dir = os.path.join(parent_dir, 'A_Tools')
 if a_tools_dir not in sys.path:
     sys.path.append(a_tools_dir)
 
+from virtual_list import VirtualList
+from dice_animation import DiceAnimation, dice_face_images, roll_outcome
+import sicbo_table
+
 def get_data_file_path():
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), '../saving_data.json')
 
@@ -40,29 +42,10 @@ def update_balance_in_json(username, new_balance):
             break
     save_user_data(users)
 
-class Dice:
-    """自定义骰子类，确保连续两次结果不是对面数字"""
-    def __init__(self, value=None):
-        self.last_value = None
-        self.value = value or self.roll()
-    
-    def roll(self):
-        if self.last_value is None:
-            self.value = secrets.randbelow(6) + 1
-        else:
-            opposite = {1: 6, 2: 5, 3: 4, 4: 3, 5: 2, 6: 1}
-            opposite_value = opposite[self.last_value]
-            possible_values = [i for i in range(1, 7) if i != opposite_value and i != self.last_value]
-            self.value = secrets.choice(possible_values)
-        
-        self.last_value = self.value
-        return self.value
-
 class DiceAnimationWindow:
-    def __init__(self, game, callback, dice_objects, fixed_dice=None):
+    def __init__(self, game, callback, fixed_dice=None):
         self.game = game
         self.callback = callback
-        self.dice_objects = dice_objects
         self.fixed_dice = fixed_dice  # 开发者模式下的固定骰子
 
         self.window = tk.Toplevel(game.root)
@@ -83,12 +66,8 @@ class DiceAnimationWindow:
         y = parent_y + (parent_height - 400) // 2
         self.window.geometry(f"500x400+{x}+{y}")
 
-        # 生成大号骰子图片
-        self.dice_images = []
-        for i in range(1, 7):
-            img = Image.new('RGB', (120, 120), '#e8d6b3')
-            self.draw_dice(img, i)
-            self.dice_images.append(ImageTk.PhotoImage(img))
+        # 大号骰子图片（共享贴图缓存）
+        self.dice_images = dice_face_images(self.window, 120, outline_width=3, one_four_color='#ff0000')
 
         self.dice_container = tk.Frame(self.window, bg='#1e3d59')
         self.dice_container.pack(pady=50)
@@ -105,124 +84,81 @@ class DiceAnimationWindow:
         self.progress = ttk.Progressbar(self.window, orient=tk.HORIZONTAL, length=400, mode='determinate')
         self.progress.pack(pady=10)
 
-        self.animation_start_time = time.time()
-        self.final_dice = None
+        # 结果在动画开始前一次决定（开发者模式下使用固定骰子）
+        if self.fixed_dice:
+            self.final_dice = list(self.fixed_dice)
+        else:
+            self.final_dice = roll_outcome(3)
         
         # 计算骰子转动时间：3100到4000
         total_milliseconds = secrets.randbelow(901) + 3100
         self.total_duration = total_milliseconds / 1000.0
-        # print(f"骰子动画时长: {total_milliseconds}毫秒 ({self.total_duration:.3f}秒)")
         
-        self.animate_dice()
+        self.animation = DiceAnimation(
+            self.window, self.dice_labels, self.dice_images,
+            finals=self.final_dice, duration=self.total_duration,
+            on_frame=self.update_progress, on_done=self.dice_stopped
+        ).start()
 
     def do_nothing(self):
         pass
 
-    def draw_dice(self, img, num):
-        draw = ImageDraw.Draw(img)
-        draw.rectangle([0, 0, img.size[0]-1, img.size[1]-1], outline='#333', width=3)
-        dot_color = '#ff0000' if num in [1, 4] else '#333'
-        size = img.size[0]
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2),
-                (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4),
-                (size//4, size//2), (3*size//4, size//2),
-                (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        dot_size = size // 10
-        for pos in dot_positions[num]:
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
-
-    def animate_dice(self):
-        elapsed = time.time() - self.animation_start_time
-        
-        # 根据随机总时长调整动画阶段
-        if elapsed < self.total_duration:
-            # 更新进度条：基于随机总时长
-            progress_percent = min(100, (elapsed / self.total_duration) * 100)
-            self.progress['value'] = progress_percent
-            
-            # 如果开发者模式有固定骰子，使用固定骰子
-            if self.fixed_dice:
-                current_dice = self.fixed_dice
-                self.final_dice = current_dice
-            else:
-                # 每次动画都重新掷骰子
-                current_dice = [dice.roll() for dice in self.dice_objects]
-                self.final_dice = current_dice
-            
-            # 更新骰子图像显示
-            for i, lbl in enumerate(self.dice_labels):
-                lbl.config(image=self.dice_images[current_dice[i]-1])
-            
-            # 继续动画（使用1毫秒间隔保持流畅）
-            self.window.after(1, self.animate_dice)
-        
+    def update_progress(self, frame, total_frames):
+        self.progress['value'] = min(100, frame / total_frames * 100)
+
+    def dice_stopped(self, final_dice):
         # 骰子停止阶段（1秒）
-        elif elapsed < self.total_duration + 1.0:
-            # 显示最终骰子结果
-            for i, lbl in enumerate(self.dice_labels):
-                lbl.config(image=self.dice_images[self.final_dice[i]-1])
-            
-            # 更新状态文本
-            self.status_label.config(text="骰子停止中...")
-            
-            # 继续动画
-            self.window.after(1, self.animate_dice)
-        
+        self.status_label.config(text="骰子停止中...")
+        self.window.after(1000, self.show_result)
+
+    def show_result(self):
         # 显示结果阶段（2秒）
-        elif elapsed < self.total_duration + 3.0:
-            # 排序骰子并计算总数
-            sorted_dice = sorted(self.final_dice)
-            total = sum(sorted_dice)
-            
-            # 确定结果类型
-            rtype = "大" if total >= 11 else "小"
-            if sorted_dice[0] == sorted_dice[1] == sorted_dice[2]:
-                rtype = "围"
-            
-            # 设置背景颜色
-            bg_color = "#FF1616" if rtype == "大" else "#CDB900"
-            if rtype == "围":
-                bg_color = "#32CD32"
-            
-            # 更新窗口颜色
-            self.window.configure(bg=bg_color)
-            self.dice_container.configure(bg=bg_color)
-            self.status_label.configure(bg=bg_color)
-            
-            # 清除原有子部件
-            for widget in self.status_label.winfo_children():
-                widget.destroy()
-            
-            # 创建结果展示框架
-            result_frame = tk.Frame(self.status_label, bg=bg_color)
-            result_frame.pack()
-            
-            # 添加"本局结果"标签
-            tk.Label(result_frame, text="本局结果:", font=("Arial", 18),
-                     bg=bg_color, fg="black").pack(side=tk.LEFT, padx=5)
-            
-            # 添加骰子图像
-            for i, val in enumerate(sorted_dice):
-                tk.Label(result_frame, image=self.game.dice_images_small[val-1],
+        # 排序骰子并计算总数
+        sorted_dice = sorted(self.final_dice)
+        total = sum(sorted_dice)
+        
+        # 确定结果类型
+        rtype = "大" if total >= 11 else "小"
+        if sorted_dice[0] == sorted_dice[1] == sorted_dice[2]:
+            rtype = "围"
+        
+        # 设置背景颜色
+        bg_color = "#FF1616" if rtype == "大" else "#CDB900"
+        if rtype == "围":
+            bg_color = "#32CD32"
+        
+        # 更新窗口颜色
+        self.window.configure(bg=bg_color)
+        self.dice_container.configure(bg=bg_color)
+        self.status_label.configure(bg=bg_color)
+        
+        # 清除原有子部件
+        for widget in self.status_label.winfo_children():
+            widget.destroy()
+        
+        # 创建结果展示框架
+        result_frame = tk.Frame(self.status_label, bg=bg_color)
+        result_frame.pack()
+        
+        # 添加"本局结果"标签
+        tk.Label(result_frame, text="本局结果:", font=("Arial", 18),
+                 bg=bg_color, fg="black").pack(side=tk.LEFT, padx=5)
+        
+        # 添加骰子图像
+        for i, val in enumerate(sorted_dice):
+            tk.Label(result_frame, image=self.game.dice_images_small[val-1],
+                     bg=bg_color).pack(side=tk.LEFT, padx=2)
+            if i < 2:
+                tk.Label(result_frame, text="+", font=("Arial", 18),
                          bg=bg_color).pack(side=tk.LEFT, padx=2)
-                if i < 2:
-                    tk.Label(result_frame, text="+", font=("Arial", 18),
-                             bg=bg_color).pack(side=tk.LEFT, padx=2)
-            
-            # 添加总分和结果类型
-            tk.Label(result_frame, text=f"= {total}点 {rtype}",
-                     font=("Arial", 18, "bold"), bg=bg_color,
-                     fg="black").pack(side=tk.LEFT, padx=5)
-            
-            # 2秒后完成
-            self.window.after(2000, self.finish)
+        
+        # 添加总分和结果类型
+        tk.Label(result_frame, text=f"= {total}点 {rtype}",
+                 font=("Arial", 18, "bold"), bg=bg_color,
+                 fg="black").pack(side=tk.LEFT, padx=5)
+        
+        # 2秒后完成
+        self.window.after(2000, self.finish)
 
     def finish(self):
         try:
@@ -286,16 +222,8 @@ class SicboGame:
         }
 
         # 骰子图片
-        self.dice_images_large = []
-        self.dice_images_small = []
-        for i in range(1, 7):
-            img_large = Image.new('RGB', (70, 70), '#e8d6b3')
-            self.draw_dice(img_large, i)
-            self.dice_images_large.append(ImageTk.PhotoImage(img_large))
-
-            img_small = Image.new('RGB', (30, 30), '#e8d6b3')
-            self.draw_dice(img_small, i)
-            self.dice_images_small.append(ImageTk.PhotoImage(img_small))
+        self.dice_images_large = dice_face_images(self.root, 70, outline_width=2, one_four_color='#bf0101')
+        self.dice_images_small = dice_face_images(self.root, 30, outline_width=2, one_four_color='#bf0101')
 
         # 筹码系统
         self.chip_values = [
@@ -314,9 +242,6 @@ class SicboGame:
         self.history = []
         self.chip_widgets = []
         
-        # 骰子对象
-        self.dice_objects = [Dice(), Dice(), Dice()]
-
         # 历史记录文件
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         logs_dir = os.path.join(parent_dir, 'A_Logs')
@@ -595,42 +520,64 @@ class SicboGame:
         self.save_history_data()
 
     def update_history_display(self):
-        """更新历史记录显示"""
-        for widget in self.history_inner.winfo_children():
-            widget.destroy()
-
+        """更新历史记录显示（新记录在最上方，行控件复用不重建）"""
         records = self.history_data.get("500_Record", {})
         display_limit = self.history_display_count if self.history_display_count <= 100 else 100
 
+        rows = []
         for i in range(1, display_limit + 1):
-            k = f"{i:02d}_Data"
-            dice = records.get(k, [])
-            if not dice or len(dice) < 3:
-                continue
-            total = sum(dice)
-            is_triple = (dice[0] == dice[1] == dice[2])
+            dice = records.get(f"{i:02d}_Data", [])
+            if dice and len(dice) >= 3:
+                rows.append(dice)
+        self.history_list.set_data(rows, offset=0)
 
-            if is_triple:
-                rtype = "围"
-                bg = COLOR_TIE
-            else:
-                rtype = "小" if total <= 10 else "大"
-                bg = COLOR_SMALL if rtype == "小" else COLOR_BIG
+        self.update_last_triple_display()
+        self.update_win_distribution()
 
-            frame = tk.Frame(self.history_inner, bg=bg, padx=5, pady=5, relief=tk.RIDGE, borderwidth=1)
-            frame.pack(fill=tk.X, padx=2, pady=2)
+    def _create_history_row(self, parent, index):
+        """创建一行历史记录控件（只在行池扩充时调用）"""
+        frame = tk.Frame(parent, padx=5, pady=5, relief=tk.RIDGE, borderwidth=1)
+        dice_frame = tk.Frame(frame)
+        dice_frame.pack(side=tk.LEFT, padx=10)
+        dice_labels = []
+        for _ in range(3):
+            lbl = tk.Label(dice_frame)
+            lbl.pack(side=tk.LEFT, padx=1)
+            dice_labels.append(lbl)
+        total_lbl = tk.Label(frame, font=("Arial", 12), width=13)
+        total_lbl.pack(side=tk.LEFT, padx=10)
+        type_lbl = tk.Label(frame, font=("Arial", 12), width=7)
+        type_lbl.pack(side=tk.LEFT, padx=5)
+        return {'frame': frame, 'dice_frame': dice_frame, 'dice': dice_labels,
+                'total': total_lbl, 'type': type_lbl, 'shown': False}
+
+    def _bind_history_row(self, row, dice):
+        """把一条记录绑定到已有的行控件上"""
+        if dice is None:
+            if row['shown']:
+                row['frame'].pack_forget()
+                row['shown'] = False
+            return
 
-            dice_frame = tk.Frame(frame, bg=bg)
-            dice_frame.pack(side=tk.LEFT, padx=10)
-            for d in dice:
-                lbl = tk.Label(dice_frame, image=self.dice_images_small[d-1], bg=bg)
-                lbl.pack(side=tk.LEFT, padx=1)
+        total = sum(dice)
+        if dice[0] == dice[1] == dice[2]:
+            rtype = "围"
+            bg = COLOR_TIE
+        else:
+            rtype = "小" if total <= 10 else "大"
+            bg = COLOR_SMALL if rtype == "小" else COLOR_BIG
 
-            tk.Label(frame, text=f"{total}", font=("Arial", 12), bg=bg, width=13).pack(side=tk.LEFT, padx=10)
-            tk.Label(frame, text=f"{rtype}", font=("Arial", 12), bg=bg, width=7).pack(side=tk.LEFT, padx=5)
+        row['frame'].config(bg=bg)
+        row['dice_frame'].config(bg=bg)
+        for lbl, d in zip(row['dice'], dice):
+            lbl.config(image=self.dice_images_small[d-1], bg=bg)
+        row['total'].config(text=f"{total}", bg=bg)
+        row['type'].config(text=f"{rtype}", bg=bg)
 
-        self.update_last_triple_display()
-        self.update_win_distribution()
+        # 空行总是位于末尾，按顺序重新 pack 可保持行序
+        if not row['shown']:
+            row['frame'].pack(fill=tk.X, padx=2, pady=2)
+            row['shown'] = True
 
     def on_window_close(self):
         """窗口关闭时保存余额"""
@@ -639,24 +586,6 @@ class SicboGame:
             update_balance_in_json(self.username, self.balance)
         self.root.destroy()
 
-    def draw_dice(self, img, num):
-        """绘制骰子图像"""
-        draw = ImageDraw.Draw(img)
-        size = img.size[0]
-        dot_size = size // 10
-        draw.rectangle([0, 0, size-1, size-1], outline='#333', width=2)
-        dot_color = "#bf0101" if num in [1, 4] else '#333'
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4), (size//4, size//2), (3*size//4, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        for pos in dot_positions[num]:
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
-
     def create_widgets(self):
         """创建游戏界面"""
         main_frame = tk.Frame(self.root, bg='#0a5f38')
@@ -1118,6 +1047,9 @@ class SicboGame:
             self.small_triple_label.config(text="↓↑↓↑↓ 赔率1:1  围骰通杀 ↑↓↑↓↑")
             self.big_triple_label.config(text="↓↑↓↑↓ 赔率1:1  围骰通杀 ↑↓↑↓↑")
 
+        # 赔率变化后刷新预期返还
+        self.update_display()
+
     def switch_tab_mode(self, mode):
         if hasattr(self, 'tab_frames'):
             tab1, tab2 = self.tab_frames
@@ -1186,25 +1118,21 @@ class SicboGame:
         tk.Label(self.records_title_frame, text="结果", font=("Arial", 12, "bold"), 
                 fg='white', bg='#1e3d59', width=4).grid(row=0, column=2, sticky="w")
 
-        # 滚动容器
+        # 滚动容器（虚拟化列表：固定数量的行控件，滚动时只重新绑定数据）
         container = tk.Frame(record_frame, bg='#D0E7FF')
         container.pack(fill=tk.BOTH, expand=True)
         
         scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.history_canvas = tk.Canvas(container, bg='#D0E7FF', yscrollcommand=scrollbar.set, height=150)
-        self.history_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.history_canvas.yview)
-        
-        self.history_inner = tk.Frame(self.history_canvas, bg='#D0E7FF')
-        self.history_window = self.history_canvas.create_window((0, 0), window=self.history_inner, anchor=tk.NW)
-        
-        self.history_inner.bind("<Configure>", lambda e: self.history_canvas.configure(scrollregion=self.history_canvas.bbox("all")))
-        self.history_canvas.bind("<Configure>", lambda e: self.history_canvas.itemconfig(self.history_window, width=e.width))
+        self.history_inner = tk.Frame(container, bg='#D0E7FF', height=150)
+        self.history_inner.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.history_inner.pack_propagate(False)
         
-        self.history_canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.history_inner.bind("<MouseWheel>", self._on_mousewheel)
+        self.history_list = VirtualList(
+            self.history_inner, self._create_history_row, self._bind_history_row,
+            scrollbar=scrollbar
+        )
         
         # 获胜分布部分
         distribution_frame = tk.Frame(parent, bg='#D0E7FF', padx=10, pady=10)
@@ -1307,13 +1235,6 @@ class SicboGame:
             lbl_count.pack()
             self.point_count_labels.append(lbl_count)
 
-    def _on_mousewheel(self, event):
-        """处理鼠标滚轮滚动历史记录"""
-        if event.delta < 0:
-            self.history_canvas.yview_scroll(1, "units")
-        elif event.delta > 0:
-            self.history_canvas.yview_scroll(-1, "units")
-
     def update_last_game_display(self):
         """更新上局点数显示"""
         records = self.history_data.get("500_Record", {})
@@ -1951,7 +1872,11 @@ class SicboGame:
     def update_display(self):
         """更新所有UI显示"""
         self.balance_label.config(text=f"餘額: ${self.balance:.2f}")
-        self.current_bet_display.config(text=f"${self.current_bet}")
+        if self.current_bet > 0:
+            expected = sicbo_table.expected_return(self.bets, self.triple_mode)
+            self.current_bet_display.config(text=f"${self.current_bet} (预期返还 ${expected:.2f})")
+        else:
+            self.current_bet_display.config(text=f"${self.current_bet}")
         self.last_win_display.config(text=f"${self.last_win}")
         self.big_bet_label.config(text=f"${self.format_amount(self.bets['big'])}")
         self.small_bet_label.config(text=f"${self.format_amount(self.bets['small'])}")
@@ -1999,7 +1924,7 @@ class SicboGame:
             fixed_dice = self.developer_dice
             self.developer_dice = None
 
-        DiceAnimationWindow(self, self.calculate_results, self.dice_objects, fixed_dice)
+        DiceAnimationWindow(self, self.calculate_results, fixed_dice)
 
     def calculate_results(self, dice):
         """计算游戏结果"""
@@ -2034,79 +1959,8 @@ class SicboGame:
         winnings = 0
         
         if self.current_bet > 0:
-            # 根据围骰模式确定赔率
-            size_odds = 0.92 if self.triple_mode else 1.0
-            
-            for bet_type, data in self.bets.items():
-                if bet_type == "small":
-                    if self.triple_mode:  # 开模式: 3-10点都赢 (包括围骰)
-                        if 3 <= total <= 10:
-                            winnings += data * (size_odds + 1)
-                    else:  # 关模式: 4-10点且不是围骰
-                        if not is_triple and 4 <= total <= 10:
-                            winnings += data * (size_odds + 1)
-                
-                if bet_type == "big":
-                    if self.triple_mode:  # 开模式: 11-18点都赢 (包括围骰)
-                        if 11 <= total <= 18:
-                            winnings += data * (size_odds + 1)
-                    else:  # 关模式: 11-17点且不是围骰
-                        if not is_triple and 11 <= total <= 17:
-                            winnings += data * (size_odds + 1)
-                
-                if bet_type == "odd":
-                    if self.triple_mode:  # 开模式: 奇数点都赢 (包括围骰)
-                        if total % 2 == 1:
-                            winnings += data * (size_odds + 1)
-                    else:  # 关模式: 奇数点且不是围骰
-                        if not is_triple and total % 2 == 1:
-                            winnings += data * (size_odds + 1)
-                
-                if bet_type == "even":
-                    if self.triple_mode:  # 开模式: 偶数点都赢 (包括围骰)
-                        if total % 2 == 0:
-                            winnings += data * (size_odds + 1)
-                    else:  # 关模式: 偶数点且不是围骰
-                        if not is_triple and total % 2 == 0:
-                            winnings += data * (size_odds + 1)
-                
-                if bet_type == "all_triples" and is_triple:
-                    winnings += data * 32
-                if bet_type == "double":
-                    for num, amount in data.items():
-                        if amount > 0 and dice.count(num) >= 2:
-                            winnings += amount * 12
-                if bet_type == "total_points":
-                    for point, amount in data.items():
-                        if amount > 0 and total == point:
-                            odds = self.get_odds(point)
-                            winnings += amount * (odds + 1)
-                if bet_type == "pairs":
-                    for pair, amount in data.items():
-                        if amount > 0:
-                            a, b = map(int, pair.split('&'))
-                            if (dice.count(a) >= 1 and dice.count(b) >= 1) or (dice.count(a) >= 2 and b == a):
-                                winnings += amount * 7
-                if bet_type == "triple":
-                    for num, amount in data.items():
-                        if amount > 0 and dice.count(num) == 3:
-                            winnings += amount * 191
-                if bet_type == "guess_num":
-                    for num, amount in data.items():
-                        if amount > 0:
-                            count = dice.count(num)
-                            if count == 1:
-                                winnings += amount * 2
-                            elif count == 2:
-                                winnings += amount * 3
-                            elif count == 3:
-                                winnings += amount * 13
-                if bet_type == "number_group":
-                    for group, amount in data.items():
-                        if amount > 0:
-                            group_set = set(int(x) for x in group)
-                            if len(set(dice)) == 3 and set(dice).issubset(group_set):
-                                winnings += amount * 8
+            # 查预计算的结算表：开出结果对应的一行与下注向量做点积
+            winnings = sicbo_table.settle(self.bets, dice, self.triple_mode)
 
         self.balance += winnings
         self.last_win = winnings
@@ -5,9 +5,15 @@ import random
 import json
 import os
 import math
-import secrets
 import subprocess, sys
 
+# 将A_Tools目录添加到系统路径（共享的随机流）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+import random_stream
+import rng_provider
+
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -32,13 +38,27 @@ PAIR_PLUS_PAYOUT = {
     2: 1    # 对子 1:1
 }
 
+# Bonus固定奖金（按牌型，美元）
+BONUS_FIXED_PAYOUT = {
+    6: 700,  # 同花顺
+    5: 350,  # 三条
+    4: 110   # 顺子
+}
+
 # Bonus支付表
 BONUS_PAYOUT = {
     "black_royal_flush": "赢得整个Progressive",
     "royal_flush": "赢得Progressive的10%",
-    "straight_flush": "$500",
-    "three_of_a_kind": "$400",
-    "straight": "$40"
+    "straight_flush": f"${BONUS_FIXED_PAYOUT[6]}",
+    "three_of_a_kind": f"${BONUS_FIXED_PAYOUT[5]}",
+    "straight": f"${BONUS_FIXED_PAYOUT[4]}"
+}
+
+# 额外Ante支付倍数（按牌型，无论输赢）
+EXTRA_ANTE_PAYOUT = {
+    6: 5,  # 同花顺 5:1
+    5: 4,  # 三条 4:1
+    4: 1   # 顺子 1:1
 }
 
 # 6 Card支付表
@@ -145,7 +165,7 @@ class Deck:
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
         
         # 保证 Python 输出为 UTF-8
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         
         try:
@@ -179,8 +199,8 @@ class Deck:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             # fallback：标准顺序+安全乱序
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52)
         
         # 通用的洗牌后索引 & 发牌序列逻辑
         self.start_pos = self.cut_position
@@ -188,12 +208,6 @@ class Deck:
         self.pointer = 0
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
     
-    def _secure_shuffle(self):
-        """Fisher–Yates 洗牌，用 secrets 保证随机性"""
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
@@ -1740,19 +1754,7 @@ class ThreeCardPokerGUI(tk.Tk):
     def calculate_extra_ante(self):
         """计算额外的Ante支付（无论输赢）"""
         player_eval = evaluate_three_card_hand(self.game.player_hand)
-        ante_bet = self.game.ante
-        
-        # 同花顺
-        if player_eval[0] == 6:  # 同花顺
-            return ante_bet * 5
-        # 三条
-        elif player_eval[0] == 5:  # 三条
-            return ante_bet * 4
-        # 顺子
-        elif player_eval[0] == 4:  # 顺子
-            return ante_bet * 1
-        
-        return 0
+        return self.game.ante * EXTRA_ANTE_PAYOUT.get(player_eval[0], 0)
     
     def update_progressive(self):
         """更新Progressive彩池金额 - 修改：使用新的计算公式"""
@@ -1795,18 +1797,18 @@ class ThreeCardPokerGUI(tk.Tk):
             },
             "straight_flush": {
                 "condition": evaluate_three_card_hand(cards)[0] == 6,
-                "amount": 700,
-                "message": "同花顺! 赢得奖金 $700!"
+                "amount": BONUS_FIXED_PAYOUT[6],
+                "message": "同花顺! 赢得奖金 ${amount}!"
             },
             "three_of_a_kind": {
                 "condition": evaluate_three_card_hand(cards)[0] == 5,
-                "amount": 350,
-                "message": "三条! 赢得奖金 $350!"
+                "amount": BONUS_FIXED_PAYOUT[5],
+                "message": "三条! 赢得奖金 ${amount}!"
             },
             "straight": {
                 "condition": evaluate_three_card_hand(cards)[0] == 4,
-                "amount": 110,
-                "message": "顺子! 赢得奖金 $110!"
+                "amount": BONUS_FIXED_PAYOUT[4],
+                "message": "顺子! 赢得奖金 ${amount}!"
             }
         }
         
@@ -0,0 +1,287 @@
+"""三张牌扑克赔率表精确分析
+
+直接读取 Three_Card_Poker.py 中的 PAIR_PLUS_PAYOUT / SIX_CARD_PAYOUT /
+BONUS_FIXED_PAYOUT / EXTRA_ANTE_PAYOUT、
+evaluate_three_card_hand / compare_hands 以及 6 Card 的五张牌判定，
+用穷举计算每个注项的精确期望值（EV），修改赔率表后可立即验证庄家优势。
+
+- Ante/Play：穷举 C(52,3) 个玩家手牌，庄家手牌分布用容斥原理从剩余 49 张中
+  精确计数；玩家每手都按期望值较高的一方选择下注或弃牌。
+- Pair Plus / Progressive：按玩家手牌牌型的精确概率计算。
+- 6 Card：按 6 张牌的点数组合与花色结构分类精确计数（C(52,6) 全部覆盖）；
+  --brute 时改为多进程逐一穷举 C(52,6)，用于交叉验证。
+
+用法:
+    python Three_Card_Poker_Analyzer.py
+    python Three_Card_Poker_Analyzer.py --jackpot 250000 --brute
+"""
+import argparse
+import os
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from Three_Card_Poker import (
+    SUITS, RANKS, PAIR_PLUS_PAYOUT, SIX_CARD_PAYOUT, BONUS_FIXED_PAYOUT, EXTRA_ANTE_PAYOUT, HAND_RANK_NAMES,
+    Card, evaluate_three_card_hand, ThreeCardPokerGUI
+)
+
+# 与 ThreeCardPokerGUI 一致的固定金额
+PROGRESSIVE_BET = 20
+QUALIFY_VALUE = 12                           # 庄家 Q 高合格
+
+DECK = [Card(s, r) for s in SUITS for r in RANKS]
+
+
+# ------------------- 三张牌 -------------------
+def _strength_key(cards):
+    rank, values = evaluate_three_card_hand(cards)
+    return rank, tuple(values)
+
+
+def _qualifies(cards):
+    rank, _ = evaluate_three_card_hand(cards)
+    return rank != 1 or max(c.value for c in cards) >= QUALIFY_VALUE
+
+
+def build_three_card_tables():
+    """所有 22100 手三张牌的强度序号；以及按单张/两张牌分组的排序强度表"""
+    hands = list(combinations(range(52), 3))
+    keys = [_strength_key([DECK[i] for i in h]) for h in hands]
+    order = {k: i for i, k in enumerate(sorted(set(keys)))}
+    strength = [order[k] for k in keys]
+
+    # 合格门槛：所有不合格手牌强度都低于任何合格手牌
+    qualify_at = min(s for h, s in zip(hands, strength) if _qualifies([DECK[i] for i in h]))
+
+    by_card = [[] for _ in range(52)]
+    by_pair = {}
+    for h, s in zip(hands, strength):
+        for c in h:
+            by_card[c].append(s)
+        for pair in combinations(h, 2):
+            by_pair.setdefault(pair, []).append(s)
+    for lst in by_card:
+        lst.sort()
+    for lst in by_pair.values():
+        lst.sort()
+    return hands, strength, qualify_at, sorted(strength), by_card, by_pair
+
+
+def _dealer_counts(sorted_strengths, p, qualify_at):
+    """一组庄家手牌相对玩家强度 p 的 (不合格, 合格且较小, 平局, 较大) 张数"""
+    not_q = bisect_left(sorted_strengths, qualify_at)
+    if p >= qualify_at:
+        lower = bisect_left(sorted_strengths, p) - not_q
+        tie = bisect_right(sorted_strengths, p) - bisect_left(sorted_strengths, p)
+        higher = len(sorted_strengths) - bisect_right(sorted_strengths, p)
+    else:
+        lower = tie = 0
+        higher = len(sorted_strengths) - not_q
+    return not_q, lower, tie, higher
+
+
+def analyze_three_card(jackpot):
+    hands, strength, qualify_at, all_sorted, by_card, by_pair = build_three_card_tables()
+    total_dealer = comb(49, 3)
+    total_hands = len(hands)
+
+    ante_play_ev = 0.0
+    fold_count = 0
+    hand_types = Counter()
+    progressive_return = 0.0
+
+    for h, p in zip(hands, strength):
+        cards = [DECK[i] for i in h]
+        rank = evaluate_three_card_hand(cards)[0]
+        hand_types[rank] += 1
+
+        # 容斥：全部手牌 − 含任一玩家牌 + 含任两张 − 含三张（即玩家手牌本身）
+        counts = list(_dealer_counts(all_sorted, p, qualify_at))
+        for c in h:
+            for i, v in enumerate(_dealer_counts(by_card[c], p, qualify_at)):
+                counts[i] -= v
+        for pair in combinations(h, 2):
+            for i, v in enumerate(_dealer_counts(by_pair[pair], p, qualify_at)):
+                counts[i] += v
+        for i, v in enumerate(_dealer_counts([p], p, qualify_at)):
+            counts[i] -= v
+        not_q, lower, tie, higher = counts
+
+        # 以 Ante 为 1 个单位；Play 等于 Ante
+        play_ev = EXTRA_ANTE_PAYOUT.get(rank, 0) + (not_q * 1 + lower * 2 - higher * 2) / total_dealer
+        if play_ev >= -1:
+            ante_play_ev += play_ev
+        else:
+            ante_play_ev -= 1
+            fold_count += 1
+
+        # Progressive 奖金（与 calculate_bonus 的判定顺序一致）
+        values = sorted(c.value for c in cards)
+        mini_royal = rank == 7 and values == [12, 13, 14]
+        if mini_royal and all(c.suit == '♠' for c in cards):
+            progressive_return += jackpot
+        elif mini_royal:
+            progressive_return += jackpot * 0.1
+        else:
+            progressive_return += BONUS_FIXED_PAYOUT.get(rank, 0)
+
+    pair_plus_ev = sum(
+        hand_types[r] * (PAIR_PLUS_PAYOUT[r] if r in PAIR_PLUS_PAYOUT else -1)
+        for r in hand_types
+    ) / total_hands
+
+    return {
+        'ante_play_ev': ante_play_ev / total_hands,
+        'fold_rate': fold_count / total_hands,
+        'pair_plus_ev': pair_plus_ev,
+        'progressive_ev': (progressive_return / total_hands - PROGRESSIVE_BET) / PROGRESSIVE_BET,
+        'hand_types': hand_types,
+        'total_hands': total_hands,
+    }
+
+
+# ------------------- 6 Card -------------------
+@lru_cache(maxsize=None)
+def five_card_payout(values, flush):
+    """五张牌赔付（含本金），直接调用游戏中的 evaluate_five_card_hand，按点数+是否同花缓存"""
+    suits = ['♠'] * 5 if flush else ['♠', '♥', '♦', '♣', '♠']
+    rank_names = {v: r for r, v in zip(RANKS, range(2, 15))}
+    cards = [Card(s, rank_names[v]) for s, v in zip(suits, values)]
+    return ThreeCardPokerGUI.evaluate_five_card_hand(None, cards)
+
+
+def six_card_payout(values, suited):
+    """6 张牌最佳赔付；values 为点数，suited[i] 表示第 i 张是否属于同一（同花）花色"""
+    if all(suited) and sorted(values) == [9, 10, 11, 12, 13, 14]:
+        return SIX_CARD_PAYOUT["6_card_super_royal"]
+    best = 0
+    for drop in range(6):
+        idx = [i for i in range(6) if i != drop]
+        flush = all(suited[i] for i in idx)
+        payout = five_card_payout(tuple(sorted((values[i] for i in idx), reverse=True)), flush)
+        if payout > best:
+            best = payout
+    return best
+
+
+def _rank_multisets(total=6, rank=2):
+    """生成 6 张牌的点数多重集（每个点数最多 4 张）"""
+    if rank > 14:
+        if total == 0:
+            yield []
+        return
+    for count in range(min(4, total) + 1):
+        for rest in _rank_multisets(total - count, rank + 1):
+            yield [rank] * count + rest
+
+
+def analyze_six_card():
+    """按点数组合 + 花色结构分类精确计数"""
+    payouts = Counter()
+    for values in _rank_multisets():
+        counts = Counter(values)
+        total = 1
+        for c in counts.values():
+            total *= comb(4, c)
+
+        flush_combos = 0
+        if len(counts) == 6:
+            # 6 张同花：4 种
+            payouts[six_card_payout(values, [True] * 6)] += 4
+            flush_combos += 4
+            # 恰好 5 张同花：不同花的那张有 6 种选择，花色 4×3
+            for off in range(6):
+                suited = [i != off for i in range(6)]
+                payouts[six_card_payout(values, suited)] += 12
+                flush_combos += 12
+        elif len(counts) == 5:
+            # 一对 + 4 张单牌：单牌与对子中的一张同花（4×3 种）
+            pair_value = next(v for v, c in counts.items() if c == 2)
+            first = values.index(pair_value)
+            suited = [i != first for i in range(6)]
+            payouts[six_card_payout(values, suited)] += 12
+            flush_combos += 12
+
+        # 其余花色组合都没有 5 张同花
+        if total > flush_combos:
+            payouts[six_card_payout(values, [False] * 6)] += total - flush_combos
+    return payouts
+
+
+def _brute_six_card_chunk(first):
+    """穷举以 first 为最小牌序号的所有 6 张组合"""
+    payouts = Counter()
+    values_of = [c.value for c in DECK]
+    suit_of = [SUITS.index(c.suit) for c in DECK]
+    for rest in combinations(range(first + 1, 52), 5):
+        cards = (first,) + rest
+        suits = [suit_of[i] for i in cards]
+        suit_count = Counter(suits)
+        main_suit, n = suit_count.most_common(1)[0]
+        values = [values_of[i] for i in cards]
+        if n >= 5:
+            suited = [s == main_suit for s in suits]
+        else:
+            suited = [False] * 6
+        payouts[six_card_payout(values, suited)] += 1
+    return payouts
+
+
+def analyze_six_card_brute(workers=None):
+    """多进程逐一穷举 C(52,6)"""
+    payouts = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_brute_six_card_chunk, range(47)):
+            payouts.update(part)
+    return payouts
+
+
+def six_card_ev(payouts):
+    total = sum(payouts.values())
+    # 赔付值含本金（calculate_six_card_bonus 返回 payout * bet）
+    return sum(p * n for p, n in payouts.items()) / total - 1, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="三张牌扑克赔率表精确分析")
+    parser.add_argument("--jackpot", type=float, default=197301.26, help="Progressive 奖池金额")
+    parser.add_argument("--brute", action="store_true", help="多进程穷举 C(52,6) 交叉验证 6 Card")
+    parser.add_argument("--workers", type=int, default=None, help="穷举时的进程数")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    three = analyze_three_card(args.jackpot)
+    t3 = time.perf_counter() - start
+
+    start = time.perf_counter()
+    six = analyze_six_card()
+    six_ev, six_total = six_card_ev(six)
+    t6 = time.perf_counter() - start
+
+    print(f"玩家手牌总数: {three['total_hands']:,}（耗时 {t3:.1f} 秒）")
+    for rank in sorted(three['hand_types'], reverse=True):
+        n = three['hand_types'][rank]
+        print(f"  {HAND_RANK_NAMES[rank]:<10}{n:>6}  {n / three['total_hands']:.6f}")
+    print(f"Ante+Play（最优策略）EV: {three['ante_play_ev']:+.6f} / Ante，弃牌率 {three['fold_rate']:.4f}")
+    print(f"Pair Plus EV: {three['pair_plus_ev']:+.6f}")
+    print(f"Progressive（${PROGRESSIVE_BET}，奖池 ${args.jackpot:,.2f}）EV: {three['progressive_ev']:+.6f}")
+    print(f"6 Card EV: {six_ev:+.6f}（{six_total:,} 组合，耗时 {t6:.1f} 秒）")
+
+    if args.brute:
+        start = time.perf_counter()
+        brute = analyze_six_card_brute(args.workers)
+        print(f"穷举验证: {'一致' if brute == six else '不一致'}（耗时 {time.perf_counter() - start:.1f} 秒）")
+
+
+if __name__ == "__main__":
+    main()
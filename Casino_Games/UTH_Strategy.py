@@ -0,0 +1,402 @@
+"""终极德州扑克精确策略 / 期望值引擎
+
+以 Ante 为 1 个单位（Blind 等于 Ante），结算规则与 UTHGUI.calculate_winnings 一致：
+- 玩家赢：Play 1:1；Blind 按 BLIND_PAYOUT（不在表中则退还）；庄家至少一对时 Ante 1:1，否则退还
+- 平局：全部退还
+- 玩家输：Play、Blind 输；庄家至少一对时 Ante 输，否则退还
+- 弃牌：输掉 Ante 和 Blind（-2）
+
+- 河牌圈：枚举庄家 C(45,2) 手牌，精确计算下注 1 倍与弃牌的 EV
+- 翻牌圈：枚举转牌/河牌 C(47,2) × 庄家手牌，精确计算下注 2 倍与过牌
+  （过牌后河牌圈按最优决策）的 EV；按转牌分块交给进程池
+- 翻牌前：完整穷举不可行，下注 4/3 倍的 EV 用随机抽样估计，
+  过牌与否使用标准基本策略
+- 结果按花色同构的标准形式缓存（♠♥ 与 ♦♣ 等价的手牌只算一次）
+
+用法:
+    python UTH_Strategy.py --hole "As Kd" --board "Qh 7c 2s"
+    python UTH_Strategy.py --audit --hands 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import comb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+import poker_eval as pe
+from Ultimate_Texas_Holdem import (
+    SUITS, RANKS, HAND_RANK_NAMES, BLIND_PAYOUT, TRIPS_PAYOUT,
+    Card, evaluate_player_pair
+)
+
+FOLD_EV = -2.0
+QUALIFY_SCORE = pe.PAIR << pe.CATEGORY_SHIFT   # 庄家至少一对
+PROGRESSIVE_BET = 2.5
+JACKPOT_FIXED = {7: 3000, 6: 500, 5: 350}
+
+_SUIT_PERMS = list(permutations(range(4)))
+
+
+# ------------------- 牌的转换 -------------------
+def card_to_int(card):
+    """游戏中的 Card 对象 -> 整数牌"""
+    return pe.card_from_game(card, SUITS)
+
+
+def int_to_card(c):
+    return Card(SUITS[c & 3], RANKS[c >> 2])
+
+
+def parse_cards(text):
+    """解析 "As Kd 10h" 形式的牌"""
+    cards = []
+    for token in text.replace(',', ' ').split():
+        rank, suit = token[:-1].upper(), token[-1].lower()
+        if rank == '10':
+            rank = 'T'
+        cards.append(pe.RANK_CHARS.index(rank) * 4 + pe.SUIT_CHARS.index(suit))
+    return cards
+
+
+def canonical(hole, board):
+    """花色同构的标准形式：24 种花色置换中字典序最小的 (手牌, 公共牌)"""
+    best = None
+    for perm in _SUIT_PERMS:
+        key = (
+            tuple(sorted((c & ~3) | perm[c & 3] for c in hole)),
+            tuple(sorted((c & ~3) | perm[c & 3] for c in board)),
+        )
+        if best is None or key < best:
+            best = key
+    return best
+
+
+# ------------------- 河牌圈 -------------------
+def board_tally(hole, board):
+    """五张公共牌已知时枚举庄家手牌
+
+    返回 (玩家牌型, 赢且庄家合格, 赢且庄家不合格, 平, 输且庄家合格, 输且庄家不合格)
+    """
+    player = pe.evaluate(list(hole) + list(board))
+    used = set(hole) | set(board)
+    rest = [c for c in range(52) if c not in used]
+    wq = wnq = tie = lq = lnq = 0
+    for d1, d2 in combinations(rest, 2):
+        dealer = pe.evaluate([d1, d2, *board])
+        if player > dealer:
+            if dealer >= QUALIFY_SCORE:
+                wq += 1
+            else:
+                wnq += 1
+        elif player == dealer:
+            tie += 1
+        elif dealer >= QUALIFY_SCORE:
+            lq += 1
+        else:
+            lnq += 1
+    return pe.category(player), wq, wnq, tie, lq, lnq
+
+
+def play_ev(tally, multiplier, blind_payout=BLIND_PAYOUT):
+    """下注 multiplier 倍 Play 时的 EV（以 Ante 为单位）"""
+    category, wq, wnq, tie, lq, lnq = tally
+    b = blind_payout.get(category, 0)
+    total = wq + wnq + tie + lq + lnq
+    return (wq * (1 + b + multiplier) + wnq * (b + multiplier)
+            - lq * (2 + multiplier) - lnq * (1 + multiplier)) / total
+
+
+@lru_cache(maxsize=4096)
+def _river_evs(hole, board):
+    tally = board_tally(hole, board)
+    return {'1x': play_ev(tally, 1), 'fold': FOLD_EV}
+
+
+def river_evs(hole, board):
+    """河牌圈各操作的精确 EV"""
+    return _river_evs(*canonical(hole, board))
+
+
+# ------------------- 翻牌圈 -------------------
+def _flop_chunk(hole, flop, turn, rivers):
+    """以 turn 为转牌的所有河牌：返回 (2 倍 EV 之和, 过牌 EV 之和, 组合数)"""
+    sum_bet = sum_check = 0.0
+    for river in rivers:
+        tally = board_tally(hole, flop + (turn, river))
+        sum_bet += play_ev(tally, 2)
+        sum_check += max(play_ev(tally, 1), FOLD_EV)
+    return sum_bet, sum_check, len(rivers)
+
+
+@lru_cache(maxsize=1024)
+def _flop_evs(hole, flop, workers):
+    used = set(hole) | set(flop)
+    rest = [c for c in range(52) if c not in used]
+    tasks = [(hole, flop, turn, rest[i + 1:]) for i, turn in enumerate(rest[:-1])]
+
+    if workers == 1:
+        parts = [_flop_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_flop_chunk, *zip(*tasks)))
+
+    sum_bet = sum(p[0] for p in parts)
+    sum_check = sum(p[1] for p in parts)
+    boards = sum(p[2] for p in parts)
+    return {'2x': sum_bet / boards, 'check': sum_check / boards}
+
+
+def flop_evs(hole, flop, workers=None):
+    """翻牌圈各操作的精确 EV；workers 为进程数（1 表示单进程）"""
+    workers = workers or os.cpu_count() or 1
+    return _flop_evs(*canonical(hole, flop), workers)
+
+
+# ------------------- 翻牌前 -------------------
+def preflop_should_raise(hole):
+    """标准基本策略：33 以上的对子、任意 A、K2s+、K5o+、Q6s+、Q8o+、J8s+、JTo+ 下注 4 倍"""
+    high, low = sorted((c >> 2 for c in hole), reverse=True)
+    suited = (hole[0] & 3) == (hole[1] & 3)
+    # 点数 0-12 对应 2-A
+    if high == low:
+        return high >= 1
+    if high == 12:
+        return True
+    if high == 11:
+        return suited or low >= 3
+    if high == 10:
+        return low >= (4 if suited else 6)
+    if high == 9:
+        return low >= (6 if suited else 8)
+    return False
+
+
+@lru_cache(maxsize=256)
+def _preflop_evs(hole, samples, seed):
+    rng = random.Random(seed)
+    rest = [c for c in range(52) if c not in hole]
+    total = {4: 0.0, 3: 0.0}
+    for _ in range(samples):
+        drawn = rng.sample(rest, 7)
+        board, dealer_hole = drawn[:5], drawn[5:]
+        player = pe.evaluate(list(hole) + board)
+        dealer = pe.evaluate(dealer_hole + board)
+        qualified = dealer >= QUALIFY_SCORE
+        b = BLIND_PAYOUT.get(pe.category(player), 0)
+        for m in total:
+            if player > dealer:
+                total[m] += (1 if qualified else 0) + b + m
+            elif player < dealer:
+                total[m] -= (1 if qualified else 0) + 1 + m
+    return {'4x': total[4] / samples, '3x': total[3] / samples}
+
+
+def preflop_evs(hole, samples=20000, seed=0):
+    """翻牌前下注 4/3 倍的抽样 EV 估计（过牌的价值依赖后续最优决策，不做估计）"""
+    return _preflop_evs(canonical(hole, ())[0], samples, seed)
+
+
+# ------------------- 提示 -------------------
+def advise(hole, board, workers=None):
+    """根据已翻开的公共牌数返回 (建议, {操作: EV})"""
+    hole = tuple(hole)
+    board = tuple(board)
+    if len(board) == 0:
+        evs = preflop_evs(hole, samples=5000)
+        return ('4x' if preflop_should_raise(hole) else 'check'), evs
+    if len(board) == 3:
+        evs = flop_evs(hole, board, workers)
+    elif len(board) == 5:
+        evs = river_evs(hole, board)
+    else:
+        raise ValueError(f"公共牌数量必须为 0、3 或 5，当前为 {len(board)}")
+    return max(evs, key=evs.get), evs
+
+
+# ------------------- 赔率表审计 -------------------
+def _rank_multisets(total, rank=0):
+    """生成 total 张牌的点数多重集（每个点数最多 4 张）"""
+    if rank > 12:
+        if total == 0:
+            yield []
+        return
+    for count in range(min(4, total) + 1):
+        for rest in _rank_multisets(total - count, rank + 1):
+            yield [rank] * count + rest
+
+
+def category_counts(n):
+    """n 张牌（5 或 7）最佳五张牌型的精确组合数
+
+    按点数多重集分类：非同花时花色依次轮换（同点数花色互不相同，不会凑成同花）；
+    同花时枚举同花花色包含的点数子集 S（|S| ≥ 5），组合数为
+    4 × Π_{r∈S} C(3, c_r - 1) × Π_{r∉S} C(3, c_r)。
+    """
+    counts = Counter()
+    for ranks in _rank_multisets(n):
+        multiplicity = Counter(ranks)
+        total = 1
+        for c in multiplicity.values():
+            total *= comb(4, c)
+
+        flush_total = 0
+        distinct = sorted(multiplicity)
+        for size in range(5, len(distinct) + 1):
+            for flush_ranks in combinations(distinct, size):
+                ways = 4
+                cards = []
+                for r in distinct:
+                    c = multiplicity[r]
+                    if r in flush_ranks:
+                        ways *= comb(3, c - 1)
+                        cards.append(r * 4)
+                        cards.extend(r * 4 + s for s in range(1, c))
+                    else:
+                        ways *= comb(3, c)
+                        cards.extend(r * 4 + s for s in range(1, c + 1))
+                if ways:
+                    counts[pe.category(pe.evaluate(cards))] += ways
+                    flush_total += ways
+
+        if total > flush_total:
+            cards = [r * 4 + (i % 4) for i, r in enumerate(ranks)]
+            counts[pe.category(pe.evaluate(cards))] += total - flush_total
+    return counts
+
+
+def player_pair_ev():
+    """Player Pair 边注的精确 EV（1326 种起手牌）"""
+    total = 0
+    for a, b in combinations(range(52), 2):
+        result = evaluate_player_pair([int_to_card(a), int_to_card(b)])
+        total += result[1] if result else -1
+    return total / comb(52, 2)
+
+
+def trips_ev(seven_counts):
+    total = sum(seven_counts.values())
+    return sum(n * (TRIPS_PAYOUT[cat] if cat in TRIPS_PAYOUT else -1)
+               for cat, n in seven_counts.items()) / total
+
+
+def progressive_ev(five_counts, jackpot):
+    """Progressive（手牌 + 翻牌五张）按 calculate_winnings 中的奖金规则"""
+    payouts = dict(JACKPOT_FIXED)
+    payouts[9] = max(jackpot, 100000)
+    payouts[8] = max(jackpot * 0.1, 10000)
+    total = sum(five_counts.values())
+    paid = sum(n * payouts.get(cat, 0) for cat, n in five_counts.items()) / total
+    return (paid - PROGRESSIVE_BET) / PROGRESSIVE_BET
+
+
+def flop_should_bet(hole, flop):
+    """翻牌圈基本策略：两对以上、用到手牌的对子（22 除外）、手牌含 10 以上的四张同花"""
+    player = pe.category(pe.evaluate(list(hole) + list(flop)))
+    hole_ranks = [c >> 2 for c in hole]
+    flop_ranks = [c >> 2 for c in flop]
+    if player >= pe.TWO_PAIR and any(r in flop_ranks for r in hole_ranks) or player >= pe.TRIPS:
+        return True
+    if hole_ranks[0] == hole_ranks[1] and hole_ranks[0] > 0:
+        return True
+    if any(r in flop_ranks and r > 0 for r in hole_ranks):
+        return True
+    suits = Counter(c & 3 for c in list(hole) + list(flop))
+    suit, n = suits.most_common(1)[0]
+    return n == 4 and any((c & 3) == suit and (c >> 2) >= 8 for c in hole)
+
+
+def _simulate_chunk(hands, seed):
+    """主注模拟：翻牌前/翻牌圈用基本策略，河牌圈用精确 EV 决策"""
+    rng = random.Random(seed)
+    deck = list(range(52))
+    total = 0.0
+    for _ in range(hands):
+        cards = rng.sample(deck, 9)
+        hole, board, dealer_hole = tuple(cards[:2]), tuple(cards[2:7]), cards[7:]
+        if preflop_should_raise(hole):
+            multiplier = 4
+        elif flop_should_bet(hole, board[:3]):
+            multiplier = 2
+        elif river_evs(hole, board)['1x'] >= FOLD_EV:
+            multiplier = 1
+        else:
+            total += FOLD_EV
+            continue
+        player = pe.evaluate(list(hole) + list(board))
+        dealer = pe.evaluate(dealer_hole + list(board))
+        qualified = 1 if dealer >= QUALIFY_SCORE else 0
+        if player > dealer:
+            total += qualified + BLIND_PAYOUT.get(pe.category(player), 0) + multiplier
+        elif player < dealer:
+            total -= qualified + 1 + multiplier
+    return total
+
+
+def simulate_main_game(hands, workers=None, seed=None, chunk_size=500):
+    workers = workers or os.cpu_count() or 1
+    base_seed = seed if seed is not None else random.getrandbits(32)
+    chunks = [min(chunk_size, hands - i) for i in range(0, hands, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        totals = pool.map(_simulate_chunk, chunks, [base_seed + i for i in range(len(chunks))])
+        return sum(totals) / hands
+
+
+def run_audit(jackpot, hands, workers):
+    start = time.perf_counter()
+    seven = category_counts(7)
+    five = category_counts(5)
+    print(f"牌型组合数（耗时 {time.perf_counter() - start:.1f} 秒）:")
+    print(f"  {'牌型':<8}{'5 张':>12}{'7 张':>14}")
+    for cat in sorted(seven, reverse=True):
+        print(f"  {HAND_RANK_NAMES[cat]:<8}{five[cat]:>12,}{seven[cat]:>14,}")
+    assert sum(five.values()) == comb(52, 5) and sum(seven.values()) == comb(52, 7)
+
+    print(f"Trips EV: {trips_ev(seven):+.6f}")
+    print(f"Player Pair EV: {player_pair_ev():+.6f}")
+    print(f"Progressive（${PROGRESSIVE_BET}，奖池 ${jackpot:,.2f}）EV: {progressive_ev(five, jackpot):+.6f}")
+
+    if hands:
+        start = time.perf_counter()
+        ev = simulate_main_game(hands, workers)
+        print(f"主注（Ante+Blind+Play）模拟 {hands:,} 局 EV: {ev:+.4f} / Ante"
+              f"（耗时 {time.perf_counter() - start:.1f} 秒）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="终极德州扑克精确策略 / 期望值引擎")
+    parser.add_argument("--hole", help='玩家手牌，例如 "As Kd"')
+    parser.add_argument("--board", default="", help='已翻开的公共牌（0、3 或 5 张）')
+    parser.add_argument("--audit", action="store_true", help="赔率表审计")
+    parser.add_argument("--jackpot", type=float, default=100000, help="Progressive 奖池金额")
+    parser.add_argument("--hands", type=int, default=0, help="审计时模拟主注的局数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数")
+    args = parser.parse_args()
+
+    if args.hole:
+        hole = parse_cards(args.hole)
+        board = parse_cards(args.board)
+        start = time.perf_counter()
+        action, evs = advise(hole, board, args.workers)
+        for name, ev in evs.items():
+            print(f"  {name:<6}{ev:+.4f}")
+        print(f"建议: {action}（耗时 {time.perf_counter() - start:.2f} 秒）")
+    if args.audit:
+        run_audit(args.jackpot, args.hands, args.workers)
+    if not args.hole and not args.audit:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
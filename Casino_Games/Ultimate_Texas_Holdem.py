@@ -6,11 +6,19 @@ import json
 import os
 from collections import Counter
 from itertools import combinations
-import math
 import hashlib
 import time
-import secrets
 import subprocess, sys
+import threading
+
+# 将A_Tools目录添加到系统路径（共享的动画调度器）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from tween import Animator
+import metrics
+import random_stream
+import rng_provider
 
 # 扑克牌花色和点数
 SUITS = ['♠', '♥', '♦', '♣']
@@ -66,6 +74,7 @@ def load_user_data():
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
     
+@metrics.timed()
 def update_balance_in_json(username, new_balance):
     users = load_user_data()
     for user in users:
@@ -126,6 +135,7 @@ class Card:
         return f"{self.rank}{self.suit}"
 
 class Deck:
+    @metrics.timed()
     def __init__(self):
         # 获取当前脚本所在目录的上一级目录
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -134,7 +144,7 @@ class Deck:
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
         
         # 保证 Python 输出为 UTF-8
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         
         try:
@@ -168,8 +178,8 @@ class Deck:
             print(f"Error calling shuffle.py: {e}. Using fallback shuffle.")
             # fallback：标准顺序+安全乱序
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(52)
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(52)
         
         # 通用的洗牌后索引 & 发牌序列逻辑
         self.start_pos = self.cut_position
@@ -177,12 +187,6 @@ class Deck:
         self.pointer = 0
         self.card_sequence = [self.full_deck[i] for i in self.indexes]
     
-    def _secure_shuffle(self):
-        """Fisher–Yates 洗牌，用 secrets 保证随机性"""
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
@@ -372,6 +376,7 @@ class UTHGUI(tk.Tk):
         self.game = UTHGame()
         self.card_images = {}
         self.animation_queue = []
+        self.animator = Animator.of(self)  # 本窗口的动画调度器
         self.animation_in_progress = False
         self.card_positions = {}
         self.active_card_labels = []  # 追踪所有活动中的卡片标签
@@ -395,6 +400,7 @@ class UTHGUI(tk.Tk):
         self._load_assets()
         self._create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        metrics.watch_window(self)
 
     def show_game_instructions(self):
         """显示游戏规则说明"""
@@ -840,7 +846,7 @@ class UTHGUI(tk.Tk):
             widget = self.bet_widgets[bet_type]
             original_bg = widget.cget('bg')
             widget.config(bg='#FFCDD2')  # 浅红色
-            self.after(500, lambda: widget.config(bg=original_bg))
+            self.animator.flash(widget, 0.5, bg=original_bg)
     
     def cycle_bet_amount(self, event):
         """循环设置Bet下注金额：0 -> 3倍Ante -> 4倍Ante -> 0"""
@@ -1180,6 +1186,12 @@ class UTHGUI(tk.Tk):
         )
         self.status_label.pack(pady=5, fill=tk.X, anchor='n')
 
+        # 策略提示（各操作的期望值，由 UTH_Strategy 在后台计算）
+        self.hint_label = tk.Label(
+            control_frame, text="", font=('Arial', 11), bg='#2a4a3c', fg='#FFD700'
+        )
+        self.hint_label.pack(fill=tk.X, anchor='n')
+
         # 本局下注和上局获胜金额显示
         bet_info_frame = tk.Frame(control_frame, bg='#2a4a3c', bd=2, relief=tk.RAISED)
         bet_info_frame.pack(fill=tk.X, pady=20)
@@ -1488,48 +1500,29 @@ class UTHGUI(tk.Tk):
         # 检查卡片是否仍然存在
         if not hasattr(card_label, "target_pos") or card_label not in self.active_card_labels:
             return
-            
+
+        def arrived():
+            card_label.is_moving = False
+
+            # 如果是回收动画且到达左上角，销毁卡片
+            if card_label.target_pos == (50, 50):
+                if card_label in self.active_card_labels:
+                    self.active_card_labels.remove(card_label)
+                card_label.destroy()
+
+            self.after(20, self.animate_deal)  # 处理下一张牌
+
         try:
-            current_x, current_y = card_label.winfo_x(), card_label.winfo_y()
-            target_x, target_y = card_label.target_pos
-            
-            # 计算移动方向向量
-            dx = target_x - current_x
-            dy = target_y - current_y
-            distance = math.sqrt(dx**2 + dy**2)
-            
-            # 如果已经到达目标位置
-            if distance < 5:
-                card_label.place(x=target_x, y=target_y)
-                card_label.is_moving = False
-                
-                # 如果是回收动画且到达左上角，销毁卡片
-                if card_label.target_pos == (50, 50):
-                    if card_label in self.active_card_labels:
-                        self.active_card_labels.remove(card_label)
-                    card_label.destroy()
-                    
-                self.after(20, self.animate_deal)  # 处理下一张牌
-                return
-            
-            # 计算移动步长
-            step_x = dx * 0.2
-            step_y = dy * 0.2
-            
-            # 更新位置
-            new_x = current_x + step_x
-            new_y = current_y + step_y
-            card_label.place(x=new_x, y=new_y)
-            
-            # 继续动画
-            self.after(20, lambda: self.animate_card_move(card_label))
-            
+            # 交给窗口的动画调度器逐帧移动（每帧移动剩余距离的20%）
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                on_done=arrived
+            )
         except tk.TclError:
             # 卡片已被销毁，停止动画
             if card_label in self.active_card_labels:
                 self.active_card_labels.remove(card_label)
-            return
-    
+
     def reveal_player_cards(self):
         """翻开玩家牌（带动画）"""
         for i, card_label in enumerate(self.player_cards_frame.winfo_children()):
@@ -1637,6 +1630,48 @@ class UTHGUI(tk.Tk):
         step += 1
         card_label.after(50, lambda: self.animate_flip(card_label, front_img, step))
     
+    def request_strategy_hint(self):
+        """在后台线程计算当前决策各操作的 EV，算完后显示在提示栏"""
+        revealed = {"pre_flop": 0, "flop": 3, "river": 5}.get(self.game.stage)
+        if revealed is None or len(self.game.player_hole) != 2:
+            return
+        from UTH_Strategy import advise, card_to_int
+
+        hole = [card_to_int(c) for c in self.game.player_hole]
+        board = [card_to_int(c) for c in self.game.community_cards[:revealed]]
+        result = {}
+        self.hint_token = token = object()
+        self.hint_label.config(text="策略提示: 计算中...")
+
+        def work():
+            try:
+                # 单进程计算：不在 Tk 进程的后台线程里 fork 进程池
+                result['value'] = advise(hole, board, workers=1)
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        self.after(100, lambda: self._poll_strategy_hint(thread, token, result))
+
+    def _poll_strategy_hint(self, thread, token, result):
+        if token is not getattr(self, 'hint_token', None) or not self.winfo_exists():
+            return
+        if thread.is_alive():
+            self.after(100, lambda: self._poll_strategy_hint(thread, token, result))
+            return
+        if 'value' not in result:
+            self.hint_label.config(text="")
+            return
+        action, evs = result['value']
+        names = {'4x': '4倍', '3x': '3倍', '2x': '2倍', '1x': '1倍', 'check': '过牌', 'fold': '弃牌'}
+        parts = [f"{names[k]} {v:+.3f}" for k, v in evs.items()]
+        self.hint_label.config(text=f"策略提示: {names[action]}  (EV: {', '.join(parts)})")
+
+    def clear_strategy_hint(self):
+        self.hint_token = None
+        self.hint_label.config(text="")
+
     def enable_preflop_buttons(self):
         """启用翻牌前的操作按钮，并根据余额设置状态"""
         # 检查按钮是否还存在
@@ -1658,6 +1693,7 @@ class UTHGUI(tk.Tk):
 
         # 过牌按钮总是可用
         self.check_button.config(state=tk.NORMAL)
+        self.request_strategy_hint()
 
     def enable_flop_buttons(self):
         """启用翻牌圈的操作按钮，并根据余额设置状态"""
@@ -1674,6 +1710,7 @@ class UTHGUI(tk.Tk):
 
         # 过牌按钮总是可用
         self.check_button.config(state=tk.NORMAL)
+        self.request_strategy_hint()
 
     def enable_river_buttons(self):
         """启用河牌圈的操作按钮"""
@@ -1690,8 +1727,10 @@ class UTHGUI(tk.Tk):
 
         # 弃牌按钮总是可用
         self.fold_button.config(state=tk.NORMAL)
+        self.request_strategy_hint()
     
     def play_action(self, bet_multiplier):
+        self.clear_strategy_hint()
         if bet_multiplier > 0:
             bet_amount = bet_multiplier * self.game.ante
             self.balance -= bet_amount
@@ -1819,6 +1858,7 @@ class UTHGUI(tk.Tk):
                 self.fold_action()
         
     def fold_action(self):
+        self.clear_strategy_hint()
         self.game.folded = True
         self.status_label.config(text="您已弃牌。游戏结束。")
 
@@ -2280,34 +2320,33 @@ class UTHGUI(tk.Tk):
         self.animate_card_out_step(auto_reset)
 
     def animate_card_out_step(self, auto_reset):
-        """移动卡片出屏幕的每一步"""
-        all_done = True
-        for card_label in self.active_card_labels[:]:  # 遍历副本，因为可能删除
-            if not hasattr(card_label, 'target_pos'):
-                continue
-
-            current_x = card_label.winfo_x()
-            target_x, target_y = card_label.target_pos
-
-            # 计算新位置
-            dx = target_x - current_x
-            if abs(dx) < 5:
-                card_label.place(x=target_x, y=target_y)
-                # 移除该卡片
-                card_label.destroy()
-                if card_label in self.active_card_labels:
-                    self.active_card_labels.remove(card_label)
-                continue
+        """把所有牌移出屏幕，全部完成后重置"""
+        cards = [
+            card_label for card_label in self.active_card_labels
+            if hasattr(card_label, 'target_pos') and card_label.winfo_exists()
+        ]
+        if not cards:
+            self._do_reset(auto_reset)
+            return
 
-            new_x = current_x + dx * 0.2
-            card_label.place(x=new_x)
-            all_done = False
+        remaining = [len(cards)]
 
-        if not all_done:
-            self.after(20, lambda: self.animate_card_out_step(auto_reset))
-        else:
-            # 所有动画完成，重置游戏
-            self._do_reset(auto_reset)
+        def card_out(card_label):
+            # 移除此卡片
+            card_label.destroy()
+            if card_label in self.active_card_labels:
+                self.active_card_labels.remove(card_label)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                # 所有动画完成，重置游戏
+                self._do_reset(auto_reset)
+
+        for card_label in cards:
+            self.animator.approach(
+                card_label, card_label.target_pos,
+                on_done=lambda c=card_label: card_out(c),
+                on_cancel=lambda c=card_label: card_out(c)
+            )
 
     def reset_game(self, auto_reset=False):
         # 取消自动重置计时器
@@ -2358,6 +2397,7 @@ class UTHGUI(tk.Tk):
 
         # 重置游戏状态
         self.game.reset_game()
+        self.clear_strategy_hint()
         self.stage_label.config(text="翻牌前")
         
         # 重置标签显示
@@ -2381,6 +2421,7 @@ class UTHGUI(tk.Tk):
         
         # 清空活动卡片列表（在收牌动画后已经清空，这里确保一下）
         self.active_card_labels = []
+        self.animator.cancel()  # 停止仍在进行的补间
         
         # 恢复下注区域
         self.ante_display.bind("<Button-1>", lambda e: self.add_chip_to_bet("ante"))
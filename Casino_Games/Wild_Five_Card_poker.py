@@ -3,12 +3,18 @@ from tkinter import ttk, messagebox
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import json
 import os
-import secrets
 import subprocess
 import sys
 from itertools import combinations, product
 from collections import Counter
 
+# 将A_Tools目录添加到系统路径（共享的随机流）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+import random_stream
+import rng_provider
+
 # ------------------------- 基础数据 -------------------------
 SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -124,7 +130,7 @@ class Deck:
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         card_dir = os.path.join(parent_dir, 'A_Tools', 'Card')
         shuffle_script = os.path.join(card_dir, 'shuffle.py')
-        env = os.environ.copy()
+        env = rng_provider.shuffle_env()
         env['PYTHONIOENCODING'] = 'utf-8'
         try:
             result = subprocess.run(
@@ -141,17 +147,12 @@ class Deck:
             self.cut_position = shuffle_data["cut_position"]
         except Exception:
             self.full_deck = [Card(s, r) for s in SUITS for r in RANKS] + [Card('JOKER', 'JOKER')]
-            self._secure_shuffle()
-            self.cut_position = secrets.randbelow(len(self.full_deck))
+            random_stream.shuffle(self.full_deck)
+            self.cut_position = random_stream.randbelow(len(self.full_deck))
         self.start_pos = self.cut_position
         self.indexes = [(self.start_pos + i) % len(self.full_deck) for i in range(len(self.full_deck))]
         self.pointer = 0
 
-    def _secure_shuffle(self):
-        for i in range(len(self.full_deck) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            self.full_deck[i], self.full_deck[j] = self.full_deck[j], self.full_deck[i]
-
     def deal(self, n=1):
         dealt = [self.full_deck[self.indexes[self.pointer + i]] for i in range(n)]
         self.pointer += n
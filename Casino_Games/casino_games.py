@@ -3,12 +3,20 @@ import os
 import time
 import sys
 import re
-import unicodedata
 
 # 让本文件可直接运行时，也能找到上层项目路径
 if __name__ == "__main__" and __package__ is None:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# 将A_Tools目录添加到系统路径（终端菜单渲染、按键输入与卡顿检测）
+a_tools_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from term_ui import GridMenu, screen, display_width
+from key_input import get_key, release as release_keys
+import rng_provider  # 设置 CASINO_SEED 时用固定种子初始化全局 random（random.shuffle 发牌等）
+import stall_watchdog
+
 ## Casino games import
 ## Poker
 from Casino_Games import Caribbean_Stud_Poker
@@ -85,137 +93,9 @@ def update_balance_in_json(username, new_balance):
     save_user_data(users)
 
 
-def display_width(s):
-    width = 0
-    for ch in s:
-        ea = unicodedata.east_asian_width(ch)
-        if ea in ('F', 'W'):  # Fullwidth, Wide
-            width += 2
-        elif ea in ('Na', 'H', 'N', 'A'):  # Narrow, Halfwidth, Neutral, Ambiguous
-            width += 1
-        else:
-            width += 1
-    return width
-
-
-def pad_game_name(name, width, highlight=False):
-    """将游戏名格式化为固定显示宽度，左对齐，可选高亮（反色）"""
-    name_width = display_width(name)
-    padding = ' ' * max(0, width - name_width)
-    if highlight:
-        return f"\033[7m{name}\033[0m{padding}"
-    else:
-        return name + padding
-
-
-def display_menu(selected_global_row, selected_global_col, sections, global_rows, fixed_width):
-    """显示分类菜单，选中项根据全局行列高亮，使用固定列宽，且所有分类标题行长度统一为最长的那个"""
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(" 欢迎来到赌场中心!\n")
-    print("请使用方向键选择游戏，回车确认(ESC返回主目录):\n")
-
-    # 第一步：计算所有分类的最大总宽度
-    interval = 2
-    global_max_width = 0
-    for section_title, rows in sections:
-        if not rows:
-            continue
-        max_cols = max(len(row) for row in rows)
-        total_width = max_cols * fixed_width + (max_cols - 1) * interval
-        if total_width > global_max_width:
-            global_max_width = total_width
-
-    current_global_idx = 0
-
-    for section_title, rows in sections:
-        if not rows:
-            continue
-
-        max_cols = max(len(row) for row in rows)
-        # 使用全局最大宽度来生成标题行
-        title = section_title
-        title_width = display_width(title)
-        left_eq = max(0, (global_max_width - title_width) // 2)
-        right_eq = max(0, global_max_width - title_width - left_eq)
-        title_line = '=' * left_eq + title + '=' * right_eq
-        print(title_line)
-
-        for row in rows:
-            line_parts = []
-            for col in range(max_cols):
-                if col < len(row):
-                    game_name = row[col]
-                    is_selected = (current_global_idx == selected_global_row and col == selected_global_col)
-                else:
-                    game_name = ""
-                    is_selected = False
-                part = pad_game_name(game_name, fixed_width, highlight=is_selected)
-                line_parts.append(part)
-            line = '  '.join(line_parts)
-            print(line)
-            current_global_idx += 1
-        print()
-
-def get_key():
-    """跨平台获取键盘按键"""
-    if os.name == 'nt':
-        import msvcrt
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch()
-                if key == b'\xe0':
-                    key = msvcrt.getch()
-                    if key == b'H':
-                        return 'up'
-                    elif key == b'P':
-                        return 'down'
-                    elif key == b'K':
-                        return 'left'
-                    elif key == b'M':
-                        return 'right'
-                elif key == b'\r':
-                    return 'enter'
-                elif key == b'\x1b':
-                    return 'esc'
-                elif key == b'0':
-                    return '0'
-                else:
-                    return key
-            time.sleep(0.05)
-    else:
-        import select
-        import termios
-        import tty
-
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                if key == '\x1b':
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        rest = sys.stdin.read(2)
-                        if rest == '[A':
-                            return 'up'
-                        elif rest == '[B':
-                            return 'down'
-                        elif rest == '[C':
-                            return 'right'
-                        elif rest == '[D':
-                            return 'left'
-                    else:
-                        return 'esc'
-                elif key == '\r':
-                    return 'enter'
-                elif key == '0':
-                    return '0'
-                else:
-                    return key
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return None
-
+def display_menu(menu, selected_global_row, selected_global_col):
+    """显示分类菜单，选中项根据全局行列高亮；布局由 GridMenu 预先计算，只重绘变化的行"""
+    screen.render(menu.lines(selected_global_row, selected_global_col))
 
 def main(balance, user):
     # ========== 定义菜单结构（每行最多4个游戏） ==========
@@ -307,14 +187,22 @@ def main(balance, user):
     max_width = max(display_width(name) for name in all_game_names)
     fixed_col_width = max(max_width, 12)
 
+    # 菜单布局只计算一次，所有分类标题行长度统一为最长的那个
+    menu = GridMenu(
+        [" 欢迎来到赌场中心!", "", "请使用方向键选择游戏，回车确认(ESC返回主目录):", ""],
+        sections, fixed_col_width
+    )
+
     total_game_rows = len(global_rows)
     selected_global_row = 0
     selected_global_col = 0
+    screen.invalidate()
 
     while True:
-        display_menu(selected_global_row, selected_global_col, sections, global_rows, fixed_col_width)
+        display_menu(menu, selected_global_row, selected_global_col)
 
         key = get_key()
+        screen.mark_input()
 
         if key == 'up':
             if selected_global_row == 0:
@@ -356,6 +244,7 @@ def main(balance, user):
                 selected_global_col = 0
 
         elif key == 'enter':
+            release_keys()  # 运行游戏/输入前恢复终端模式
             _, _, row_games = global_rows[selected_global_row]
             game_name = row_games[selected_global_col]
             game_id, game_func = game_config[game_name]
@@ -370,11 +259,14 @@ def main(balance, user):
 
             if game_func:
                 try:
-                    balance = game_func(balance, user)
+                    # 设置 CASINO_WATCHDOG 时监视游戏窗口的主线程卡顿
+                    with stall_watchdog.watch_windows(game_func.__module__.rsplit('.', 1)[-1]):
+                        balance = game_func(balance, user)
                     update_balance_in_json(user, balance)
                 except Exception as e:
                     print(f"游戏运行出错: {e}")
                     time.sleep(2)
+                screen.invalidate()
 
         elif key == '0' or key == 'esc':
             return balance
@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import secrets
-import time
-from PIL import Image, ImageTk, ImageDraw
 import os, json, sys
 import random
 
@@ -15,6 +13,9 @@ a_tools_dir = os.path.join(parent_dir, 'A_Tools')
 if a_tools_dir not in sys.path:
     sys.path.append(a_tools_dir)
 
+from dice_animation import DiceAnimation, dice_face_images, roll_outcome
+import craps_rules
+
 def get_data_file_path():
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(parent_dir, 'saving_data.json')
@@ -49,18 +50,9 @@ class Dice:
         return secrets.randbelow(6) + 1
 
 class DiceAnimationWindow:
-    @staticmethod
-    def next_dice_value(current):
-        """根据当前骰子点数，生成下一个骰子点数（排除当前值和对面值）"""
-        opposite = 7 - current
-        candidates = [x for x in range(1, 7) if x != current and x != opposite]
-        return secrets.choice(candidates)
-
     def __init__(self, game, callback, init_dice1, init_dice2):
         self.game = game
         self.callback = callback
-        self.cur_dice1 = init_dice1
-        self.cur_dice2 = init_dice2
 
         self.window = tk.Toplevel(game.root)
         self.window.title("骰子摇动中...")
@@ -80,12 +72,8 @@ class DiceAnimationWindow:
         y = parent_y + (parent_height - 400) // 2
         self.window.geometry(f"500x400+{x}+{y}")
 
-        # 生成大号骰子图片
-        self.dice_images = []
-        for i in range(1, 7):
-            img = Image.new('RGB', (120, 120), '#e8d6b3')
-            self.draw_dice(img, i)
-            self.dice_images.append(ImageTk.PhotoImage(img))
+        # 大号骰子图片（共享贴图缓存）
+        self.dice_images = dice_face_images(self.window, 120)
 
         self.dice_container = tk.Frame(self.window, bg='#1e3d59')
         self.dice_container.pack(pady=50)
@@ -97,8 +85,8 @@ class DiceAnimationWindow:
             self.dice_labels.append(lbl)
 
         # 初始显示起始骰子
-        self.dice_labels[0].config(image=self.dice_images[self.cur_dice1-1])
-        self.dice_labels[1].config(image=self.dice_images[self.cur_dice2-1])
+        self.dice_labels[0].config(image=self.dice_images[init_dice1-1])
+        self.dice_labels[1].config(image=self.dice_images[init_dice2-1])
 
         self.status_label = tk.Label(self.window, text="骰子摇动中...", font=("Arial", 18), fg='white', bg='#1e3d59')
         self.status_label.pack(pady=20)
@@ -106,108 +94,64 @@ class DiceAnimationWindow:
         self.progress = ttk.Progressbar(self.window, orient=tk.HORIZONTAL, length=400, mode='determinate')
         self.progress.pack(pady=10)
 
-        self.animation_start_time = time.time()
-        self.final_dice = None
-        self.result_frame = None   # 用于存放最终结果的框架
-
-        # 计算骰子转动时间：3100到4000毫秒
-        total_milliseconds = secrets.randbelow(901) + 3100
-        self.total_duration = total_milliseconds / 1000.0
-
-        self.animate_dice()
+        # 结果在动画开始前一次决定，之后5秒只播放预先生成的翻滚画面
+        self.final_dice = tuple(roll_outcome(2))
+        self.animation = DiceAnimation(
+            self.window, self.dice_labels, self.dice_images,
+            finals=self.final_dice, duration=5.0, starts=[init_dice1, init_dice2],
+            on_frame=self.update_progress, on_done=self.dice_stopped
+        ).start()
 
     def do_nothing(self):
         """忽略关闭窗口的请求"""
         pass
 
-    def draw_dice(self, img, num):
-        draw = ImageDraw.Draw(img)
-        size = img.size[0]
-        dot_size = max(2, size // 10)
-        draw.rectangle([0, 0, size-1, size-1], outline='#333', width=1)
-        dot_color = '#333'
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4), (size//4, size//2), (3*size//4, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        for pos in dot_positions[num]:
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
-
-    def animate_dice(self):
-        elapsed = time.time() - self.animation_start_time
-        if elapsed < 5:  # 5秒快速变化
-            self.progress['value'] = min(100, (elapsed / 5) * 100)
-
-            # 根据规则生成下一组骰子点数
-            self.cur_dice1 = self.next_dice_value(self.cur_dice1)
-            self.cur_dice2 = self.next_dice_value(self.cur_dice2)
-
-            # 更新显示
-            self.dice_labels[0].config(image=self.dice_images[self.cur_dice1-1])
-            self.dice_labels[1].config(image=self.dice_images[self.cur_dice2-1])
-
-            # 保存最终结果（当接近5秒时记录）
-            if elapsed > 4.9:
-                self.final_dice = (self.cur_dice1, self.cur_dice2)
+    def update_progress(self, frame, total_frames):
+        self.progress['value'] = min(100, frame / total_frames * 100)
 
-            self.window.after(100, self.animate_dice)
+    def dice_stopped(self, final_dice):
+        # 1秒静止显示最终结果
+        self.status_label.config(text="骰子停止中...")
+        self.window.after(1000, self.show_result)
 
-        elif elapsed < 6:  # 1秒静止显示最终结果
-            if self.final_dice is None:
-                self.final_dice = (self.cur_dice1, self.cur_dice2)
+    def show_result(self):
+        # 3秒显示结果（使用图片形式）
+        total = sum(self.final_dice)
 
-            # 确保显示最终结果
-            self.dice_labels[0].config(image=self.dice_images[self.final_dice[0]-1])
-            self.dice_labels[1].config(image=self.dice_images[self.final_dice[1]-1])
-            self.status_label.config(text="骰子停止中...")
-            self.window.after(100, self.animate_dice)
+        # 隐藏原来的状态标签
+        self.status_label.pack_forget()
 
-        elif elapsed < 9:  # 3秒显示结果（使用图片形式）
-            total = sum(self.final_dice)
+        self.result_frame = tk.Frame(self.window, bg='#1e3d59')
+        self.result_frame.pack(pady=20)
 
-            # 如果尚未创建结果框架，则创建
-            if self.result_frame is None:
-                # 隐藏原来的状态标签
-                self.status_label.pack_forget()
+        # 获取小骰子图片（30x30）
+        small_dice_images = self.game.dice_images_small
 
-                self.result_frame = tk.Frame(self.window, bg='#1e3d59')
-                self.result_frame.pack(pady=20)
+        # 第一个骰子图片
+        self.dice_img1 = tk.Label(self.result_frame, image=small_dice_images[self.final_dice[0]-1], bg='#1e3d59')
+        self.dice_img1.pack(side=tk.LEFT, padx=5)
 
-                # 获取小骰子图片（30x30）
-                small_dice_images = self.game.dice_images_small
+        # 加号
+        plus_label = tk.Label(self.result_frame, text="+", font=("Arial", 14, "bold"), fg='white', bg='#1e3d59')
+        plus_label.pack(side=tk.LEFT, padx=5)
 
-                # 第一个骰子图片
-                self.dice_img1 = tk.Label(self.result_frame, image=small_dice_images[self.final_dice[0]-1], bg='#1e3d59')
-                self.dice_img1.pack(side=tk.LEFT, padx=5)
+        # 第二个骰子图片
+        self.dice_img2 = tk.Label(self.result_frame, image=small_dice_images[self.final_dice[1]-1], bg='#1e3d59')
+        self.dice_img2.pack(side=tk.LEFT, padx=5)
 
-                # 加号
-                plus_label = tk.Label(self.result_frame, text="+", font=("Arial", 14, "bold"), fg='white', bg='#1e3d59')
-                plus_label.pack(side=tk.LEFT, padx=5)
+        # 等号
+        equal_label = tk.Label(self.result_frame, text="=", font=("Arial", 14, "bold"), fg='white', bg='#1e3d59')
+        equal_label.pack(side=tk.LEFT, padx=5)
 
-                # 第二个骰子图片
-                self.dice_img2 = tk.Label(self.result_frame, image=small_dice_images[self.final_dice[1]-1], bg='#1e3d59')
-                self.dice_img2.pack(side=tk.LEFT, padx=5)
+        # 总和数字
+        total_label = tk.Label(self.result_frame, text=str(total), font=("Arial", 16, "bold"), fg='yellow', bg='#1e3d59')
+        total_label.pack(side=tk.LEFT, padx=5)
 
-                # 等号
-                equal_label = tk.Label(self.result_frame, text="=", font=("Arial", 14, "bold"), fg='white', bg='#1e3d59')
-                equal_label.pack(side=tk.LEFT, padx=5)
+        self.window.after(3000, self.finish)
 
-                # 总和数字
-                total_label = tk.Label(self.result_frame, text=str(total), font=("Arial", 16, "bold"), fg='yellow', bg='#1e3d59')
-                total_label.pack(side=tk.LEFT, padx=5)
-
-            self.window.after(100, self.animate_dice)
-
-        else:
-            self.window.destroy()
-            if self.final_dice is not None:
-                self.callback(self.final_dice)
-            else:
-                self.callback()
+    def finish(self):
+        self.window.destroy()
+        self.callback(self.final_dice)
 
 class CrapsGame:
     def __init__(self, root, username=None, initial_balance=10000):
@@ -298,25 +242,10 @@ class CrapsGame:
         self.come_points = {}
         self.dont_come_points = {}
 
-        # 创建骰子图片
-        self.dice_images_large = []
-        self.dice_images_small = []
-        self.dice_images_mini = []
-        for i in range(1, 7):
-            # 大尺寸骰子
-            img_large = Image.new('RGB', (70, 70), '#e8d6b3')
-            self.draw_dice(img_large, i)
-            self.dice_images_large.append(ImageTk.PhotoImage(img_large))
-
-            # 小尺寸骰子
-            img_small = Image.new('RGB', (30, 30), '#e8d3b3')
-            self.draw_dice(img_small, i)
-            self.dice_images_small.append(ImageTk.PhotoImage(img_small))
-
-            # 迷你尺寸骰子
-            img_mini = Image.new('RGB', (20, 20), '#e8d3b3')
-            self.draw_dice(img_mini, i)
-            self.dice_images_mini.append(ImageTk.PhotoImage(img_mini))
+        # 创建骰子图片（共享贴图缓存）
+        self.dice_images_large = dice_face_images(self.root, 70)
+        self.dice_images_small = dice_face_images(self.root, 30, bg='#e8d3b3')
+        self.dice_images_mini = dice_face_images(self.root, 20, bg='#e8d3b3')
 
         # 筹码值与颜色
         self.chip_values = [
@@ -347,23 +276,6 @@ class CrapsGame:
             update_balance_in_json(self.username, self.balance)
         self.root.destroy()
 
-    def draw_dice(self, img, num):
-        draw = ImageDraw.Draw(img)
-        size = img.size[0]
-        dot_size = max(2, size // 10)
-        draw.rectangle([0, 0, size-1, size-1], outline='#333', width=1)
-        dot_color = '#333'
-        dot_positions = {
-            1: [(size//2, size//2)],
-            2: [(size//4, size//4), (3*size//4, 3*size//4)],
-            3: [(size//4, size//4), (size//2, size//2), (3*size//4, 3*size//4)],
-            4: [(size//4, size//4), (3*size//4, size//4), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            5: [(size//4, size//4), (3*size//4, size//4), (size//2, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)],
-            6: [(size//4, size//4), (3*size//4, size//4), (size//4, size//2), (3*size//4, size//2), (size//4, 3*size//4), (3*size//4, 3*size//4)]
-        }
-        for pos in dot_positions[num]:
-            draw.ellipse([pos[0]-dot_size, pos[1]-dot_size, pos[0]+dot_size, pos[1]+dot_size], fill=dot_color)
-
     def create_widgets(self):
         main_frame = tk.Frame(self.root, bg='#0a5f38')
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -1371,23 +1283,16 @@ class CrapsGame:
         self.single_roll_bets = {k: 0 for k in self.single_roll_bets}
         self.current_bet = 0
 
-        # Place Bets 结算
-        rates = {
-            "big_6": 1, "big_8": 1,
-            "place_4": 9/5, "place_5": 7/5,
-            "place_6": 7/6, "place_8": 7/6,
-            "place_9": 7/5, "place_10": 9/5
-        }
-
-        # 在Point阶段或Come Out且Place Bets为ON时结算
+        # Place Bets 结算（在Point阶段或Come Out且Place Bets为ON时）
         if old_state == "point" or (old_state == "come_out" and self.place_bets_on):
-            for bt, rate in rates.items():
+            for bt in craps_rules.PLACE_BETS:
                 amt = self.multi_roll_bets.get(bt, 0)
                 if amt > 0:
-                    if total == 7:
+                    outcome, ret = craps_rules.resolve(bt, dice[0], dice[1])
+                    if outcome == craps_rules.LOSE:
                         self.multi_roll_bets[bt] = 0
-                    elif total == int(bt.split('_')[1] if bt.startswith('place_') else bt.split('_')[1]):
-                        total_return = amt * (1 + rate)
+                    elif outcome == craps_rules.WIN:
+                        total_return = amt * ret
                         self.balance += total_return
                         self.last_win += total_return
                         self.multi_roll_bets[bt] = 0
@@ -1535,77 +1440,8 @@ class CrapsGame:
         self.enter_binding = self.root.bind('<Return>', lambda e: self.roll_dice())
 
     def calculate_single_roll_win(self, bet_type, amount, dice, total):
-        dice1, dice2 = dice
-        sorted_dice = sorted(dice)
-
-        if bet_type == "field":
-            if total in [2, 12]:
-                return amount * 3
-            elif total in [3, 4, 9, 10, 11]:
-                return amount * 2
-            return 0
-
-        elif bet_type == "any_craps":
-            if total in [2, 3, 12]:
-                return amount * 8
-            return 0
-
-        elif bet_type == "any_7":
-            if total == 7:
-                return amount * 5
-            return 0
-
-        elif bet_type == "horn_2":
-            if total == 2:
-                return amount * 31
-            return 0
-        elif bet_type == "horn_3":
-            if total == 3:
-                return amount * 16
-            return 0
-        elif bet_type == "horn_11":
-            if total == 11:
-                return amount * 16
-            return 0
-        elif bet_type == "horn_12":
-            if total == 12:
-                return amount * 31
-            return 0
-
-        elif bet_type == "combo_11":
-            if sorted_dice == [1, 1]:
-                return amount * 31
-            return 0
-        elif bet_type == "combo_12":
-            if sorted_dice == [1, 2]:
-                return amount * 16
-            return 0
-        elif bet_type == "combo_22":
-            if sorted_dice == [2, 2]:
-                return amount * 8
-            return 0
-        elif bet_type == "combo_33":
-            if sorted_dice == [3, 3]:
-                return amount * 10
-            return 0
-        elif bet_type == "combo_44":
-            if sorted_dice == [4, 4]:
-                return amount * 10
-            return 0
-        elif bet_type == "combo_55":
-            if sorted_dice == [5, 5]:
-                return amount * 8
-            return 0
-        elif bet_type == "combo_56":
-            if sorted_dice == [5, 6]:
-                return amount * 16
-            return 0
-        elif bet_type == "combo_66":
-            if sorted_dice == [6, 6]:
-                return amount * 31
-            return 0
-
-        return 0
+        """单轮注返还（含本金），查 craps_rules 预编译的结算表"""
+        return craps_rules.payout(bet_type, amount, dice)
 
     def clear_bets(self):
         if not self.accept_bets:
@@ -3,11 +3,13 @@ import os
 import time
 import sys
 
-# 只在 Unix-like 系统上导入这些模块
-if os.name != 'nt':  # 不是 Windows 系统
-    import select
-    import termios
-    import tty
+# 将A_Tools目录添加到系统路径（终端菜单渲染与按键输入）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from term_ui import screen
+from key_input import get_key, release as release_keys
 
 ## Lotto games import
 from tkinter import Tk
@@ -41,84 +43,26 @@ def update_balance_in_json(username, new_balance):
             break
     save_user_data(users)  # 保存更新后的数据
 
-def display_menu(selected_row):
-    # 定义游戏菜单布局（每行一个选项）
-    menu_items = [
-        "验钞机(1块/特易中奖)  - 大奖1000！",
-        "高尔夫球(1块)       - 大奖10 000！",
-        "过三关(1块)         - 大奖10 000！",
-        "叠叠乐(5块)         - 大奖50 000！",
-        "100X现金大挑战(5块) - 大奖50 000！",
-        "返回主目录"
-    ]
-    
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(" 欢迎来到刮刮卡中心!\n")
-    print("请使用方向键选择游戏，回车确认(ESC返回主目录):\n")
-    
-    # 打印菜单，高亮显示选中的游戏
-    for idx, item in enumerate(menu_items):
-        if idx == selected_row:
-            print(f">> {item} <<")  # 高亮显示选中的选项
-        else:
-            print(f"   {item}   ")
-    print("\n")
+# 定义游戏菜单布局（每行一个选项）
+MENU_ITEMS = [
+    "验钞机(1块/特易中奖)  - 大奖1000！",
+    "高尔夫球(1块)       - 大奖10 000！",
+    "过三关(1块)         - 大奖10 000！",
+    "叠叠乐(5块)         - 大奖50 000！",
+    "100X现金大挑战(5块) - 大奖50 000！",
+    "返回主目录"
+]
+MENU_HEADER = [" 欢迎来到刮刮卡中心!", "", "请使用方向键选择游戏，回车确认(ESC返回主目录):", ""]
+# 每个选项的普通/高亮两种显示只生成一次
+MENU_LINES = [(f"   {item}   ", f">> {item} <<") for item in MENU_ITEMS]
 
-def get_key():
-    """跨平台获取键盘按键"""
-    # Windows系统
-    if os.name == 'nt':
-        import msvcrt
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch()
-                if key == b'\xe0':  # 扩展键（方向键）
-                    key = msvcrt.getch()
-                    if key == b'H': return 'up'
-                    elif key == b'P': return 'down'
-                    elif key == b'K': return 'left'
-                    elif key == b'M': return 'right'
-                elif key == b'\r':  # 回车键
-                    return 'enter'
-                elif key == b'\x1b':  # ESC键
-                    return 'esc'
-                elif key == b'0':
-                    return '0'
-                else:
-                    return key
-            time.sleep(0.05)  # 减少CPU占用
-    
-    # Unix-like系统 (Mac/Linux)
-    else:
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                if key == '\x1b':  # 可能是方向键
-                    # 读取接下来的字符
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        rest = sys.stdin.read(2)
-                        if rest == '[A':  # 上箭头
-                            return 'up'
-                        elif rest == '[B':  # 下箭头
-                            return 'down'
-                        elif rest == '[C':  # 右箭头
-                            return 'right'
-                        elif rest == '[D':  # 左箭头
-                            return 'left'
-                    else:
-                        return 'esc'  # ESC键
-                elif key == '\r':  # 回车键
-                    return 'enter'
-                elif key == '0':
-                    return '0'
-                else:
-                    return key
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return None
+def display_menu(selected_row):
+    # 打印菜单，高亮显示选中的游戏；只重绘变化的行
+    lines = list(MENU_HEADER)
+    for idx, (normal, highlighted) in enumerate(MENU_LINES):
+        lines.append(highlighted if idx == selected_row else normal)
+    lines += ["", ""]
+    screen.render(lines)
 
 def main(balance, user):
     # 初始选择位置 (第0行)
@@ -141,6 +85,7 @@ def main(balance, user):
         root.mainloop()  # 运行游戏
         return game.balance  # 退出后获取余额
     
+    screen.invalidate()
     while True:
         display_menu(selected_row)
         
@@ -149,6 +94,7 @@ def main(balance, user):
         
         # 获取按键
         key = get_key()
+        screen.mark_input()
         
         # 处理方向键
         if key == 'up':
@@ -165,6 +111,7 @@ def main(balance, user):
             
         # 处理回车键
         elif key == 'enter':
+            release_keys()  # 运行游戏/输入前恢复终端模式
             if current_game and current_game[1]:
                 try:
                     if selected_row == 1:  # 高尔夫球游戏特殊处理
@@ -175,6 +122,7 @@ def main(balance, user):
                 except Exception as e:
                     print(f"游戏运行出错: {e}")
                     time.sleep(2)
+                screen.invalidate()
             elif current_game and current_game[0] == 'return':
                 return balance  # 返回主目录
                 
@@ -0,0 +1,136 @@
+"""小游戏返还率（RTP）验证
+
+用 A_Tools/sampler 中与游戏相同的采样器大批量模拟回合，与按概率表算出的
+精确值对比（需要 numpy）：
+
+- rocket  飞天数字：自动兑现倍数 t 的 RTP = t × P(爆炸倍数 >= t)
+- stock   股票涨跌：200 次涨跌（每次 ±1%-10%，限制在 ±100%）后买涨/买跌的返还
+- keno    Keno：每种难度、每种选号数量的返还，与 keno_math 的超几何精确值对比
+
+用法:
+    python RTP_Check.py --game rocket --rounds 10000000
+    python RTP_Check.py --game all --workers 4
+"""
+import argparse
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+for path in (current_dir, a_tools_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from sampler import crash_sampler, crash_survival, draw_distinct_many
+
+ROCKET_MAX_MULTIPLIER = 1000000
+ROCKET_TARGETS = (1.1, 1.5, 2.0, 3.0, 5.0, 10.0, 100.0)
+STOCK_STEPS = 200          # 10 秒，每 0.05 秒一次
+STOCK_WIN_RATE = 0.95
+
+
+def _chunks(total, size):
+    while total > 0:
+        yield min(size, total)
+        total -= size
+
+
+# ------------------- 火箭 -------------------
+def rocket_chunk(rounds, seed):
+    boom = crash_sampler(ROCKET_MAX_MULTIPLIER).sample_many(rounds, seed)
+    return np.array([np.count_nonzero(boom >= t) for t in ROCKET_TARGETS], dtype=np.int64)
+
+
+def rocket_report(hits, rounds):
+    sampler = crash_sampler(ROCKET_MAX_MULTIPLIER)
+    lines = ["飞天数字（自动兑现）:", f"  {'目标':>8}{'模拟 RTP':>12}{'精确 RTP':>12}"]
+    for t, h in zip(ROCKET_TARGETS, hits):
+        lines.append(f"  {t:>8.2f}{t * h / rounds:>12.5f}{t * crash_survival(sampler, t):>12.5f}")
+    return "\n".join(lines)
+
+
+# ------------------- 股票 -------------------
+def stock_chunk(rounds, seed):
+    from stock_market import price_change_sampler
+
+    rng = np.random.default_rng(seed)
+    steps = price_change_sampler.sample_many(rounds * STOCK_STEPS, rng).reshape(rounds, STOCK_STEPS)
+    signs = np.where(rng.random((rounds, STOCK_STEPS)) < 0.5, 1, -1)
+    percent = np.zeros(rounds)
+    for i in range(STOCK_STEPS):
+        percent = np.clip(percent + signs[:, i] * steps[:, i], -100, 100)
+    up = np.where(percent > 0, 1 + percent / 100 * STOCK_WIN_RATE, np.maximum(0.0, 1 - np.abs(percent) / 100))
+    down = np.where(percent < 0, 1 + np.abs(percent) / 100 * STOCK_WIN_RATE, np.maximum(0.0, 1 - percent / 100))
+    return np.array([up.sum(), down.sum()])
+
+
+def stock_report(sums, rounds):
+    return f"股票涨跌:\n  买涨 RTP {sums[0] / rounds:.5f}\n  买跌 RTP {sums[1] / rounds:.5f}"
+
+
+# ------------------- Keno -------------------
+def keno_chunk(rounds, seed):
+    from keno_math import hit_counts
+
+    return hit_counts(draw_distinct_many(rounds, 1, 50, 10, seed))
+
+
+def keno_report(hits, rounds):
+    from keno import odds_easy, odds_medium, odds_difficult
+    from keno_math import rtp, simulated_rtp
+
+    tables = (odds_easy, odds_medium, odds_difficult)
+    lines = ["Keno（每注返还，模拟 / 精确）:", f"  {'选号':>4}{'简单':>18}{'中等':>18}{'困难':>18}"]
+    for n in range(1, 11):
+        cells = [f"{simulated_rtp(hits, t[n], n):.4f} / {rtp(t[n], n):.4f}" for t in tables]
+        lines.append(f"  {n:>4}" + "".join(f"{c:>18}" for c in cells))
+    return "\n".join(lines)
+
+
+GAMES = {
+    'rocket': (rocket_chunk, rocket_report),
+    'stock': (stock_chunk, stock_report),
+    'keno': (keno_chunk, keno_report),
+}
+
+
+def run_check(game, rounds, workers=None, chunk_size=1000000, seed=None):
+    chunk_func, report = GAMES[game]
+    base_seed = seed if seed is not None else secrets.randbits(32)
+    if game == 'stock':
+        chunk_size = max(1, chunk_size // STOCK_STEPS * 4)
+    total = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(chunk_func, size, base_seed + i)
+                   for i, size in enumerate(_chunks(rounds, chunk_size))]
+        for future in futures:
+            part = future.result()
+            total = part if total is None else total + part
+    return report(total, rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="小游戏返还率（RTP）验证")
+    parser.add_argument("--game", default="all", help=f"{', '.join(GAMES)} 或 all")
+    parser.add_argument("--rounds", type=int, default=10000000, help="模拟回合数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核心数）")
+    parser.add_argument("--chunk", type=int, default=1000000, help="每个任务的回合数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（可复现）")
+    args = parser.parse_args()
+
+    games = list(GAMES) if args.game == "all" else [args.game]
+    for game in games:
+        if game not in GAMES:
+            parser.error(f"未知游戏: {game}")
+        start = time.perf_counter()
+        print(run_check(game, args.rounds, args.workers, args.chunk, args.seed))
+        print(f"  {args.rounds:,} 回合，耗时 {time.perf_counter() - start:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
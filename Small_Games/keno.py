@@ -5,6 +5,15 @@ import json
 import os
 import time
 import math
+import sys
+
+# 定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from sampler import draw_distinct
 
 def get_data_file_path():
     # 用于获取保存数据的文件路径
@@ -450,11 +459,7 @@ class KenoGame:
         self.matches_var.set(f"匹配: 0 | 倍数: 0.0x")
         
         # 生成中奖号码
-        self.winning_numbers = []
-        while len(self.winning_numbers) < 10:
-            num = random.randint(1, 50)
-            if num not in self.winning_numbers:
-                self.winning_numbers.append(num)
+        self.winning_numbers = draw_distinct(1, 50, 10)
         
         # 开始抽奖动画
         self.draw_index = 0
@@ -0,0 +1,147 @@
+"""Keno 赔率表数学模块
+
+50 个号码开出 10 个，玩家选 n 个（1-10）。命中数服从超几何分布：
+    P(命中 k) = C(n, k) · C(50 - n, 10 - k) / C(50, 10)
+导入时预先算出每种选号数量的精确命中分布，据此给出每张赔率表的精确返还率（RTP）、
+方差和命中频率；另提供批量开奖生成器，在多进程中模拟数百万张彩票用于交叉验证。
+
+用法:
+    python keno_math.py                      # 精确 RTP
+    python keno_math.py --simulate 10000000  # 同时模拟验证
+"""
+import argparse
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import comb
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+POOL = 50
+DRAWN = 10
+MAX_PICKS = 10
+
+
+def hit_distribution(picks, pool=POOL, drawn=DRAWN):
+    """选 picks 个号码时命中 0..picks 个的精确概率（Fraction）"""
+    total = comb(pool, drawn)
+    return [Fraction(comb(picks, k) * comb(pool - picks, drawn - k), total) for k in range(picks + 1)]
+
+
+# HIT_DISTRIBUTION[n][k] = 选 n 个号码命中 k 个的概率
+HIT_DISTRIBUTION = {n: hit_distribution(n) for n in range(1, MAX_PICKS + 1)}
+
+
+def rtp(odds, picks):
+    """一种选号数量的精确返还率；odds[k] 为命中 k 个时的倍数（含本金）"""
+    return float(sum(p * Fraction(str(odds[k])) for k, p in enumerate(HIT_DISTRIBUTION[picks]) if k < len(odds)))
+
+
+def variance(odds, picks):
+    """每注返还的方差"""
+    dist = HIT_DISTRIBUTION[picks]
+    mean = sum(float(p) * odds[k] for k, p in enumerate(dist) if k < len(odds))
+    return sum(float(p) * (odds[k] - mean) ** 2 for k, p in enumerate(dist) if k < len(odds))
+
+
+def hit_frequency(odds, picks):
+    """有返还（倍数 > 0）的概率"""
+    return float(sum(p for k, p in enumerate(HIT_DISTRIBUTION[picks]) if k < len(odds) and odds[k] > 0))
+
+
+def table_report(table):
+    """{选号数量: (RTP, 方差, 命中频率)}"""
+    return {n: (rtp(odds, n), variance(odds, n), hit_frequency(odds, n)) for n, odds in table.items()}
+
+
+# ------------------- 批量模拟 -------------------
+def draw_batches(rounds, batch_size=1000000, rng=None):
+    """逐批生成 (batch, 10) 的开奖号码数组（需要 numpy）"""
+    import numpy as np
+    from sampler import draw_distinct_many
+
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    while rounds > 0:
+        size = min(batch_size, rounds)
+        yield draw_distinct_many(size, 1, POOL, DRAWN, rng)
+        rounds -= size
+
+
+def hit_counts(draws):
+    """统计一批开奖对每种选号数量的命中数直方图
+
+    由对称性，选号固定为 1..n 即可：命中数 = 开奖号码中 <= n 的个数。
+    返回 hits[n - 1][k]。
+    """
+    import numpy as np
+
+    hits = np.zeros((MAX_PICKS, MAX_PICKS + 1), dtype=np.int64)
+    for n in range(1, MAX_PICKS + 1):
+        matches = np.count_nonzero(draws <= n, axis=1)
+        hits[n - 1] = np.bincount(matches, minlength=MAX_PICKS + 1)[:MAX_PICKS + 1]
+    return hits
+
+
+def simulate_chunk(rounds, seed=None):
+    """工作进程：模拟 rounds 次开奖，返回命中直方图"""
+    total = None
+    for draws in draw_batches(rounds, rng=seed):
+        hits = hit_counts(draws)
+        total = hits if total is None else total + hits
+    return total
+
+
+def simulate(rounds, workers=None, chunk_size=1000000, seed=None):
+    """多进程模拟 rounds 次开奖，返回合并后的命中直方图"""
+    base_seed = seed if seed is not None else secrets.randbits(32)
+    sizes = []
+    while rounds > 0:
+        sizes.append(min(chunk_size, rounds))
+        rounds -= sizes[-1]
+    total = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for hits in pool.map(simulate_chunk, sizes, [base_seed + i for i in range(len(sizes))]):
+            total = hits if total is None else total + hits
+    return total
+
+
+def simulated_rtp(hits, odds, picks):
+    row = hits[picks - 1]
+    return sum(odds[k] * int(row[k]) for k in range(len(odds))) / int(row.sum())
+
+
+def main():
+    from keno import odds_easy, odds_medium, odds_difficult
+
+    parser = argparse.ArgumentParser(description="Keno 赔率表精确分析")
+    parser.add_argument("--simulate", type=int, default=0, help="模拟开奖次数（0 为不模拟）")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核心数）")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（可复现）")
+    args = parser.parse_args()
+
+    hits = None
+    if args.simulate:
+        start = time.perf_counter()
+        hits = simulate(args.simulate, args.workers, seed=args.seed)
+        print(f"模拟 {args.simulate:,} 次开奖，耗时 {time.perf_counter() - start:.1f} 秒")
+
+    for name, table in (("简单", odds_easy), ("中等", odds_medium), ("困难", odds_difficult)):
+        print(f"== {name}")
+        header = f"  {'选号':>4}{'RTP':>10}{'方差':>12}{'中奖率':>10}"
+        print(header + (f"{'模拟 RTP':>12}" if hits is not None else ""))
+        for n, (r, var, freq) in table_report(table).items():
+            line = f"  {n:>4}{r:>10.4%}{var:>12.2f}{freq:>10.4f}"
+            if hits is not None:
+                line += f"{simulated_rtp(hits, table[n], n):>12.4%}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
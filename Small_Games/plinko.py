@@ -67,6 +67,33 @@ class CircleButton(tk.Canvas):
         if self.command:
             self.command()
 
+class PegGrid:
+    """钉子的均匀网格空间索引
+
+    每个格子记录落在其中的钉子下标；查询时只检查弹珠所在格子及周围 8 格，
+    返回的下标按原钉子顺序排列，碰撞顺序与逐个遍历时一致。
+    """
+    def __init__(self, pegs, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        for index, (x, y) in enumerate(pegs):
+            key = (int(x // cell_size), int(y // cell_size))
+            self.cells.setdefault(key, []).append(index)
+
+    def nearby(self, x, y):
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        found = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                indices = self.cells.get((gx, gy))
+                if indices:
+                    found.extend(indices)
+        if len(found) > 1:
+            found.sort()
+        return found
+
+
 class PlinkoGame:
     def __init__(self, root, initial_balance, username):
         self.root = root
@@ -91,6 +118,8 @@ class PlinkoGame:
         self.history = deque(maxlen=8)  # 存储最近8次结果
         self.last_payouts = []  # 存储最近弹珠的赔率信息
         self.pegs = []  # 存储所有钉子的位置
+        self.peg_grid = None  # 钉子的空间索引（随画布尺寸重建）
+        self.peg_layout_size = None  # 上次计算钉子位置时的画布尺寸
         self.active_balls = 0  # 当前活动弹珠数量
         
         # 定义赔率 - 使用指定的赔率设置
@@ -101,6 +130,8 @@ class PlinkoGame:
         }
         
         # 物理参数
+        self.ball_radius = 8
+        self.peg_radius = 5
         self.gravity = 0.5
         self.damping = 0.8
         self.elasticity = 0.8
@@ -402,6 +433,23 @@ class PlinkoGame:
         if width < 100 or height < 100:
             return
         
+        # 只有画布尺寸变化时才重新计算钉子位置和空间索引
+        if self.peg_layout_size != (width, height):
+            self.layout_pegs(width, height)
+        
+        peg_radius = self.peg_radius
+        for x, y in self.pegs:
+            # 绘制钉子
+            self.board_canvas.create_oval(
+                x - peg_radius, 
+                y - peg_radius,
+                x + peg_radius, 
+                y + peg_radius,
+                fill="#ffffff", outline="#aaaaaa"
+            )
+    
+    def layout_pegs(self, width, height):
+        """计算钉子位置并重建空间索引"""
         # 金字塔顶部
         top_width = 50
         top_y = 100
@@ -412,7 +460,6 @@ class PlinkoGame:
         
         # 总行数：8行（对应9个槽位）
         rows = 8
-        peg_radius = 5
         
         # 每行钉子数量（对应槽位布局）
         pegs_per_row = [1, 2, 3, 4, 5, 6, 7, 8]  # 每行钉子数量
@@ -431,7 +478,6 @@ class PlinkoGame:
             # 获取当前行钉子数量
             peg_count = pegs_per_row[row]
             
-            # 绘制当前行的钉子
             for i in range(peg_count):
                 # 计算钉子的x位置（均匀分布）
                 spacing = current_width / (peg_count + 1)
@@ -439,15 +485,11 @@ class PlinkoGame:
                 
                 # 存储钉子位置
                 self.pegs.append((x, y))
-                
-                # 绘制钉子
-                self.board_canvas.create_oval(
-                    x - peg_radius, 
-                    y - peg_radius,
-                    x + peg_radius, 
-                    y + peg_radius,
-                    fill="#ffffff", outline="#aaaaaa"
-                )
+        
+        # 格子边长取碰撞距离的 2.5 倍：周围 3x3 格能覆盖碰撞后被推开的位置
+        cell_size = (self.ball_radius + self.peg_radius) * 2.5
+        self.peg_grid = PegGrid(self.pegs, cell_size)
+        self.peg_layout_size = (width, height)
     
     def draw_slots(self, width, height):
         """绘制底部槽位和赔率（凹形设计）"""
@@ -737,28 +779,26 @@ class PlinkoGame:
             new_x = max_x
             ball['vx'] = -ball['vx'] * self.damping
         
-        # 钉子碰撞检测
-        ball_radius = 8
-        peg_radius = 5
+        # 钉子碰撞检测：只检查附近格子中的钉子，未碰撞时不开平方
+        hit_dist = self.ball_radius + self.peg_radius
+        hit_dist_sq = hit_dist * hit_dist
+        pegs = self.pegs
         
-        for peg in self.pegs:
-            px, py = peg
-            # 计算弹珠与钉子的距离
-            dist = math.sqrt((new_x - px)**2 + (new_y - py)**2)
+        for index in self.peg_grid.nearby(new_x, new_y) if self.peg_grid else ():
+            px, py = pegs[index]
+            dx = new_x - px
+            dy = new_y - py
+            dist_sq = dx*dx + dy*dy
             
             # 如果发生碰撞
-            if dist <= ball_radius + peg_radius:
-                # 计算碰撞方向向量
-                dx = new_x - px
-                dy = new_y - py
-                
-                if dx == 0 and dy == 0:
+            if dist_sq <= hit_dist_sq:
+                if dist_sq == 0:
                     continue
                 
-                # 单位化向量
-                length = math.sqrt(dx*dx + dy*dy)
-                nx = dx / length
-                ny = dy / length
+                # 单位化碰撞方向向量
+                dist = math.sqrt(dist_sq)
+                nx = dx / dist
+                ny = dy / dist
                 
                 # 计算碰撞后的速度
                 dot_product = ball['vx'] * nx + ball['vy'] * ny
@@ -770,7 +810,7 @@ class PlinkoGame:
                 ball['vy'] *= self.damping
                 
                 # 调整位置防止陷入钉子
-                overlap = (ball_radius + peg_radius) - dist
+                overlap = hit_dist - dist
                 new_x += nx * overlap * 1.1
                 new_y += ny * overlap * 1.1
                 
@@ -808,6 +848,46 @@ class PlinkoGame:
         update_balance_in_json(self.username, self.balance)
         self.root.destroy()
 
+def run_collision_benchmark(ball_counts=(1, 50, 200), frames=300, width=1000, height=650):
+    """无界面基准：统计不同同时弹珠数量下每帧物理更新耗时（含全量遍历对比）"""
+    game = PlinkoGame.__new__(PlinkoGame)
+    game.ball_radius = 8
+    game.peg_radius = 5
+    game.gravity = 0.5
+    game.damping = 0.8
+    game.risk_level = "1"
+    game.payouts = {"1": [5.6, 2.1, 1.1, 1, 0.5, 1, 1.1, 2.1, 5.6]}
+    game.peg_layout_size = None
+    game.layout_pegs(width, height)
+    grid = game.peg_grid
+    # 格子足够大时所有钉子落在同一格，相当于逐个遍历全部钉子
+    full_scan = PegGrid(game.pegs, cell_size=float(width * height))
+
+    def new_ball():
+        x = width // 2 + random.uniform(-3, 3)
+        return {'x': x, 'y': 100, 'vx': 0.0, 'vy': 0.0, 'positions': [(x, 100)],
+                'color': '#ffffff', 'finished': False, 'slot': None, 'payout': None}
+
+    print(f"钉子数量: {len(game.pegs)}，帧数: {frames}")
+    for count in ball_counts:
+        results = []
+        for name, index in (("空间索引", grid), ("全量遍历", full_scan)):
+            game.peg_grid = index
+            game.last_payouts = []
+            random.seed(count)
+            balls = [new_ball() for _ in range(count)]
+            start = time.perf_counter()
+            for _ in range(frames):
+                for i, ball in enumerate(balls):
+                    game.update_ball_position(ball, width, height)
+                    if ball['finished']:
+                        balls[i] = new_ball()
+            elapsed = (time.perf_counter() - start) / frames
+            results.append(f"{name} {elapsed * 1000:.3f} ms/帧")
+        print(f"{count:>4} 颗弹珠: " + "，".join(results))
+    game.peg_grid = grid
+
+
 def main(initial_balance, username):
     """供small_games.py调用的主函数"""
     root = tk.Tk()
@@ -817,6 +897,10 @@ def main(initial_balance, username):
     return game.balance
 
 if __name__ == "__main__":
+    import sys
+    if "--benchmark" in sys.argv:
+        run_collision_benchmark()
+        sys.exit(0)
     # 单独运行时的测试代码
     root = tk.Tk()
     # 使用测试余额和用户名
@@ -6,6 +6,15 @@ import os
 import time
 import math
 import threading
+import sys
+
+# 定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from sampler import crash_sampler
 
 def get_data_file_path():
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), '../saving_data.json')
@@ -393,24 +402,11 @@ class RocketGame:
         self.balance_var.set(f"${self.balance:.2f}")
         
     def generate_probability_table(self, max_multiplier, C=100, k=1.5):
-        probability_table = []
-        multiplier = 1.01
-        while multiplier <= max_multiplier:
-            prob = C / (multiplier ** k)
-            probability_table.append((round(multiplier, 2), prob))
-            multiplier += 0.01 if multiplier < 2 else 0.1 if multiplier < 10 else 1
-        total_prob = sum(prob for _, prob in probability_table)
-        probability_table = [(m, (p / total_prob) * 100) for m, p in probability_table]
-        return probability_table
+        """爆炸倍数采样器（长尾用逆 CDF 抽取，建立只需几毫秒，不必预先在后台建表）"""
+        return crash_sampler(max_multiplier, C, k)
     
     def generate_boom_multiplier(self, probability_table):
-        random_number = random.uniform(0, 100)
-        cumulative_probability = 0
-        for multiplier, prob in probability_table:
-            cumulative_probability += prob
-            if random_number <= cumulative_probability:
-                return multiplier
-        return probability_table[-1][0]
+        return probability_table.sample()
     
     def start_game(self):
         if self.current_bet <= 0:
@@ -2,17 +2,18 @@ import json
 import os
 import time
 import sys
-import unicodedata
 
 # 让本文件可直接运行时，也能找到上层项目路径
 if __name__ == "__main__" and __package__ is None:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 只在 Unix-like 系统上导入这些模块
-if os.name != 'nt':  # 不是 Windows 系统
-    import select
-    import termios
-    import tty
+# 将A_Tools目录添加到系统路径（终端菜单渲染与按键输入）
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+from term_ui import GridMenu, screen, display_width
+from key_input import get_key, release as release_keys
 
 ## Small games import
 from Small_Games import ChickenCrossing_tk
@@ -55,131 +56,9 @@ def update_balance_in_json(username, new_balance):
             break
     save_user_data(users)  # 保存更新后的数据
 
-def display_width(s):
-    width = 0
-    for ch in s:
-        ea = unicodedata.east_asian_width(ch)
-        if ea in ('F', 'W'):  # Fullwidth, Wide
-            width += 2
-        elif ea in ('Na', 'H', 'N', 'A'):  # Narrow, Halfwidth, Neutral, Ambiguous
-            # 对于 Ambiguous 通常按 1 处理（视终端而定）
-            width += 1
-        else:
-            width += 1
-    return width
-
-def pad_game_name(name, width, highlight=False):
-    """将游戏名格式化为固定显示宽度，左对齐，可选高亮（反色）"""
-    name_width = display_width(name)
-    padding = ' ' * (width - name_width)
-    if highlight:
-        # 反色显示
-        return f"\033[7m{name}\033[0m{padding}"
-    else:
-        return name + padding
-
-def display_menu(sections, selected_row, selected_col, fixed_width):
-    """显示分类菜单，选中项根据全局行列高亮，使用固定列宽"""
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(" 欢迎来到街机小游戏中心!\n")
-    print("请使用方向键选择游戏，回车确认(ESC返回主目录):\n")
-
-    current_global_idx = 0  # 当前输出的全局游戏行索引
-    interval = 2  # 列之间的空格数
-
-    for section_title, rows in sections:
-        if not rows:
-            continue
-
-        # 该分类的最大列数
-        max_cols = max(len(row) for row in rows)
-
-        # 计算标题线的总宽度
-        total_width = max_cols * fixed_width + (max_cols - 1) * interval
-
-        # 生成标题线
-        title = section_title
-        title_width = display_width(title)
-        left_eq = (total_width - title_width) // 2
-        right_eq = total_width - title_width - left_eq
-        title_line = '=' * left_eq + title + '=' * right_eq
-        print(title_line)
-
-        # 输出该分类下的所有游戏行
-        for row in rows:
-            line_parts = []
-            for col in range(max_cols):
-                if col < len(row):
-                    game_name = row[col]
-                    # 判断当前游戏是否为选中项
-                    is_selected = (current_global_idx == selected_row and col == selected_col)
-                else:
-                    game_name = ""
-                    is_selected = False
-                # 格式化游戏名（固定宽度）
-                part = pad_game_name(game_name, fixed_width, highlight=is_selected)
-                line_parts.append(part)
-            # 用两个空格连接各列
-            line = '  '.join(line_parts)
-            print(line)
-            current_global_idx += 1
-        print()  # 分类间空一行
-
-def get_key():
-    """跨平台获取键盘按键"""
-    # Windows系统
-    if os.name == 'nt':
-        import msvcrt
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch()
-                if key == b'\xe0':  # 扩展键（方向键）
-                    key = msvcrt.getch()
-                    if key == b'H': return 'up'
-                    elif key == b'P': return 'down'
-                    elif key == b'K': return 'left'
-                    elif key == b'M': return 'right'
-                elif key == b'\r':  # 回车键
-                    return 'enter'
-                elif key == b'\x1b':  # ESC键
-                    return 'esc'
-                elif key == b'0':
-                    return '0'
-                else:
-                    return key
-            time.sleep(0.05)  # 减少CPU占用
-    
-    # Unix-like系统 (Mac/Linux)
-    else:
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                if key == '\x1b':  # 可能是方向键
-                    # 读取接下来的字符
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        rest = sys.stdin.read(2)
-                        if rest == '[A':  # 上箭头
-                            return 'up'
-                        elif rest == '[B':  # 下箭头
-                            return 'down'
-                        elif rest == '[C':  # 右箭头
-                            return 'right'
-                        elif rest == '[D':  # 左箭头
-                            return 'left'
-                    else:
-                        return 'esc'  # ESC键
-                elif key == '\r':  # 回车键
-                    return 'enter'
-                elif key == '0':
-                    return '0'
-                else:
-                    return key
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return None
+def display_menu(menu, selected_row, selected_col):
+    """显示分类菜单，选中项根据全局行列高亮；布局由 GridMenu 预先计算，只重绘变化的行"""
+    screen.render(menu.lines(selected_row, selected_col))
 
 def main(balance, user):
     # ========== 定义菜单结构（分类 + 游戏行） ==========
@@ -234,15 +113,23 @@ def main(balance, user):
     max_width = max(display_width(name) for name in all_game_names)
     fixed_col_width = max(max_width, 12)     # 固定列宽
 
+    # 菜单布局只计算一次（每个分类的标题线按该分类自身宽度）
+    menu = GridMenu(
+        [" 欢迎来到街机小游戏中心!", "", "请使用方向键选择游戏，回车确认(ESC返回主目录):", ""],
+        sections, fixed_col_width, uniform_titles=False
+    )
+
     # 初始选中位置
     selected_row = 0
     selected_col = 0
+    screen.invalidate()
 
     while True:
         # 显示菜单（根据分类 + 高亮选中项）
-        display_menu(sections, selected_row, selected_col, fixed_col_width)
+        display_menu(menu, selected_row, selected_col)
 
         key = get_key()
+        screen.mark_input()
 
         # 上下左右移动逻辑（支持边界循环）
         if key == 'up':
@@ -288,6 +175,7 @@ def main(balance, user):
                 selected_col = 0
 
         elif key == 'enter':
+            release_keys()  # 运行游戏/输入前恢复终端模式
             # 获取当前选中的游戏名称
             _, _, row_games = global_rows[selected_row]
             game_name = row_games[selected_col]
@@ -305,6 +193,7 @@ def main(balance, user):
                 except Exception as e:
                     print(f"游戏运行出错: {e}")
                     time.sleep(2)
+                screen.invalidate()
 
         elif key == '0' or key == 'esc':
             return balance
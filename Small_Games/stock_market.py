@@ -6,6 +6,16 @@ import os
 import time
 import math
 from datetime import datetime
+import sys
+
+# 定位到A_Tools文件夹
+current_dir = os.path.dirname(os.path.abspath(__file__))
+a_tools_dir = os.path.join(os.path.dirname(current_dir), 'A_Tools')
+if a_tools_dir not in sys.path:
+    sys.path.append(a_tools_dir)
+
+from sampler import AliasSampler, cumulative_scan_weights
+import rng_provider  # 设置 CASINO_SEED 时用固定种子初始化全局 random，行情可复现
 
 def get_data_file_path():
     # 用于获取保存数据的文件路径
@@ -100,6 +110,9 @@ price_changes = {
     10: 0.03   # 10% 变动
 }
 
+# 按原先“累计概率逐项比较”的实际概率建立别名表
+price_change_sampler = AliasSampler(*cumulative_scan_weights(price_changes))
+
 class CircleButton(tk.Canvas):
     """自定义圆形按钮"""
     def __init__(self, master, text, bg_color, fg_color, command=None, radius=30, 
@@ -934,15 +947,7 @@ class StockMarketGame:
         direction = random.choice(['up', 'down'])  # 50%上涨，50%下跌
 
         # 根据概率分布选择涨跌幅度
-        rand_val = random.random()
-        cumulative_prob = 0
-        change_percent = 1  # 默认1%
-
-        for percent, prob in price_changes.items():
-            cumulative_prob += prob
-            if rand_val <= cumulative_prob:
-                change_percent = percent
-                break
+        change_percent = price_change_sampler.sample()
 
         # 应用涨跌方向
         if direction == 'down':
@@ -0,0 +1,245 @@
+"""基准测试用例
+
+每个用例是一个 setup 函数，返回 (被测函数, 每次调用包含的操作数)；准备数据、临时文件、
+猴子补丁都在 setup 里做，计时只包含被测函数本身。写文件的用例全部改到临时目录，
+不会碰到 saving_data.json 和 A_Logs 里的真实记录。
+
+needs_tk=True 的用例要画布，没有显示器时跳过（可用 xvfb-run 或 --xvfb 运行）。
+"""
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+A_TOOLS_DIR = os.path.join(PROJECT_ROOT, "A_Tools")
+for path in (PROJECT_ROOT, A_TOOLS_DIR, os.path.join(A_TOOLS_DIR, "Card")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+SEED = 20240601
+CASES = {}
+
+# find_best_5 / evaluate_hand 的各个副本（规则相同，写法略有差异）
+BEST5_MODULES = [
+    "Auto_Stud_Poker", "Auto_Texas_Holdem", "Casino_Holdem", "Heads_Up_Holdem",
+    "Let_It_Ride", "Mississippi_Stud_Poker", "Ultimate_Texas_Holdem",
+]
+EVALUATE_MODULES = BEST5_MODULES + ["Ultimate_Omaha_Holdem"]
+HAND_BATCH = 200
+# 写文件、读系统熵源的用例受磁盘和系统负载影响大，阈值放宽
+IO_THRESHOLD = 2.0
+
+_tempdir = None
+
+
+def case(name, group, needs_tk=False, threshold=None, slow=False):
+    """注册用例；threshold 为该用例允许的相对基线变慢倍数（默认见 run_benchmarks），
+    slow 的用例只跑一轮，--quick 时跳过"""
+    def register(setup):
+        CASES[name] = SimpleNamespace(name=name, group=group, setup=setup, needs_tk=needs_tk,
+                                      threshold=threshold, slow=slow)
+        return setup
+    return register
+
+
+def game(module_name):
+    return importlib.import_module(f"Casino_Games.{module_name}")
+
+
+def temp_path(name):
+    """本次运行共用的临时目录下的文件路径"""
+    global _tempdir
+    if _tempdir is None:
+        _tempdir = tempfile.TemporaryDirectory(prefix="casino_bench_")
+    return os.path.join(_tempdir.name, name)
+
+
+def random_hands(module, size, count=HAND_BATCH, jokers=False):
+    """用 module 自己的 Card 类随机发 count 手牌（固定种子，每次运行相同）"""
+    rng = random.Random(SEED + size)
+    deck = [module.Card(s, r) for s in module.SUITS for r in module.RANKS]
+    if jokers:
+        deck.append(module.Card('JOKER', 'JOKER'))
+    return [rng.sample(deck, size) for _ in range(count)]
+
+
+# ----------------------------------------------------------------------
+# 洗牌
+# ----------------------------------------------------------------------
+def _shuffle_case(deck_count):
+    def setup():
+        shuffle = importlib.import_module("shuffle")
+        return (lambda: shuffle.generate_shuffled_deck(False, deck_count)), 1
+    return setup
+
+
+for _decks in (1, 2, 6, 8):
+    case(f"shuffle.generate_shuffled_deck[{_decks} deck]", "shuffle", threshold=IO_THRESHOLD)(_shuffle_case(_decks))
+
+
+@case("random_stream.shuffle_shoe[8 deck]", "shuffle")
+def _stream_shoe():
+    random_stream = importlib.import_module("random_stream")
+    deck = list(range(52))
+    return (lambda: random_stream.shuffle_shoe(deck, 8)), 1
+
+
+@case("random_stream.roll_dice[10000]", "shuffle")
+def _stream_dice():
+    random_stream = importlib.import_module("random_stream")
+    return (lambda: random_stream.roll_dice(10_000)), 1
+
+
+# ----------------------------------------------------------------------
+# 牌力评估
+# ----------------------------------------------------------------------
+def _evaluate_case(module_name):
+    def setup():
+        module = game(module_name)
+        hands = random_hands(module, 5)
+        evaluate = module.evaluate_hand
+        return (lambda: [evaluate(h) for h in hands]), len(hands)
+    return setup
+
+
+def _best5_case(module_name):
+    def setup():
+        module = game(module_name)
+        hands = random_hands(module, 7)
+        find_best_5 = module.find_best_5
+        return (lambda: [find_best_5(h) for h in hands]), len(hands)
+    return setup
+
+
+for _name in EVALUATE_MODULES:
+    case(f"{_name}.evaluate_hand[5 cards]", "evaluator")(_evaluate_case(_name))
+for _name in BEST5_MODULES:
+    case(f"{_name}.find_best_5[7 cards]", "evaluator")(_best5_case(_name))
+
+
+@case("poker_eval.evaluate[7 cards]", "evaluator")
+def _poker_eval():
+    poker_eval = importlib.import_module("poker_eval")
+    rng = random.Random(SEED)
+    hands = [rng.sample(range(52), 7) for _ in range(HAND_BATCH)]
+    evaluate = poker_eval.evaluate
+    return (lambda: [evaluate(h) for h in hands]), len(hands)
+
+
+@case("DJ_Wild.best_hand_with_wildcards[random 5]", "evaluator")
+def _dj_wild_random():
+    module = game("DJ_Wild")
+    hands = random_hands(module, 5, jokers=True)
+    best = module.best_hand_with_wildcards
+    return (lambda: [best(h) for h in hands]), len(hands)
+
+
+@case("DJ_Wild.best_hand_with_wildcards[2 wild]", "evaluator")
+def _dj_wild_two():
+    # 两张万能牌要枚举 13^2 种点数组合，是常见情况里最慢的
+    module = game("DJ_Wild")
+    rng = random.Random(SEED)
+    plain = [module.Card(s, r) for s in module.SUITS for r in module.RANKS if r != '2']
+    hands = [rng.sample(plain, 3) + [module.Card('JOKER', 'JOKER'), module.Card(module.SUITS[0], '2')]
+             for _ in range(20)]
+    best = module.best_hand_with_wildcards
+    return (lambda: [best(h) for h in hands]), len(hands)
+
+
+@case("Pai_Gow_Poker.dealer_way_split[7 cards]", "evaluator")
+def _pai_gow_split():
+    module = game("Pai_Gow_Poker")
+    hands = random_hands(module, 7, jokers=True)
+    split = module.dealer_way_split
+    return (lambda: [split(h) for h in hands]), len(hands)
+
+
+# ----------------------------------------------------------------------
+# 存档 / 历史记录
+# ----------------------------------------------------------------------
+@case("Roulette_Europe.RouletteHistory.add_result", "persistence", threshold=IO_THRESHOLD)
+def _roulette_history():
+    module = game("Roulette_Europe")
+    path = temp_path("Roulette_Europe.json")
+    history = module.RouletteHistory(path)
+    rng = random.Random(SEED)
+    # 先填满两个记录区，每次写入的文件大小与长期使用后相同
+    entries = [{"result": r, "color": module.roulette_color(r)}
+               for r in (rng.choice(module.ROULETTE_SEQUENCE) for _ in range(history.RECORD2_MAX))]
+    history.data[history.RECORD1_KEY] = history._ordered_list_to_record(entries[:history.RECORD1_MAX])
+    history.data[history.RECORD2_KEY] = history._ordered_list_to_record(entries)
+    history._reorder_and_save()
+    return (lambda: history.add_result(rng.choice(module.ROULETTE_SEQUENCE))), 1
+
+
+@case("Sicbo.shift_and_insert_record", "persistence", threshold=IO_THRESHOLD)
+def _sicbo_record():
+    module = game("Sicbo")
+    rng = random.Random(SEED)
+    stub = SimpleNamespace(history_file=temp_path("Sicbo.json"), history_data={
+        "500_Record": {f"{i:02d}_Data": sorted(rng.randint(1, 6) for _ in range(3))
+                       for i in range(1, module.MAX_RECORDS + 1)},
+    })
+    stub.save_history_data = lambda: module.SicboGame.save_history_data(stub)
+    shift = module.SicboGame.shift_and_insert_record
+    return (lambda: shift(stub, sorted(rng.randint(1, 6) for _ in range(3)))), 1
+
+
+def _balance_case(users):
+    def setup():
+        module = game("Baccarat")
+        path = temp_path(f"saving_data_{users}.json")
+        data = [{"user_name": f"user{i:07d}", "password": f"password{i:07d}",
+                 "cash": f"{1000 + i:.2f}", "lock": "False"} for i in range(users)]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        module.get_data_file_path = lambda: path
+        target = f"user{users - 1:07d}"     # 最后一个用户：线性查找的最坏情况
+        balance = [1000.0]
+
+        def run():
+            balance[0] += 1
+            module.update_balance_in_json(target, balance[0])
+        return run, 1
+    return setup
+
+
+for _users in (10, 10_000):
+    case(f"update_balance_in_json[{_users} users]", "persistence", threshold=IO_THRESHOLD)(_balance_case(_users))
+case("update_balance_in_json[1000000 users]", "persistence", threshold=IO_THRESHOLD, slow=True)(_balance_case(1_000_000))
+
+
+# ----------------------------------------------------------------------
+# 画布重绘
+# ----------------------------------------------------------------------
+def _bigroad_results(count, sides):
+    rng = random.Random(SEED + count)
+    return [{"winner": rng.choices(sides + ("Tie",), (0.458, 0.446, 0.096))[0]} for _ in range(count)]
+
+
+def _bigroad_case(module_name, gui_class, sides, results, max_cols):
+    def setup(root):
+        import tkinter as tk
+        module = game(module_name)
+        canvas = tk.Canvas(root, width=max_cols * 27 + 40, height=6 * 27 + 30)
+        canvas.pack()
+        stub = SimpleNamespace(bigroad_canvas=canvas, bigroad_results=_bigroad_results(results, sides),
+                               _max_rows=6, _max_cols=max_cols, _bigroad_occupancy=[])
+        update = getattr(module, gui_class)._update_bigroad
+
+        def run():
+            update(stub)
+            canvas.update_idletasks()
+        return run, 1
+    return setup
+
+
+for _results in (60, 400):
+    case(f"Baccarat._update_bigroad[{_results} results]", "render", needs_tk=True)(
+        _bigroad_case("Baccarat", "BaccaratGUI", ("Banker", "Player"), _results, 50))
+    case(f"Dragon_Tiger._update_bigroad[{_results} results]", "render", needs_tk=True)(
+        _bigroad_case("Dragon_Tiger", "DragonTigerGUI", ("Dragon", "Tiger"), _results, 150))
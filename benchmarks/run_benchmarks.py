@@ -0,0 +1,229 @@
+"""运行基准测试并与基线比较
+
+    python benchmarks/run_benchmarks.py                 # 全部用例，与 benchmarks/baseline.json 比较
+    python benchmarks/run_benchmarks.py -k evaluate_hand --quick
+    python benchmarks/run_benchmarks.py --save          # 把本次结果写成新基线
+    xvfb-run python benchmarks/run_benchmarks.py        # 没有显示器时也跑画布用例（或加 --xvfb）
+
+每个用例先试跑一次估算耗时，再按 --min-time 定每轮调用次数，重复 --repeat 轮；
+比较用每次操作的最短耗时（噪声最小）。比基线慢超过阈值（默认 1.25 倍，基线文件里
+可按用例单独设置）记为退化，此时退出码为 1。基线只在同一台机器、同一 Python 版本下
+有比较意义，版本不同时会给出提示。
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from cases import CASES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 1.25
+
+
+def environment():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(terse=True), "machine": platform.machine()}
+
+
+def start_xvfb():
+    """没有 DISPLAY 且装了 Xvfb 时启动一个虚拟显示，返回进程（用完需 terminate）"""
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        proc = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(0.5)
+        if proc.poll() is None:
+            os.environ["DISPLAY"] = f":{number}"
+            return proc
+    return None
+
+
+class TkRoot:
+    """画布用例共用的隐藏窗口；没有显示器时 root 为 None"""
+    def __init__(self):
+        self.root = None
+        self.error = None
+        self._tried = False
+
+    def get(self):
+        if not self._tried:
+            self._tried = True
+            try:
+                import tkinter as tk
+                self.root = tk.Tk()
+                self.root.withdraw()
+            except Exception as e:     # TclError（无显示器）或没有 tkinter
+                self.error = str(e).splitlines()[0]
+        return self.root
+
+    def reset(self):
+        """清掉上一个用例留下的控件"""
+        if self.root is not None:
+            for child in self.root.winfo_children():
+                child.destroy()
+
+
+def measure(func, ops, min_time, repeat):
+    """返回 {min_s, median_s, max_s}（每次操作的秒数）与每轮调用次数"""
+    start = time.perf_counter()
+    func()
+    once = max(time.perf_counter() - start, 1e-9)
+    number = max(1, int(min_time / once))
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number / ops)
+    return {"min_s": min(rounds), "median_s": statistics.median(rounds), "max_s": max(rounds),
+            "ops": ops, "calls_per_round": number, "rounds": repeat}
+
+
+def run_cases(selected, args, tk_root):
+    results, skipped = {}, {}
+    for bench in selected:
+        if bench.needs_tk:
+            root = tk_root.get()
+            if root is None:
+                skipped[bench.name] = f"没有显示器: {tk_root.error}"
+                continue
+            tk_root.reset()
+            func, ops = bench.setup(root)
+        else:
+            func, ops = bench.setup()
+        repeat = 1 if bench.slow else args.repeat
+        stats = measure(func, ops, args.min_time, repeat)
+        stats["group"] = bench.group
+        results[bench.name] = stats
+        print(f"  {bench.name:<52} {format_time(stats['min_s']):>10} /op"
+              f"  (中位 {format_time(stats['median_s'])}, {stats['calls_per_round']}×{repeat})", flush=True)
+    return results, skipped
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, default_threshold):
+    """返回 [(用例, 当前/基线 倍数, 阈值, 是否退化)]，基线里没有的用例不比较"""
+    rows = []
+    for name, stats in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        threshold = base.get("threshold") or CASES[name].threshold or default_threshold
+        ratio = stats["min_s"] / base["min_s"] if base["min_s"] else 1.0
+        rows.append((name, ratio, threshold, ratio > threshold))
+    return rows
+
+
+def save_baseline(path, results, previous, default_threshold):
+    """写入基线；保留旧基线里手工设置的阈值和本次没跑的用例"""
+    cases = dict(previous.get("cases", {})) if previous else {}
+    for name, stats in results.items():
+        entry = {"group": stats["group"], "min_s": stats["min_s"], "median_s": stats["median_s"], "ops": stats["ops"]}
+        threshold = (cases.get(name) or {}).get("threshold") or CASES[name].threshold
+        if threshold:
+            entry["threshold"] = threshold
+        cases[name] = entry
+    payload = {
+        "environment": environment(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "default_threshold": (previous or {}).get("default_threshold", default_threshold),
+        "cases": dict(sorted(cases.items())),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="赌场游戏基准测试")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="只跑名称包含该字符串的用例（可多次指定）")
+    parser.add_argument("--group", action="append", choices=sorted({c.group for c in CASES.values()}),
+                        help="只跑指定分组")
+    parser.add_argument("--quick", action="store_true", help="跳过很慢的用例（如 100 万用户存档）")
+    parser.add_argument("--list", action="store_true", help="只列出用例")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="把结果写入基线文件")
+    parser.add_argument("--output", help="另外把本次结果写到该 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="默认退化阈值（倍数）")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最短计时秒数")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--xvfb", action="store_true", help="没有显示器时尝试启动 Xvfb")
+    args = parser.parse_args(argv)
+
+    selected = [c for c in CASES.values()
+                if (not args.filter or any(f in c.name for f in args.filter))
+                and (not args.group or c.group in args.group)
+                and not (args.quick and c.slow)]
+    if args.list:
+        for c in selected:
+            print(f"{c.group:<12} {c.name}{'  [Tk]' if c.needs_tk else ''}{'  [slow]' if c.slow else ''}")
+        return 0
+
+    xvfb = start_xvfb() if args.xvfb else None
+    tk_root = TkRoot()
+    try:
+        print(f"运行 {len(selected)} 个用例（Python {platform.python_version()}）")
+        results, skipped = run_cases(selected, args, tk_root)
+    finally:
+        if tk_root.root is not None:
+            tk_root.root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+
+    for name, reason in skipped.items():
+        print(f"  跳过 {name}: {reason}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "cases": results, "skipped": skipped},
+                      f, ensure_ascii=False, indent=2)
+
+    baseline = load_baseline(args.baseline)
+    status = 0
+    if baseline and not args.save:
+        if baseline.get("environment", {}).get("python") != platform.python_version():
+            print(f"注意：基线来自 Python {baseline.get('environment', {}).get('python')}，结果仅供参考")
+        rows = compare(results, baseline, baseline.get("default_threshold", args.threshold))
+        regressions = [row for row in rows if row[3]]
+        print(f"\n与基线比较（{len(rows)} 个用例）：")
+        for name, ratio, threshold, regressed in rows:
+            mark = "退化" if regressed else ("变快" if ratio < 1 / threshold else "")
+            print(f"  {name:<52} {ratio:>6.2f}x  (阈值 {threshold:.2f}x) {mark}")
+        if regressions:
+            print(f"\n{len(regressions)} 个用例比基线慢超过阈值")
+            status = 1
+    elif not baseline and not args.save:
+        print(f"\n没有基线文件 {args.baseline}，可加 --save 生成")
+
+    if args.save:
+        save_baseline(args.baseline, results, baseline, args.threshold)
+        print(f"\n基线已写入 {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
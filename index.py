@@ -5,11 +5,11 @@ import time
 import sys
 import getpass  # 用于安全输入密码
 
-# 只在 Unix-like 系统上导入这些模块
-if os.name != 'nt':  # 不是 Windows 系统
-    import select
-    import termios
-    import tty
+# 终端菜单渲染与按键输入（A_Tools）
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'A_Tools'))
+from term_ui import screen
+from key_input import get_key, release as release_keys
+import term_ui
 
 # Account Setting
 import register
@@ -35,85 +35,17 @@ def save_user_data(users):
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(users, f, ensure_ascii=False, indent=4)
 
-def get_key():
-    """跨平台获取键盘按键"""
-    # Windows系统
-    if os.name == 'nt':
-        import msvcrt
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch()
-                if key == b'\xe0':  # 扩展键（方向键）
-                    key = msvcrt.getch()
-                    if key == b'H': return 'up'
-                    elif key == b'P': return 'down'
-                    elif key == b'K': return 'left'
-                    elif key == b'M': return 'right'
-                elif key == b'\r':  # 回车键
-                    return 'enter'
-                elif key == b'\x1b':  # ESC键
-                    return 'esc'
-                elif key == b'0':
-                    return '0'
-                else:
-                    return key
-            time.sleep(0.05)  # 减少CPU占用
-    
-    # Unix-like系统 (Mac/Linux)
-    else:
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                if key == '\x1b':  # 可能是方向键
-                    # 读取接下来的字符
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        rest = sys.stdin.read(2)
-                        if rest == '[A':  # 上箭头
-                            return 'up'
-                        elif rest == '[B':  # 下箭头
-                            return 'down'
-                        elif rest == '[C':  # 右箭头
-                            return 'right'
-                        elif rest == '[D':  # 左箭头
-                            return 'left'
-                    else:
-                        return 'esc'  # ESC键
-                elif key == '\r':  # 回车键
-                    return 'enter'
-                elif key == '0':
-                    return '0'
-                else:
-                    return key
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return None
-
 def display_login_register_menu(selected_option):
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("欢迎来到游戏中心!\n")
-    print("使用左右方向键选择，回车确认")
-    print("\n请选择操作：")
+    lines = ["欢迎来到游戏中心!", "", "使用左右方向键选择，回车确认", "", "请选择操作："]
     if selected_option == 0:
-        print(">> 登录 <<       注册")
+        lines.append(">> 登录 <<       注册")
     else:
-        print("   登录       >> 注册 <<")
-    print("\n按0或ESC返回")
+        lines.append("   登录       >> 注册 <<")
+    lines += ["", "按0或ESC返回"]
+    screen.render(lines)
 
-def display_main_menu(selected_row, selected_col):
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("欢迎来到游戏中心!\n")
-    print("请选择游戏类别：")
-    
-    # 主菜单布局 - 更新为一行三个选项，第二行两个选项
-    menu_layout = [
-        ["赌场游戏", "刮刮乐", "街机小游戏"],    # 第一行
-        ["账号服务", "登出"]                   # 第二行
-    ]
-    
-    # 打印菜单
+def menu_grid_lines(menu_layout, selected_row, selected_col):
+    lines = []
     for row_idx, row in enumerate(menu_layout):
         line = ""
         for col_idx, item in enumerate(row):
@@ -121,14 +53,25 @@ def display_main_menu(selected_row, selected_col):
                 line += f">> {item} <<  "  # 高亮显示
             else:
                 line += f"   {item}     "  # 普通显示
-        print(line)
-    
-    print("\n按0或ESC返回")
+        lines.append(line)
+    return lines
+
+# 主菜单布局 - 一行三个选项，第二行两个选项
+MAIN_MENU_LAYOUT = [
+    ["赌场游戏", "刮刮乐", "街机小游戏"],    # 第一行
+    ["账号服务", "登出"]                   # 第二行
+]
+
+def display_main_menu(selected_row, selected_col):
+    lines = ["欢迎来到游戏中心!", "", "请选择游戏类别："]
+    lines += menu_grid_lines(MAIN_MENU_LAYOUT, selected_row, selected_col)
+    lines += ["", "按0或ESC返回"]
+    screen.render(lines)
 
 # User login
 def login():
     users = load_user_data()
-    os.system('cls' if os.name == 'nt' else 'clear')
+    term_ui.clear()
 
     # Track the attempted usernames
     attempted_usernames = []  # List to keep track of attempted usernames
@@ -145,13 +88,13 @@ def login():
 
                 # Check if the user is locked
                 if user.get('lock', "True") == "True":  # Check if the account is locked
-                    os.system('cls' if os.name == 'nt' else 'clear')
+                    term_ui.clear()
                     print(f"你的账号 {username} 被锁定 请联系管理员解锁\n")
                     return None, None, None  # Return if locked
 
                 # Check password
                 if user['password'] == password:
-                    os.system('cls' if os.name == 'nt' else 'clear')
+                    term_ui.clear()
                     print(f"欢迎, {username}! 你现在的余额为 {user['cash']}")
                     return user, users, username  # Return the current user and the full user list for updating
 
@@ -166,36 +109,28 @@ def login():
     save_user_data(users)  # Save changes to JSON
     return None, None, None  # Return None since the login failed for all users
 
+# 账号服务菜单布局
+ACCOUNT_MENU_LAYOUT = [
+    ["查询余额", "充值"],     # 第一行
+    ["更改密码", "提款"]      # 第二行
+]
+
 def display_account_menu(selected_row, selected_col):
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("请选择账号服务：")
-    
-    # 账号服务菜单布局
-    menu_layout = [
-        ["查询余额", "充值"],     # 第一行
-        ["更改密码", "提款"]      # 第二行
-    ]
-    
-    # 打印菜单
-    for row_idx, row in enumerate(menu_layout):
-        line = ""
-        for col_idx, item in enumerate(row):
-            if selected_row == row_idx and selected_col == col_idx:
-                line += f">> {item} <<  "  # 高亮显示
-            else:
-                line += f"   {item}     "  # 普通显示
-        print(line)
-    
-    print("\n按0或ESC返回")
+    lines = ["请选择账号服务："]
+    lines += menu_grid_lines(ACCOUNT_MENU_LAYOUT, selected_row, selected_col)
+    lines += ["", "按0或ESC返回"]
+    screen.render(lines)
 
 def account_services(user, users, balance):
     selected_row = 0
     selected_col = 0
+    screen.invalidate()
     
     while True:
         display_account_menu(selected_row, selected_col)
         
         key = get_key()
+        screen.mark_input()
         
         # 处理方向键
         if key == 'up':
@@ -207,6 +142,7 @@ def account_services(user, users, balance):
         elif key == 'right':
             selected_col = min(1, selected_col + 1)
         elif key == 'enter':
+            release_keys()  # 运行游戏/输入前恢复终端模式
             # 第一行第一列：查询余额
             if selected_row == 0 and selected_col == 0:
                 print(f"你最新的余额为:{balance:.2f}")
@@ -242,6 +178,7 @@ def account_services(user, users, balance):
             # 更新用户余额
             user['cash'] = f"{balance:.2f}"
             save_user_data(users)
+            screen.invalidate()
         elif key == '0' or key == 'esc':  # 0 或 ESC 键返回
             return balance, False
             
@@ -253,15 +190,18 @@ def main():
         selected_option = 0  # 0: 登录, 1: 注册
         login_register_choice = None
         
+        screen.invalidate()
         while login_register_choice is None:
             display_login_register_menu(selected_option)
             key = get_key()
+            screen.mark_input()
             
             if key == 'left':
                 selected_option = 0
             elif key == 'right':
                 selected_option = 1
             elif key == 'enter':
+                release_keys()  # 运行游戏/输入前恢复终端模式
                 login_register_choice = selected_option
             elif key == '0' or key == 'esc':
                 return  # 退出程序
@@ -282,15 +222,14 @@ def main():
         logout = False
         
         # 主菜单布局
-        menu_layout = [
-            ["赌场游戏", "刮刮乐", "街机小游戏"],    # 第一行
-            ["账号服务", "登出"]                   # 第二行
-        ]
+        menu_layout = MAIN_MENU_LAYOUT
         
+        screen.invalidate()
         while not logout:
             display_main_menu(selected_row, selected_col)
             
             key = get_key()
+            screen.mark_input()
             
             # 处理方向键
             if key == 'up':
@@ -340,6 +279,7 @@ def main():
                         selected_col = 0  # 第一行的第一个选项
                         
             elif key == 'enter':
+                release_keys()  # 运行游戏/输入前恢复终端模式
                 # 第一行第一列：赌场游戏
                 if selected_row == 0 and selected_col == 0:
                     balance = casino_games.main(balance, username)
@@ -355,6 +295,7 @@ def main():
                 # 第二行第二列：登出
                 elif selected_row == 1 and selected_col == 1:
                     logout = True
+                screen.invalidate()
             elif key == '0' or key == 'esc':  # 0 或 ESC 键返回
                 logout = True
             